@@ -1,8 +1,9 @@
 import structlog
 from fastapi import APIRouter, HTTPException, Query, Request
 
-from app.core.deps import DbClient, UserId, verify_child_ownership
+from app.core.deps import AsyncDbClient, UserId, verify_child_ownership_async
 from app.middleware.rate_limit import limiter
+from app.services.async_db import execute
 
 logger = structlog.get_logger("skolar.analytics")
 
@@ -11,14 +12,14 @@ router = APIRouter(prefix="/api/analytics", tags=["analytics"])
 
 @router.get("/skill_accuracy")
 @limiter.limit("60/minute")
-async def skill_accuracy(request: Request, user_id: UserId, db: DbClient):
+async def skill_accuracy(request: Request, user_id: UserId, db: AsyncDbClient):
     try:
         # Get user's children to scope data to this user only
-        children_res = db.table("children").select("id").eq("user_id", user_id).execute()
+        children_res = await execute(db.table("children").select("id").eq("user_id", user_id))
         child_ids = [c["id"] for c in (children_res.data or [])]
         if not child_ids:
             return []
-        res = db.table("v_skill_accuracy").select("*").in_("student_id", child_ids).execute()
+        res = await execute(db.table("v_skill_accuracy").select("*").in_("student_id", child_ids))
         return res.data
     except Exception as e:
         logger.error("skill_accuracy_failed", user_id=user_id, error=str(e))
@@ -30,19 +31,19 @@ async def skill_accuracy(request: Request, user_id: UserId, db: DbClient):
 async def error_distribution(
     request: Request,
     user_id: UserId,
-    db: DbClient,
+    db: AsyncDbClient,
     skill_tag: str | None = Query(default=None, max_length=100),
 ):
     try:
         # Get user's children to scope data to this user only
-        children_res = db.table("children").select("id").eq("user_id", user_id).execute()
+        children_res = await execute(db.table("children").select("id").eq("user_id", user_id))
         child_ids = [c["id"] for c in (children_res.data or [])]
         if not child_ids:
             return []
         q = db.table("v_error_distribution").select("*").in_("student_id", child_ids)
         if skill_tag:
             q = q.eq("skill_tag", skill_tag)
-        return q.execute().data
+        return (await execute(q)).data
     except Exception as e:
         logger.error("error_distribution_failed", user_id=user_id, error=str(e))
         raise HTTPException(status_code=500, detail="Failed to fetch error distribution")
@@ -50,10 +51,11 @@ async def error_distribution(
 
 @router.get("/student_progress")
 @limiter.limit("60/minute")
-async def student_progress(request: Request, user_id: UserId, db: DbClient, student_id: str = Query(...)):
-    verify_child_ownership(user_id, student_id)
+async def student_progress(request: Request, user_id: UserId, db: AsyncDbClient, student_id: str = Query(...)):
+    await verify_child_ownership_async(user_id, student_id, db)
     try:
-        return db.table("v_student_skill_progress").select("*").eq("student_id", student_id).execute().data
+        result = await execute(db.table("v_student_skill_progress").select("*").eq("student_id", student_id))
+        return result.data
     except Exception as e:
         logger.error("student_progress_failed", user_id=user_id, student_id=student_id, error=str(e))
         raise HTTPException(status_code=500, detail="Failed to fetch student progress")
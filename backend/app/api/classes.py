@@ -4,9 +4,10 @@ import structlog
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field, field_validator
 
-from app.core.deps import DbClient, UserId
+from app.core.deps import AsyncDbClient, DbClient, UserId
 from app.middleware.rate_limit import limiter
 from app.middleware.sanitize import sanitize_string
+from app.services.async_db import execute, gather
 
 router = APIRouter(prefix="/api/classes", tags=["classes"])
 logger = structlog.get_logger("skolar.classes")
@@ -164,7 +165,7 @@ async def get_class_dashboard(
     request: Request,
     class_id: str,
     user_id: UserId,
-    db: DbClient,
+    db: AsyncDbClient,
 ):
     """Return class mastery heatmap, weak topics, and per-student summaries.
 
@@ -174,13 +175,12 @@ async def get_class_dashboard(
 
     # 1. Verify teacher owns this class
     try:
-        cls_result = (
+        cls_result = await execute(
             db.table("teacher_classes")
             .select("id, name, grade, subject")
             .eq("id", class_id)
             .eq("user_id", user_id)
             .maybe_single()
-            .execute()
         )
         cls = getattr(cls_result, "data", None)
     except Exception as e:
@@ -192,7 +192,7 @@ async def get_class_dashboard(
 
     # 2. Find distinct children linked to this class via worksheets
     try:
-        ws_result = db.table("worksheets").select("child_id").eq("class_id", class_id).execute()
+        ws_result = await execute(db.table("worksheets").select("child_id").eq("class_id", class_id))
         ws_rows = getattr(ws_result, "data", None) or []
     except Exception as e:
         logger.error("[get_class_dashboard] DB error fetching worksheets for class %s: %s", class_id, e)
@@ -211,18 +211,11 @@ async def get_class_dashboard(
         }
 
     # 3 + 4. Fetch children names AND topic mastery in parallel (fixes N+1)
-    import asyncio
-
-    async def _fetch_children():
-        return db.table("children").select("id, name").in_("id", child_ids).execute()
-
-    async def _fetch_mastery():
-        return (
-            db.table("topic_mastery").select("child_id, topic_slug, mastery_level").in_("child_id", child_ids).execute()
-        )
-
     try:
-        children_result, mastery_result = await asyncio.gather(_fetch_children(), _fetch_mastery())
+        children_result, mastery_result = await gather(
+            db.table("children").select("id, name").in_("id", child_ids),
+            db.table("topic_mastery").select("child_id, topic_slug, mastery_level").in_("child_id", child_ids),
+        )
         children_rows = getattr(children_result, "data", None) or []
         mastery_rows = getattr(mastery_result, "data", None) or []
     except Exception as e:
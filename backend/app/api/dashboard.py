@@ -1,7 +1,7 @@
 import structlog
 from fastapi import APIRouter, Query, Request
 
-from app.core.deps import DbClient, UserId, verify_child_ownership
+from app.core.deps import AsyncDbClient, UserId, verify_child_ownership_async
 from app.middleware.rate_limit import limiter
 from app.services.dashboard_service import get_parent_dashboard
 
@@ -12,8 +12,8 @@ router = APIRouter(prefix="/api/v1/dashboard", tags=["dashboard"])
 
 @router.get("/parent")
 @limiter.limit("60/minute")
-async def parent_dashboard(request: Request, user_id: UserId, db: DbClient, student_id: str = Query(...)):
-    verify_child_ownership(user_id, student_id)
+async def parent_dashboard(request: Request, user_id: UserId, db: AsyncDbClient, student_id: str = Query(...)):
+    await verify_child_ownership_async(user_id, student_id, db)
 
     from app.services.cache import get_cached_dashboard, set_cached_dashboard
 
@@ -22,7 +22,7 @@ async def parent_dashboard(request: Request, user_id: UserId, db: DbClient, stud
         return cached
 
     try:
-        data = get_parent_dashboard(student_id)
+        data = await get_parent_dashboard(student_id, db)
         set_cached_dashboard(student_id, data)
         return data
     except Exception as e:
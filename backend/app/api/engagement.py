@@ -4,8 +4,9 @@ import structlog
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
-from app.core.deps import DbClient, UserId
+from app.core.deps import AsyncDbClient, UserId
 from app.middleware.rate_limit import limiter
+from app.services.async_db import execute
 
 router = APIRouter(prefix="/api/engagement", tags=["engagement"])
 logger = structlog.get_logger("skolar.engagement")
@@ -20,17 +21,16 @@ class EngagementStats(BaseModel):
     last_activity_date: str | None
 
 
-def ensure_engagement_exists(db: DbClient, user_id: str, child_id: str) -> dict:
+async def ensure_engagement_exists(db: AsyncDbClient, user_id: str, child_id: str) -> dict:
     """Ensure engagement record exists for a child."""
-    result = db.table("child_engagement").select("*").eq("child_id", child_id).execute()
+    result = await execute(db.table("child_engagement").select("*").eq("child_id", child_id))
 
     if result.data and len(result.data) > 0:
         return result.data[0]
 
     # Create new engagement record
-    insert_result = (
-        db.table("child_engagement")
-        .insert(
+    insert_result = await execute(
+        db.table("child_engagement").insert(
             {
                 "user_id": user_id,
                 "child_id": child_id,
@@ -41,7 +41,6 @@ def ensure_engagement_exists(db: DbClient, user_id: str, child_id: str) -> dict:
                 "total_worksheets_completed": 0,
             }
         )
-        .execute()
     )
 
     if insert_result.data:
@@ -52,16 +51,18 @@ def ensure_engagement_exists(db: DbClient, user_id: str, child_id: str) -> dict:
 
 @router.get("/{child_id}", response_model=EngagementStats)
 @limiter.limit("60/minute")
-async def get_engagement(request: Request, child_id: str, user_id: UserId, db: DbClient):
+async def get_engagement(request: Request, child_id: str, user_id: UserId, db: AsyncDbClient):
     """Get engagement stats for a child."""
     try:
         # Verify child belongs to user
-        child_result = db.table("children").select("id").eq("id", child_id).eq("user_id", user_id).single().execute()
+        child_result = await execute(
+            db.table("children").select("id").eq("id", child_id).eq("user_id", user_id).single()
+        )
 
         if not child_result.data:
             raise HTTPException(status_code=404, detail="Child not found")
 
-        engagement = ensure_engagement_exists(db, user_id, child_id)
+        engagement = await ensure_engagement_exists(db, user_id, child_id)
 
         return EngagementStats(
             child_id=engagement["child_id"],
@@ -81,16 +82,18 @@ async def get_engagement(request: Request, child_id: str, user_id: UserId, db: D
 
 @router.post("/{child_id}/complete")
 @limiter.limit("30/minute")
-async def record_completion(request: Request, child_id: str, user_id: UserId, db: DbClient):
+async def record_completion(request: Request, child_id: str, user_id: UserId, db: AsyncDbClient):
     """Record a worksheet completion (triggered on PDF download)."""
     try:
         # Verify child belongs to user
-        child_result = db.table("children").select("id").eq("id", child_id).eq("user_id", user_id).single().execute()
+        child_result = await execute(
+            db.table("children").select("id").eq("id", child_id).eq("user_id", user_id).single()
+        )
 
         if not child_result.data:
             raise HTTPException(status_code=404, detail="Child not found")
 
-        engagement = ensure_engagement_exists(db, user_id, child_id)
+        engagement = await ensure_engagement_exists(db, user_id, child_id)
 
         today = date.today()
         last_activity = None
@@ -122,16 +125,20 @@ async def record_completion(request: Request, child_id: str, user_id: UserId, db
         new_total = engagement["total_worksheets_completed"] + 1
 
         # Update engagement
-        db.table("child_engagement").update(
-            {
-                "total_stars": new_stars,
-                "current_streak": current_streak,
-                "longest_streak": longest_streak,
-                "total_worksheets_completed": new_total,
-                "last_activity_date": today.isoformat(),
-                "updated_at": datetime.now().isoformat(),
-            }
-        ).eq("child_id", child_id).execute()
+        await execute(
+            db.table("child_engagement")
+            .update(
+                {
+                    "total_stars": new_stars,
+                    "current_streak": current_streak,
+                    "longest_streak": longest_streak,
+                    "total_worksheets_completed": new_total,
+                    "last_activity_date": today.isoformat(),
+                    "updated_at": datetime.now().isoformat(),
+                }
+            )
+            .eq("child_id", child_id)
+        )
 
         return {
             "success": True,
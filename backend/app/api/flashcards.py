@@ -19,7 +19,6 @@ from pydantic import BaseModel, Field, field_validator
 from app.core.deps import DbClient, UserId
 from app.middleware.rate_limit import limiter
 from app.middleware.sanitize import VALID_GRADES, VALID_SUBJECTS
-from app.services.flashcard_pdf import FlashcardPDFService
 from app.services.subscription_check import check_ai_usage_allowed
 
 logger = structlog.get_logger("skolar.flashcards")
@@ -83,12 +82,9 @@ async def generate_flashcards(request: Request, req: FlashcardRequest, user_id:
         raise HTTPException(status_code=402, detail=usage["message"])
 
     # -- Cache check --
-    from app.services.cache import get_cached_flashcards, set_cached_flashcards
+    from app.services.cache import get_or_create_flashcards
 
-    cached = get_cached_flashcards(req.grade, req.subject, req.topic, req.language)
-    if cached:
-        result = cached
-    else:
+    async def _generate() -> dict:
         prompt = _build_flashcard_prompt(req.grade, req.subject, req.topic, req.language, req.count)
 
         # -- RAG: Inject curriculum context --
@@ -100,17 +96,18 @@ async def generate_flashcards(request: Request, req: FlashcardRequest, user_id:
             logger.info("Curriculum context injected for flashcards: %s/%s/%s", req.grade, req.subject, req.topic)
         # -- End RAG --
 
-        result = await _call_gemini_for_flashcards(prompt)
+        generated = await _call_gemini_for_flashcards(prompt)
 
         # Validate output
         from app.services.output_validator import get_validator
 
-        is_valid, errors = get_validator().validate_flashcards(result)
+        is_valid, errors = get_validator().validate_flashcards(generated)
         if not is_valid:
             logger.warning("Flashcard validation issues", extra={"errors": errors})
+        return generated
 
-        # Cache the result
-        set_cached_flashcards(req.grade, req.subject, req.topic, req.language, result)
+    # Cached per grade/subject/topic/language; concurrent misses share one generation
+    result = dict(await get_or_create_flashcards(req.grade, req.subject, req.topic, req.language, _generate))
 
     # Attach request metadata
     result["grade"] = req.grade
@@ -127,6 +124,9 @@ async def generate_flashcards(request: Request, req: FlashcardRequest, user_id:
 @limiter.limit("10/minute")
 async def export_flashcard_pdf(request: Request, data: FlashcardSet, user_id: UserId, db: DbClient):
     """Generate a printable 2-page PDF from flashcards and return as downloadable file."""
+    # ReportLab + font registration is imported on first export, not at worker boot
+    from app.services.flashcard_pdf import FlashcardPDFService
+
     pdf_bytes = FlashcardPDFService.generate(data.model_dump())
     logger.info(f"Flashcard PDF exported for user={user_id}: {data.topic}")
 
@@ -1,12 +1,23 @@
+import importlib
 import os
 
 import structlog
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
 
 logger = structlog.get_logger("skolar.health")
 
 router = APIRouter()
 
+# (checks key, module, stats function) — counters shown by /health/deep that never fail it
+_STATS_CHECKS: tuple[tuple[str, str, str], ...] = (
+    ("cache", "app.services.cache", "cache_stats"),
+    ("telemetry", "app.services.telemetry", "telemetry_stats"),
+    ("auth_cache", "app.core.jwt_verify", "auth_cache_stats"),
+    ("pdf_pool", "app.services.v3.pdf_pool", "pdf_pool_stats"),
+    ("pdf_artifacts", "app.services.pdf_artifact_cache", "pdf_artifact_stats"),
+)
+
 
 @router.get("/health")
 async def health_check():
@@ -62,14 +73,13 @@ async def deep_health(request: Request):
         logger.debug("curriculum_check_failed", error=str(e))
         checks["curriculum_topics"] = "unavailable"
 
-    # 5. Cache stats
-    try:
-        from app.services.cache import cache_stats
-
-        checks["cache"] = cache_stats()
-    except Exception as e:
-        logger.debug("cache_check_failed", error=str(e))
-        checks["cache"] = "unavailable"
+    # 5. Component counters (cache, telemetry sink, auth cache, PDF pool, PDF artifacts)
+    for key, module, getter in _STATS_CHECKS:
+        try:
+            checks[key] = getattr(importlib.import_module(module), getter)()
+        except Exception as e:
+            logger.debug(f"{key}_check_failed", error=str(e))
+            checks[key] = "unavailable"
 
     # 6. Embedding service
     try:
@@ -93,7 +103,8 @@ async def deep_health(request: Request):
         logger.debug("vector_search_check_failed", error=str(e))
         checks["vector_search"] = f"error: {str(e)[:100]}"
 
-    all_ok = all(v == "ok" for k, v in checks.items() if k not in ("ai_stats", "curriculum_topics", "cache"))
+    informational = {"ai_stats", "curriculum_topics", *(key for key, _, _ in _STATS_CHECKS)}
+    all_ok = all(v == "ok" for k, v in checks.items() if k not in informational)
 
     return {
         "status": "healthy" if all_ok else "degraded",
@@ -122,6 +133,25 @@ async def ai_metrics(request: Request):
         raise HTTPException(status_code=500, detail="Failed to get AI metrics")
 
 
+@router.get("/metrics")
+async def prometheus_metrics(request: Request):
+    """Per-stage generation latency histograms in Prometheus text format.
+
+    Protected by HEALTH_CHECK_TOKEN when set — sent as X-Health-Token or as a
+    bearer token (Prometheus ``authorization`` scrape config).
+    """
+    expected_token = os.environ.get("HEALTH_CHECK_TOKEN", "")
+    if expected_token:
+        provided = request.headers.get("X-Health-Token", "")
+        bearer = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if expected_token not in (provided, bearer):
+            raise HTTPException(status_code=403, detail="Forbidden")
+
+    from app.services.metrics import get_metrics_registry
+
+    return PlainTextResponse(get_metrics_registry().render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @router.get("/api/v1/curriculum/check")
 async def check_curriculum(grade: str = "Class 3", subject: str = "Maths", topic: str = "Fractions"):
     """Check if curriculum content exists for a topic (debug endpoint)."""
@@ -19,7 +19,6 @@ from pydantic import BaseModel, field_validator
 from app.core.deps import DbClient, UserId
 from app.middleware.rate_limit import limiter
 from app.middleware.sanitize import VALID_GRADES, VALID_SUBJECTS
-from app.services.revision_pdf import generate_revision_pdf
 from app.services.subscription_check import check_ai_usage_allowed
 
 logger = structlog.get_logger("skolar.revision")
@@ -107,12 +106,9 @@ async def generate_revision_notes(request: Request, req: RevisionRequest, user_i
         raise HTTPException(status_code=402, detail=usage["message"])
 
     # -- Cache check --
-    from app.services.cache import get_cached_revision, set_cached_revision
+    from app.services.cache import get_or_create_revision
 
-    cached = get_cached_revision(req.grade, req.subject, req.topic, req.language)
-    if cached:
-        result = cached
-    else:
+    async def _generate() -> dict:
         prompt = _build_revision_prompt(req.grade, req.subject, req.topic, req.language)
 
         # -- RAG: Inject curriculum context --
@@ -124,17 +120,18 @@ async def generate_revision_notes(request: Request, req: RevisionRequest, user_i
             logger.info("Curriculum context injected for revision: %s/%s/%s", req.grade, req.subject, req.topic)
         # -- End RAG --
 
-        result = await _call_gemini_for_revision(prompt)
+        generated = await _call_gemini_for_revision(prompt)
 
         # Validate output
         from app.services.output_validator import get_validator
 
-        is_valid, errors = get_validator().validate_revision(result)
+        is_valid, errors = get_validator().validate_revision(generated)
         if not is_valid:
             logger.warning("Revision validation issues", extra={"errors": errors})
+        return generated
 
-        # Cache the result
-        set_cached_revision(req.grade, req.subject, req.topic, req.language, result)
+    # Cached per grade/subject/topic/language; concurrent misses share one generation
+    result = dict(await get_or_create_revision(req.grade, req.subject, req.topic, req.language, _generate))
 
     # Attach request metadata to the response
     result["grade"] = req.grade
@@ -153,6 +150,9 @@ async def export_revision_pdf(request: Request, notes: RevisionResponse, user_id
 
     import asyncio
 
+    # ReportLab + font registration is imported on first export, not at worker boot
+    from app.services.revision_pdf import generate_revision_pdf
+
     pdf_bytes = await asyncio.to_thread(generate_revision_pdf, notes)
     logger.info(f"Revision PDF exported for user={user_id}: {notes.topic}")
 
@@ -1,21 +1,31 @@
-"""Saved worksheets API — save, list, get, delete, export-pdf, regenerate, analytics.
+"""Saved worksheets API — save, list, get, delete, export-pdf, export-bulk, regenerate, analytics.
 
 These endpoints were in the old worksheets.py and got deleted in Sprint A1.
 Restored here as a standalone module with modern patterns.
 """
 
+import os
 from datetime import datetime
+from pathlib import Path
+from typing import Literal
 from urllib.parse import quote
 
 import structlog
 from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
 
-from app.core.deps import AiClient, DbClient, PdfDep, UserId
+from app.core.deps import AiClient, AsyncDbClient, DbClient, PdfDep, UserId
 from app.middleware.rate_limit import limiter
+from app.middleware.sanitize import VALID_GRADES, VALID_SUBJECTS
 
 logger = structlog.get_logger("skolar.saved_worksheets")
 
+# Bulk export: most PDFs per request, and renders in flight at once
+BULK_EXPORT_MAX_FILES = int(os.getenv("PDF_BULK_MAX_FILES", "120"))
+BULK_EXPORT_CONCURRENCY = int(os.getenv("PDF_BULK_CONCURRENCY", "0"))  # 0 = one per pool worker
+
 router = APIRouter(prefix="/api/worksheets", tags=["saved-worksheets"])
 
 
@@ -73,6 +83,14 @@ class PDFExportRequest(BaseModel):
         extra = "allow"
 
 
+class BulkPDFExportRequest(BaseModel):
+    worksheet_ids: list[str] = Field(default_factory=list, max_length=100)
+    class_id: str | None = None  # every saved worksheet of this class
+    pdf_types: list[Literal["full", "student", "answer_key"]] = Field(default=["student"], min_length=1, max_length=3)
+    visual_theme: str | None = "color"
+    format: Literal["zip", "pdf"] = "zip"  # pdf = one merged document
+
+
 # ── 1. Save worksheet ─────────────────────────────────────────────────────────
 
 
@@ -164,13 +182,15 @@ async def save_worksheet(
 async def list_saved_worksheets(
     request: Request,
     user_id: UserId,
-    db: DbClient,
+    db: AsyncDbClient,
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
     child_id: str | None = None,
     class_id: str | None = None,
 ):
     """List user's saved worksheets."""
+    from app.services.async_db import execute
+
     try:
         query = db.table("worksheets").select("*, children(id, name), teacher_classes(id, name)").eq("user_id", user_id)
 
@@ -179,7 +199,7 @@ async def list_saved_worksheets(
         if class_id:
             query = query.eq("class_id", class_id)
 
-        result = query.order("created_at", desc=True).range(offset, offset + limit - 1).execute()
+        result = await execute(query.order("created_at", desc=True).range(offset, offset + limit - 1))
 
         worksheets = []
         for row in result.data:
@@ -327,15 +347,157 @@ async def delete_saved_worksheet(
 # ── 5. Export PDF ─────────────────────────────────────────────────────────────
 
 
+async def _user_watermark(user_id: str, db) -> str | None:
+    """Watermark text for *user_id*'s PDFs: "Skolar" on the free tier, None when paid."""
+    from app.services.subscription_check import get_user_tier
+
+    try:
+        if await get_user_tier(user_id, db) == "paid":
+            return None  # paid users get clean PDFs
+    except Exception as _tier_exc:
+        logger.warning("tier_lookup_failed", error=str(_tier_exc))
+    return "Skolar"  # default: free tier watermark
+
+
+def _pdf_filename(title: str, pdf_type: str) -> tuple[str, str]:
+    """(ASCII-safe filename, UTF-8 filename) for a worksheet PDF."""
+    type_suffix = f"_{pdf_type}" if pdf_type != "full" else ""
+    raw_title = (title or "worksheet").replace(" ", "_")
+    safe_title = raw_title.encode("ascii", errors="ignore").decode("ascii") or "worksheet"
+    return f"{safe_title}{type_suffix}.pdf", f"{raw_title}{type_suffix}.pdf"
+
+
+def _attachment_headers(filename: str, utf8_filename: str) -> dict:
+    return {"Content-Disposition": f"attachment; filename=\"{filename}\"; filename*=UTF-8''{quote(utf8_filename)}"}
+
+
+async def _cached_pdf(worksheet_dict: dict, pdf_type: str, visual_theme: str | None, watermark: str | None):
+    """Look up a previously rendered PDF. Returns (artifact_key or None, Path or None).
+
+    The Path is pinned against eviction; pass it to _release_cached_pdf() once served.
+    """
+    import asyncio
+
+    from app.services.pdf_artifact_cache import artifact_key, get_pdf_artifact_store
+
+    artifacts = get_pdf_artifact_store()
+    if artifacts is None:
+        return None, None
+    key = artifact_key(worksheet_dict, pdf_type, visual_theme, watermark)
+    return key, await asyncio.to_thread(artifacts.lookup, key)
+
+
+def _release_cached_pdf(path: Path) -> None:
+    from app.services.pdf_artifact_cache import get_pdf_artifact_store
+
+    artifacts = get_pdf_artifact_store()
+    if artifacts is not None:
+        artifacts.release(path)
+
+
+def _metric_labels(worksheet_dict: dict) -> dict:
+    """subject/grade histogram labels from the client's worksheet body.
+
+    Both are free text here, and every distinct value would be a new series
+    kept for the life of the worker, so anything unknown is reported as "other".
+    """
+    subject, grade = worksheet_dict.get("subject"), worksheet_dict.get("grade")
+    return {
+        "subject": subject if subject in VALID_SUBJECTS else "other",
+        "grade": grade if grade in VALID_GRADES else "other",
+    }
+
+
+async def _render_pdf(
+    worksheet_dict: dict,
+    pdf_type: str,
+    visual_theme: str | None,
+    watermark: str | None,
+    encrypt_password: str | None,
+    pdf_service,
+    cache_key: str | None = None,
+) -> bytes:
+    """Render a worksheet PDF and store it in the artifact cache under *cache_key*.
+
+    Tries the WeasyPrint renderer on the PDF worker pool first and falls back
+    to ReportLab in a thread, so the event loop keeps serving other requests.
+    Raises PDFPoolBusy when the pool is at capacity.
+    """
+    import asyncio
+
+    from app.services.metrics import stage_timer
+    from app.services.pdf_artifact_cache import get_pdf_artifact_store
+    from app.services.v3.pdf_pool import PDFPoolBusy, get_pdf_pool
+
+    _labels = _metric_labels(worksheet_dict)
+    USE_NEW_PDF = True
+    engine = "weasyprint" if USE_NEW_PDF else "reportlab"
+    if USE_NEW_PDF:
+        try:
+            with stage_timer("pdf_render", engine="weasyprint", **_labels):
+                pdf_bytes = await get_pdf_pool().render(worksheet_dict, pdf_type=pdf_type)
+        except PDFPoolBusy:
+            raise
+        except Exception as weasy_exc:
+            logger.warning("weasyprint_failed_fallback_to_reportlab", error=str(weasy_exc))
+            engine = "reportlab"
+            worksheet_dict["visual_theme"] = visual_theme or "color"
+            with stage_timer("pdf_render", engine="reportlab", **_labels):
+                pdf_bytes = await asyncio.to_thread(
+                    pdf_service.generate_worksheet_pdf,
+                    worksheet_dict,
+                    pdf_type=pdf_type,
+                    watermark=watermark,
+                    encrypt_password=encrypt_password,
+                )
+    else:
+        worksheet_dict["visual_theme"] = visual_theme or "color"
+        with stage_timer("pdf_render", engine="reportlab", **_labels):
+            pdf_bytes = await asyncio.to_thread(
+                pdf_service.generate_worksheet_pdf,
+                worksheet_dict,
+                pdf_type=pdf_type,
+                watermark=watermark,
+                encrypt_password=encrypt_password,
+            )
+
+    # Answer keys from the ReportLab fallback are encrypted per user — never share those
+    _artifacts = get_pdf_artifact_store()
+    _cacheable = engine == "weasyprint" or encrypt_password is None
+    if _artifacts is not None and cache_key is not None and _cacheable:
+        await asyncio.to_thread(_artifacts.store, cache_key, pdf_bytes)
+    return pdf_bytes
+
+
 @router.post("/export-pdf")
 @limiter.limit("10/minute")
 async def export_worksheet_pdf(
     request: Request, body: PDFExportRequest, user_id: UserId, db: DbClient, pdf_service: PdfDep
 ):
-    """Export a worksheet as a PDF file."""
+    """Export a worksheet as a PDF file.
+
+    Rendered PDFs are cached by content (worksheet, pdf_type, visual_theme,
+    watermark): repeat exports are served from disk without scoring or rendering.
+    """
     try:
+        from app.services.v3.pdf_pool import PDFPoolBusy
+
         worksheet_dict = body.worksheet.model_dump()
 
+        # Determine user tier for watermark (cached per user for a few minutes)
+        _watermark = await _user_watermark(user_id, db)
+        _headers = _attachment_headers(*_pdf_filename(body.worksheet.title, body.pdf_type))
+
+        # Repeat export → stream the stored file
+        _artifact_key, cached_path = await _cached_pdf(worksheet_dict, body.pdf_type, body.visual_theme, _watermark)
+        if cached_path is not None:
+            return FileResponse(
+                cached_path,
+                media_type="application/pdf",
+                headers=_headers,
+                background=BackgroundTask(_release_cached_pdf, cached_path),
+            )
+
         # Quality score — log warning if below threshold but don't block export.
         # Users should always be able to download worksheets the system generated.
         try:
@@ -353,58 +515,29 @@ async def export_worksheet_pdf(
         except Exception as _qs_exc:
             logger.warning("quality_score_skipped", error=str(_qs_exc))
 
-        # Determine user tier for watermark
-        _watermark = "Skolar"  # default: free tier watermark
-        try:
-            _sub = db.table("user_subscriptions").select("tier").eq("user_id", user_id).maybe_single().execute()
-            if _sub.data and _sub.data.get("tier") == "paid":
-                _watermark = None  # paid users get clean PDFs
-        except Exception as _tier_exc:
-            logger.warning("tier_lookup_failed", error=str(_tier_exc))
-
         # Encrypt answer keys with user_id prefix
         _encrypt = None
         if body.pdf_type == "answer_key":
             _encrypt = user_id[:8]
 
-        # Generate PDF — try new WeasyPrint renderer first, fall back to ReportLab
-        USE_NEW_PDF = True
-        if USE_NEW_PDF:
-            try:
-                from app.services.v3.pdf_renderer import generate_pdf as weasy_generate_pdf
-
-                pdf_bytes = weasy_generate_pdf(worksheet_dict, pdf_type=body.pdf_type)
-            except Exception as weasy_exc:
-                logger.warning("weasyprint_failed_fallback_to_reportlab", error=str(weasy_exc))
-                worksheet_dict["visual_theme"] = body.visual_theme or "color"
-                pdf_bytes = pdf_service.generate_worksheet_pdf(
-                    worksheet_dict,
-                    pdf_type=body.pdf_type,
-                    watermark=_watermark,
-                    encrypt_password=_encrypt,
-                )
-        else:
-            worksheet_dict["visual_theme"] = body.visual_theme or "color"
-            pdf_bytes = pdf_service.generate_worksheet_pdf(
+        try:
+            pdf_bytes = await _render_pdf(
                 worksheet_dict,
-                pdf_type=body.pdf_type,
-                watermark=_watermark,
-                encrypt_password=_encrypt,
+                body.pdf_type,
+                body.visual_theme,
+                _watermark,
+                _encrypt,
+                pdf_service,
+                cache_key=_artifact_key,
+            )
+        except PDFPoolBusy as busy:
+            raise HTTPException(
+                status_code=503,
+                detail="PDF export is busy right now. Please try again in a few seconds.",
+                headers={"Retry-After": str(busy.retry_after)},
             )
 
-        # Create safe filename
-        type_suffix = f"_{body.pdf_type}" if body.pdf_type != "full" else ""
-        raw_title = body.worksheet.title.replace(" ", "_")
-        safe_title = raw_title.encode("ascii", errors="ignore").decode("ascii") or "worksheet"
-        filename = f"{safe_title}{type_suffix}.pdf"
-
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename=\"{filename}\"; filename*=UTF-8''{quote(raw_title + type_suffix + '.pdf')}"
-            },
-        )
+        return Response(content=pdf_bytes, media_type="application/pdf", headers=_headers)
     except HTTPException:
         raise
     except Exception as exc:
@@ -415,6 +548,158 @@ async def export_worksheet_pdf(
         raise HTTPException(status_code=500, detail=f"PDF generation failed: {type(exc).__name__}: {exc}")
 
 
+# ── 5b. Bulk export (class set / worksheet set) ──────────────────────────────
+
+
+@router.post("/export-bulk")
+@limiter.limit("3/minute")
+async def export_worksheets_bulk(
+    request: Request, body: BulkPDFExportRequest, user_id: UserId, db: AsyncDbClient, pdf_service: PdfDep
+):
+    """Export many saved worksheets × pdf_types in one request.
+
+    ``format="zip"`` streams a ZIP that grows as each PDF finishes rendering;
+    ``format="pdf"`` returns one merged PDF in worksheet order. Renders run
+    concurrently (bounded by the PDF worker pool) and reuse the artifact cache.
+    """
+    import asyncio
+    import shutil
+    import tempfile
+
+    from fastapi.responses import StreamingResponse
+
+    from app.services.async_db import execute
+    from app.services.pdf_bundle import BundleJob, merge_pdfs, render_bounded, stream_zip
+    from app.services.v3.pdf_pool import PDFPoolBusy, get_pdf_pool
+
+    if not body.worksheet_ids and not body.class_id:
+        raise HTTPException(status_code=422, detail="Provide worksheet_ids or class_id")
+
+    # 1. Load the worksheets (owned by this user only)
+    try:
+        if body.class_id:
+            cls_result = await execute(
+                db.table("teacher_classes")
+                .select("id, name")
+                .eq("id", body.class_id)
+                .eq("user_id", user_id)
+                .maybe_single()
+            )
+            cls = getattr(cls_result, "data", None)
+            if not cls:
+                raise HTTPException(status_code=403, detail="Access denied or class not found")
+        query = db.table("worksheets").select("*, children(id, name)").eq("user_id", user_id)
+        if body.worksheet_ids:
+            query = query.in_("id", body.worksheet_ids)
+        if body.class_id:
+            query = query.eq("class_id", body.class_id)
+        result = await execute(query.order("created_at", desc=False))
+        rows = getattr(result, "data", None) or []
+    except HTTPException:
+        raise
+    except Exception as exc:
+        logger.error("bulk_export_load_failed", error=str(exc))
+        raise HTTPException(status_code=500, detail="Failed to load worksheets")
+
+    if not rows:
+        raise HTTPException(status_code=404, detail="No worksheets found")
+    if body.worksheet_ids:
+        order = {ws_id: i for i, ws_id in enumerate(body.worksheet_ids)}
+        rows.sort(key=lambda r: order.get(r["id"], len(order)))
+    if len(rows) * len(body.pdf_types) > BULK_EXPORT_MAX_FILES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many PDFs in one export (max {BULK_EXPORT_MAX_FILES}). Select fewer worksheets or PDF types.",
+        )
+
+    # 2. One job per (worksheet, pdf_type)
+    _watermark = await _user_watermark(user_id, db)
+    jobs = []
+    for i, row in enumerate(rows, start=1):
+        worksheet_dict = PDFExportWorksheet(
+            **{k: row[k] for k in PDFExportWorksheet.model_fields if row.get(k) is not None}
+        ).model_dump()
+        child = row.get("children") or {}
+        title = f"{child['name']}_{worksheet_dict['title']}" if child.get("name") else worksheet_dict["title"]
+        for pdf_type in body.pdf_types:
+            jobs.append(BundleJob(f"{i:03d}_{_pdf_filename(title, pdf_type)[0]}", worksheet_dict, pdf_type))
+
+    async def _render(job: BundleJob) -> bytes | Path:
+        key, cached_path = await _cached_pdf(job.worksheet, job.pdf_type, body.visual_theme, _watermark)
+        if cached_path is not None:
+            return cached_path
+        encrypt = user_id[:8] if job.pdf_type == "answer_key" else None
+        # Other users' exports can fill the pool mid-stream; wait for a slot instead of failing the item
+        for attempt in range(3):
+            try:
+                return await _render_pdf(
+                    dict(job.worksheet), job.pdf_type, body.visual_theme, _watermark, encrypt, pdf_service, key
+                )
+            except PDFPoolBusy as busy:
+                if attempt == 2:
+                    raise
+                await asyncio.sleep(busy.retry_after)
+
+    concurrency = BULK_EXPORT_CONCURRENCY or max(1, get_pdf_pool().workers)
+    logger.info("bulk_export_started", files=len(jobs), format=body.format, concurrency=concurrency)
+    bundle_name = "Class_set" if body.class_id else "Worksheets"
+
+    async def _released(results):
+        # A cached part is a pinned link to the artifact — drop it once its entry is written
+        async for res in results:
+            yield res
+            if isinstance(res.pdf, Path):
+                _release_cached_pdf(res.pdf)
+
+    # 3a. ZIP — streamed while rendering
+    if body.format == "zip":
+        return StreamingResponse(
+            stream_zip(_released(render_bounded(jobs, _render, concurrency))),
+            media_type="application/zip",
+            headers=_attachment_headers(f"{bundle_name}.zip", f"{bundle_name}.zip"),
+        )
+
+    # 3b. Merged PDF — spool parts to disk in completion order, merge in worksheet order
+    tmpdir = Path(tempfile.mkdtemp(prefix="skolar-bulk-"))
+    try:
+        parts: dict[str, Path] = {}
+        failed = 0
+        async for res in render_bounded(jobs, _render, concurrency):
+            if res.error is not None:
+                failed += 1
+                continue
+            part = tmpdir / res.job.name
+            if isinstance(res.pdf, Path):
+                await asyncio.to_thread(shutil.copyfile, res.pdf, part)
+                _release_cached_pdf(res.pdf)
+            else:
+                await asyncio.to_thread(part.write_bytes, res.pdf)
+            parts[res.job.name] = part
+        if not parts:
+            raise HTTPException(status_code=500, detail="PDF generation failed for every worksheet")
+
+        out_path = tmpdir / f"{bundle_name}.pdf"
+        ordered = [parts[job.name] for job in jobs if job.name in parts]
+        await asyncio.to_thread(merge_pdfs, ordered, out_path, user_id[:8])
+    except HTTPException:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        raise
+    except Exception as exc:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        logger.exception("bulk_export_failed", error=str(exc))
+        raise HTTPException(status_code=500, detail=f"PDF generation failed: {type(exc).__name__}: {exc}")
+
+    headers = _attachment_headers(out_path.name, out_path.name)
+    if failed:
+        headers["X-Export-Failed-Count"] = str(failed)
+    return FileResponse(
+        out_path,
+        media_type="application/pdf",
+        headers=headers,
+        background=BackgroundTask(shutil.rmtree, tmpdir, ignore_errors=True),
+    )
+
+
 # ── 6. Regenerate worksheet ───────────────────────────────────────────────────
 
 
@@ -23,6 +23,7 @@ from app.models.worksheet import (
     WorksheetGenerationRequest,
     WorksheetGenerationResponse,
 )
+from app.services.ai_client import wait_for_llm
 from app.services.subscription_check import check_and_increment_usage
 from app.services.worksheet_generator import generate_worksheet
 
@@ -91,7 +92,7 @@ async def generate_worksheet_v2(
             from app.services.v4_engine import generate_worksheet_v4
 
             ai_client = get_ai_client()
-            data, elapsed_ms, warnings = await asyncio.wait_for(
+            data, elapsed_ms, warnings = await wait_for_llm(
                 asyncio.to_thread(
                     generate_worksheet_v4,
                     client=ai_client,
@@ -110,11 +111,10 @@ async def generate_worksheet_v2(
             )
             logger.info("[v4] Generation complete: %dms, %d warnings", elapsed_ms, len(warnings))
         elif engine == "v3":
-            from app.services.v3 import generate_worksheet_v3
+            from app.services.v3 import generate_worksheet_v3_async
 
-            data, elapsed_ms, warnings = await asyncio.wait_for(
-                asyncio.to_thread(
-                    generate_worksheet_v3,
+            data, elapsed_ms, warnings = await wait_for_llm(
+                generate_worksheet_v3_async(
                     client=client,
                     board=body.board,
                     grade_level=body.grade_level,
@@ -131,7 +131,7 @@ async def generate_worksheet_v2(
             )
             logger.info("[v3] Generation complete: %dms, %d warnings", elapsed_ms, len(warnings))
         else:
-            data, elapsed_ms, warnings = await asyncio.wait_for(
+            data, elapsed_ms, warnings = await wait_for_llm(
                 asyncio.to_thread(
                     generate_worksheet,
                     client=client,
@@ -3,15 +3,20 @@ Worksheets v3 API — deterministic slot-builder pipeline.
 
 Mounts at /api/v3/worksheets. Uses the v3 slot builder that makes all
 structural decisions in Python and only asks Gemini to write question text.
+
+/generate/stream returns the same worksheet as Server-Sent Events so the UI
+can show the slot plan and each question as soon as its batch is ready.
 """
 
 from __future__ import annotations
 
 import asyncio
+import json
 
 import sentry_sdk
 import structlog
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
 from app.core.deps import DbClient, OpenAICompat, UserId
 from app.middleware.rate_limit import limiter
@@ -21,6 +26,7 @@ from app.models.worksheet import (
     WorksheetGenerationRequest,
     WorksheetGenerationResponse,
 )
+from app.services.ai_client import iter_with_llm_deadline, wait_for_llm
 from app.services.subscription_check import check_and_increment_usage
 
 logger = structlog.get_logger(__name__)
@@ -76,12 +82,11 @@ async def generate_worksheet_v3_endpoint(
     if not usage["allowed"]:
         raise HTTPException(status_code=402, detail=usage["message"])
     from app.services.telemetry import emit_event
-    from app.services.v3 import generate_worksheet_v3
+    from app.services.v3 import generate_worksheet_v3_async
 
     try:
-        data, elapsed_ms, warnings = await asyncio.wait_for(
-            asyncio.to_thread(
-                generate_worksheet_v3,
+        data, elapsed_ms, warnings = await wait_for_llm(
+            generate_worksheet_v3_async(
                 client=client,
                 board=body.board,
                 grade_level=body.grade_level,
@@ -128,6 +133,13 @@ async def generate_worksheet_v3_endpoint(
         ok=True,
     )
 
+    return _build_response(body, data, elapsed_ms, warnings)
+
+
+def _build_response(
+    body: WorksheetGenerationRequest, data: dict, elapsed_ms: int, warnings: list[str]
+) -> WorksheetGenerationResponse:
+    """Map a v3 worksheet dict to the API response (shared by /generate and /generate/stream)."""
     raw_questions = data.get("questions", [])
     questions = [_map_question(q, i) for i, q in enumerate(raw_questions)]
 
@@ -188,3 +200,94 @@ async def generate_worksheet_v3_endpoint(
         quality_score=None,
         trust_summary=trust_summary,
     )
+
+
+def _sse(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False, default=str)}\n\n"
+
+
+@router.post("/generate/stream")
+@limiter.limit("10/minute")
+async def generate_worksheet_v3_stream(
+    request: Request, body: WorksheetGenerationRequest, user_id: UserId, db: DbClient, client: OpenAICompat
+):
+    """Generate a v3 worksheet, streamed as Server-Sent Events.
+
+    Events, in order: ``plan`` (slot skeleton), ``question`` (one per slot as
+    its batch is filled and light-validated, repeated with ``retried`` if the
+    retry replaced it), ``quality_gate``, ``html``, then ``done`` carrying the
+    same WorksheetGenerationResponse as /generate (minus rendered_html, already
+    sent in ``html``). A failure mid-stream, or running past the same 90 s
+    deadline as /generate, ends with an ``error`` event.
+    """
+    sentry_sdk.set_tag("topic", body.topic)
+    sentry_sdk.set_tag("subject", body.subject)
+
+    usage = await check_and_increment_usage(user_id, db)
+    if not usage["allowed"]:
+        raise HTTPException(status_code=402, detail=usage["message"])
+    from app.services.telemetry import emit_event
+    from app.services.v3 import stream_worksheet_v3
+
+    route = "/api/v3/worksheets/generate/stream"
+
+    async def events():
+        try:
+            async for event, payload in iter_with_llm_deadline(
+                stream_worksheet_v3(
+                    client=client,
+                    board=body.board,
+                    grade_level=body.grade_level,
+                    subject=body.subject,
+                    topic=body.topic,
+                    difficulty=body.difficulty,
+                    num_questions=body.num_questions,
+                    language=body.language,
+                    problem_style=body.problem_style,
+                    custom_instructions=body.custom_instructions,
+                ),
+                timeout=90.0,
+            ):
+                if event != "done":
+                    yield _sse(event, payload)
+                    continue
+                data, elapsed_ms = payload["worksheet"], payload["elapsed_ms"]
+                emit_event(
+                    "worksheet_generation",
+                    route=route,
+                    version="v3",
+                    topic=body.topic,
+                    skill_tag=data.get("skill_focus"),
+                    latency_ms=elapsed_ms,
+                    ok=True,
+                )
+                response = _build_response(body, data, elapsed_ms, payload["warnings"])
+                yield _sse("done", response.model_dump(mode="json", exclude={"worksheet": {"rendered_html"}}))
+        except asyncio.TimeoutError:
+            emit_event(
+                "worksheet_generation",
+                route=route,
+                version="v3",
+                topic=body.topic,
+                ok=False,
+                error_type="TimeoutError",
+            )
+            logger.error("[v3] Streamed generation timed out (90s) topic=%s", body.topic)
+            yield _sse("error", {"detail": "Worksheet generation timed out. Please try again."})
+        except Exception as exc:
+            emit_event(
+                "worksheet_generation",
+                route=route,
+                version="v3",
+                topic=body.topic,
+                ok=False,
+                error_type=type(exc).__name__,
+            )
+            logger.error("[v3] Streamed generation failed: %s", exc)
+            yield _sse("error", {"detail": "Worksheet generation failed. Please try again."})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -11,6 +11,7 @@ class Settings(BaseSettings):
     # Supabase
     supabase_url: str
     supabase_service_key: str
+    supabase_jwt_secret: str = ""  # HS256 projects: lets auth verify tokens locally
 
     # OpenAI (kept for fallback)
     openai_api_key: str = ""
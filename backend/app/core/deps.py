@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated, Any
 
 import structlog
 from fastapi import Depends, Header, HTTPException
-from supabase import Client, create_client
+from supabase import AsyncClient, Client, create_client
 
 from app.core.config import get_settings
+from app.core.jwt_verify import LOCAL_VERIFY, InvalidTokenError, get_token_verifier
 from app.services.ai_client import AIClient, OpenAICompatAdapter, get_ai_client, get_openai_compat_client
 from app.services.embedding import EmbeddingService, get_embedding_service
-from app.services.pdf import PDFService, get_pdf_service
+
+if TYPE_CHECKING:
+    from app.services.pdf import PDFService
 
 logger = structlog.get_logger("skolar.deps")
 
@@ -21,17 +24,28 @@ def get_supabase_client() -> Client:
     return create_client(settings.supabase_url, settings.supabase_service_key)
 
 
+async def get_async_supabase_client() -> AsyncClient:
+    """Pooled async Supabase client — await its queries via app.services.async_db.execute()."""
+    from app.services.async_db import get_async_supabase
+
+    return get_async_supabase()
+
+
 def get_current_user_id(authorization: str) -> str:
     """Extract user_id from Supabase JWT token.
 
     Centralised auth helper — all routers should import this instead
-    of maintaining their own ``get_user_id_from_token`` copy.
+    of maintaining their own ``get_user_id_from_token`` copy. Tokens are
+    verified locally and cached until expiry (see app.core.jwt_verify).
     """
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
 
     token = authorization.replace("Bearer ", "")
     try:
+        if LOCAL_VERIFY:
+            return get_token_verifier().user_id(token)
+
         sb = get_supabase_client()
         user_response = sb.auth.get_user(token)
         if not user_response or not user_response.user:
@@ -39,11 +53,24 @@ def get_current_user_id(authorization: str) -> str:
         return user_response.user.id
     except HTTPException:
         raise
+    except InvalidTokenError:
+        raise HTTPException(status_code=401, detail="Invalid token")
     except Exception as e:
         logger.error("Auth verification failed: %s", e)
         raise HTTPException(status_code=401, detail="Authentication failed")
 
 
+def get_pdf_service() -> PDFService:
+    """Shared PDFService, imported on first use.
+
+    app.services.pdf loads ReportLab and registers its fonts at import time
+    (~200 ms), so workers only pay for it on their first PDF export.
+    """
+    from app.services.pdf import get_pdf_service as _get_pdf_service
+
+    return _get_pdf_service()
+
+
 async def get_user_id(authorization: str = Header(...)) -> str:
     """FastAPI dependency that extracts user_id from JWT.
 
@@ -54,10 +81,14 @@ async def get_user_id(authorization: str = Header(...)) -> str:
 
 # Typed aliases for FastAPI Depends() — use in endpoint signatures.
 DbClient = Annotated[Client, Depends(get_supabase_client)]
+AsyncDbClient = Annotated[AsyncClient, Depends(get_async_supabase_client)]
 UserId = Annotated[str, Depends(get_user_id)]
 AiClient = Annotated[AIClient, Depends(get_ai_client)]
 OpenAICompat = Annotated[OpenAICompatAdapter, Depends(get_openai_compat_client)]
-PdfDep = Annotated[PDFService, Depends(get_pdf_service)]
+if TYPE_CHECKING:
+    PdfDep = Annotated[PDFService, Depends(get_pdf_service)]
+else:
+    PdfDep = Annotated[Any, Depends(get_pdf_service)]  # PDFService, resolved lazily
 EmbedDep = Annotated[EmbeddingService, Depends(get_embedding_service)]
 
 
@@ -67,3 +98,13 @@ def verify_child_ownership(user_id: str, child_id: str) -> None:
     result = sb.table("children").select("id").eq("id", child_id).eq("user_id", user_id).maybe_single().execute()
     if not getattr(result, "data", None):
         raise HTTPException(status_code=403, detail="Access denied")
+
+
+async def verify_child_ownership_async(user_id: str, child_id: str, db: AsyncClient | None = None) -> None:
+    """Non-blocking verify_child_ownership() for async routes."""
+    from app.services.async_db import execute, get_async_supabase
+
+    db = db if db is not None else get_async_supabase()
+    result = await execute(db.table("children").select("id").eq("id", child_id).eq("user_id", user_id).maybe_single())
+    if not getattr(result, "data", None):
+        raise HTTPException(status_code=403, detail="Access denied")
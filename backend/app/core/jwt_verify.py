@@ -0,0 +1,203 @@
+"""Local verification of Supabase access tokens for get_current_user_id().
+
+get_current_user_id() used to call ``sb.auth.get_user(token)`` — a network
+round-trip to Supabase Auth — on every authenticated request. Access tokens
+are signed JWTs, so signature and expiry can be checked in-process:
+
+  - HS256 (legacy JWT secret): SUPABASE_JWT_SECRET
+  - RS256 / ES256 (asymmetric signing keys): public keys from the project's
+    JWKS endpoint (<SUPABASE_URL>/auth/v1/.well-known/jwks.json), cached
+
+Verified token → user_id pairs sit in a bounded TLRU cache keyed by the token
+hash; every entry expires at the token's own ``exp`` (capped at
+AUTH_TOKEN_CACHE_MAX_TTL_S), so an expired token is never served from cache.
+Tokens that can't be checked locally (HS256 with no secret configured, JWKS
+unreachable) fall back to Supabase Auth and are cached the same way.
+
+Caveat: a session revoked server-side keeps working here until its access
+token expires (~1 h by default on Supabase). AUTH_LOCAL_VERIFY=0 restores a
+remote check on every request.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections.abc import Callable
+
+import jwt
+import structlog
+from cachetools import TLRUCache
+
+logger = structlog.get_logger("skolar.auth")
+
+LOCAL_VERIFY = os.getenv("AUTH_LOCAL_VERIFY", "1") == "1"
+CACHE_MAXSIZE = int(os.getenv("AUTH_TOKEN_CACHE_MAXSIZE", "10000"))
+CACHE_MAX_TTL_S = int(os.getenv("AUTH_TOKEN_CACHE_MAX_TTL_S", "3600"))
+JWKS_TTL_S = int(os.getenv("AUTH_JWKS_TTL_S", "600"))
+AUDIENCE = os.getenv("AUTH_JWT_AUDIENCE", "authenticated")
+LEEWAY_S = 10
+
+_ASYMMETRIC_ALGS = frozenset({"RS256", "ES256", "EdDSA"})
+
+
+class InvalidTokenError(Exception):
+    """Token failed signature, expiry or audience checks (or Supabase Auth rejected it)."""
+
+
+class TokenVerifier:
+    """Verifies access tokens locally and caches token → user_id until the token expires."""
+
+    def __init__(
+        self,
+        jwt_secret: str = "",
+        jwks_url: str = "",
+        remote_verify: Callable[[str], str | None] | None = None,
+        maxsize: int = CACHE_MAXSIZE,
+        max_ttl_s: float = CACHE_MAX_TTL_S,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.jwt_secret = jwt_secret
+        self.jwks_url = jwks_url
+        self._remote_verify = remote_verify
+        self._max_ttl_s = max_ttl_s
+        self._clock = clock
+        # value = (user_id, expires_at) — ttu hands the expiry straight to the cache
+        self._cache: TLRUCache = TLRUCache(maxsize=maxsize, ttu=lambda _k, v, _now: v[1], timer=clock)
+        self._jwks: jwt.PyJWKClient | None = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "local": 0, "remote": 0, "rejected": 0}
+
+    def user_id(self, token: str) -> str:
+        """Return the user id for *token* or raise InvalidTokenError."""
+        key = hashlib.sha256(token.encode()).hexdigest()
+        with self._lock:
+            entry = self._cache.get(key)
+            self._stats["hits" if entry else "misses"] += 1
+        if entry:
+            return entry[0]
+
+        try:
+            user_id, exp = self._verify(token)
+        except InvalidTokenError:
+            self._count("rejected")
+            raise
+        expires_at = min(exp, self._clock() + self._max_ttl_s)
+        if expires_at > self._clock():
+            with self._lock:
+                self._cache[key] = (user_id, expires_at)
+        return user_id
+
+    def _verify(self, token: str) -> tuple[str, float]:
+        try:
+            alg = jwt.get_unverified_header(token).get("alg")
+        except jwt.PyJWTError as exc:
+            raise InvalidTokenError(str(exc)) from exc
+
+        if alg != "HS256" and alg not in _ASYMMETRIC_ALGS:
+            raise InvalidTokenError(f"unsupported alg {alg!r}")
+
+        key = None
+        if alg == "HS256" and self.jwt_secret:
+            key = self.jwt_secret
+        elif alg in _ASYMMETRIC_ALGS and self.jwks_url:
+            try:
+                key = self._jwk_client().get_signing_key_from_jwt(token).key
+            except jwt.PyJWKClientError as exc:
+                # JWKS unreachable or unknown kid — let Supabase Auth decide
+                logger.warning("jwks_lookup_failed", error=str(exc))
+
+        if key is not None:
+            try:
+                claims = jwt.decode(
+                    token,
+                    key,
+                    algorithms=[alg],
+                    audience=AUDIENCE,
+                    leeway=LEEWAY_S,
+                    options={"require": ["exp", "sub"]},
+                )
+            except jwt.PyJWTError as exc:
+                raise InvalidTokenError(str(exc)) from exc
+            self._count("local")
+            return claims["sub"], float(claims["exp"])
+
+        return self._verify_remote(token)
+
+    def _verify_remote(self, token: str) -> tuple[str, float]:
+        if self._remote_verify is None:
+            raise InvalidTokenError("no key to verify token")
+        user_id = self._remote_verify(token)
+        if not user_id:
+            raise InvalidTokenError("rejected by Supabase Auth")
+        self._count("remote")
+        # Supabase Auth vouched for the token, so its exp claim can bound the cache entry
+        try:
+            exp = float(jwt.decode(token, options={"verify_signature": False}).get("exp") or 0)
+        except (jwt.PyJWTError, TypeError, ValueError):
+            exp = 0.0
+        return user_id, exp or self._clock() + self._max_ttl_s
+
+    def _jwk_client(self) -> jwt.PyJWKClient:
+        if self._jwks is None:
+            with self._lock:
+                if self._jwks is None:
+                    self._jwks = jwt.PyJWKClient(self.jwks_url, cache_keys=True, lifespan=JWKS_TTL_S, timeout=5)
+        return self._jwks
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "size": len(self._cache),
+                "maxsize": self._cache.maxsize,
+                "mode": "hs256" if self.jwt_secret else "jwks" if self.jwks_url else "remote",
+            }
+
+
+# -- Singleton ----------------------------------------------------------------
+
+_verifier: TokenVerifier | None = None
+_verifier_lock = threading.Lock()
+
+
+def _remote_user_id(token: str) -> str | None:
+    from app.core.deps import get_supabase_client
+
+    user_response = get_supabase_client().auth.get_user(token)
+    if not user_response or not user_response.user:
+        return None
+    return user_response.user.id
+
+
+def get_token_verifier() -> TokenVerifier:
+    global _verifier
+    if _verifier is None:
+        with _verifier_lock:
+            if _verifier is None:
+                from app.core.config import get_settings
+
+                settings = get_settings()
+                _verifier = TokenVerifier(
+                    jwt_secret=settings.supabase_jwt_secret,
+                    jwks_url=f"{settings.supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json",
+                    remote_verify=_remote_user_id,
+                )
+    return _verifier
+
+
+def auth_cache_stats() -> dict | None:
+    """Counters for /health/deep; None until the first authenticated request."""
+    return _verifier.stats() if _verifier is not None else None
@@ -0,0 +1,122 @@
+"""Precompiled index over TOPIC_PROFILES keys for get_topic_profile().
+
+get_topic_profile() used to fall through to full scans of every profile key,
+running regexes on each one per call. The index computes those per-key facts
+once (on first use) so every fallback is a handful of dict/bisect lookups:
+
+  - per key: lowercase form, head (text before "("), class number, subject group
+  - class-stripped base → keys         (alias grade variants)
+  - sorted lowercase keys              ("key starts with topic", via bisect)
+  - head → keys                        ("topic starts with key head", probe each prefix)
+  - NUL-joined haystack of keys        ("key contains topic", one str.find scan)
+
+Candidate lists are always returned in TOPIC_PROFILES order so the resolver
+picks exactly what the linear scans did.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+import threading
+
+_CLASS_SUFFIX_RE = re.compile(r"\s*\(class\s*\d+\)\s*$", re.IGNORECASE)
+_CLASS_NUM_RE = re.compile(r"class\s*(\d+)", re.IGNORECASE)
+_CLASS_DIGIT_RE = re.compile(r"class\s*(\d)", re.IGNORECASE)
+
+
+def class_stripped_base(key: str) -> str:
+    """Lowercase key without its trailing class marker: "Time (Class 1)" → "time"."""
+    return _CLASS_SUFFIX_RE.sub("", key).strip().lower()
+
+
+def _class_num(key: str) -> int | None:
+    m = _CLASS_NUM_RE.search(key)
+    return int(m.group(1)) if m else None
+
+
+def _class_digit(key: str) -> str | None:
+    m = _CLASS_DIGIT_RE.search(key)
+    return m.group(1) if m else None
+
+
+class TopicIndex:
+    """Read-only lookup structures over a snapshot of TOPIC_PROFILES."""
+
+    def __init__(self, profiles: dict[str, dict]):
+        from app.data.topic_profiles import _profile_subject_group
+
+        self.keys: list[str] = list(profiles)
+        self.order: dict[str, int] = {k: i for i, k in enumerate(self.keys)}
+        self.group: dict[str, str] = {k: _profile_subject_group(p) for k, p in profiles.items()}
+        self._class_num: dict[str, int | None] = {k: _class_num(k) for k in self.keys}
+        self.class_digit: dict[str, str | None] = {k: _class_digit(k.lower()) for k in self.keys}
+
+        self.by_base: dict[str, list[str]] = {}
+        self.by_head: dict[str, list[str]] = {}
+        for key in self.keys:
+            self.by_base.setdefault(class_stripped_base(key), []).append(key)
+            self.by_head.setdefault(key.lower().split("(")[0].strip(), []).append(key)
+
+        self._sorted: list[tuple[str, int]] = sorted((k.lower(), i) for i, k in enumerate(self.keys))
+        self._sorted_lower = [s for s, _ in self._sorted]
+
+        lowered = [k.lower() for k in self.keys]
+        self._haystack = "\0".join(lowered)
+        self._ends: list[int] = []
+        self._offsets: list[int] = []
+        pos = 0
+        for low in lowered:
+            self._offsets.append(pos)
+            pos += len(low)
+            self._ends.append(pos)
+            pos += 1
+
+    def class_num(self, key: str) -> int | None:
+        if key in self._class_num:
+            return self._class_num[key]
+        return _class_num(key)
+
+    def same_base(self, key: str) -> list[str]:
+        """Keys sharing *key*'s class-stripped base, in profile order."""
+        return self.by_base.get(class_stripped_base(key), [])
+
+    def prefix_matches(self, query: str) -> list[str]:
+        """Keys where ``key.lower().startswith(query)`` or ``query.startswith(head)``, in profile order."""
+        hits: set[int] = set()
+        i = bisect.bisect_left(self._sorted_lower, query)
+        while i < len(self._sorted) and self._sorted_lower[i].startswith(query):
+            hits.add(self._sorted[i][1])
+            i += 1
+        for end in range(len(query) + 1):
+            for key in self.by_head.get(query[:end], ()):
+                hits.add(self.order[key])
+        return [self.keys[i] for i in sorted(hits)]
+
+    def containing(self, query: str) -> list[str]:
+        """Keys whose lowercase form contains *query*, in profile order."""
+        if "\0" in query:
+            return []
+        hits: list[str] = []
+        start = self._haystack.find(query)
+        while start != -1:
+            i = bisect.bisect_right(self._offsets, start) - 1
+            hits.append(self.keys[i])
+            # Resume at the next key so a key matching twice is listed once
+            start = self._haystack.find(query, self._ends[i] + 1)
+        return hits
+
+
+_index: TopicIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_topic_index() -> TopicIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                from app.data.topic_profiles import TOPIC_PROFILES
+
+                _index = TopicIndex(TOPIC_PROFILES)
+    return _index
@@ -6,6 +6,7 @@ Maps 198+ CBSE topics to their configuration.
 from __future__ import annotations
 
 import re as _re
+from functools import lru_cache as _lru_cache
 
 TOPIC_PROFILES: dict[str, dict] = {
     # ── Arithmetic topics (carry/borrow enforcement handled elsewhere) ──
@@ -5454,7 +5455,23 @@ def get_topic_profile(topic: str, subject: str | None = None, grade_level: str |
     If subject is given (e.g. "EVS", "English"), reject profiles whose
     skill-tag prefix belongs to a different subject group.
     subject=None keeps the original permissive behaviour (backward compatible).
+
+    Resolution is memoized per (topic, subject, grade_level); the fallbacks
+    run against the precompiled index in app.data.topic_index.
     """
+    try:
+        key = _resolve_profile_key(topic, subject, grade_level)
+    except TypeError:  # unhashable argument — resolve without the memo
+        key = _resolve_profile_key.__wrapped__(topic, subject, grade_level)
+    return TOPIC_PROFILES.get(key) if key else None
+
+
+@_lru_cache(maxsize=4096)
+def _resolve_profile_key(topic: str, subject: str | None, grade_level: str | int | None) -> str | None:
+    """Resolve to a TOPIC_PROFILES key (or None) — see get_topic_profile()."""
+    from app.data.topic_index import get_topic_index
+
+    index = get_topic_index()
 
     grade_num = None
     if grade_level is not None:
@@ -5480,15 +5497,15 @@ def get_topic_profile(topic: str, subject: str | None = None, grade_level: str |
         elif grade_num == 3 and "division" in t_lower and "long" not in t_lower:
             topic_for_lookup = "Division basics"
 
-    def _ok(profile: dict) -> bool:
-        if not subject:
-            return True
-        expected = _SUBJECT_TO_PROFILE_GROUP.get(subject.lower())
-        return not expected or _profile_subject_group(profile) == expected
+    expected_group = _SUBJECT_TO_PROFILE_GROUP.get(subject.lower()) if subject else None
 
-    def _class_num_from_key(key: str) -> int | None:
-        km = _re.search(r"class\s*(\d+)", key, _re.IGNORECASE)
-        return int(km.group(1)) if km else None
+    def _ok(key: str) -> bool:
+        if not expected_group:
+            return True
+        group = index.group.get(key)
+        if group is None:
+            group = _profile_subject_group(TOPIC_PROFILES[key])
+        return group == expected_group
 
     def _prefer_grade(candidates: list[str]) -> str | None:
         if not candidates:
@@ -5496,11 +5513,10 @@ def get_topic_profile(topic: str, subject: str | None = None, grade_level: str |
         if grade_num is None:
             return candidates[0]
         for key in candidates:
-            key_grade = _class_num_from_key(key)
-            if key_grade == grade_num:
+            if index.class_num(key) == grade_num:
                 return key
         for key in candidates:
-            if _class_num_from_key(key) is None:
+            if index.class_num(key) is None:
                 return key
         return candidates[0]
 
@@ -5509,18 +5525,15 @@ def get_topic_profile(topic: str, subject: str | None = None, grade_level: str |
         from app.data.topic_lookup import resolve_topic
 
         resolved_key = resolve_topic(topic_for_lookup, grade_num)
-        if resolved_key and resolved_key in TOPIC_PROFILES:
-            profile = TOPIC_PROFILES[resolved_key]
-            if _ok(profile):
-                return profile
+        if resolved_key and resolved_key in TOPIC_PROFILES and _ok(resolved_key):
+            return resolved_key
     except ImportError:
         pass
 
     normalized = topic_for_lookup
 
-    profile = TOPIC_PROFILES.get(normalized)
-    if profile:
-        return profile if _ok(profile) else None
+    if TOPIC_PROFILES.get(normalized):
+        return normalized if _ok(normalized) else None
 
     alias_key = normalized.lower()
     if alias_key in _TOPIC_ALIASES:
@@ -5528,45 +5541,27 @@ def get_topic_profile(topic: str, subject: str | None = None, grade_level: str |
         candidates = [mapped_key]
         # If alias mapped to wrong grade variant, try same-base with requested grade.
         if grade_num is not None:
-            alias_base = _re.sub(r"\s*\(class\s*\d+\)\s*$", "", mapped_key, flags=_re.IGNORECASE).strip().lower()
-            for key in TOPIC_PROFILES:
-                key_base = _re.sub(r"\s*\(class\s*\d+\)\s*$", "", key, flags=_re.IGNORECASE).strip().lower()
-                if key_base == alias_base and key not in candidates:
-                    candidates.append(key)
+            candidates += [key for key in index.same_base(mapped_key) if key != mapped_key]
         selected = _prefer_grade(candidates)
-        if selected:
-            p = TOPIC_PROFILES.get(selected)
-            if p:
-                return p if _ok(p) else None
+        if selected and TOPIC_PROFILES.get(selected):
+            return selected if _ok(selected) else None
 
     # Substring fallback — guard by class marker AND subject
     _class_marker = _re.search(r"class\s*(\d)", alias_key, _re.IGNORECASE)
-    matches = []
-    for key in TOPIC_PROFILES:
-        key_lower = key.lower()
-        if key_lower.startswith(alias_key) or alias_key.startswith(key_lower.split("(")[0].strip()):
-            if _class_marker:
-                km = _re.search(r"class\s*(\d)", key_lower, _re.IGNORECASE)
-                if not km or km.group(1) != _class_marker.group(1):
-                    continue
-            if not _ok(TOPIC_PROFILES[key]):
-                continue
-            matches.append(key)
+    matches = [
+        key
+        for key in index.prefix_matches(alias_key)
+        if (not _class_marker or index.class_digit.get(key) == _class_marker.group(1)) and _ok(key)
+    ]
     if matches:
         matches.sort(key=len, reverse=True)
         selected = _prefer_grade(matches)
         if selected:
-            return TOPIC_PROFILES[selected]
+            return selected
     # Fuzzy fallback: find profile whose key contains the topic stem.
     # Handles frontend sending "Time" when key is "Time (Class 1)".
     if topic:
-        _t_lower = topic.lower()
-        fuzzy_matches = []
-        for _k, _v in TOPIC_PROFILES.items():
-            if _t_lower in _k.lower() or _k.lower().startswith(_t_lower):
-                if _ok(_v):
-                    fuzzy_matches.append(_k)
-        selected = _prefer_grade(fuzzy_matches)
+        selected = _prefer_grade([key for key in index.containing(topic.lower()) if _ok(key)])
         if selected:
-            return TOPIC_PROFILES[selected]
+            return selected
     return None
@@ -1,4 +1,6 @@
 import json as _json
+import os
+import sys
 from contextlib import asynccontextmanager
 
 import sentry_sdk
@@ -73,6 +75,28 @@ async def lifespan(app: FastAPI):
     get_ai_client()
     _lifespan_logger.info("ai_client_ready")
 
+    # Spawn + warm the PDF render workers now, not on the first export
+    if os.getenv("PDF_POOL_PREWARM", "1") == "1":
+        try:
+            from app.services.v3.pdf_pool import get_pdf_pool
+
+            pdf_pool = get_pdf_pool()
+            pdf_pool.start()
+            _lifespan_logger.info("pdf_pool_started", workers=pdf_pool.workers, capacity=pdf_pool.capacity)
+        except Exception as e:
+            _lifespan_logger.warning("pdf_pool_start_failed", error=str(e))
+
+    # Index (or build) the print-ready image derivatives the PDF renderer embeds
+    if os.getenv("IMAGE_ASSET_PREWARM", "1") == "1":
+        try:
+            import asyncio
+
+            from app.services.image_assets import prepare_image_assets
+
+            await asyncio.to_thread(prepare_image_assets)
+        except Exception as e:
+            _lifespan_logger.warning("image_assets_prepare_failed", error=str(e))
+
     _lifespan_logger.info("startup_complete")
 
     # ── Background email sequence processor (runs every hour) ────────
@@ -142,7 +166,45 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         _lifespan_logger.warning("ai_stats_log_failed", error=str(e))
 
-    # 3. Flush Sentry events
+    # 3. Flush buffered telemetry rows (bulk insert, spill file if the DB is down)
+    try:
+        from app.services.telemetry import shutdown_telemetry
+
+        telemetry_stats = await asyncio.to_thread(shutdown_telemetry, 5.0)
+        if telemetry_stats is not None:
+            _lifespan_logger.info("telemetry_flushed", **telemetry_stats)
+    except Exception as e:
+        _lifespan_logger.warning("telemetry_flush_failed", error=str(e))
+
+    # 4. Close pooled async Supabase connections
+    try:
+        from app.services.async_db import close_async_supabase
+
+        await close_async_supabase()
+        _lifespan_logger.info("async_supabase_closed")
+    except Exception as e:
+        _lifespan_logger.warning("async_supabase_close_failed", error=str(e))
+
+    # 5. Stop PDF render workers
+    try:
+        from app.services.v3.pdf_pool import shutdown_pdf_pool
+
+        shutdown_pdf_pool()
+        _lifespan_logger.info("pdf_pool_stopped")
+    except Exception as e:
+        _lifespan_logger.warning("pdf_pool_stop_failed", error=str(e))
+
+    # 5b. Persist memoized Devanagari shapes (only if PDFService was used and PDF_SHAPE_CACHE_FILE is set)
+    if os.getenv("PDF_SHAPE_CACHE_FILE") and "app.services.pdf" in sys.modules:
+        try:
+            from app.services.pdf import save_shape_cache
+
+            n_shapes = save_shape_cache()
+            _lifespan_logger.info("shape_cache_saved", entries=n_shapes)
+        except Exception as e:
+            _lifespan_logger.warning("shape_cache_save_failed", error=str(e))
+
+    # 6. Flush Sentry events
     try:
         sentry_sdk.flush(timeout=5)
         _lifespan_logger.info("sentry_flushed")
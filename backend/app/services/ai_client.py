@@ -23,15 +23,38 @@ Usage:
 
     # Chat with history (Ask Skolar multi-turn)
     text = ai.generate_chat(messages, system=system_prompt)
+
+Deadlines and hedging (generate_json / generate_openai_style and its async twin):
+
+    with llm_deadline(90.0):      # set once per request, e.g. in the route
+        ...                       # every LLM call below it gets the remaining time
+
+    result = await wait_for_llm(asyncio.to_thread(generate, ...), timeout=90.0)
+    async for event in iter_with_llm_deadline(stream(...), timeout=90.0): ...
+
+Each Gemini request carries the time left before the deadline as its HTTP
+timeout, and no request starts once the deadline has passed. A request that
+has not answered by its method's recent p90 latency gets a hedge: an
+identical second request. The first response that parses as JSON (any
+non-empty text with expect_json=False) wins and the other is cancelled.
+Callers opt out with hedge=False. See LLMMetrics.record_hedge for the win rates.
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
 import hashlib
 import json
+import os
+import threading
 import time
-from collections import defaultdict
-from typing import Any
+from collections import defaultdict, deque
+from collections.abc import AsyncIterator, Awaitable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor
+from concurrent.futures import wait as _wait_futures
+from contextlib import contextmanager
+from typing import Any, TypeVar
 
 import sentry_sdk
 import structlog
@@ -40,6 +63,8 @@ from app.core.config import get_settings
 
 logger = structlog.get_logger("skolar.ai")
 
+T = TypeVar("T")
+
 # Default model
 DEFAULT_MODEL = "gemini-2.5-flash"
 
@@ -60,6 +85,100 @@ _CACHED_INPUT_COST_PER_M = 0.04  # $0.04 per 1M cached input tokens
 # Context window limit (Gemini 2.5 Flash)
 _MAX_CONTEXT_TOKENS = 1_000_000
 
+# ── Hedged requests ───────────────────────────────────────────────────────────
+# Hedging starts once a method has LLM_HEDGE_MIN_SAMPLES successful latencies
+# in its window. A hedge fires at the LLM_HEDGE_QUANTILE latency, but never
+# sooner than LLM_HEDGE_MIN_DELAY_S.
+HEDGE_ENABLED = os.getenv("LLM_HEDGE", "1") != "0"
+HEDGE_QUANTILE = float(os.getenv("LLM_HEDGE_QUANTILE", "0.9"))
+HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+HEDGE_MIN_DELAY_S = float(os.getenv("LLM_HEDGE_MIN_DELAY_S", "1.0"))
+_LATENCY_WINDOW = 200
+
+# Only hedges run on this pool; a sync primary gets its own thread, so queueing
+# here can never delay a primary or make it look slow. A hedge is skipped
+# rather than queued when every worker is busy. A running loser cannot be
+# interrupted; its HTTP timeout (the time left before the deadline) bounds how
+# long it keeps a thread.
+_HEDGE_MAX_WORKERS = int(os.getenv("LLM_HEDGE_MAX_WORKERS", "16"))
+_hedge_executor = ThreadPoolExecutor(max_workers=_HEDGE_MAX_WORKERS, thread_name_prefix="llm-hedge")
+_hedge_slots = threading.BoundedSemaphore(_HEDGE_MAX_WORKERS)
+
+# Absolute time.monotonic() deadline for LLM calls in the current request
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar("llm_deadline", default=None)
+
+
+@contextmanager
+def llm_deadline(seconds: float) -> Iterator[None]:
+    """Bound every LLM call made inside the block (and threads/tasks started from it) to *seconds*.
+
+    Nested deadlines keep the earlier one. asyncio.to_thread and new tasks
+    copy the context, so a deadline set in a route reaches the generator.
+    """
+    current = _deadline.get()
+    deadline = time.monotonic() + seconds
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def deadline_remaining() -> float | None:
+    """Seconds left before the current LLM deadline, or None if there is none."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+async def wait_for_llm(aw: Awaitable[T], timeout: float) -> T:
+    """asyncio.wait_for(aw, timeout) with the same llm_deadline() for the LLM calls inside *aw*.
+
+    Routes use this so a request's LLM calls stop at the route timeout
+    instead of running on in worker threads after it has given up.
+    """
+    with llm_deadline(timeout):
+        return await asyncio.wait_for(aw, timeout)
+
+
+async def iter_with_llm_deadline(items: AsyncIterator[T], timeout: float) -> AsyncIterator[T]:
+    """Async-iterator twin of wait_for_llm(): *items* must be exhausted within *timeout* seconds.
+
+    *items* runs in its own task, started under llm_deadline(timeout), so the
+    deadline reaches its LLM calls and its context stays the same between
+    items. Raises TimeoutError when the deadline passes; the task is cancelled
+    then, or when the caller stops iterating.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    queue: asyncio.Queue[T] = asyncio.Queue(maxsize=1)
+
+    async def pump() -> None:
+        async for item in items:
+            await queue.put(item)
+
+    with llm_deadline(timeout):
+        producer = asyncio.create_task(pump())
+    try:
+        while True:
+            if not queue.empty():
+                yield queue.get_nowait()
+                continue
+            if producer.done():
+                producer.result()  # re-raises the iterator's error
+                return
+            getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait(
+                {getter, producer}, timeout=deadline - loop.time(), return_when=FIRST_COMPLETED
+            )
+            if getter in done:
+                yield getter.result()
+                continue
+            getter.cancel()  # an item it had not taken yet stays queued
+            if not done:
+                raise TimeoutError(f"stream did not finish within {timeout:.0f}s")
+    finally:
+        producer.cancel()
+
 
 def estimate_tokens(text: str) -> int:
     """Estimate token count from text length. ~4 chars per token for Gemini."""
@@ -80,7 +199,7 @@ class LLMMetrics:
     """Thread-safe LLMOps metrics collector.
 
     Tracks per-method and aggregate stats: calls, latency, tokens, cost,
-    cache hits, retries, errors.
+    cache hits, retries, errors, hedges.
     """
 
     def __init__(self):
@@ -94,6 +213,14 @@ class LLMMetrics:
         self._cost_usd: dict[str, float] = defaultdict(float)
         self._cache_hits = 0
         self._cache_misses = 0
+        self._slot_fill_hits = 0
+        self._slot_fill_misses = 0
+        self._slot_fill_quota_skips = 0
+        # Recent per-request latencies (one request, not hedged wall time)
+        self._recent_latency_ms: dict[str, deque[int]] = defaultdict(lambda: deque(maxlen=_LATENCY_WINDOW))
+        self._hedges: dict[str, int] = defaultdict(int)
+        self._hedge_wins: dict[str, int] = defaultdict(int)
+        self._hedge_primary_wins: dict[str, int] = defaultdict(int)
 
     def record_call(
         self,
@@ -116,12 +243,36 @@ class LLMMetrics:
         if is_retry:
             self._retries[method] += 1
 
+    def record_request_latency(self, method: str, latency_ms: int) -> None:
+        """One successful Gemini request's latency, for the hedge delay."""
+        self._recent_latency_ms[method].append(latency_ms)
+
+    def latency_quantile_ms(self, method: str, q: float) -> int | None:
+        """*q* quantile of *method*'s recent request latencies; None below HEDGE_MIN_SAMPLES."""
+        window = sorted(self._recent_latency_ms[method])
+        if len(window) < HEDGE_MIN_SAMPLES:
+            return None
+        return window[min(len(window) - 1, int(q * len(window)))]
+
+    def record_hedge(self, method: str, winner: str | None) -> None:
+        """A hedge was fired; *winner* is "hedge", "primary", or None (neither returned usable JSON)."""
+        self._hedges[method] += 1
+        if winner == "hedge":
+            self._hedge_wins[method] += 1
+        elif winner == "primary":
+            self._hedge_primary_wins[method] += 1
+
     def record_cache_hit(self, hit: bool) -> None:
         if hit:
             self._cache_hits += 1
         else:
             self._cache_misses += 1
 
+    def record_slot_fill_cache(self, hits: int, misses: int, quota_skipped: int = 0) -> None:
+        self._slot_fill_hits += hits
+        self._slot_fill_misses += misses
+        self._slot_fill_quota_skips += quota_skipped
+
     def snapshot(self) -> dict[str, Any]:
         """Return a point-in-time snapshot of all metrics."""
         total_calls = sum(self._calls.values())
@@ -133,6 +284,9 @@ class LLMMetrics:
         total_cached = sum(self._cached_tokens.values())
         total_cost = sum(self._cost_usd.values())
         cache_total = self._cache_hits + self._cache_misses
+        slot_fill_total = self._slot_fill_hits + self._slot_fill_misses
+        total_hedges = sum(self._hedges.values())
+        total_hedge_wins = sum(self._hedge_wins.values())
 
         return {
             "total_calls": total_calls,
@@ -148,6 +302,18 @@ class LLMMetrics:
             "cache_hit_rate": round(self._cache_hits / cache_total, 4) if cache_total else 0,
             "cache_hits": self._cache_hits,
             "cache_misses": self._cache_misses,
+            "slot_fill_cache": {
+                "hits": self._slot_fill_hits,
+                "misses": self._slot_fill_misses,
+                "hit_rate": round(self._slot_fill_hits / slot_fill_total, 4) if slot_fill_total else 0,
+                "quota_skipped": self._slot_fill_quota_skips,
+            },
+            "hedging": {
+                "hedged": total_hedges,
+                "hedge_wins": total_hedge_wins,
+                "primary_wins": sum(self._hedge_primary_wins.values()),
+                "hedge_win_rate": round(total_hedge_wins / total_hedges, 4) if total_hedges else 0,
+            },
             "by_method": {
                 method: {
                     "calls": self._calls[method],
@@ -157,6 +323,9 @@ class LLMMetrics:
                     "input_tokens": self._input_tokens[method],
                     "output_tokens": self._output_tokens[method],
                     "cost_usd": round(self._cost_usd[method], 4),
+                    "p90_latency_ms": self.latency_quantile_ms(method, 0.9),
+                    "hedged": self._hedges[method],
+                    "hedge_wins": self._hedge_wins[method],
                 }
                 for method in sorted(self._calls.keys())
             },
@@ -177,11 +346,12 @@ def _types():
 class AIClient:
     """Single Gemini client for the entire Skolar app."""
 
-    def __init__(self, api_key: str, model: str = DEFAULT_MODEL):
+    def __init__(self, api_key: str, model: str = DEFAULT_MODEL, hedge: bool = HEDGE_ENABLED):
         from google import genai as _genai
 
         self.client = _genai.Client(api_key=api_key)
         self.model = model
+        self.hedge = hedge
         self.metrics = _metrics
         logger.info("AIClient initialized", model=model)
 
@@ -199,6 +369,9 @@ class AIClient:
         """Generate a JSON response from Gemini.
 
         Parses the response, strips markdown fences, retries on parse failure.
+        Each attempt is bounded by the current llm_deadline() and, with hedging
+        on, raced against a second copy when it runs slow (see _hedged()); only
+        a reply that parses as JSON can win.
         """
         input_tokens = estimate_tokens(prompt + (system or ""))
 
@@ -222,14 +395,9 @@ class AIClient:
                         response_mime_type="application/json",
                         thinking_config=t.ThinkingConfig(thinking_budget=thinking_budget),
                     )
-                    response = self.client.models.generate_content(
-                        model=self.model,
-                        contents=prompt,
-                        config=config,
-                    )
+                    raw = self._hedged("generate_json", {"model": self.model, "contents": prompt, "config": config})
                     elapsed_ms = int((time.perf_counter() - start) * 1000)
 
-                    raw = response.text or ""
                     output_tokens = estimate_tokens(raw)
                     parsed = self._parse_json(raw)
 
@@ -253,6 +421,18 @@ class AIClient:
                     )
                     return parsed
 
+            except TimeoutError as e:
+                # Deadline passed: another attempt cannot start either
+                elapsed_ms = int((time.perf_counter() - start) * 1000)
+                self.metrics.record_call(
+                    "generate_json",
+                    elapsed_ms,
+                    input_tokens=input_tokens,
+                    is_error=True,
+                    is_retry=is_retry,
+                )
+                logger.warning("generate_json deadline exceeded", attempt=attempt + 1, error=str(e))
+                raise
             except json.JSONDecodeError as e:
                 elapsed_ms = int((time.perf_counter() - start) * 1000)
                 self.metrics.record_call(
@@ -597,6 +777,8 @@ class AIClient:
         temperature: float = 0.7,
         max_tokens: int = 4096,
         thinking_budget: int = 0,
+        hedge: bool = True,
+        expect_json: bool = True,
     ) -> str:
         """Backward-compatible method that mimics the old OpenAI-style interface.
 
@@ -607,16 +789,11 @@ class AIClient:
 
         Uses Gemini context caching for the system prompt when available,
         reducing input token costs by 50-90% across repeated generations.
+        The request is bounded by the current llm_deadline() and hedged unless
+        *hedge* is False. Pass expect_json=False for plain-text replies, so any
+        non-empty response can win the race.
         """
-        system_parts = [m["content"] for m in messages if m.get("role") == "system"]
-        user_parts = [m["content"] for m in messages if m.get("role") != "system"]
-
-        system_instruction = "\n\n".join(system_parts) or None
-        user_prompt = "\n\n".join(user_parts)
-
-        system_tokens = estimate_tokens(system_instruction) if system_instruction else 0
-        user_tokens = estimate_tokens(user_prompt)
-        input_tokens = system_tokens + user_tokens
+        system_instruction, user_prompt, system_tokens, input_tokens = self._split_openai_messages(messages)
 
         start = time.perf_counter()
         try:
@@ -636,40 +813,16 @@ class AIClient:
                 cache_hit = cached_content is not None
                 self.metrics.record_cache_hit(cache_hit)
 
+                span.set_data("cache_hit", cache_hit)
                 if cached_content:
                     # Use cached content — system prompt is already server-side
-                    span.set_data("cache_hit", True)
                     cached_tokens = system_tokens
-                    config = t.GenerateContentConfig(
-                        temperature=temperature,
-                        max_output_tokens=max_tokens,
-                        response_mime_type="application/json",
-                        thinking_config=t.ThinkingConfig(thinking_budget=thinking_budget),
-                    )
-                    response = self.client.models.generate_content(
-                        model=self.model,
-                        contents=user_prompt,
-                        config=config,
-                        cached_content=cached_content.name,
-                    )
-                else:
-                    # Fallback: uncached call with inline system instruction
-                    span.set_data("cache_hit", False)
-                    config = t.GenerateContentConfig(
-                        system_instruction=system_instruction,
-                        temperature=temperature,
-                        max_output_tokens=max_tokens,
-                        response_mime_type="application/json",
-                        thinking_config=t.ThinkingConfig(thinking_budget=thinking_budget),
-                    )
-                    response = self.client.models.generate_content(
-                        model=self.model,
-                        contents=user_prompt,
-                        config=config,
-                    )
+                request = self._openai_style_request(
+                    t, system_instruction, user_prompt, cached_content, temperature, max_tokens, thinking_budget
+                )
+                text = self._hedged("generate_openai_style", request, hedge=hedge, expect_json=expect_json)
 
                 elapsed_ms = int((time.perf_counter() - start) * 1000)
-                text = response.text or ""
                 output_tokens = estimate_tokens(text)
                 self.metrics.record_call(
                     "generate_openai_style",
@@ -703,8 +856,313 @@ class AIClient:
             logger.error("generate_openai_style failed", error=str(e))
             raise
 
+    async def generate_openai_style_async(
+        self,
+        messages: list[dict],
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        thinking_budget: int = 0,
+        hedge: bool = True,
+        expect_json: bool = True,
+    ) -> str:
+        """Async twin of generate_openai_style() using the SDK's native aio client.
+
+        Awaits the Gemini round-trip on the caller's event loop instead of
+        occupying a worker thread, so cancelling the awaiting task (e.g. via
+        asyncio.wait_for) actually abandons the request. Hedged requests are
+        tasks too, so the losing one is really cancelled.
+        """
+        system_instruction, user_prompt, system_tokens, input_tokens = self._split_openai_messages(messages)
+
+        start = time.perf_counter()
+        try:
+            with sentry_sdk.start_span(op="ai.generate", description="generate_openai_style_async") as span:
+                span.set_data("temperature", temperature)
+                span.set_data("max_tokens", max_tokens)
+                span.set_data("thinking_budget", thinking_budget)
+                span.set_data("input_tokens_est", input_tokens)
+                t = _types()
+
+                cached_content = None
+                cached_tokens = 0
+                if system_instruction:
+                    cache_key = hashlib.sha256(system_instruction.encode()).hexdigest()
+                    cached_content = _cached_contents.get(cache_key)
+                    if cached_content is None:
+                        # Cache creation is a one-off per system prompt — keep it off the loop
+                        cached_content = await asyncio.to_thread(self._get_or_create_cache, system_instruction)
+
+                cache_hit = cached_content is not None
+                self.metrics.record_cache_hit(cache_hit)
+                span.set_data("cache_hit", cache_hit)
+                if cached_content:
+                    cached_tokens = system_tokens
+
+                request = self._openai_style_request(
+                    t, system_instruction, user_prompt, cached_content, temperature, max_tokens, thinking_budget
+                )
+                text = await self._hedged_async("generate_openai_style", request, hedge=hedge, expect_json=expect_json)
+
+                elapsed_ms = int((time.perf_counter() - start) * 1000)
+                output_tokens = estimate_tokens(text)
+                self.metrics.record_call(
+                    "generate_openai_style",
+                    elapsed_ms,
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
+                    cached_tokens=cached_tokens,
+                )
+                span.set_data("latency_ms", elapsed_ms)
+                span.set_data("response_len", len(text))
+                span.set_data("cached_tokens", cached_tokens)
+                logger.info(
+                    "generate_openai_style_async OK",
+                    latency_ms=elapsed_ms,
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
+                    cache_hit=cache_hit,
+                )
+                return text
+
+        except asyncio.CancelledError:
+            elapsed_ms = int((time.perf_counter() - start) * 1000)
+            logger.info("generate_openai_style_async cancelled", latency_ms=elapsed_ms)
+            raise
+        except Exception as e:
+            elapsed_ms = int((time.perf_counter() - start) * 1000)
+            self.metrics.record_call(
+                "generate_openai_style",
+                elapsed_ms,
+                input_tokens=input_tokens,
+                is_error=True,
+            )
+            sentry_sdk.set_context("ai_call", {"method": "generate_openai_style_async", "model": self.model})
+            sentry_sdk.capture_exception(e)
+            logger.error("generate_openai_style_async failed", error=str(e))
+            raise
+
+    # -- Hedged requests ----------------------------------------------------
+
+    def _hedge_delay_s(self, method: str, remaining: float | None) -> float | None:
+        """When to fire a hedge for *method*, or None to send a single request."""
+        if not self.hedge:
+            return None
+        p = self.metrics.latency_quantile_ms(method, HEDGE_QUANTILE)
+        if p is None:
+            return None
+        delay = max(HEDGE_MIN_DELAY_S, p / 1000)
+        # A hedge fired this close to the deadline could not finish in time
+        return None if remaining is not None and remaining <= delay else delay
+
+    @staticmethod
+    def _remaining_or_raise(method: str) -> float | None:
+        remaining = deadline_remaining()
+        if remaining is not None and remaining <= 0:
+            raise TimeoutError(f"{method}: LLM deadline exceeded")
+        return remaining
+
+    @staticmethod
+    def _with_timeout(request: dict[str, Any], timeout_s: float | None) -> dict[str, Any]:
+        """Copy of *request* whose HTTP timeout is the time left before the deadline."""
+        if timeout_s is None:
+            return request
+        http_options = _types().HttpOptions(timeout=max(1, int(timeout_s * 1000)))
+        return {**request, "config": request["config"].model_copy(update={"http_options": http_options})}
+
+    def _request_text(
+        self,
+        method: str,
+        request: dict[str, Any],
+        started: threading.Event | None = None,
+        record: bool = True,
+    ) -> str:
+        """One Gemini request, bounded by the deadline; returns the response text.
+
+        *started* is set just before the request goes out. Only hedgeable
+        requests are *record*ed, so the latency window stays comparable.
+        """
+        try:
+            request = self._with_timeout(request, self._remaining_or_raise(method))
+        finally:
+            if started is not None:
+                started.set()
+        start = time.perf_counter()
+        response = self.client.models.generate_content(**request)
+        if record:
+            self.metrics.record_request_latency(method, int((time.perf_counter() - start) * 1000))
+        return response.text or ""
+
+    async def _request_text_async(self, method: str, request: dict[str, Any], record: bool = True) -> str:
+        request = self._with_timeout(request, self._remaining_or_raise(method))
+        start = time.perf_counter()
+        response = await self.client.aio.models.generate_content(**request)
+        if record:
+            self.metrics.record_request_latency(method, int((time.perf_counter() - start) * 1000))
+        return response.text or ""
+
+    @classmethod
+    def _is_json(cls, text: str) -> bool:
+        try:
+            cls._parse_json(text)
+        except json.JSONDecodeError:
+            return False
+        return True
+
+    def _start_primary(self, method: str, request: dict[str, Any]) -> tuple[Future, threading.Event]:
+        """Run the primary request on its own thread; returns (future, started)."""
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        started = threading.Event()
+        # copy_context() carries the deadline (and metric labels) into the thread
+        ctx = contextvars.copy_context()
+
+        def run() -> None:
+            try:
+                future.set_result(ctx.run(self._request_text, method, request, started))
+            except BaseException as exc:
+                future.set_exception(exc)
+
+        threading.Thread(target=run, name="llm-primary", daemon=True).start()
+        return future, started
+
+    def _hedged(self, method: str, request: dict[str, Any], hedge: bool = True, expect_json: bool = True) -> str:
+        """Send *request*; if it has not answered by the hedge delay, race a second copy.
+
+        Returns the first acceptable response: one that parses as JSON, or any
+        non-empty text when *expect_json* is False. If neither is, the last
+        response is returned (callers repair or retry as before). If both
+        fail, the last error is raised.
+        """
+        delay = self._hedge_delay_s(method, self._remaining_or_raise(method)) if hedge else None
+        if delay is None:
+            return self._request_text(method, request, record=hedge)
+
+        primary, started = self._start_primary(method, request)
+        # The hedge timer starts when the request goes out, not when it was queued
+        started.wait()
+        if _wait_futures([primary], timeout=delay).done:
+            return primary.result()
+        if not _hedge_slots.acquire(blocking=False):
+            logger.info("llm_hedge_skipped", method=method, reason="pool_busy")
+            return primary.result()
+        hedge_future = _hedge_executor.submit(contextvars.copy_context().run, self._request_text, method, request)
+        hedge_future.add_done_callback(lambda _: _hedge_slots.release())
+        logger.info("llm_hedge_fired", method=method, delay_ms=int(delay * 1000))
+
+        accept = self._is_json if expect_json else bool
+        pending = {primary: "primary", hedge_future: "hedge"}
+        fallback: str | None = None
+        last_error: BaseException | None = None
+        while pending:
+            done, _ = _wait_futures(pending, timeout=deadline_remaining(), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                role = pending.pop(future)
+                if future.exception() is not None:
+                    last_error = future.exception()
+                    continue
+                text = future.result()
+                if accept(text):
+                    for loser in pending:
+                        loser.cancel()
+                    self.metrics.record_hedge(method, role)
+                    return text
+                fallback = text
+        for loser in pending:
+            loser.cancel()
+        self.metrics.record_hedge(method, None)
+        if fallback is not None:
+            return fallback
+        raise last_error or TimeoutError(f"{method}: LLM deadline exceeded")
+
+    async def _hedged_async(
+        self, method: str, request: dict[str, Any], hedge: bool = True, expect_json: bool = True
+    ) -> str:
+        """Async twin of _hedged(). The losing request's task is cancelled."""
+        delay = self._hedge_delay_s(method, self._remaining_or_raise(method)) if hedge else None
+        if delay is None:
+            return await self._request_text_async(method, request, record=hedge)
+
+        accept = self._is_json if expect_json else bool
+        pending: dict[asyncio.Task, str] = {}
+        try:
+            primary = asyncio.ensure_future(self._request_text_async(method, request))
+            pending[primary] = "primary"
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                del pending[primary]
+                return primary.result()
+            pending[asyncio.ensure_future(self._request_text_async(method, request))] = "hedge"
+            logger.info("llm_hedge_fired", method=method, delay_ms=int(delay * 1000))
+
+            fallback: str | None = None
+            last_error: BaseException | None = None
+            while pending:
+                done, _ = await asyncio.wait(pending, timeout=deadline_remaining(), return_when=FIRST_COMPLETED)
+                if not done:
+                    break
+                for task in done:
+                    role = pending.pop(task)
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+                    text = task.result()
+                    if accept(text):
+                        self.metrics.record_hedge(method, role)
+                        return text
+                    fallback = text
+            self.metrics.record_hedge(method, None)
+            if fallback is not None:
+                return fallback
+            raise last_error or TimeoutError(f"{method}: LLM deadline exceeded")
+        finally:
+            # Losers, and everything still running if the caller was cancelled
+            for task in pending:
+                task.cancel()
+
     # -- Internal helpers ---------------------------------------------------
 
+    @staticmethod
+    def _split_openai_messages(messages: list[dict]) -> tuple[str | None, str, int, int]:
+        """Split OpenAI-style messages into (system, user_prompt, system_tokens, input_tokens)."""
+        system_parts = [m["content"] for m in messages if m.get("role") == "system"]
+        user_parts = [m["content"] for m in messages if m.get("role") != "system"]
+
+        system_instruction = "\n\n".join(system_parts) or None
+        user_prompt = "\n\n".join(user_parts)
+
+        system_tokens = estimate_tokens(system_instruction) if system_instruction else 0
+        input_tokens = system_tokens + estimate_tokens(user_prompt)
+        return system_instruction, user_prompt, system_tokens, input_tokens
+
+    def _openai_style_request(
+        self,
+        t: Any,
+        system_instruction: str | None,
+        user_prompt: str,
+        cached_content: Any,
+        temperature: float,
+        max_tokens: int,
+        thinking_budget: int,
+    ) -> dict[str, Any]:
+        """Build generate_content() kwargs, using the cached system prompt when available."""
+        config_kwargs: dict[str, Any] = {
+            "temperature": temperature,
+            "max_output_tokens": max_tokens,
+            "response_mime_type": "application/json",
+            "thinking_config": t.ThinkingConfig(thinking_budget=thinking_budget),
+        }
+        request: dict[str, Any] = {"model": self.model, "contents": user_prompt}
+        if cached_content:
+            # System prompt is already server-side
+            request["cached_content"] = cached_content.name
+        else:
+            # Fallback: uncached call with inline system instruction
+            config_kwargs["system_instruction"] = system_instruction
+        request["config"] = t.GenerateContentConfig(**config_kwargs)
+        return request
+
     @staticmethod
     def _parse_json(raw: str) -> dict[str, Any]:
         """Parse JSON from AI response, stripping markdown fences."""
@@ -737,6 +1195,23 @@ class AIClient:
 # -- OpenAI-compat adapter for worksheet_generator -------------------------
 
 
+class _CompatMessage:
+    def __init__(self, content):
+        self.content = content
+
+
+class _CompatChoice:
+    def __init__(self, content):
+        self.message = _CompatMessage(content)
+
+
+class _CompatResponse:
+    """Minimal stand-in for an OpenAI ChatCompletion: ``resp.choices[0].message.content``."""
+
+    def __init__(self, text):
+        self.choices = [_CompatChoice(text)]
+
+
 class OpenAICompatAdapter:
     """Makes AIClient compatible with code that calls client.chat.completions.create().
 
@@ -761,21 +1236,23 @@ class OpenAICompatAdapter:
                     temperature=temperature,
                     max_tokens=max_tokens or 4096,
                     thinking_budget=thinking_budget,
+                    hedge=kwargs.get("hedge", True),
+                    expect_json=kwargs.get("expect_json", True),
                 )
+                return _CompatResponse(text)
 
-                class _Msg:
-                    def __init__(self, content):
-                        self.content = content
-
-                class _Choice:
-                    def __init__(self, content):
-                        self.message = _Msg(content)
-
-                class _Resp:
-                    def __init__(self, text):
-                        self.choices = [_Choice(text)]
-
-                return _Resp(text)
+            async def acreate(
+                self, model=None, messages=None, temperature=0.7, max_tokens=None, thinking_budget=0, **kwargs
+            ):
+                text = await self._ai.generate_openai_style_async(
+                    messages=messages or [],
+                    temperature=temperature,
+                    max_tokens=max_tokens or 4096,
+                    thinking_budget=thinking_budget,
+                    hedge=kwargs.get("hedge", True),
+                    expect_json=kwargs.get("expect_json", True),
+                )
+                return _CompatResponse(text)
 
 
 # -- Singletons ------------------------------------------------------------
@@ -797,6 +1274,11 @@ def get_openai_compat_client() -> OpenAICompatAdapter:
     return OpenAICompatAdapter(get_ai_client())
 
 
+def record_slot_fill_cache(hits: int, misses: int, quota_skipped: int = 0) -> None:
+    """Record v3 slot-fill cache lookups in the global LLM metrics."""
+    _metrics.record_slot_fill_cache(hits, misses, quota_skipped)
+
+
 def get_llm_metrics() -> dict[str, Any]:
     """Get the global LLM metrics snapshot. Used by /health/ai-metrics."""
     return _metrics.snapshot()
@@ -0,0 +1,128 @@
+"""Async Supabase data access for async routes.
+
+The sync ``supabase.Client`` blocks the event loop for the whole PostgREST
+round-trip: one slow query stalls every other request on that worker, and
+``asyncio.gather()`` over sync ``.execute()`` calls runs them one after another.
+
+This module owns a ``supabase.AsyncClient`` on a pooled HTTP/2 httpx client
+(keep-alive, bounded connections) plus one awaitable entry point:
+
+    result = await execute(db.table("children").select("id").eq("id", child_id))
+    children, mastery = await gather(q1, q2)      # real concurrent fan-out
+
+execute() also accepts query builders from a sync client (the legacy
+get_supabase_client(), tests' FakeSupabase) and runs those in a worker thread,
+so shared helpers such as check_and_increment_usage() never block the loop
+whichever client the caller holds.
+
+The client is bound to the event loop it was created on; a new loop (tests,
+worker restart) gets a fresh pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import os
+import threading
+import time
+from typing import Any
+
+import httpx
+import structlog
+from supabase import AsyncClient, AsyncClientOptions
+
+from app.services.metrics import get_metrics_registry
+
+logger = structlog.get_logger("skolar.async_db")
+
+HTTP2 = os.getenv("SUPABASE_HTTP2", "1") == "1"
+POOL_MAX_CONNECTIONS = int(os.getenv("SUPABASE_POOL_MAX_CONNECTIONS", "100"))
+POOL_MAX_KEEPALIVE = int(os.getenv("SUPABASE_POOL_MAX_KEEPALIVE", "20"))
+KEEPALIVE_EXPIRY_S = float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY_S", "30"))
+TIMEOUT_S = float(os.getenv("SUPABASE_ASYNC_TIMEOUT_S", "20"))
+
+DB_QUERY_LATENCY = get_metrics_registry().histogram(
+    "skolar_db_query_seconds",
+    "Wall time of Supabase queries issued through async_db.execute()",
+    ("mode",),
+)
+
+
+def create_async_supabase(url: str, key: str, transport: httpx.AsyncBaseTransport | None = None) -> AsyncClient:
+    """Build an AsyncClient whose PostgREST/storage/functions calls share one pooled httpx client.
+
+    *transport* is for load tests and benchmarks (e.g. an httpx.MockTransport
+    with injected latency); production leaves it None.
+    """
+    http_client = httpx.AsyncClient(
+        http2=HTTP2,
+        timeout=httpx.Timeout(TIMEOUT_S),
+        limits=httpx.Limits(
+            max_connections=POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=POOL_MAX_KEEPALIVE,
+            keepalive_expiry=KEEPALIVE_EXPIRY_S,
+        ),
+        transport=transport,
+    )
+    # Service-role key, no user session — nothing to persist or refresh
+    options = AsyncClientOptions(httpx_client=http_client, auto_refresh_token=False, persist_session=False)
+    return AsyncClient(url, key, options)
+
+
+async def execute(query: Any) -> Any:
+    """Await a PostgREST query builder from either an async or a sync Supabase client."""
+    native = inspect.iscoroutinefunction(getattr(query, "execute", None))
+    t0 = time.perf_counter()
+    try:
+        if native:
+            return await query.execute()
+        return await asyncio.to_thread(query.execute)
+    finally:
+        DB_QUERY_LATENCY.observe(time.perf_counter() - t0, mode="async" if native else "thread")
+
+
+async def gather(*queries: Any) -> list[Any]:
+    """Run several queries concurrently; results in argument order. Raises the first failure."""
+    return list(await asyncio.gather(*(execute(q) for q in queries)))
+
+
+# -- Singleton (per event loop) -------------------------------------------------
+
+_client: AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+_client_lock = threading.Lock()
+
+
+def get_async_supabase() -> AsyncClient:
+    """Shared AsyncClient for the running event loop (created on first use)."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        with _client_lock:
+            if _client is None or _client_loop is not loop:
+                from app.core.config import get_settings
+
+                settings = get_settings()
+                _client = create_async_supabase(settings.supabase_url, settings.supabase_service_key)
+                _client_loop = loop
+                logger.info(
+                    "async_supabase_ready",
+                    http2=HTTP2,
+                    max_connections=POOL_MAX_CONNECTIONS,
+                    max_keepalive=POOL_MAX_KEEPALIVE,
+                )
+    return _client
+
+
+async def close_async_supabase() -> None:
+    """Close the pooled connections (lifespan shutdown)."""
+    global _client, _client_loop
+    with _client_lock:
+        client, loop = _client, _client_loop
+        _client = _client_loop = None
+    if client is None or loop is not asyncio.get_running_loop():
+        return
+    http_client = client.options.httpx_client
+    if http_client is not None:
+        await http_client.aclose()
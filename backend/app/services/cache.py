@@ -1,29 +1,517 @@
 """
 Application-level caching for AI responses and data lookups.
 
-Uses in-memory TTL caches. No Redis needed at current scale (< 1000 users).
-When scale demands it, swap these for Redis with the same interface.
+Each cache (revision, flashcards, dashboard) is a ``CacheNamespace`` on top of a
+pluggable backend chosen by ``CACHE_BACKEND``:
+
+  - ``memory`` (default) — per-process LRU with TTL, same as before
+  - ``sqlite`` — on-disk SQLite file (``CACHE_SQLITE_PATH``) shared by every
+    uvicorn worker on the host, fronted by a short-lived in-process LRU
+  - ``redis`` — any Redis-protocol server (``REDIS_URL``) shared by every
+    worker and host, fronted by the same in-process LRU
+
+On top of the backend, ``get_or_compute()`` adds:
+
+  - request coalescing (single-flight): concurrent misses on one key trigger a
+    single generation — in-process via a shared future, across workers via a
+    lease key in the shared backend
+  - stale-while-revalidate: an entry past its TTL but inside ``stale_ttl`` is
+    served immediately while one background task refreshes it
 """
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from typing import Any
 
 import structlog
-from cachetools import TTLCache
+from cachetools import LRUCache
 
 logger = structlog.get_logger("skolar.cache")
 
-# -- Cache instances -----------------------------------------------------------
+_KEY_PREFIX = "skolar:cache:"
 
-# Revision notes: key = "grade:subject:topic:language" -> full AI response dict
-_revision_cache: TTLCache = TTLCache(maxsize=500, ttl=86400)  # 24 hours
+# Shared-tier entries are mirrored in a per-process LRU for at most this long,
+# which bounds how long a cross-worker invalidation can take to be seen.
+_L1_TTL_S = float(os.getenv("CACHE_L1_TTL_S", "30"))
 
-# Flashcards: same key pattern -> full AI response dict
-_flashcard_cache: TTLCache = TTLCache(maxsize=500, ttl=86400)  # 24 hours
+# Single-flight lease: how long another worker may hold a key while generating,
+# and how often waiters poll for its result.
+_LEASE_TTL_S = 60.0
+_LEASE_POLL_S = 0.1
+
+
+# -- Backends ------------------------------------------------------------------
+
+
+class CacheBackend(ABC):
+    """Minimal key/value interface every cache tier implements.
+
+    Values are JSON-serialisable objects; ``ttl`` is in seconds.
+    """
+
+    name = "abstract"
 
-# Dashboard: key = "child_id" -> dashboard data dict
-_dashboard_cache: TTLCache = TTLCache(maxsize=200, ttl=300)  # 5 minutes
+    @abstractmethod
+    def get(self, key: str) -> Any | None: ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def clear(self, prefix: str) -> None:
+        """Delete every key starting with *prefix*."""
+
+    def acquire_lease(self, key: str, ttl: float, token: str) -> bool:
+        """Set *key* to *token* only if absent. True means the caller owns the lease."""
+        return True
+
+    def release_lease(self, key: str, token: str) -> None:
+        """Delete *key* only if it still holds *token* — an expired lease may belong to someone else now."""
+
+    def size(self, prefix: str) -> int | None:
+        return None
+
+
+class MemoryBackend(CacheBackend):
+    """In-process LRU with per-entry expiry."""
+
+    name = "memory"
+
+    def __init__(self, maxsize: int, max_ttl: float | None = None):
+        self._data: LRUCache = LRUCache(maxsize=maxsize)
+        self._max_ttl = max_ttl
+        self._lock = threading.Lock()
+
+    @property
+    def maxsize(self) -> int:
+        return int(self._data.maxsize)
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.time():
+                self._data.pop(key, None)
+                return None
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        if self._max_ttl is not None:
+            ttl = min(ttl, self._max_ttl)
+        with self._lock:
+            self._data[key] = (time.time() + ttl, value)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix)]:
+                self._data.pop(key, None)
+
+    def size(self, prefix: str) -> int | None:
+        with self._lock:
+            return sum(1 for k in self._data if k.startswith(prefix))
+
+
+class SQLiteBackend(CacheBackend):
+    """On-disk tier shared by all worker processes on one host."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self._path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)")
+        self._writes = 0
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, payload, time.time() + ttl),
+            )
+            self._writes += 1
+            if self._writes % 200 == 0:
+                self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self, prefix: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key >= ? AND key < ?", (prefix, prefix + "\uffff"))
+
+    def acquire_lease(self, key: str, ttl: float, token: str) -> bool:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ? AND expires_at <= ?", (key, now))
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, token, now + ttl),
+            )
+            return cur.rowcount == 1
+
+    def release_lease(self, key: str, token: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ? AND value = ?", (key, token))
+
+    def size(self, prefix: str) -> int | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM cache WHERE key >= ? AND key < ? AND expires_at > ?",
+                (prefix, prefix + "\uffff", time.time()),
+            ).fetchone()
+        return int(row[0])
+
+
+_RELEASE_LEASE_LUA = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisBackend(CacheBackend):
+    """Redis-protocol tier shared across workers and hosts.
+
+    Accepts any client exposing ``get/set(ex|px, nx)/delete/scan_iter/eval``
+    (redis-py, fakeredis, or a compatible stand-in).
+    """
+
+    name = "redis"
+
+    def __init__(self, client: Any):
+        self._client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> RedisBackend:
+        import redis  # optional dependency — only needed when CACHE_BACKEND=redis
+
+        return cls(redis.Redis.from_url(url, socket_timeout=1.0, socket_connect_timeout=1.0))
+
+    def get(self, key: str) -> Any | None:
+        raw = self._client.get(key)
+        if raw is None:
+            return None
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._client.set(key, json.dumps(value, ensure_ascii=False), px=max(1, int(ttl * 1000)))
+
+    def delete(self, key: str) -> None:
+        self._client.delete(key)
+
+    def clear(self, prefix: str) -> None:
+        keys = list(self._client.scan_iter(match=f"{prefix}*"))
+        if keys:
+            self._client.delete(*keys)
+
+    def acquire_lease(self, key: str, ttl: float, token: str) -> bool:
+        return bool(self._client.set(key, token, px=max(1, int(ttl * 1000)), nx=True))
+
+    def release_lease(self, key: str, token: str) -> None:
+        # GET + DEL in one atomic step, so a lease re-acquired in between is not deleted
+        self._client.eval(_RELEASE_LEASE_LUA, 1, key, token)
+
+
+class TieredBackend(CacheBackend):
+    """Per-process L1 in front of a shared L2. Reads backfill L1; writes go to both."""
+
+    def __init__(self, l1: MemoryBackend, l2: CacheBackend):
+        self.l1 = l1
+        self.l2 = l2
+        self.name = f"memory+{l2.name}"
+
+    def get(self, key: str) -> Any | None:
+        value = self.l1.get(key)
+        if value is not None:
+            return value
+        try:
+            value = self.l2.get(key)
+        except Exception as e:
+            logger.warning("cache_l2_get_failed", backend=self.l2.name, error=str(e))
+            return None
+        if value is not None:
+            self.l1.set(key, value, _L1_TTL_S)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self.l1.set(key, value, ttl)
+        try:
+            self.l2.set(key, value, ttl)
+        except Exception as e:
+            logger.warning("cache_l2_set_failed", backend=self.l2.name, error=str(e))
+
+    def delete(self, key: str) -> None:
+        self.l1.delete(key)
+        try:
+            self.l2.delete(key)
+        except Exception as e:
+            logger.warning("cache_l2_delete_failed", backend=self.l2.name, error=str(e))
+
+    def clear(self, prefix: str) -> None:
+        self.l1.clear(prefix)
+        try:
+            self.l2.clear(prefix)
+        except Exception as e:
+            logger.warning("cache_l2_clear_failed", backend=self.l2.name, error=str(e))
+
+    def acquire_lease(self, key: str, ttl: float, token: str) -> bool:
+        try:
+            return self.l2.acquire_lease(key, ttl, token)
+        except Exception as e:
+            # Shared tier down — fall back to in-process coalescing only
+            logger.warning("cache_l2_lease_failed", backend=self.l2.name, error=str(e))
+            return True
+
+    def release_lease(self, key: str, token: str) -> None:
+        try:
+            self.l2.release_lease(key, token)
+        except Exception as e:
+            logger.warning("cache_l2_lease_release_failed", backend=self.l2.name, error=str(e))
+
+    def size(self, prefix: str) -> int | None:
+        try:
+            return self.l2.size(prefix)
+        except Exception:
+            return None
+
+
+_shared_backend: CacheBackend | None = None
+_shared_backend_lock = threading.Lock()
+
+
+def get_shared_backend() -> CacheBackend | None:
+    """Return the process-wide shared tier selected by CACHE_BACKEND, or None for memory-only."""
+    global _shared_backend
+    if _shared_backend is not None:
+        return _shared_backend
+    kind = os.getenv("CACHE_BACKEND", "memory").lower()
+    if kind == "memory":
+        return None
+    with _shared_backend_lock:
+        if _shared_backend is None:
+            try:
+                if kind == "sqlite":
+                    _shared_backend = SQLiteBackend(os.getenv("CACHE_SQLITE_PATH", "/tmp/skolar_cache.sqlite3"))  # noqa: S108
+                elif kind == "redis":
+                    _shared_backend = RedisBackend.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+                else:
+                    logger.warning("cache_backend_unknown", backend=kind)
+                    return None
+                logger.info("cache_backend_ready", backend=kind)
+            except Exception as e:
+                logger.error("cache_backend_init_failed", backend=kind, error=str(e))
+                return None
+    return _shared_backend
+
+
+def set_shared_backend(backend: CacheBackend | None) -> None:
+    """Install a shared tier explicitly (tests, or custom wiring at startup)."""
+    global _shared_backend
+    _shared_backend = backend
+    for ns in _NAMESPACES:
+        ns._backend = None
+
+
+# -- Namespaces ----------------------------------------------------------------
+
+
+class CacheNamespace:
+    """One logical cache (e.g. revision notes) with TTL, stale window and single-flight."""
+
+    def __init__(self, name: str, maxsize: int, ttl: float, stale_ttl: float = 0.0):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._prefix = f"{_KEY_PREFIX}{name}:"
+        self._backend: CacheBackend | None = None
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.coalesced = 0
+
+    @property
+    def backend(self) -> CacheBackend:
+        if self._backend is None:
+            shared = get_shared_backend()
+            if shared is None:
+                self._backend = MemoryBackend(self.maxsize)
+            else:
+                self._backend = TieredBackend(MemoryBackend(self.maxsize, max_ttl=_L1_TTL_S), shared)
+        return self._backend
+
+    def key(self, *parts: str) -> str:
+        return self._prefix + _make_key(*parts)
+
+    # Envelopes carry the write time so freshness is decided here, not by the backend
+    def _read(self, key: str) -> dict | None:
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            logger.warning("cache_get_failed", cache=self.name, error=str(e))
+            return None
+
+    def _write(self, key: str, value: Any) -> None:
+        try:
+            self.backend.set(key, {"value": value, "stored_at": time.time()}, self.ttl + self.stale_ttl)
+        except Exception as e:
+            logger.warning("cache_set_failed", cache=self.name, error=str(e))
+
+    def get(self, key: str) -> Any | None:
+        """Return the fresh value for *key*, or None."""
+        entry = self._read(key)
+        if entry is not None and time.time() - entry["stored_at"] < self.ttl:
+            self.hits += 1
+            return entry["value"]
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        self._write(key, value)
+
+    def delete(self, key: str) -> None:
+        try:
+            self.backend.delete(key)
+        except Exception as e:
+            logger.warning("cache_delete_failed", cache=self.name, error=str(e))
+
+    def clear(self) -> None:
+        self.backend.clear(self._prefix)
+
+    async def _offload(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a backend call off the event loop, unless the backend is in-process memory.
+
+        SQLite (5 s busy timeout) and Redis (1 s socket timeout) calls block, so
+        one slow shared tier must not stall every request on this worker.
+        """
+        if isinstance(self.backend, MemoryBackend):
+            return fn(*args)
+        return await asyncio.to_thread(fn, *args)
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for *key*, generating it at most once across concurrent callers."""
+        entry = await self._offload(self._read, key)
+        if entry is not None:
+            age = time.time() - entry["stored_at"]
+            if age < self.ttl:
+                self.hits += 1
+                return entry["value"]
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._flight(key, compute)
+                return entry["value"]
+        self.misses += 1
+        return await self._single_flight(key, compute)
+
+    async def _single_flight(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            joined = key in self._inflight
+            flight = self._flight(key, compute)
+            if joined:
+                self.coalesced += 1
+            try:
+                # shield: a caller that goes away (client disconnect) stops waiting,
+                # but the shared computation keeps running for everyone else
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if flight.cancelled() and not (task is not None and task.cancelling()):
+                    continue  # the computation itself was cancelled, not this caller — start a new one
+                raise
+
+    def _flight(self, key: str, compute: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """The detached task computing *key*, started if none is running.
+
+        It belongs to no caller, so cancelling any one waiter never reaches
+        the others.
+        """
+        flight = self._inflight.get(key)
+        if flight is None:
+            flight = asyncio.create_task(self._compute_with_lease(key, compute))
+            self._inflight[key] = flight
+            flight.add_done_callback(lambda t: self._on_flight_done(key, t))
+        return flight
+
+    def _on_flight_done(self, key: str, flight: asyncio.Task) -> None:
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+        # Retrieve the exception so a flight nobody awaits (a background refresh) is logged, not leaked
+        if not flight.cancelled() and flight.exception() is not None:
+            logger.warning("cache_compute_failed", cache=self.name, error=str(flight.exception()))
+
+    async def _compute_with_lease(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        lease_key = key + ":lease"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + _LEASE_TTL_S
+        while not await self._offload(self.backend.acquire_lease, lease_key, _LEASE_TTL_S, token):
+            # Another worker is generating this key — wait for its result, and take
+            # over as soon as its lease is released (e.g. its compute raised)
+            if time.monotonic() >= deadline:
+                logger.warning("cache_lease_wait_expired", cache=self.name)
+                value = await compute()
+                await self._offload(self._write, key, value)
+                return value
+            await asyncio.sleep(_LEASE_POLL_S)
+            entry = await self._offload(self._read, key)
+            if entry is not None and time.time() - entry["stored_at"] < self.ttl:
+                self.coalesced += 1
+                return entry["value"]
+
+        try:
+            value = await compute()
+            await self._offload(self._write, key, value)
+            return value
+        finally:
+            await self._offload(self.backend.release_lease, lease_key, token)
+
+    def stats(self) -> dict:
+        backend = self.backend
+        return {
+            "size": backend.size(self._prefix),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            "backend": backend.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "coalesced": self.coalesced,
+        }
 
 
 def _make_key(*parts: str) -> str:
@@ -32,12 +520,26 @@ def _make_key(*parts: str) -> str:
     return hashlib.sha256(raw.encode()).hexdigest()
 
 
+# -- Cache instances -----------------------------------------------------------
+
+# Revision notes: key = "grade:subject:topic:language" -> full AI response dict
+_revision_cache = CacheNamespace("revision", maxsize=500, ttl=86400, stale_ttl=3600)  # 24 hours
+
+# Flashcards: same key pattern -> full AI response dict
+_flashcard_cache = CacheNamespace("flashcards", maxsize=500, ttl=86400, stale_ttl=3600)  # 24 hours
+
+# Dashboard: key = "child_id" -> dashboard data dict (explicitly invalidated, so no stale serving)
+_dashboard_cache = CacheNamespace("dashboard", maxsize=200, ttl=300)  # 5 minutes
+
+_NAMESPACES = (_revision_cache, _flashcard_cache, _dashboard_cache)
+
+
 # -- Revision Cache ------------------------------------------------------------
 
 
 def get_cached_revision(grade: str, subject: str, topic: str, language: str = "English") -> dict | None:
     """Get cached revision notes, or None if not cached."""
-    key = _make_key("revision", grade, subject, topic, language)
+    key = _revision_cache.key("revision", grade, subject, topic, language)
     result = _revision_cache.get(key)
     if result:
         logger.info("cache_hit", cache="revision", topic=topic)
@@ -46,17 +548,25 @@ def get_cached_revision(grade: str, subject: str, topic: str, language: str = "E
 
 def set_cached_revision(grade: str, subject: str, topic: str, language: str, data: dict) -> None:
     """Cache revision notes."""
-    key = _make_key("revision", grade, subject, topic, language)
-    _revision_cache[key] = data
+    key = _revision_cache.key("revision", grade, subject, topic, language)
+    _revision_cache.set(key, data)
     logger.info("cache_set", cache="revision", topic=topic)
 
 
+async def get_or_create_revision(
+    grade: str, subject: str, topic: str, language: str, generate: Callable[[], Awaitable[dict]]
+) -> dict:
+    """Cached revision notes; concurrent misses share one ``generate()`` call."""
+    key = _revision_cache.key("revision", grade, subject, topic, language)
+    return await _revision_cache.get_or_compute(key, generate)
+
+
 # -- Flashcard Cache -----------------------------------------------------------
 
 
 def get_cached_flashcards(grade: str, subject: str, topic: str, language: str = "English") -> dict | None:
     """Get cached flashcards, or None if not cached."""
-    key = _make_key("flashcards", grade, subject, topic, language)
+    key = _flashcard_cache.key("flashcards", grade, subject, topic, language)
     result = _flashcard_cache.get(key)
     if result:
         logger.info("cache_hit", cache="flashcards", topic=topic)
@@ -65,17 +575,25 @@ def get_cached_flashcards(grade: str, subject: str, topic: str, language: str =
 
 def set_cached_flashcards(grade: str, subject: str, topic: str, language: str, data: dict) -> None:
     """Cache flashcards."""
-    key = _make_key("flashcards", grade, subject, topic, language)
-    _flashcard_cache[key] = data
+    key = _flashcard_cache.key("flashcards", grade, subject, topic, language)
+    _flashcard_cache.set(key, data)
     logger.info("cache_set", cache="flashcards", topic=topic)
 
 
+async def get_or_create_flashcards(
+    grade: str, subject: str, topic: str, language: str, generate: Callable[[], Awaitable[dict]]
+) -> dict:
+    """Cached flashcards; concurrent misses share one ``generate()`` call."""
+    key = _flashcard_cache.key("flashcards", grade, subject, topic, language)
+    return await _flashcard_cache.get_or_compute(key, generate)
+
+
 # -- Dashboard Cache -----------------------------------------------------------
 
 
 def get_cached_dashboard(child_id: str) -> dict | None:
     """Get cached dashboard data, or None if not cached."""
-    key = _make_key("dashboard", child_id)
+    key = _dashboard_cache.key("dashboard", child_id)
     result = _dashboard_cache.get(key)
     if result:
         logger.info("cache_hit", cache="dashboard", child_id=child_id[:8])
@@ -84,15 +602,15 @@ def get_cached_dashboard(child_id: str) -> dict | None:
 
 def set_cached_dashboard(child_id: str, data: dict) -> None:
     """Cache dashboard data."""
-    key = _make_key("dashboard", child_id)
-    _dashboard_cache[key] = data
+    key = _dashboard_cache.key("dashboard", child_id)
+    _dashboard_cache.set(key, data)
     logger.info("cache_set", cache="dashboard", child_id=child_id[:8])
 
 
 def invalidate_dashboard(child_id: str) -> None:
     """Invalidate dashboard cache (call after grading, new worksheet, etc.)."""
-    key = _make_key("dashboard", child_id)
-    _dashboard_cache.pop(key, None)
+    key = _dashboard_cache.key("dashboard", child_id)
+    _dashboard_cache.delete(key)
     logger.info("cache_invalidate", cache="dashboard", child_id=child_id[:8])
 
 
@@ -100,17 +618,12 @@ def invalidate_dashboard(child_id: str) -> None:
 
 
 def cache_stats() -> dict:
-    """Return current cache sizes and capacities."""
-    return {
-        "revision": {"size": len(_revision_cache), "maxsize": _revision_cache.maxsize, "ttl": _revision_cache.ttl},
-        "flashcards": {"size": len(_flashcard_cache), "maxsize": _flashcard_cache.maxsize, "ttl": _flashcard_cache.ttl},
-        "dashboard": {"size": len(_dashboard_cache), "maxsize": _dashboard_cache.maxsize, "ttl": _dashboard_cache.ttl},
-    }
+    """Return current cache sizes, capacities and hit counters."""
+    return {ns.name: ns.stats() for ns in _NAMESPACES}
 
 
 def clear_all() -> None:
     """Clear all caches."""
-    _revision_cache.clear()
-    _flashcard_cache.clear()
-    _dashboard_cache.clear()
+    for ns in _NAMESPACES:
+        ns.clear()
     logger.info("all_caches_cleared")
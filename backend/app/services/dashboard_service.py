@@ -1,18 +1,41 @@
+import asyncio
 import logging
 
-from app.services.supabase_client import get_supabase_client
+from app.services.async_db import execute
 
 logger = logging.getLogger(__name__)
 
 
-def get_parent_dashboard(student_id: str):
+async def get_parent_dashboard(student_id: str, db) -> dict:
     """
     Build parent dashboard from actual DB tables:
     - mastery_state: skill-level progress
     - child_engagement: streaks and stars
     - worksheets: recent worksheet history
+
+    The three queries run concurrently through async_db.execute(); a failed
+    one leaves its section empty instead of failing the dashboard.
     """
-    sb = get_supabase_client()
+    eng_resp, mastery_resp, ws_resp = await asyncio.gather(
+        execute(
+            db.table("child_engagement")
+            .select("total_stars, current_streak, longest_streak, total_worksheets_completed")
+            .eq("child_id", student_id)
+        ),
+        execute(
+            db.table("mastery_state")
+            .select("skill_tag, streak, total_attempts, correct_attempts, mastery_level")
+            .eq("student_id", student_id)
+        ),
+        execute(
+            db.table("worksheets")
+            .select("topic, created_at")
+            .eq("child_id", student_id)
+            .order("created_at", desc=True)
+            .limit(100)
+        ),
+        return_exceptions=True,
+    )
 
     # --- Overall stats from child_engagement ---
     overall_stats = {
@@ -22,12 +45,8 @@ def get_parent_dashboard(student_id: str):
         "longest_streak": 0,
     }
     try:
-        eng_resp = (
-            sb.table("child_engagement")
-            .select("total_stars, current_streak, longest_streak, total_worksheets_completed")
-            .eq("child_id", student_id)
-            .execute()
-        )
+        if isinstance(eng_resp, Exception):
+            raise eng_resp
         if eng_resp.data and len(eng_resp.data) > 0:
             row = eng_resp.data[0]
             overall_stats["total_stars"] = row.get("total_stars", 0) or 0
@@ -40,12 +59,8 @@ def get_parent_dashboard(student_id: str):
     # --- Skills from mastery_state ---
     skills = []
     try:
-        mastery_resp = (
-            sb.table("mastery_state")
-            .select("skill_tag, streak, total_attempts, correct_attempts, mastery_level")
-            .eq("student_id", student_id)
-            .execute()
-        )
+        if isinstance(mastery_resp, Exception):
+            raise mastery_resp
         if mastery_resp.data:
             for row in mastery_resp.data:
                 total = row.get("total_attempts", 0) or 0
@@ -67,14 +82,8 @@ def get_parent_dashboard(student_id: str):
     # --- Recent topics from worksheets ---
     recent_topics = []
     try:
-        ws_resp = (
-            sb.table("worksheets")
-            .select("topic, created_at")
-            .eq("child_id", student_id)
-            .order("created_at", desc=True)
-            .limit(100)
-            .execute()
-        )
+        if isinstance(ws_resp, Exception):
+            raise ws_resp
         if ws_resp.data:
             # Also update total_worksheets from worksheets table if engagement was empty
             if overall_stats["total_worksheets"] == 0:
@@ -0,0 +1,188 @@
+"""
+Print-ready image derivatives for PDF embedding.
+
+The ReportLab PDF used to open every cartoon image with PIL on every render,
+flatten it, re-encode it to JPEG and write it to the temp dir under a name
+derived from its basename. That is repeated CPU and disk I/O, and parallel
+renders could collide on the same temp file. Now each image in
+``IMAGE_REGISTRY`` is prepared once:
+
+  - flattened onto white (no alpha), downscaled to print resolution for the
+    size it is embedded at, and saved as an optimized JPEG
+  - named by a hash of the source bytes plus the derivative settings. A
+    derivative that exists is never rebuilt, and two renders can never
+    collide on one file.
+  - kept in an in-memory index (registry path → file + pixel size), so
+    renderers can lay images out without opening them
+
+``prepare_image_assets()`` runs at startup (IMAGE_ASSET_PREWARM) and from
+``scripts/prepare_image_assets.py`` at Docker build time. Images not
+prepared yet are built on first use.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+
+import structlog
+
+logger = structlog.get_logger("skolar.image_assets")
+
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "images")
+ASSET_DIR = os.getenv("IMAGE_ASSET_DIR", "") or os.path.join(tempfile.gettempdir(), "skolar-image-assets")
+
+# Cartoon images are embedded at most 1.8 cm wide; 300 dpi print → ~213 px
+PRINT_DPI = int(os.getenv("IMAGE_ASSET_DPI", "300"))
+MAX_EMBED_CM = 1.8
+JPEG_QUALITY = 75
+
+# Bump when the derivative recipe changes (resampling, background, encoder settings)
+_RECIPE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ImageAsset:
+    """A prepared, print-sized derivative of one source image."""
+
+    path: str
+    width: int  # pixels
+    height: int
+
+    def fit(self, max_width: float, max_height: float) -> tuple[float, float]:
+        """Largest (width, height) within the box that keeps the aspect ratio."""
+        scale = min(max_width / self.width, max_height / self.height)
+        return self.width * scale, self.height * scale
+
+
+def _print_px() -> int:
+    return round(MAX_EMBED_CM / 2.54 * PRINT_DPI)
+
+
+def source_path(image_path: str) -> str:
+    """Local file for a registry path such as ``/images/animals/cow.webp``."""
+    return os.path.join(IMAGES_DIR, image_path.removeprefix("/images/"))
+
+
+class ImageAssetStore:
+    """Registry path → ImageAsset, backed by a directory of content-hashed JPEGs."""
+
+    def __init__(self, directory: str = ASSET_DIR, max_px: int | None = None):
+        self.directory = directory
+        self.max_px = max_px or _print_px()
+        self._index: dict[str, ImageAsset] = {}
+        self._missing: set[str] = set()
+        self._lock = threading.Lock()
+        self._build_locks: dict[str, threading.Lock] = {}
+        self._stats = {"built": 0, "reused": 0, "failed": 0}
+
+    def get(self, image_path: str) -> ImageAsset | None:
+        """Prepared derivative for *image_path*, building it on first use. None if unusable."""
+        with self._lock:
+            asset = self._index.get(image_path)
+            if asset is not None or image_path in self._missing:
+                return asset
+            build_lock = self._build_locks.setdefault(image_path, threading.Lock())
+        # One build per image even when several renders ask for it at once
+        with build_lock:
+            with self._lock:
+                if image_path in self._index or image_path in self._missing:
+                    return self._index.get(image_path)
+            asset = self._prepare(image_path)
+            with self._lock:
+                if asset is None:
+                    self._missing.add(image_path)
+                else:
+                    self._index[image_path] = asset
+            return asset
+
+    def _prepare(self, image_path: str) -> ImageAsset | None:
+        src = source_path(image_path)
+        if not image_path or not os.path.isfile(src):
+            return None
+        with open(src, "rb") as f:
+            data = f.read()
+        recipe = f"v{_RECIPE_VERSION}:{self.max_px}:{JPEG_QUALITY}".encode()
+        digest = hashlib.sha256(recipe + b"\0" + data).hexdigest()[:24]
+        out = os.path.join(self.directory, f"{digest}.jpg")
+        try:
+            from PIL import Image as PILImage
+
+            if os.path.exists(out):
+                with PILImage.open(out) as img:
+                    self._count("reused")
+                    return ImageAsset(out, *img.size)
+
+            os.makedirs(self.directory, exist_ok=True)
+            with PILImage.open(src) as img:
+                img.load()
+                if img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info):
+                    rgba = img.convert("RGBA")
+                    flat = PILImage.new("RGB", rgba.size, (255, 255, 255))
+                    flat.paste(rgba, mask=rgba.split()[3])
+                else:
+                    flat = img.convert("RGB")
+            flat.thumbnail((self.max_px, self.max_px), PILImage.Resampling.LANCZOS)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    flat.save(f, "JPEG", quality=JPEG_QUALITY, optimize=True)
+                os.replace(tmp, out)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+                raise
+            self._count("built")
+            return ImageAsset(out, *flat.size)
+        except Exception as e:
+            self._count("failed")
+            logger.warning("image_asset_prepare_failed", image=image_path, error=str(e))
+            return None
+
+    def prepare_all(self, image_paths: list[str]) -> dict:
+        """Build (or re-index) every image in *image_paths*. Returns counters."""
+        t0 = time.monotonic()
+        ready = sum(1 for p in image_paths if self.get(p) is not None)
+        stats = {**self.stats(), "ready": ready, "elapsed_ms": int((time.monotonic() - t0) * 1000)}
+        logger.info("image_assets_prepared", **stats)
+        return stats
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "indexed": len(self._index), "max_px": self.max_px, "directory": self.directory}
+
+
+# -- Singleton -----------------------------------------------------------------
+
+_store: ImageAssetStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_image_asset_store() -> ImageAssetStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ImageAssetStore()
+    return _store
+
+
+def get_print_asset(image_path: str) -> ImageAsset | None:
+    """Print-ready derivative for a registry image path, or None if the source is missing."""
+    return get_image_asset_store().get(image_path)
+
+
+def prepare_image_assets() -> dict:
+    """Prepare every image referenced by IMAGE_REGISTRY."""
+    from app.data.image_registry import IMAGE_REGISTRY
+
+    paths = sorted({entry["path"] for entry in IMAGE_REGISTRY.values() if entry.get("path")})
+    return get_image_asset_store().prepare_all(paths)
@@ -0,0 +1,230 @@
+"""In-process latency histograms for the generation pipeline.
+
+Every stage of worksheet generation records its wall time into a bucketed
+histogram labelled by stage / engine / subject / grade:
+
+    slot_build, curriculum_rag, gemini_batch, validation, quality_gate,
+    visual_enrichment, template_render, pdf_render
+
+Exposed in Prometheus text format on GET /metrics (see app/api/health.py), so
+p99 regressions per stage show up on a dashboard instead of in log greps.
+
+Usage:
+    with stage_labels(engine="v3", subject="Maths", grade="Class 3"):
+        with stage_timer("slot_build"):
+            ...
+
+stage_labels() sets the labels in a contextvar, so nested code (e.g. each
+Gemini batch in gemini_filler) only names its stage. Histograms are
+per-process: with several uvicorn workers each one reports its own series.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+# Seconds — covers sub-ms Python stages up to the 90 s route timeout
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    20.0,
+    45.0,
+    90.0,
+)
+
+STAGE_LABELS: tuple[str, ...] = ("stage", "engine", "subject", "grade")
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics), thread-safe."""
+
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...], buckets: tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        # label values → [bucket counts..., +Inf count], sum
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "") or "") for n in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[key] = series
+            counts, total = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            total[0] += value
+
+    def snapshot(self) -> dict[tuple[str, ...], dict]:
+        """label values → {"buckets": [(le, cumulative count)...], "sum": s, "count": n}."""
+        with self._lock:
+            items = [(k, list(c), t[0]) for k, (c, t) in self._series.items()]
+        out = {}
+        for key, counts, total in items:
+            cumulative = []
+            running = 0
+            for bound, n in zip(self.buckets, counts):
+                running += n
+                cumulative.append((bound, running))
+            running += counts[-1]
+            out[key] = {"buckets": cumulative, "sum": total, "count": running}
+        return out
+
+    def quantile(self, q: float, **labels: str) -> float | None:
+        """Upper bucket bound holding the q-th observation (coarse p50/p99 for logs and tests)."""
+        key = tuple(str(labels.get(n, "") or "") for n in self.label_names)
+        series = self.snapshot().get(key)
+        if not series or not series["count"]:
+            return None
+        target = q * series["count"]
+        for bound, cumulative in series["buckets"]:
+            if cumulative >= target:
+                return bound
+        return float("inf")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._histograms: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        label_names: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = Histogram(name, help_text, label_names, buckets)
+                self._histograms[name] = hist
+            return hist
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: list[str] = []
+        with self._lock:
+            histograms = list(self._histograms.values())
+        for hist in histograms:
+            lines.append(f"# HELP {hist.name} {hist.help_text}")
+            lines.append(f"# TYPE {hist.name} histogram")
+            for key, series in sorted(hist.snapshot().items()):
+                base = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(hist.label_names, key))
+                sep = "," if base else ""
+                for bound, cumulative in series["buckets"]:
+                    lines.append(f'{hist.name}_bucket{{{base}{sep}le="{float(bound)!r}"}} {cumulative}')
+                lines.append(f'{hist.name}_bucket{{{base}{sep}le="+Inf"}} {series["count"]}')
+                lines.append(f"{hist.name}_sum{{{base}}} {series['sum']:.6f}")
+                lines.append(f"{hist.name}_count{{{base}}} {series['count']}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            histograms = list(self._histograms.values())
+        for hist in histograms:
+            hist.reset()
+
+
+# -- Singleton ----------------------------------------------------------------
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    return _registry
+
+
+STAGE_LATENCY = _registry.histogram(
+    "skolar_generation_stage_seconds",
+    "Wall time of each worksheet generation stage",
+    STAGE_LABELS,
+)
+
+
+# -- Stage timing ---------------------------------------------------------------
+
+_stage_labels: contextvars.ContextVar[dict[str, str]] = contextvars.ContextVar("skolar_stage_labels", default={})
+
+
+@contextmanager
+def stage_labels(**labels: str) -> Iterator[None]:
+    """Set engine/subject/grade labels for every stage_timer() in this context."""
+    token = _stage_labels.set({**_stage_labels.get(), **{k: v for k, v in labels.items() if v is not None}})
+    try:
+        yield
+    finally:
+        try:
+            _stage_labels.reset(token)
+        except ValueError:
+            # Async generator finalised from another context — nothing to restore
+            pass
+
+
+# Raw-sample sinks for benchmarks (scripts/bench_generate.py): the histogram
+# buckets are too coarse to compare sub-millisecond stages against a baseline
+_sample_sinks: list[dict[str, list[float]]] = []
+_sample_lock = threading.Lock()
+
+
+def observe_stage(stage: str, seconds: float, **labels: str) -> None:
+    STAGE_LATENCY.observe(seconds, stage=stage, **{**_stage_labels.get(), **labels})
+    if _sample_sinks:
+        with _sample_lock:
+            for sink in _sample_sinks:
+                sink.setdefault(stage, []).append(seconds)
+
+
+@contextmanager
+def capture_stage_samples() -> Iterator[dict[str, list[float]]]:
+    """Collect every stage observation made while the block runs: stage → [seconds...]."""
+    sink: dict[str, list[float]] = {}
+    with _sample_lock:
+        _sample_sinks.append(sink)
+    try:
+        yield sink
+    finally:
+        with _sample_lock:
+            # By identity — two sinks holding the same samples compare equal
+            _sample_sinks[:] = [s for s in _sample_sinks if s is not sink]
+
+
+@contextmanager
+def stage_timer(stage: str, **labels: str) -> Iterator[None]:
+    """Record the wall time of the enclosed block (also when it raises)."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - t0, **labels)
@@ -17,10 +17,76 @@ from __future__ import annotations
 
 import logging
 import re
+from functools import cache
 from typing import Any
 
+from app.services.question_analysis import analyze_text
+
 logger = logging.getLogger("skolar.validator")
 
+# ── Template pattern bank ─────────────────────────────────────────────────
+# Placeholder vocabularies for _make_template / _make_deep_template. Every
+# entry is a single word, so the bank is a word → placeholder table and a
+# template is one pass over the text's \w+ runs with a dict lookup per run.
+# A run matches exactly when the old \b(?:a|b|…)\b alternation would.
+# Names are context_pools.INDIAN_NAMES plus these, which older generators used.
+
+_TEMPLATE_EXTRA_NAMES = ("ravi", "kiran", "anita", "deepa", "suresh", "sunita", "mohan")
+
+_TEMPLATE_OBJECTS = (
+    "apples", "oranges", "mangoes", "bananas", "pencils", "pens", "erasers", "books",
+    "notebooks", "pages", "marbles", "balls", "sweets", "toffees", "chocolates", "stickers",
+    "stamps", "coins", "rupees", "toys", "flowers", "leaves", "trees", "birds", "fishes", "eggs",
+    "cups", "plates", "bottles", "bags", "boxes", "beads", "shells", "stones", "buttons", "seeds",
+    "cookies", "cakes", "candies", "balloons", "candles", "ribbons", "stars", "tickets", "cards",
+    "crayons", "colours", "colors", "caps", "cars", "buses",
+)  # fmt: skip
+
+_TEMPLATE_PLACES = (
+    "market", "shop", "store", "school", "park", "zoo", "kitchen", "festival", "playground",
+    "station", "library", "farm", "bakery", "hospital", "garden", "field", "party", "temple",
+    "beach", "museum", "cinema", "restaurant", "home", "classroom", "bus", "train",
+)  # fmt: skip
+
+_TEMPLATE_PRONOUNS = ("she", "he", "her", "his", "him", "they", "them", "their")
+
+_TIME_RE = re.compile(r"\d{1,2}:\d{2}\s*(?:AM|PM|am|pm)?")
+_AMOUNT_RE = re.compile(r"₹?\d+(?:\.\d+)?")
+_WORD_RUN_RE = re.compile(r"\w+")
+_WS_RE = re.compile(r"\s+")
+_DUP_PLACEHOLDER_RE = re.compile(r"(<(?:NAME|NUM|OBJ|PLACE|VERB|TIME)>)(\s*\1)+")
+
+
+class _TemplateBank:
+    """Precompiled placeholder tables for structural question templates."""
+
+    def __init__(self, names, verbs):
+        self._shallow = dict.fromkeys((n.lower() for n in names), "<NAME>")
+        # Earlier categories win where vocabularies overlap
+        self._deep = dict(self._shallow)
+        for words, placeholder in (
+            (_TEMPLATE_OBJECTS, "<OBJ>"),
+            (_TEMPLATE_PLACES, "<PLACE>"),
+            (verbs, "<VERB>"),
+            (_TEMPLATE_PRONOUNS, "<NAME>"),
+        ):
+            for word in words:
+                self._deep.setdefault(word, placeholder)
+
+    @staticmethod
+    def _rewrite(text: str, table: dict[str, str]) -> str:
+        # Times before amounts: "3:45" must not become "<NUM>:<NUM>"
+        tmpl = _AMOUNT_RE.sub("<NUM>", _TIME_RE.sub("<TIME>", text))
+        return _WORD_RUN_RE.sub(lambda m: table.get(m.group(0).lower(), m.group(0)), tmpl)
+
+    def template(self, text: str) -> str:
+        return _WS_RE.sub(" ", self._rewrite(text, self._shallow)).strip()
+
+    def deep_template(self, text: str) -> str:
+        tmpl = _WS_RE.sub(" ", self._rewrite(text, self._deep))
+        tmpl = _DUP_PLACEHOLDER_RE.sub(r"\1", tmpl)
+        return _WS_RE.sub(" ", tmpl).strip()
+
 
 class OutputValidator:
     """Validates AI-generated outputs before they reach users."""
@@ -140,11 +206,11 @@ class OutputValidator:
                     errors.append(f"{qid}: MCQ answer '{answer}' not in options")
 
         # 3. Duplicate detection — exact + pattern-based near-duplicates
-        texts = [q.get("text", "").strip().lower() for q in questions if q.get("text")]
         seen = set()
-        for t in texts:
-            # Normalize whitespace for comparison
-            normalized = re.sub(r"\s+", " ", t)
+        for q in questions:
+            if not q.get("text"):
+                continue
+            normalized = analyze_text(q["text"]).normalized
             if normalized in seen:
                 errors.append("Duplicate question detected")
                 break
@@ -152,11 +218,7 @@ class OutputValidator:
 
         # 3b. Near-duplicate detection — strip names/numbers/times to create templates
         if len(questions) >= 4:
-            templates: list[str] = []
-            for q in questions:
-                text = q.get("text", "").strip().lower()
-                tmpl = self._make_template(text)
-                templates.append(tmpl)
+            templates = [analyze_text(q.get("text", "")).template for q in questions]
             from collections import Counter
 
             counts = Counter(templates)
@@ -176,8 +238,9 @@ class OutputValidator:
                 text = q.get("text", "")
 
                 # Class 1-2: questions shouldn't be too long
-                if grade_num <= 2 and len(text.split()) > 40:
-                    errors.append(f"{qid}: question too long for {grade} ({len(text.split())} words)")
+                word_count = analyze_text(text).word_count
+                if grade_num <= 2 and word_count > 40:
+                    errors.append(f"{qid}: question too long for {grade} ({word_count} words)")
 
                 # Class 1-2: shouldn't use complex vocabulary
                 if grade_num <= 2:
@@ -356,10 +419,8 @@ class OutputValidator:
         # 11. Number reuse across questions — no number in >2 questions
         if len(questions) >= 5:
             number_to_questions: dict[str, int] = {}
-            _NUM_RE = re.compile(r"\b(\d+)\b")
             for q in questions:
-                text = q.get("text", "")
-                nums_in_q = set(_NUM_RE.findall(text))
+                nums_in_q = set(analyze_text(q.get("text", "")).numbers)
                 for n in nums_in_q:
                     if n in ("0", "1"):
                         continue  # trivial numbers excluded
@@ -372,10 +433,8 @@ class OutputValidator:
         # 12. Round number cap — ≤30% of numbers may be multiples of 5 or 10
         if len(questions) >= 5 and subject.lower() in ("maths", "mathematics", "math"):
             all_nums: list[int] = []
-            _NUM_RE_12 = re.compile(r"\b(\d+)\b")
             for q in questions:
-                text = q.get("text", "")
-                for n_str in _NUM_RE_12.findall(text):
+                for n_str in analyze_text(q.get("text", "")).numbers:
                     n = int(n_str)
                     if n > 1:  # skip 0 and 1
                         all_nums.append(n)
@@ -515,9 +574,7 @@ class OutputValidator:
             )
             scenario_counts: dict[str, int] = {}
             for q in questions:
-                text = q.get("text", "").lower()
-                words = set(re.findall(r"\b\w+\b", text))
-                found_scenarios = words & _SCENARIO_WORDS
+                found_scenarios = analyze_text(q.get("text", "")).tokens & _SCENARIO_WORDS
                 for sc in found_scenarios:
                     scenario_counts[sc] = scenario_counts.get(sc, 0) + 1
             for sc, cnt in scenario_counts.items():
@@ -552,7 +609,7 @@ class OutputValidator:
 
         # 20. Deep sentence-structure diversity — flag if too many questions share a formula
         if len(questions) >= 5:
-            deep_templates = [self._make_deep_template(q.get("text", "")) for q in questions]
+            deep_templates = [analyze_text(q.get("text", "")).deep_template for q in questions]
             unique_count = len(set(deep_templates))
             diversity_score = unique_count / len(deep_templates)
 
@@ -764,23 +821,7 @@ class OutputValidator:
         Used for near-duplicate detection — two questions that differ only in
         names/numbers/times will produce the same template.
         """
-        # Replace time patterns (e.g. "3:45 PM", "10:30 AM")
-        tmpl = re.sub(r"\d{1,2}:\d{2}\s*(?:AM|PM|am|pm)?", "<TIME>", text)
-        # Replace numbers (including currency like ₹500)
-        tmpl = re.sub(r"₹?\d+(?:\.\d+)?", "<NUM>", tmpl)
-        # Replace common Indian names (case-insensitive)
-        _NAMES_PATTERN = (
-            r"\b(?:aarav|ananya|vihaan|diya|reyansh|saanvi|arjun|isha|kabir|myra|"
-            r"aditya|kiara|rohan|priya|vivaan|anika|krishna|zara|rudra|pari|"
-            r"atharv|navya|shaurya|aadhya|dhruv|riya|arnav|sara|dev|anvi|"
-            r"ishan|tara|kian|meera|yash|nisha|aryan|siya|neil|pooja|"
-            r"rahul|sneha|manav|kavya|sameer|tanvi|kunal|ritika|"
-            r"ravi|kiran|anita|deepa|suresh|sunita|mohan)\b"
-        )
-        tmpl = re.sub(_NAMES_PATTERN, "<NAME>", tmpl, flags=re.IGNORECASE)
-        # Collapse whitespace
-        tmpl = re.sub(r"\s+", " ", tmpl).strip()
-        return tmpl
+        return _template_bank().template(text)
 
     @classmethod
     def _make_deep_template(cls, text: str) -> str:
@@ -790,43 +831,7 @@ class OutputValidator:
         Two questions that differ only in surface-level details (names, numbers,
         objects, verbs, places) will produce the same deep template.
         """
-        # Step 1: Apply existing template (handles names, numbers, times)
-        tmpl = cls._make_template(text)
-
-        # Step 2: Normalize countable objects → <OBJ>
-        _COUNTABLE_OBJ_PATTERN = (
-            r"\b(?:apples|oranges|mangoes|bananas|pencils|pens|erasers|books|"
-            r"notebooks|pages|marbles|balls|sweets|toffees|chocolates|stickers|"
-            r"stamps|coins|rupees|toys|flowers|leaves|trees|birds|fishes|eggs|"
-            r"cups|plates|bottles|bags|boxes|beads|shells|stones|buttons|seeds|"
-            r"cookies|cakes|candies|balloons|candles|ribbons|stars|tickets|cards|"
-            r"crayons|colours|colors|caps|cars|buses)\b"
-        )
-        tmpl = re.sub(_COUNTABLE_OBJ_PATTERN, "<OBJ>", tmpl, flags=re.IGNORECASE)
-
-        # Step 3: Normalize scenario/location words → <PLACE>
-        _SCENARIO_PATTERN = (
-            r"\b(?:market|shop|store|school|park|zoo|kitchen|festival|playground|"
-            r"station|library|farm|bakery|hospital|garden|field|party|temple|"
-            r"beach|museum|cinema|restaurant|home|classroom|bus|train)\b"
-        )
-        tmpl = re.sub(_SCENARIO_PATTERN, "<PLACE>", tmpl, flags=re.IGNORECASE)
-
-        # Step 4: Normalize verb forms → <VERB>
-        def _replace_verb(m: re.Match) -> str:
-            word = m.group(0).lower()
-            return "<VERB>" if word in cls._VERB_FORMS else m.group(0)
-
-        _verb_keys = "|".join(re.escape(v) for v in cls._VERB_FORMS)
-        tmpl = re.sub(rf"\b({_verb_keys})\b", _replace_verb, tmpl, flags=re.IGNORECASE)
-
-        # Step 5: Normalize pronouns → <NAME>
-        tmpl = re.sub(r"\b(?:she|he|her|his|him|they|them|their)\b", "<NAME>", tmpl, flags=re.IGNORECASE)
-
-        # Step 6: Collapse adjacent duplicate placeholders and whitespace
-        tmpl = re.sub(r"(<(?:NAME|NUM|OBJ|PLACE|VERB|TIME)>)(\s*\1)+", r"\1", tmpl)
-        tmpl = re.sub(r"\s+", " ", tmpl).strip()
-        return tmpl
+        return _template_bank().deep_template(text)
 
     @staticmethod
     def _parse_grade_num(grade: str) -> int | None:
@@ -954,6 +959,13 @@ class OutputValidator:
         return False
 
 
+@cache
+def _template_bank() -> _TemplateBank:
+    from app.services.v3.context_pools import INDIAN_NAMES
+
+    return _TemplateBank((*INDIAN_NAMES, *_TEMPLATE_EXTRA_NAMES), OutputValidator._VERB_FORMS)
+
+
 # Singleton
 _validator: OutputValidator | None = None
 
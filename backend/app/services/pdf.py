@@ -10,16 +10,19 @@ Gold-G8: Redesigned to match Pearson/Oxford primary workbook quality.
 from __future__ import annotations
 
 import io
+import json
 import logging
 import os
 import re
-import tempfile
+import threading
+from dataclasses import dataclass
 from xml.sax.saxutils import escape as xml_escape
 
+from cachetools import LRUCache
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1, getSampleStyleSheet
 from reportlab.lib.units import cm
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.pdfmetrics import registerFontFamily
@@ -95,19 +98,58 @@ FONT_REGULAR = "SkolarFont" if _USE_UNICODE_FONT else "Helvetica"
 FONT_BOLD = "SkolarFont-Bold" if _USE_UNICODE_FONT else "Helvetica-Bold"
 FONT_ITALIC = "SkolarFont-Italic" if _USE_UNICODE_FONT else "Helvetica-Oblique"
 
+
+def _serialize_font_subsetting(font_name: str) -> None:
+    """Make concurrent renders safe on a shared TTF face.
+
+    TTFontFace.makeSubset() reads glyph data through the face's single
+    seek/read cursor, so two threads saving PDFs at once corrupt each
+    other's subsets. Only that step is serialized; layout stays parallel.
+    """
+    face = pdfmetrics.getFont(font_name).face
+    if getattr(face, "_skolar_subset_lock", None) is not None:
+        return
+    lock = threading.Lock()
+    make_subset = face.makeSubset
+
+    def _locked_make_subset(subset):
+        with lock:
+            return make_subset(subset)
+
+    face._skolar_subset_lock = lock
+    face.makeSubset = _locked_make_subset
+
+
+if _USE_UNICODE_FONT:
+    for _fn in (FONT_REGULAR, FONT_BOLD, FONT_ITALIC):
+        _serialize_font_subsetting(_fn)
+
 # ── HarfBuzz text shaping for Devanagari conjuncts ──────────────────────
 # ReportLab doesn't apply OpenType GSUB rules, so conjuncts like क्ष, ज्ञ,
 # श्र, त्र render as broken sequences. We use HarfBuzz to shape text into
 # proper glyph sequences, then map shaped glyphs to Private Use Area (PUA)
 # codepoints that ReportLab can render via the font's glyph table.
+#
+# The GID→PUA mapping is fixed (PUA = base + glyph id) and installed into
+# every SkolarFont face once at import, for every glyph in the font — so all
+# conjuncts are covered up front, shaping never mutates shared state, and a
+# shaped string means the same thing in every thread and process. Shaped
+# segments are memoized per (segment, bold); PDF_SHAPE_CACHE_FILE optionally
+# persists them across restarts.
 
 _HB_AVAILABLE = False
 _hb_font = None
 _hb_font_bold = None
 _DEVANAGARI_RE = re.compile(r"[\u0900-\u097F\u200C\u200D]+(?:[\u0020][\u0900-\u097F\u200C\u200D]+)*")
 _PUA_BASE = 0xE000
-_next_pua = _PUA_BASE
-_gid_to_pua: dict[int, int] = {}
+_PUA_BMP_SIZE = 0x1900  # U+E000..U+F8FF
+_PUA_SUPPLEMENTARY_BASE = 0xF0000  # Plane 15, for fonts with more glyphs than the BMP PUA holds
+
+_SHAPE_CACHE_SIZE = int(os.getenv("PDF_SHAPE_CACHE_SIZE", "50000"))
+_SHAPE_CACHE_FILE = os.getenv("PDF_SHAPE_CACHE_FILE", "")
+_shape_cache: LRUCache = LRUCache(maxsize=_SHAPE_CACHE_SIZE)
+_shape_cache_lock = threading.Lock()
+_shape_font_signature = ""
 
 # Determine which font path to use for shaping (must match what ReportLab uses)
 _SHAPE_FONT_PATH = None  # type: str | None
@@ -128,6 +170,30 @@ if _USE_UNICODE_FONT:
             _SHAPE_FONT_PATH_BOLD = _candidate_b
             break
 
+
+def _pua_for_gid(gid: int) -> int:
+    """Fixed PUA codepoint standing in for glyph *gid*."""
+    if gid < _PUA_BMP_SIZE:
+        return _PUA_BASE + gid
+    return _PUA_SUPPLEMENTARY_BASE + gid
+
+
+def _install_pua_glyphs(rl_font_name: str, hb_f) -> int:
+    """Map every glyph of *hb_f* into the ReportLab face *rl_font_name* at its fixed PUA codepoint.
+
+    Widths are the font's nominal advances scaled to ReportLab's 1000-unit em.
+    Returns the number of glyphs installed.
+    """
+    face = pdfmetrics.getFont(rl_font_name).face
+    scale = 1000.0 / (hb_f.face.upem or 1000)
+    count = hb_f.face.glyph_count
+    for gid in range(count):
+        pua = _pua_for_gid(gid)
+        face.charToGlyph[pua] = gid
+        face.charWidths[pua] = round(hb_f.get_glyph_h_advance(gid) * scale)
+    return count
+
+
 if _SHAPE_FONT_PATH:
     try:
         import uharfbuzz as hb
@@ -135,7 +201,6 @@ if _SHAPE_FONT_PATH:
         _blob = hb.Blob.from_file_path(_SHAPE_FONT_PATH)
         _face = hb.Face(_blob)
         _hb_font = hb.Font(_face)
-        _HB_AVAILABLE = True
         # Bold font for shaping bold text
         if _SHAPE_FONT_PATH_BOLD and _SHAPE_FONT_PATH_BOLD != _SHAPE_FONT_PATH:
             _blob_b = hb.Blob.from_file_path(_SHAPE_FONT_PATH_BOLD)
@@ -143,7 +208,17 @@ if _SHAPE_FONT_PATH:
             _hb_font_bold = hb.Font(_face_b)
         else:
             _hb_font_bold = _hb_font
-        logger.info("HarfBuzz shaping: enabled (Devanagari conjuncts will render correctly)")
+        # SkolarFont-Italic is registered from the regular font file
+        _n_glyphs = _install_pua_glyphs("SkolarFont", _hb_font)
+        _install_pua_glyphs("SkolarFont-Italic", _hb_font)
+        _install_pua_glyphs("SkolarFont-Bold", _hb_font_bold)
+        _shape_font_signature = "|".join(
+            f"{os.path.basename(_p)}:{os.path.getsize(_p)}" for _p in (_SHAPE_FONT_PATH, _SHAPE_FONT_PATH_BOLD)
+        )
+        _HB_AVAILABLE = True
+        logger.info(
+            "HarfBuzz shaping: enabled, %d glyphs mapped (Devanagari conjuncts will render correctly)", _n_glyphs
+        )
     except ImportError:
         logger.warning("uharfbuzz not installed — Devanagari conjuncts may render incorrectly")
     except Exception as e:
@@ -154,46 +229,72 @@ def _shape_devanagari_segment(text: str, bold: bool = False) -> str:
     """Shape a Devanagari text segment using HarfBuzz.
 
     Returns a string of PUA-mapped characters that ReportLab can render
-    as properly shaped glyphs (conjuncts, ligatures, etc.).
+    as properly shaped glyphs (conjuncts, ligatures, etc.). Memoized per
+    (text, bold); safe to call from any thread.
     """
-    global _next_pua
+    key = (text, bold)
+    with _shape_cache_lock:
+        shaped = _shape_cache.get(key)
+    if shaped is not None:
+        return shaped
+
     import uharfbuzz as hb
 
     hb_f = _hb_font_bold if bold and _hb_font_bold else _hb_font
-    rl_font_name = "SkolarFont-Bold" if bold else "SkolarFont"
-    rl_font_obj = pdfmetrics.getFont(rl_font_name)
-
     buf = hb.Buffer()
     buf.add_str(text)
     buf.guess_segment_properties()
     hb.shape(hb_f, buf)
+    shaped = "".join(chr(_pua_for_gid(info.codepoint)) for info in buf.glyph_infos)
+
+    with _shape_cache_lock:
+        _shape_cache[key] = shaped
+    return shaped
+
+
+def shape_cache_stats() -> dict:
+    with _shape_cache_lock:
+        return {"entries": len(_shape_cache), "maxsize": _shape_cache.maxsize, "enabled": _HB_AVAILABLE}
+
+
+def save_shape_cache(path: str = "") -> int:
+    """Write memoized shapes to *path* (default PDF_SHAPE_CACHE_FILE). Returns entries written."""
+    path = path or _SHAPE_CACHE_FILE
+    if not path or not _HB_AVAILABLE:
+        return 0
+    with _shape_cache_lock:
+        entries = [[text, bold, shaped] for (text, bold), shaped in _shape_cache.items()]
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"font": _shape_font_signature, "pua_base": _PUA_BASE, "entries": entries}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+    return len(entries)
 
-    result = []
-    for info, pos in zip(buf.glyph_infos, buf.glyph_positions):
-        gid = info.codepoint
-        if gid not in _gid_to_pua:
-            pua = _next_pua
-            _next_pua += 1
-            _gid_to_pua[gid] = pua
-            # Inject into ALL registered SkolarFont variants
-            for fn in ["SkolarFont", "SkolarFont-Bold", "SkolarFont-Italic"]:
-                try:
-                    f = pdfmetrics.getFont(fn)
-                    f.face.charToGlyph[pua] = gid
-                    f.face.charWidths[pua] = pos.x_advance
-                except Exception as exc:
-                    logger.debug("PUA glyph inject skipped for %s: %s", fn, exc)
-                    continue
-        else:
-            # Update width if not yet set for this font variant
-            pua = _gid_to_pua[gid]
-            try:
-                if pua not in rl_font_obj.face.charWidths:
-                    rl_font_obj.face.charWidths[pua] = pos.x_advance
-            except Exception:
-                logger.debug("PUA width update skipped for gid=%d", gid)
-        result.append(chr(_gid_to_pua[gid]))
-    return "".join(result)
+
+def load_shape_cache(path: str = "") -> int:
+    """Prime the shape memo from *path* (default PDF_SHAPE_CACHE_FILE). Returns entries loaded.
+
+    Files written for a different font build are ignored.
+    """
+    path = path or _SHAPE_CACHE_FILE
+    if not path or not _HB_AVAILABLE or not os.path.exists(path):
+        return 0
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("font") != _shape_font_signature or data.get("pua_base") != _PUA_BASE:
+            return 0
+        with _shape_cache_lock:
+            for text, bold, shaped in data["entries"]:
+                _shape_cache[(text, bool(bold))] = shaped
+        return len(data["entries"])
+    except Exception as e:
+        logger.warning("Shape cache load failed for %s: %s", path, e)
+        return 0
+
+
+if _SHAPE_CACHE_FILE:
+    load_shape_cache()
 
 
 def _shape_text(text: str, bold: bool = False) -> str:
@@ -218,43 +319,9 @@ def _shape_text(text: str, bold: bool = False) -> str:
     return "".join(parts)
 
 
-def _flatten_image_alpha(local_path: str) -> str:
-    """Convert RGBA images to RGB with white background and optimize size.
-
-    - Non-alpha RGB images: saved as JPEG quality=75 (60-80% smaller)
-    - Alpha images: flattened to RGB, saved as JPEG quality=75
-    Returns path to temp file (or original if no conversion needed).
-    """
-    try:
-        from PIL import Image as PILImage
-
-        img = PILImage.open(local_path)
-        if img.mode in ("RGBA", "LA", "PA"):
-            background = PILImage.new("RGB", img.size, (255, 255, 255))
-            if img.mode == "RGBA":
-                background.paste(img, mask=img.split()[3])
-            else:
-                background.paste(img)
-            flat_path = os.path.join(tempfile.gettempdir(), f"skolar_{os.path.basename(local_path)}.jpg")
-            background.save(flat_path, "JPEG", quality=75, optimize=True)
-            return flat_path
-        elif img.mode == "RGB":
-            # Already RGB — save as optimized JPEG
-            opt_path = os.path.join(tempfile.gettempdir(), f"skolar_{os.path.basename(local_path)}.jpg")
-            img.save(opt_path, "JPEG", quality=75, optimize=True)
-            return opt_path
-        return local_path
-    except Exception as e:
-        logger.warning("Failed to flatten image alpha for %s: %s", local_path, e)
-        return local_path
-
-
 # ──────────────────────────────────────────────
 # Colours — warm, professional palette
 # ──────────────────────────────────────────────
-_PRIMARY = colors.HexColor("#1E1B4B")  # Skolar indigo
-_ACCENT = colors.HexColor("#F97316")  # orange accent
-_LIGHT_BG = colors.HexColor("#F8FAFC")  # soft slate bg
 _TIER_BG = colors.HexColor("#F1F5F9")  # tier header bg
 _MUTED = colors.HexColor("#94A3B8")  # muted slate
 _RULE = colors.HexColor("#B0B4BC")  # ruled line colour — print-visible
@@ -276,6 +343,35 @@ TIER_COLORS = {
 }
 
 
+@dataclass(frozen=True)
+class _Palette:
+    """Theme colours: question numbers, titles, rules (primary), badges (accent), zebra rows (light_bg)."""
+
+    primary: colors.Color
+    accent: colors.Color
+    light_bg: colors.Color
+
+
+# visual_theme → palette. Unknown themes get the Skolar brand palette.
+_PALETTES = {
+    "color": _Palette(
+        primary=colors.HexColor("#1E1B4B"),  # Skolar indigo
+        accent=colors.HexColor("#F97316"),  # orange accent
+        light_bg=colors.HexColor("#F8FAFC"),  # soft slate bg
+    ),
+    "black_and_white": _Palette(
+        primary=colors.Color(0.1, 0.1, 0.1),
+        accent=colors.Color(0.3, 0.3, 0.3),
+        light_bg=colors.white,
+    ),
+    "minimal": _Palette(
+        primary=colors.Color(0.2, 0.2, 0.2),
+        accent=colors.Color(0.4, 0.4, 0.4),
+        light_bg=colors.white,
+    ),
+}
+
+
 # ──────────────────────────────────────────────
 # Unicode → simpler character replacements
 # ──────────────────────────────────────────────
@@ -466,225 +562,261 @@ def _flatten_tier_order(questions: list) -> list:
     return result
 
 
-class PDFService:
-    """Service for generating premium PDF worksheets."""
-
-    def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
-        self._page_count = 0
-        self._show_hints = True
-
-    def _setup_custom_styles(self):
-        """Set up premium paragraph styles."""
-
-        # ── Title ──
-        self.styles.add(
-            ParagraphStyle(
-                name="WorksheetTitle",
-                fontName=FONT_BOLD,
-                fontSize=20,
-                leading=24,
-                spaceAfter=4,
-                alignment=TA_CENTER,
-                textColor=_PRIMARY,
-            )
+def _build_style_sheet(palette: _Palette) -> StyleSheet1:
+    """Build the premium paragraph styles for one colour palette."""
+    styles = getSampleStyleSheet()
+
+    # ── Title ──
+    styles.add(
+        ParagraphStyle(
+            name="WorksheetTitle",
+            fontName=FONT_BOLD,
+            fontSize=20,
+            leading=24,
+            spaceAfter=4,
+            alignment=TA_CENTER,
+            textColor=palette.primary,
         )
-
-        # ── Subtitle (grade | subject | topic) ──
-        self.styles.add(
-            ParagraphStyle(
-                name="WorksheetSubtitle",
-                fontName=FONT_REGULAR,
-                fontSize=10,
-                textColor=_MUTED,
-                alignment=TA_CENTER,
-                spaceAfter=16,
-            )
+    )
+
+    # ── Subtitle (grade | subject | topic) ──
+    styles.add(
+        ParagraphStyle(
+            name="WorksheetSubtitle",
+            fontName=FONT_REGULAR,
+            fontSize=10,
+            textColor=_MUTED,
+            alignment=TA_CENTER,
+            spaceAfter=16,
         )
-
-        # ── Tier section header ──
-        self.styles.add(
-            ParagraphStyle(
-                name="TierHeader",
-                fontName=FONT_BOLD,
-                fontSize=11,
-                leading=14,
-                textColor=_PRIMARY,
-                spaceBefore=18,
-                spaceAfter=4,
-            )
+    )
+
+    # ── Tier section header ──
+    styles.add(
+        ParagraphStyle(
+            name="TierHeader",
+            fontName=FONT_BOLD,
+            fontSize=11,
+            leading=14,
+            textColor=palette.primary,
+            spaceBefore=18,
+            spaceAfter=4,
         )
-        self.styles.add(
-            ParagraphStyle(
-                name="TierDesc",
-                fontName=FONT_ITALIC,
-                fontSize=8.5,
-                textColor=_MUTED,
-                spaceAfter=10,
-                leftIndent=2,
-            )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="TierDesc",
+            fontName=FONT_ITALIC,
+            fontSize=8.5,
+            textColor=_MUTED,
+            spaceAfter=10,
+            leftIndent=2,
         )
-
-        # ── Question text ──
-        self.styles.add(
-            ParagraphStyle(
-                name="QuestionText",
-                fontName=FONT_REGULAR,
-                fontSize=11,
-                leading=15,
-                spaceAfter=6,
-                leftIndent=28,
-            )
+    )
+
+    # ── Question text ──
+    styles.add(
+        ParagraphStyle(
+            name="QuestionText",
+            fontName=FONT_REGULAR,
+            fontSize=11,
+            leading=15,
+            spaceAfter=6,
+            leftIndent=28,
         )
-
-        # ── Question number ──
-        self.styles.add(
-            ParagraphStyle(
-                name="QuestionNumber",
-                fontName=FONT_BOLD,
-                fontSize=11,
-                leading=15,
-                textColor=_PRIMARY,
-            )
+    )
+
+    # ── Question number ──
+    styles.add(
+        ParagraphStyle(
+            name="QuestionNumber",
+            fontName=FONT_BOLD,
+            fontSize=11,
+            leading=15,
+            textColor=palette.primary,
         )
-
-        # ── Options (MCQ) ──
-        self.styles.add(
-            ParagraphStyle(
-                name="OptionText",
-                fontName=FONT_REGULAR,
-                fontSize=10,
-                leading=13,
-                leftIndent=42,
-                spaceAfter=2,
-            )
+    )
+
+    # ── Options (MCQ) ──
+    styles.add(
+        ParagraphStyle(
+            name="OptionText",
+            fontName=FONT_REGULAR,
+            fontSize=10,
+            leading=13,
+            leftIndent=42,
+            spaceAfter=2,
         )
-
-        # ── Instructions box ──
-        self.styles.add(
-            ParagraphStyle(
-                name="Instructions",
-                fontName=FONT_REGULAR,
-                fontSize=9,
-                leading=13,
-                textColor=colors.Color(0.3, 0.3, 0.3),
-                spaceAfter=12,
-            )
+    )
+
+    # ── Instructions box ──
+    styles.add(
+        ParagraphStyle(
+            name="Instructions",
+            fontName=FONT_REGULAR,
+            fontSize=9,
+            leading=13,
+            textColor=colors.Color(0.3, 0.3, 0.3),
+            spaceAfter=12,
         )
-
-        # ── Parent tip (Trust P0) ──
-        self.styles.add(
-            ParagraphStyle(
-                name="ParentTip",
-                fontName=FONT_REGULAR,
-                fontSize=9,
-                leading=13,
-                textColor=colors.Color(0.2, 0.2, 0.2),
-            )
+    )
+
+    # ── Parent tip (Trust P0) ──
+    styles.add(
+        ParagraphStyle(
+            name="ParentTip",
+            fontName=FONT_REGULAR,
+            fontSize=9,
+            leading=13,
+            textColor=colors.Color(0.2, 0.2, 0.2),
         )
-
-        # ── Header fields (Name/Date/Score) ──
-        self.styles.add(
-            ParagraphStyle(
-                name="HeaderField",
-                fontName=FONT_REGULAR,
-                fontSize=10,
-                leading=13,
-            )
+    )
+
+    # ── Header fields (Name/Date/Score) ──
+    styles.add(
+        ParagraphStyle(
+            name="HeaderField",
+            fontName=FONT_REGULAR,
+            fontSize=10,
+            leading=13,
         )
-
-        # ── Hint text ──
-        self.styles.add(
-            ParagraphStyle(
-                name="HintText",
-                fontName=FONT_ITALIC,
-                fontSize=8.5,
-                leading=11,
-                textColor=_MUTED,
-                leftIndent=28,
-                spaceAfter=4,
-            )
+    )
+
+    # ── Hint text ──
+    styles.add(
+        ParagraphStyle(
+            name="HintText",
+            fontName=FONT_ITALIC,
+            fontSize=8.5,
+            leading=11,
+            textColor=_MUTED,
+            leftIndent=28,
+            spaceAfter=4,
         )
-
-        # ── Learning objective ──
-        self.styles.add(
-            ParagraphStyle(
-                name="ObjectiveTitle",
-                fontName=FONT_BOLD,
-                fontSize=9.5,
-                leading=12,
-                textColor=_PRIMARY,
-                spaceAfter=4,
-            )
+    )
+
+    # ── Learning objective ──
+    styles.add(
+        ParagraphStyle(
+            name="ObjectiveTitle",
+            fontName=FONT_BOLD,
+            fontSize=9.5,
+            leading=12,
+            textColor=palette.primary,
+            spaceAfter=4,
         )
-        self.styles.add(
-            ParagraphStyle(
-                name="ObjectiveItem",
-                fontName=FONT_REGULAR,
-                fontSize=9,
-                leading=12,
-                leftIndent=12,
-                textColor=colors.Color(0.25, 0.25, 0.25),
-            )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="ObjectiveItem",
+            fontName=FONT_REGULAR,
+            fontSize=9,
+            leading=12,
+            leftIndent=12,
+            textColor=colors.Color(0.25, 0.25, 0.25),
         )
-
-        # ── Answer key ──
-        self.styles.add(
-            ParagraphStyle(
-                name="AnswerKeyTitle",
-                fontName=FONT_BOLD,
-                fontSize=16,
-                leading=22,
-                textColor=_PRIMARY,
-                spaceBefore=8,
-                spaceAfter=10,
-                alignment=TA_CENTER,
-            )
+    )
+
+    # ── Answer key ──
+    styles.add(
+        ParagraphStyle(
+            name="AnswerKeyTitle",
+            fontName=FONT_BOLD,
+            fontSize=16,
+            leading=22,
+            textColor=palette.primary,
+            spaceBefore=8,
+            spaceAfter=10,
+            alignment=TA_CENTER,
         )
-        self.styles.add(
-            ParagraphStyle(
-                name="AnswerText",
-                fontName=FONT_REGULAR,
-                fontSize=9,
-                leading=12,
-                leftIndent=8,
-            )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="AnswerText",
+            fontName=FONT_REGULAR,
+            fontSize=9,
+            leading=12,
+            leftIndent=8,
         )
-        self.styles.add(
-            ParagraphStyle(
-                name="ExplanationText",
-                fontName=FONT_ITALIC,
-                fontSize=8.5,
-                leading=11,
-                leftIndent=8,
-                textColor=_MUTED,
-            )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="ExplanationText",
+            fontName=FONT_ITALIC,
+            fontSize=8.5,
+            leading=11,
+            leftIndent=8,
+            textColor=_MUTED,
         )
-
-        # ── Verification footer (answer key) ──
-        self.styles.add(
-            ParagraphStyle(
-                name="VerificationFooter",
-                fontName=FONT_ITALIC,
-                fontSize=7,
-                textColor=_MUTED,
-                alignment=TA_CENTER,
-                spaceBefore=4,
-            )
+    )
+
+    # ── Verification footer (answer key) ──
+    styles.add(
+        ParagraphStyle(
+            name="VerificationFooter",
+            fontName=FONT_ITALIC,
+            fontSize=7,
+            textColor=_MUTED,
+            alignment=TA_CENTER,
+            spaceBefore=4,
         )
-
-        # ── Curriculum badge ──
-        self.styles.add(
-            ParagraphStyle(
-                name="CurriculumBadge",
-                fontName=FONT_ITALIC,
-                fontSize=8.5,
-                textColor=colors.HexColor("#059669"),  # emerald
-                alignment=TA_CENTER,
-                spaceAfter=4,
-            )
+    )
+
+    # ── Curriculum badge ──
+    styles.add(
+        ParagraphStyle(
+            name="CurriculumBadge",
+            fontName=FONT_ITALIC,
+            fontSize=8.5,
+            textColor=colors.HexColor("#059669"),  # emerald
+            alignment=TA_CENTER,
+            spaceAfter=4,
         )
+    )
+    return styles
+
+
+_style_sheets: dict[str, StyleSheet1] = {}
+_style_sheets_lock = threading.Lock()
+
+
+def _palette_for(visual_theme: str | None) -> tuple[str, _Palette]:
+    theme = (visual_theme or "color").lower()
+    if theme not in _PALETTES:
+        theme = "color"
+    return theme, _PALETTES[theme]
+
+
+def _style_sheet(visual_theme: str | None) -> StyleSheet1:
+    """Precompiled style sheet for a theme, built once per process and shared read-only."""
+    theme, palette = _palette_for(visual_theme)
+    sheet = _style_sheets.get(theme)
+    if sheet is None:
+        with _style_sheets_lock:
+            sheet = _style_sheets.get(theme)
+            if sheet is None:
+                sheet = _style_sheets[theme] = _build_style_sheet(palette)
+    return sheet
+
+
+class PDFService:
+    """Service for generating premium PDF worksheets.
+
+    Re-entrant: generate_worksheet_pdf() renders on a fresh PDFService bound to
+    the worksheet's visual_theme (the render context). Per-render state — page
+    counter, hints, watermark, Hindi labels, palette — lives on that context,
+    never on the shared service or in module globals, so threads can export
+    concurrently. Style sheets are precompiled once per theme and shared.
+    """
+
+    def __init__(self, visual_theme: str | None = "color"):
+        self.theme, self.palette = _palette_for(visual_theme)
+        self.styles = _style_sheet(self.theme)
+        self._page_count = 0
+        self._show_hints = True
+        self._watermark: str | None = None
+        self._hindi = False
+        self._goal_title = "Today's Learning Goal"
 
     # ──────────────────────────────────────────
     # Main entry point
@@ -710,8 +842,13 @@ class PDFService:
         Returns:
             PDF file as bytes
         """
-        self._show_hints = show_hints
-        self._watermark = watermark
+        # Per-call render context: nothing below touches self or module state
+        render = type(self)(visual_theme=worksheet.get("visual_theme"))
+        render._show_hints = show_hints
+        render._watermark = watermark
+        render._hindi = _is_hindi(worksheet)
+        render._goal_title = _HINDI_LABELS["learning_goal"] if render._hindi else "Today's Learning Goal"
+
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(
             buffer,
@@ -721,51 +858,30 @@ class PDFService:
             topMargin=2.0 * cm,
             bottomMargin=2.0 * cm,
             pageCompression=1,
+            # Fixed creation date / document ID: same input → same bytes (content-hash caching, tests)
+            invariant=1,
         )
 
-        # Store worksheet metadata for header/footer callbacks
-        self._current_worksheet = worksheet
-        self._page_count = 0
-        self._hindi = _is_hindi(worksheet)
-        self._goal_title = _HINDI_LABELS["learning_goal"] if self._hindi else "Today's Learning Goal"
-
         story = []
         questions = worksheet.get("questions", [])
 
-        # Switch colour palette based on visual_theme
-        global _PRIMARY, _ACCENT, _LIGHT_BG
-        _theme = (worksheet.get("visual_theme") or "color").lower()
-        if _theme == "black_and_white":
-            _PRIMARY = colors.Color(0.1, 0.1, 0.1)
-            _ACCENT = colors.Color(0.3, 0.3, 0.3)
-            _LIGHT_BG = colors.white
-        elif _theme == "minimal":
-            _PRIMARY = colors.Color(0.2, 0.2, 0.2)
-            _ACCENT = colors.Color(0.4, 0.4, 0.4)
-            _LIGHT_BG = colors.white
-        else:
-            # Restore Skolar brand defaults in case a prior call changed them
-            _PRIMARY = colors.HexColor("#1E1B4B")
-            _ACCENT = colors.HexColor("#F97316")
-            _LIGHT_BG = colors.HexColor("#F8FAFC")
-
         # Compute display order once — tier-sorted (Foundation → Application →
         # Stretch), bonus last.  Both _build_questions and _build_answer_key
         # must iterate the *same* list so Q-numbers stay in sync.
         display_questions = _flatten_tier_order(questions)
 
         if pdf_type == "answer_key":
-            self._build_answer_key(story, worksheet, display_questions)
+            render._build_answer_key(story, worksheet, display_questions)
         else:
-            self._build_questions(story, worksheet, display_questions)
+            render._build_questions(story, worksheet, display_questions)
             if pdf_type == "full" and display_questions:
                 story.append(PageBreak())
-                self._build_answer_key(story, worksheet, display_questions)
+                render._build_answer_key(story, worksheet, display_questions)
 
         doc.build(
             story,
-            onFirstPage=self._draw_page_furniture,
-            onLaterPages=self._draw_page_furniture,
+            onFirstPage=render._draw_page_furniture,
+            onLaterPages=render._draw_page_furniture,
         )
         buffer.seek(0)
         pdf_bytes = buffer.getvalue()
@@ -798,7 +914,7 @@ class PDFService:
         self._page_count += 1
 
         # ── Watermark (drawn first, behind content) ──
-        watermark = getattr(self, "_watermark", None)
+        watermark = self._watermark
         if watermark:
             canvas.saveState()
             canvas.setFont(FONT_BOLD, 54)
@@ -809,7 +925,7 @@ class PDFService:
             canvas.restoreState()
 
         # ── Top rule line ──
-        canvas.setStrokeColor(_PRIMARY)
+        canvas.setStrokeColor(self.palette.primary)
         canvas.setLineWidth(1.5)
         canvas.line(2.0 * cm, page_height - 1.6 * cm, page_width - 2.0 * cm, page_height - 1.6 * cm)
 
@@ -956,7 +1072,7 @@ class PDFService:
         for tier_key, tier_label, tier_desc, tier_qs in tiers:
             if tier_label:
                 stars = _TIER_STARS.get(tier_key, "")
-                tier_color = _TIER_COLORS_BY_KEY.get(tier_key, _PRIMARY)
+                tier_color = _TIER_COLORS_BY_KEY.get(tier_key, self.palette.primary)
                 # Colored indicator line before tier header
                 story.append(
                     HRFlowable(
@@ -988,7 +1104,7 @@ class PDFService:
                 HRFlowable(
                     width="100%",
                     thickness=1.0,
-                    color=_ACCENT,
+                    color=self.palette.accent,
                     spaceBefore=4,
                     spaceAfter=8,
                 )
@@ -2124,8 +2240,8 @@ class PDFService:
         if q_type != "vertical_sum":
             elements.append(
                 Paragraph(
-                    f"<b><font color='#{_PRIMARY.hexval()[2:]}'>{number}.</font></b>"
-                    f"<font size='7' color='#{_ACCENT.hexval()[2:]}'>{star_badge}</font>"
+                    f"<b><font color='#{self.palette.primary.hexval()[2:]}'>{number}.</font></b>"
+                    f"<font size='7' color='#{self.palette.accent.hexval()[2:]}'>{star_badge}</font>"
                     f"{diff_label}  {q_text}",
                     self.styles["QuestionText"],
                 )
@@ -2134,20 +2250,19 @@ class PDFService:
         # ── Cartoon images (EVS/Science) — horizontal row, max 2 ─────────────
         raw_images = question.get("images", []) or []
         if raw_images:
-            import os
-
             from reportlab.platypus import Image as RLImage
 
+            from app.services.image_assets import get_print_asset
+
             img_cells = []
             for img in raw_images[:2]:
                 img_path = img.get("path", "")
-                local_path = os.path.join(
-                    os.path.dirname(os.path.dirname(__file__)), "data", "images", img_path.removeprefix("/images/")
-                )
-                if os.path.exists(local_path):
+                # Pre-flattened, print-sized JPEG prepared once per image (see image_assets)
+                asset = get_print_asset(img_path)
+                if asset is not None:
                     try:
-                        flat_path = _flatten_image_alpha(local_path)
-                        img_cells.append(RLImage(flat_path, width=1.8 * cm, height=1.8 * cm, kind="proportional"))
+                        w, h = asset.fit(1.8 * cm, 1.8 * cm)
+                        img_cells.append(RLImage(asset.path, width=w, height=h))
                     except Exception as e:
                         logger.warning("Failed to embed image %s in PDF: %s", img_path, e)
 
@@ -2192,7 +2307,7 @@ class PDFService:
                 letter = chr(65 + j)
                 elements.append(
                     Paragraph(
-                        f"<font color='#{_PRIMARY.hexval()[2:]}'>{letter})</font>  {_sanitize_text(str(option))}",
+                        f"<font color='#{self.palette.primary.hexval()[2:]}'>{letter})</font>  {_sanitize_text(str(option))}",
                         self.styles["OptionText"],
                     )
                 )
@@ -2205,7 +2320,7 @@ class PDFService:
                 letter = chr(65 + j)
                 elements.append(
                     Paragraph(
-                        f"<font color='#{_PRIMARY.hexval()[2:]}'>{letter})</font>  ______________________________",
+                        f"<font color='#{self.palette.primary.hexval()[2:]}'>{letter})</font>  ______________________________",
                         self.styles["OptionText"],
                     )
                 )
@@ -2218,8 +2333,8 @@ class PDFService:
                 r"(\d+)\s*([+\-\u00d7\u00f7x])\s*(\d+)",
                 q_text,
             )
-            _px = _PRIMARY.hexval()[2:]
-            _ac = _ACCENT.hexval()[2:]
+            _px = self.palette.primary.hexval()[2:]
+            _ac = self.palette.accent.hexval()[2:]
             if _vs_match:
                 _a = _vs_match.group(1)
                 _op = _vs_match.group(2)
@@ -2300,7 +2415,7 @@ class PDFService:
             elements.append(Spacer(1, 6))
 
         elif q_type == "true_false":
-            _px = _PRIMARY.hexval()[2:]
+            _px = self.palette.primary.hexval()[2:]
             _true = _HINDI_LABELS["true"] if self._hindi else "True"
             _false = _HINDI_LABELS["false"] if self._hindi else "False"
             elements.append(Paragraph(f"<font color='#{_px}'>A)</font>  {_true}", self.styles["OptionText"]))
@@ -2383,7 +2498,8 @@ class PDFService:
 
         # Question text paragraph
         q_para = Paragraph(
-            f"<b><font color='#{_ACCENT.hexval()[2:]}'>BONUS:</font></b>  {q_text}", self.styles["QuestionText"]
+            f"<b><font color='#{self.palette.accent.hexval()[2:]}'>BONUS:</font></b>  {q_text}",
+            self.styles["QuestionText"],
         )
 
         # Three answer lines
@@ -2408,7 +2524,7 @@ class PDFService:
         box_table.setStyle(
             TableStyle(
                 [
-                    ("BOX", (0, 0), (-1, -1), 1.2, _ACCENT),
+                    ("BOX", (0, 0), (-1, -1), 1.2, self.palette.accent),
                     ("BACKGROUND", (0, 0), (-1, -1), colors.Color(1.0, 0.97, 0.88)),
                     ("TOPPADDING", (0, 0), (-1, -1), 8),
                     ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
@@ -2431,7 +2547,7 @@ class PDFService:
             HRFlowable(
                 width="100%",
                 thickness=2.0,
-                color=_PRIMARY,
+                color=self.palette.primary,
                 spaceBefore=6,
                 spaceAfter=8,
             )
@@ -2445,7 +2561,7 @@ class PDFService:
             HRFlowable(
                 width="100%",
                 thickness=0.5,
-                color=_PRIMARY,
+                color=self.palette.primary,
                 spaceBefore=2,
                 spaceAfter=14,
             )
@@ -2549,7 +2665,10 @@ class PDFService:
                         ("LEFTPADDING", (0, 0), (-1, -1), 6),
                         ("GRID", (0, 0), (-1, -1), 0.4, _RULE),
                         # Alternate row shading
-                        *[("BACKGROUND", (0, r), (-1, r), _LIGHT_BG) for r in range(0, len(answer_data), 2)],
+                        *[
+                            ("BACKGROUND", (0, r), (-1, r), self.palette.light_bg)
+                            for r in range(0, len(answer_data), 2)
+                        ],
                     ]
                 )
             )
@@ -2640,5 +2759,12 @@ class PDFService:
         story.append(Paragraph(badge_text, self.styles["VerificationFooter"]))
 
 
+_pdf_service: PDFService | None = None
+
+
 def get_pdf_service() -> PDFService:
-    return PDFService()
+    """Shared PDFService — safe to use from many threads (see PDFService)."""
+    global _pdf_service
+    if _pdf_service is None:
+        _pdf_service = PDFService()
+    return _pdf_service
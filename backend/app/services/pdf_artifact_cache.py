@@ -0,0 +1,328 @@
+"""
+Rendered-PDF artifact cache for /api/worksheets/export-pdf.
+
+The same saved worksheet is exported over and over — student copy, answer
+key, full, once per parent opening a share link — and every export used to
+re-score and re-render it from scratch. Rendered PDFs are now stored under
+a key derived from everything that changes the output:
+
+    sha256(canonical worksheet JSON, pdf_type, visual_theme, watermark)
+
+Storage tiers:
+
+  - ``LocalDiskStore`` — files under ``PDF_ARTIFACT_DIR``, shared by every
+    uvicorn worker on the host. Hits bump the file mtime; once the directory
+    grows past ``PDF_ARTIFACT_MAX_MB`` the least recently used files are
+    deleted. Usage is recomputed from the directory on every write, so the
+    cap holds across workers. Hits are served straight from disk as a
+    FileResponse (sendfile / ASGI pathsend where the server supports it) —
+    the PDF never passes through Python memory. A hit is served from a
+    pinned hard link that eviction never deletes, so evicting the entry
+    mid-response cannot break the download.
+  - ``ObjectStore`` — optional shared tier behind the disk (Supabase Storage
+    via ``PDF_ARTIFACT_BUCKET``, or any implementation of the interface).
+    A local miss that hits the object store is copied to disk and served.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger("skolar.pdf_artifacts")
+
+ENABLED = os.getenv("PDF_ARTIFACT_CACHE", "1") == "1"
+ARTIFACT_DIR = os.getenv("PDF_ARTIFACT_DIR", "") or os.path.join(tempfile.gettempdir(), "skolar-pdf-artifacts")
+MAX_BYTES = int(float(os.getenv("PDF_ARTIFACT_MAX_MB", "512")) * 1024 * 1024)
+BUCKET = os.getenv("PDF_ARTIFACT_BUCKET", "")
+
+# Bump when the renderers change output for identical input (templates, fonts, layout)
+_KEY_VERSION = 2
+
+# Eviction trims the directory to this fraction of MAX_BYTES so it doesn't run on every put
+_EVICT_TO = 0.9
+
+# Pins (hard links handed out by lookups) that were never released are pruned after this long
+PIN_TTL_S = 3600
+_PIN_DIR = "pinned"
+
+
+def artifact_key(worksheet: dict, pdf_type: str, visual_theme: str | None, watermark: str | None) -> str:
+    """Content hash of everything that determines the rendered PDF."""
+    payload = {
+        "v": _KEY_VERSION,
+        "worksheet": worksheet,
+        "pdf_type": pdf_type,
+        "visual_theme": visual_theme or "color",
+        "watermark": watermark,
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+# -- Object store tier ---------------------------------------------------------
+
+
+class ObjectStore(ABC):
+    """Shared blob tier behind the local disk (S3, GCS, Supabase Storage, ...)."""
+
+    name = "abstract"
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> None: ...
+
+
+class SupabaseStorageStore(ObjectStore):
+    """Artifacts as objects in a Supabase Storage bucket."""
+
+    name = "supabase"
+
+    def __init__(self, client: Any, bucket: str, prefix: str = "pdf-artifacts/"):
+        self._client = client
+        self._bucket = bucket
+        self._prefix = prefix
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return self._client.storage.from_(self._bucket).download(f"{self._prefix}{key}.pdf")
+        except Exception:
+            # storage3 raises on 404 — a missing object is just a miss
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        self._client.storage.from_(self._bucket).upload(
+            f"{self._prefix}{key}.pdf",
+            data,
+            {"content-type": "application/pdf", "upsert": "true"},
+        )
+
+
+# -- Local disk tier -----------------------------------------------------------
+
+
+class LocalDiskStore:
+    """Size-bounded directory of PDFs with mtime-based LRU eviction.
+
+    The directory itself is the index, so several worker processes can share
+    it: writes are atomic renames and every write rescans the directory.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._pins = self.directory / _PIN_DIR
+        self._pins.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._bytes = sum(size for _, size, _ in self._scan())
+        self.evictions = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.pdf"
+
+    def _scan(self) -> list[tuple[Path, int, float]]:
+        entries = []
+        for path in self.directory.glob("*/*.pdf"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((path, st.st_size, st.st_mtime))
+        return entries
+
+    def get(self, key: str) -> Path | None:
+        path = self._path(key)
+        try:
+            # Touch: mtime is the LRU clock (atime is unreliable on noatime mounts)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def pin(self, key: str) -> Path | None:
+        """Touch the entry for *key* and return a hard link to it that eviction never deletes.
+
+        Serve from the link, then unpin() it. Links left behind are pruned
+        after PIN_TTL_S.
+        """
+        path = self.get(key)
+        if path is None:
+            return None
+        pinned = self._pins / f"{key}-{uuid.uuid4().hex[:12]}.pin"
+        try:
+            os.link(path, pinned)
+        except FileNotFoundError:
+            return None  # evicted since the touch
+        except OSError:
+            return path  # no hard links on this filesystem — serve unpinned
+        return pinned
+
+    def unpin(self, path: Path) -> None:
+        if path.parent == self._pins:
+            path.unlink(missing_ok=True)
+
+    def put(self, key: str, data: bytes) -> Path:
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._evict()
+        return path
+
+    def _evict(self) -> None:
+        """Recompute usage from the directory (other workers write to it too) and trim it if over."""
+        with self._lock:
+            entries = sorted(self._scan(), key=lambda e: e[2])
+            total = sum(size for _, size, _ in entries)
+            if total > self.max_bytes:
+                target = self.max_bytes * _EVICT_TO
+                for path, size, _ in entries:
+                    if total <= target:
+                        break
+                    path.unlink(missing_ok=True)
+                    total -= size
+                    self.evictions += 1
+            self._bytes = total
+            self._prune_pins()
+
+    def _prune_pins(self) -> None:
+        cutoff = time.time() - PIN_TTL_S
+        for path in self._pins.glob("*.pin"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+            except FileNotFoundError:
+                continue
+
+    def clear(self) -> None:
+        with self._lock:
+            for path, _, _ in self._scan():
+                path.unlink(missing_ok=True)
+            self._bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+
+# -- Store ---------------------------------------------------------------------
+
+
+class PDFArtifactStore:
+    """Local disk in front of an optional object store."""
+
+    def __init__(self, local: LocalDiskStore, remote: ObjectStore | None = None):
+        self.local = local
+        self.remote = remote
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "remote_hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+    def lookup(self, key: str) -> Path | None:
+        """Pinned path of the cached PDF for *key*, or None. Blocking — call from a thread.
+
+        The file stays readable until release(path), even if eviction removes
+        the entry meanwhile.
+        """
+        path = self.local.pin(key)
+        if path is not None:
+            self._count("hits")
+            return path
+        if self.remote is not None:
+            try:
+                data = self.remote.get(key)
+                if data:
+                    self.local.put(key, data)
+                    path = self.local.pin(key)
+                    if path is not None:
+                        self._count("remote_hits")
+                        return path
+            except Exception as e:
+                self._count("errors")
+                logger.warning("pdf_artifact_remote_get_failed", backend=self.remote.name, error=str(e))
+        self._count("misses")
+        return None
+
+    def release(self, path: Path) -> None:
+        """Drop the pin on a path returned by lookup() once it has been served."""
+        self.local.unpin(path)
+
+    def store(self, key: str, data: bytes) -> None:
+        """Save a freshly rendered PDF. Failures are logged, never raised."""
+        try:
+            self.local.put(key, data)
+            if self.remote is not None:
+                self.remote.put(key, data)
+            self._count("stores")
+        except Exception as e:
+            self._count("errors")
+            logger.warning("pdf_artifact_store_failed", error=str(e))
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["remote_hits"] + self._stats["misses"]
+            served = self._stats["hits"] + self._stats["remote_hits"]
+            return {
+                **self._stats,
+                "hit_rate": round(served / lookups, 4) if lookups else 0.0,
+                "evictions": self.local.evictions,
+                "size_mb": round(self.local.size_bytes / (1024 * 1024), 2),
+                "max_mb": round(self.local.max_bytes / (1024 * 1024), 2),
+                "remote": self.remote.name if self.remote is not None else None,
+            }
+
+
+# -- Singleton -----------------------------------------------------------------
+
+_store: PDFArtifactStore | None = None
+_store_lock = threading.Lock()
+_store_failed_at: float | None = None
+
+
+def get_pdf_artifact_store() -> PDFArtifactStore | None:
+    """Process-wide artifact store, or None when disabled or the directory is unusable."""
+    global _store, _store_failed_at
+    if not ENABLED:
+        return None
+    if _store is None:
+        with _store_lock:
+            # Don't retry a broken directory on every export
+            if _store is None and (_store_failed_at is None or time.monotonic() - _store_failed_at > 60):
+                try:
+                    remote = None
+                    if BUCKET:
+                        from app.core.deps import get_supabase_client
+
+                        remote = SupabaseStorageStore(get_supabase_client(), BUCKET)
+                    _store = PDFArtifactStore(LocalDiskStore(ARTIFACT_DIR), remote)
+                    logger.info("pdf_artifact_store_ready", directory=ARTIFACT_DIR, remote=BUCKET or None)
+                except Exception as e:
+                    _store_failed_at = time.monotonic()
+                    logger.error("pdf_artifact_store_init_failed", directory=ARTIFACT_DIR, error=str(e))
+    return _store
+
+
+def pdf_artifact_stats() -> dict | None:
+    """Counters for /health/deep; None until the store is first used."""
+    return _store.stats() if _store is not None else None
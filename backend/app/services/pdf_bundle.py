@@ -0,0 +1,171 @@
+"""
+Bulk PDF export: bounded concurrent rendering into a streamed ZIP or one merged PDF.
+
+A teacher exporting a class set used to fire one POST /export-pdf per
+worksheet. The bulk endpoint renders the whole set in one request:
+
+  - ``render_bounded`` runs at most *concurrency* renders at a time and
+    yields results in completion order, so only that many PDFs are ever
+    held in memory.
+  - ``stream_zip`` writes each finished PDF into a ZIP on the fly and yields
+    the bytes as they are produced. The client starts downloading after the
+    first worksheet, and a finished PDF is dropped once it is in the ZIP.
+    Entries are STORED because PDFs are already compressed.
+  - ``merge_pdfs`` concatenates spooled PDF files on disk into one document
+    (the "print the whole class set" case). The output is a temp file that
+    the route streams from disk.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import zipfile
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+import structlog
+
+logger = structlog.get_logger("skolar.pdf_bundle")
+
+# Copy buffer for entries that come from the artifact cache as files
+_CHUNK = 256 * 1024
+
+
+@dataclass
+class BundleJob:
+    """One PDF in the bundle."""
+
+    name: str  # file name inside the ZIP
+    worksheet: dict
+    pdf_type: str
+
+
+@dataclass
+class BundleResult:
+    job: BundleJob
+    pdf: bytes | Path | None = None  # bytes when freshly rendered, Path on a cache hit
+    error: str | None = None
+
+
+async def render_bounded(
+    jobs: Iterable[BundleJob],
+    render: Callable[[BundleJob], Awaitable[bytes | Path]],
+    concurrency: int,
+) -> AsyncIterator[BundleResult]:
+    """Render *jobs* with at most *concurrency* in flight; yield in completion order.
+
+    A failed render is yielded as a result with ``error`` set, never raised, so
+    one bad worksheet does not abort a class-sized export.
+    """
+    pending_jobs = iter(jobs)
+    running: dict[asyncio.Task, BundleJob] = {}
+
+    def _fill() -> None:
+        while len(running) < max(1, concurrency):
+            job = next(pending_jobs, None)
+            if job is None:
+                return
+            running[asyncio.ensure_future(render(job))] = job
+
+    _fill()
+    try:
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                job = running.pop(task)
+                exc = task.exception()
+                if exc is not None:
+                    logger.warning("bulk_pdf_render_failed", name=job.name, error=str(exc))
+                    yield BundleResult(job, error=f"{type(exc).__name__}: {exc}")
+                else:
+                    yield BundleResult(job, pdf=task.result())
+            _fill()
+    finally:
+        # Client disconnected mid-stream — stop the renders nobody will read
+        for task in running:
+            task.cancel()
+
+
+class _ChunkSink:
+    """Write-only, unseekable file object that collects what ZipFile writes."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._offset = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _write_entry(zf: zipfile.ZipFile, name: str, pdf: bytes | Path) -> None:
+    info = zipfile.ZipInfo(name)
+    info.compress_type = zipfile.ZIP_STORED
+    with zf.open(info, "w") as entry:
+        if isinstance(pdf, Path):
+            with pdf.open("rb") as src:
+                while chunk := src.read(_CHUNK):
+                    entry.write(chunk)
+        else:
+            entry.write(pdf)
+
+
+async def stream_zip(results: AsyncIterator[BundleResult]) -> AsyncIterator[bytes]:
+    """Yield a ZIP archive built from *results* as each one arrives.
+
+    Failed renders are listed in an ``errors.txt`` entry at the end, because
+    the response status has already been sent by then.
+    """
+    sink = _ChunkSink()
+    zf = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED)
+    errors: list[str] = []
+    async for result in results:
+        if result.error is not None:
+            errors.append(f"{result.job.name}: {result.error}")
+            continue
+        await asyncio.to_thread(_write_entry, zf, result.job.name, result.pdf)
+        yield sink.drain()
+    if errors:
+        zf.writestr("errors.txt", "\n".join(errors) + "\n")
+    zf.close()
+    yield sink.drain()
+
+
+def merge_pdfs(parts: list[Path], out_path: Path, password: str | None = None) -> int:
+    """Concatenate *parts* into *out_path*; return the page count. Blocking.
+
+    Parts encrypted with *password* (per-user answer keys from the ReportLab
+    fallback) are decrypted for merging. If any part was encrypted, the
+    merged file is encrypted with the same password.
+    """
+    from PyPDF2 import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    encrypted = False
+    for part in parts:
+        reader = PdfReader(str(part))
+        if reader.is_encrypted:
+            if password is None:
+                raise ValueError(f"{part.name} is encrypted")
+            reader.decrypt(password)
+            encrypted = True
+        for page in reader.pages:
+            writer.add_page(page)
+    if encrypted:
+        writer.encrypt(password)
+    with out_path.open("wb") as f:
+        writer.write(f)
+    return len(writer.pages)
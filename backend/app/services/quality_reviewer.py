@@ -63,11 +63,13 @@ import logging
 import operator
 import random
 import re
+from collections.abc import Collection
 from dataclasses import dataclass, field
 from fractions import Fraction
 from pathlib import Path
 from typing import Optional
 
+from app.services.question_analysis import analyze_text, answer_verdict
 from app.services.topic_intelligence import GenerationContext
 
 # ---------------------------------------------------------------------------
@@ -663,7 +665,6 @@ def _contains_llm_artifact(text: str) -> bool:
 # ---------------------------------------------------------------------------
 
 _LATIN_IN_DEVANAGARI_RE = re.compile(r"[a-zA-Z]{2,}")
-_DEVANAGARI_CHAR_RE = re.compile(r"[\u0900-\u097F]")
 
 # Legitimate English abbreviations/units that may appear in Hindi text.
 # These should NOT trigger code-mixing detection.
@@ -1022,8 +1023,8 @@ def _has_hindi_code_mixing(text: str) -> bool:
 
     Legitimate abbreviations/units in _HINDI_ENGLISH_ALLOWLIST are excluded.
     """
-    if not _DEVANAGARI_CHAR_RE.search(text):
-        return False  # Not Hindi text — skip
+    if analyze_text(text).script != "mixed":
+        return False  # Not Hindi text, or no Latin letters to flag
     matches = _LATIN_IN_DEVANAGARI_RE.findall(text)
     non_allowed = [m for m in matches if m not in _HINDI_ENGLISH_ALLOWLIST]
     return bool(non_allowed)
@@ -1031,7 +1032,7 @@ def _has_hindi_code_mixing(text: str) -> bool:
 
 def _has_hindi_transliteration(text: str) -> bool:
     """Return True if Hindi text contains Devanagari-transliterated English words."""
-    if not _DEVANAGARI_CHAR_RE.search(text):
+    if analyze_text(text).script not in ("devanagari", "mixed"):
         return False
     # Extract Devanagari word sequences (handles punctuation like "सन," or "बॉल।")
     words = set(re.findall(r"[\u0900-\u097F]+", text))
@@ -1199,6 +1200,7 @@ class QualityReviewerAgent:
         self,
         questions: list,
         context: GenerationContext,
+        reviewed: Collection[int] = (),
     ) -> ReviewResult:
         """
         Review and auto-correct the question list.
@@ -1207,15 +1209,19 @@ class QualityReviewerAgent:
             questions:  List of question dicts as produced by generate_all_questions().
             context:    GenerationContext from TopicIntelligenceAgent — provides
                         grade, subject, and valid_skill_tags.
+            reviewed:   Indices of questions already reviewed (e.g. the ones kept
+                        by a partial retry). They are left untouched, but still
+                        count towards worksheet-level targets (CHECK 11, 12).
 
         Returns:
             ReviewResult with corrected questions and structured logs.
         """
         result = ReviewResult(questions=list(questions))
+        pending = [q for i, q in enumerate(result.questions) if i not in reviewed]
         is_maths = context.subject.lower() in ("maths", "mathematics", "math")
 
         # P2-B: Unconditional filler stripping (before word-count check)
-        for q in result.questions:
+        for q in pending:
             qt = q.get("question_text", q.get("text", ""))
             cleaned = _strip_filler_phrases(qt)
             # Only update if filler was actually removed (ignore whitespace-only diffs)
@@ -1224,7 +1230,7 @@ class QualityReviewerAgent:
                 q["text"] = cleaned
                 result.corrections.append(f"Q{q.get('id', '?')}: removed filler phrases")
 
-        for q in result.questions:
+        for q in pending:
             q_id = q.get("id", "?")
             slot_type = q.get("slot_type", "")
             question_text = q.get("question_text", "")
@@ -1236,9 +1242,7 @@ class QualityReviewerAgent:
             # If mismatch: sets _answer_mismatch=True (downstream R15 blocks).
             # If extraction fails (Maths only): sets _math_unverified=True.
             try:
-                from app.services.answer_authority import get_answer_authority
-
-                verdict = get_answer_authority().verify_question(q, context.subject)
+                verdict = answer_verdict(q, context.subject)
                 if verdict.match is False:
                     msg = (
                         f"Q{q_id}: answer mismatch — declared '{verdict.declared_answer}', "
@@ -1246,7 +1250,7 @@ class QualityReviewerAgent:
                     )
                     logger.warning("[quality_reviewer] %s", msg)
                     q["_answer_mismatch"] = True
-                    q["_answer_mismatch_debug"] = verdict.debug
+                    q["_answer_mismatch_debug"] = dict(verdict.debug)
                     result.corrections.append(msg)
                 elif is_maths and verdict.match is None and verdict.method not in ("unverifiable", "error_detection"):
                     q["_math_unverified"] = True
@@ -1281,7 +1285,7 @@ class QualityReviewerAgent:
             try:
                 grade = int(context.grade)
                 limit = _word_limit(grade)
-                word_count = len(question_text.split())
+                word_count = analyze_text(question_text).word_count
                 if word_count > limit:
                     ratio = word_count / limit
                     msg = f"Q{q_id}: question has {word_count} words (Grade {grade} limit is {limit})"
@@ -1677,8 +1681,8 @@ class QualityReviewerAgent:
                 r"|सोचो और बताओ\s*:\s*)"
             )
 
-            # Step 1: Strip existing engagement prefixes from ALL questions
-            for q in result.questions:
+            # Step 1: Strip existing engagement prefixes from ALL unreviewed questions
+            for q in pending:
                 q_text = (q.get("text") or q.get("question_text") or "").strip()
                 if not q_text:
                     continue
@@ -1711,7 +1715,7 @@ class QualityReviewerAgent:
                 _rng.shuffle(names_pool)
                 name_idx = 0
                 injected = 0
-                for q in result.questions:
+                for q in pending:
                     if injected >= (target - engagement_count):
                         break
                     q_text = (q.get("text") or q.get("question_text") or "").strip()
@@ -1774,7 +1778,7 @@ class QualityReviewerAgent:
             # Extract numbers from question text
             _ALL_NUMS_RE = re.compile(r"\d+(?:\.\d+)?")
 
-            for q in result.questions:
+            for q in pending:
                 q_type = q.get("type", q.get("slot_type", ""))
                 if q_type not in ("error_detection", "error_spot"):
                     continue
@@ -1893,7 +1897,7 @@ class QualityReviewerAgent:
         # If the LLM hallucinated an answer that isn't one of the options,
         # try to find the correct option from the explanation text.
         try:
-            for q in result.questions:
+            for q in pending:
                 q_type = q.get("type", q.get("slot_type", ""))
                 if q_type != "mcq":
                     continue
@@ -1935,7 +1939,7 @@ class QualityReviewerAgent:
         try:
             from app.utils.answer_normalizer import normalize_numeric
 
-            for q in result.questions:
+            for q in pending:
                 q_type = q.get("type", q.get("slot_type", ""))
                 if q_type != "mcq":
                     continue
@@ -2010,7 +2014,7 @@ class QualityReviewerAgent:
             _true_label = "सही" if _is_hindi_subject else "True"
             _false_label = "गलत" if _is_hindi_subject else "False"
 
-            for q in result.questions:
+            for q in pending:
                 q_type = q.get("type", q.get("slot_type", ""))
                 if q_type != "true_false":
                     continue
@@ -2064,7 +2068,7 @@ class QualityReviewerAgent:
         try:
             _BAHUVACHAN_RE = re.compile(r"बहुवचन|plural", re.IGNORECASE)
             _EKVACHAN_RE = re.compile(r"एकवचन|singular", re.IGNORECASE)
-            for q in result.questions:
+            for q in pending:
                 q_text = q.get("text") or q.get("question_text") or ""
                 q_key = "text" if "text" in q else "question_text"
                 # Only check if question explicitly mentions vachan terms
@@ -2175,7 +2179,7 @@ class QualityReviewerAgent:
                         break
                     # Find a question of the dominant type and rewrite to target_type
                     for i, q in enumerate(result.questions):
-                        if q_types[i] != dominant:
+                        if i in reviewed or q_types[i] != dominant:
                             continue
                         text = (q.get("text") or q.get("question_text") or "").strip()
                         rewritten = False
@@ -2213,7 +2217,7 @@ class QualityReviewerAgent:
 
                 _SIMPLE_ARITH_RE = re.compile(r"^.*?(\d+)\s*([+\-×÷xX*/])\s*(\d+)")
                 _round_fixes = 0
-                for q in result.questions:
+                for q in pending:
                     if q.get("_is_bonus") or q.get("_math_unverified"):
                         continue
                     qtype = (q.get("type") or q.get("format") or "").lower()
@@ -2286,7 +2290,7 @@ class QualityReviewerAgent:
 
                 topic_slug = context.topic_slug.lower() if hasattr(context, "topic_slug") and context.topic_slug else ""
 
-                for q in result.questions:
+                for q in pending:
                     q_type = (q.get("type") or q.get("format") or "").lower()
                     if q_type != "word_problem":
                         continue
@@ -21,6 +21,8 @@ import os
 import re
 from dataclasses import dataclass, field
 
+from app.services.question_analysis import analyze_text
+
 logger = logging.getLogger("skolar.quality_scorer")
 
 # ---------------------------------------------------------------------------
@@ -459,7 +461,7 @@ def _run_curriculum_checks(
     word_limit = 15 if grade_num <= 2 else 25
     for q in questions:
         text = q.get("text", q.get("question_text", ""))
-        wc = len(text.split())
+        wc = analyze_text(text).word_count
         if wc > word_limit * 1.5:
             buckets["curriculum"].append(
                 FailureReason(
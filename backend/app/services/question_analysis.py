@@ -0,0 +1,167 @@
+"""
+Shared per-question text analysis for the validators.
+
+A worksheet passes through seven validators (v3 light validator, v3 quality
+gate, quality reviewer, OutputValidator, quality scorer, release gate, utils
+quality gate). Each one used to re-derive the same features from each
+question's text: whitespace word sets for Jaccard, ``\\b\\d+\\b`` numbers,
+clock times, content words, the name/number template and the deep
+sentence-structure template. OutputValidator runs twice, once on its own and
+once inside the quality scorer. The utils gate re-derived times and content
+words for *both* sides of every question pair.
+
+``analyze_text(text)`` returns one ``QuestionAnalysis`` per distinct text.
+It is memoized, so every validator that looks at the same text shares it.
+Eager fields are cheap. Everything else is a ``cached_property`` computed on
+first use, so a validator only pays for the features some validator
+actually reads. Keying on the text, not the question dict, keeps the cache
+correct when the reviewer rewrites a question mid-pipeline: the new text is
+simply a new entry.
+
+``answer_verdict(q, subject)`` memoizes the answer-authority verdict the
+same way, keyed by the fields the verifier reads.
+
+The feature extractors are the validators' own helpers
+(``OutputValidator._make_template``, ``utils.quality_gate.extract_times``,
+…). This module only decides how often they run, so verdicts are unchanged.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+
+from cachetools import LRUCache
+
+ANALYSIS_CACHE_SIZE = 4096
+VERDICT_CACHE_SIZE = 2048
+
+_TOKEN_RE = re.compile(r"\b\w+\b")
+_NUMBER_RE = re.compile(r"\b(\d+)\b")
+_WS_RE = re.compile(r"\s+")
+_DEVANAGARI_RE = re.compile(r"[ऀ-ॿ]")
+_LATIN_RE = re.compile(r"[A-Za-z]")
+
+
+@dataclass(frozen=True)
+class QuestionAnalysis:
+    """Text features of one question, shared by every validator that reads them."""
+
+    text: str
+    words: tuple[str, ...] = field(repr=False)  # text.split()
+    lower_words: frozenset[str] = field(repr=False)  # Jaccard word set
+
+    @property
+    def word_count(self) -> int:
+        return len(self.words)
+
+    @cached_property
+    def normalized(self) -> str:
+        """Lower-cased, stripped, whitespace-collapsed text (exact-duplicate key)."""
+        return _WS_RE.sub(" ", self.text.strip().lower())
+
+    @cached_property
+    def tokens(self) -> frozenset[str]:
+        """Lower-cased ``\\b\\w+\\b`` tokens."""
+        return frozenset(_TOKEN_RE.findall(self.text.lower()))
+
+    @cached_property
+    def numbers(self) -> tuple[str, ...]:
+        """Every standalone integer in the text, in order (repeats kept)."""
+        return tuple(_NUMBER_RE.findall(self.text))
+
+    @cached_property
+    def times(self) -> frozenset[str]:
+        from app.utils.quality_gate import extract_times
+
+        return extract_times(self.text)
+
+    @cached_property
+    def content_words(self) -> frozenset[str]:
+        from app.utils.quality_gate import _content_words
+
+        return _content_words(self.text)
+
+    @cached_property
+    def template(self) -> str:
+        """Name/number/time template of the lower-cased text (near-duplicate key)."""
+        from app.services.output_validator import OutputValidator
+
+        return OutputValidator._make_template(self.text.strip().lower())
+
+    @cached_property
+    def deep_template(self) -> str:
+        """Deep sentence-structure template (names, objects, places, verbs normalized)."""
+        from app.services.output_validator import OutputValidator
+
+        return OutputValidator._make_deep_template(self.text)
+
+    @cached_property
+    def script(self) -> str:
+        """'devanagari', 'latin', 'mixed', or 'none' (no letters of either script)."""
+        has_deva = _DEVANAGARI_RE.search(self.text) is not None
+        has_latin = _LATIN_RE.search(self.text) is not None
+        if has_deva and has_latin:
+            return "mixed"
+        if has_deva:
+            return "devanagari"
+        return "latin" if has_latin else "none"
+
+    def jaccard(self, other: QuestionAnalysis) -> float:
+        """Jaccard similarity of the lower-cased whitespace word sets."""
+        a, b = self.lower_words, other.lower_words
+        if not a or not b:
+            return 0.0
+        return len(a & b) / len(a | b)
+
+
+@lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def analyze_text(text: str) -> QuestionAnalysis:
+    """Shared analysis of *text*. Same text → same object, across validators."""
+    words = tuple(text.split())
+    return QuestionAnalysis(text=text, words=words, lower_words=frozenset(w.lower() for w in words))
+
+
+# -- Answer-authority verdicts ----------------------------------------------------
+
+_verdicts: LRUCache = LRUCache(maxsize=VERDICT_CACHE_SIZE)
+_verdicts_lock = threading.Lock()
+
+
+def _verdict_key(q: dict, subject: str) -> tuple:
+    # Exactly the fields AnswerAuthority.verify_question reads
+    options = q.get("options") or ()
+    return (
+        str(q.get("id", "?")),
+        q.get("slot_type", q.get("type", "")),
+        q.get("question_text", q.get("text", "")),
+        str(q.get("answer", q.get("correct_answer", ""))),
+        tuple(str(o) for o in options) if isinstance(options, (list, tuple)) else str(options),
+        subject.lower(),
+    )
+
+
+def answer_verdict(q: dict, subject: str):
+    """Memoized ``get_answer_authority().verify_question(q, subject)``.
+
+    The verdict is shared; callers must not mutate it (copy ``debug`` first).
+    """
+    from app.services.answer_authority import get_answer_authority
+
+    key = _verdict_key(q, subject)
+    with _verdicts_lock:
+        verdict = _verdicts.get(key)
+    if verdict is None:
+        verdict = get_answer_authority().verify_question(q, subject)
+        with _verdicts_lock:
+            _verdicts[key] = verdict
+    return verdict
+
+
+def clear_analysis_cache() -> None:
+    """Drop every cached analysis and verdict (benchmarks, tests)."""
+    analyze_text.cache_clear()
+    with _verdicts_lock:
+        _verdicts.clear()
@@ -12,18 +12,30 @@ Runs AFTER all 4 agents (topic intelligence → prompt builder → quality revie
 
 All rules are fail-open: a crashing rule counts as failed with its declared
 enforcement level, never blocks the entire gate.
+
+Each rule also declares its cost tier and the GateContext inputs it reads.
+Derived inputs (question texts, their shared analyses, deep templates) are
+memoized on the context, so rules that need the same analysis compute it
+once. run_release_gate has two modes:
+  full — every rule, in registry order; the complete report for audits
+  fast — cheapest rules first, stop at the first blocking failure; for
+         callers that only need the verdict
+Both record per-rule wall time in ReleaseVerdict.rule_timings_ms.
 """
 
 from __future__ import annotations
 
 import logging
 import re
+import time
 from collections import Counter
-from dataclasses import dataclass, field
-from enum import Enum
+from dataclasses import dataclass, field, fields
+from enum import Enum, IntEnum
+from functools import cached_property
 from typing import Any, Callable
 
 from app.core.config import get_settings
+from app.services.question_analysis import analyze_text
 from app.services.trust_policy import (
     FAIL_CLOSED_RULES,
     TrustSeverity,
@@ -48,6 +60,12 @@ class Enforcement(str, Enum):
     STAMP = "stamp"
 
 
+class RuleCost(IntEnum):
+    FIELDS = 0  # question flags / context fields only
+    TEXT = 1  # analyses question text
+    LOOKUP = 2  # consults another service (curriculum graph, parent-block validator)
+
+
 @dataclass
 class RuleResult:
     rule_name: str
@@ -66,6 +84,9 @@ class ReleaseVerdict:
     stamps: dict = field(default_factory=dict)
     block_reasons: list[str] = field(default_factory=list)
     degrade_reasons: list[str] = field(default_factory=list)
+    mode: str = "full"  # "full" | "fast"
+    skipped_rules: list[str] = field(default_factory=list)  # not evaluated (fast mode)
+    rule_timings_ms: dict[str, float] = field(default_factory=dict)
 
 
 @dataclass
@@ -84,6 +105,23 @@ class GateContext:
     gold_standard_mode: bool = False  # stricter enforcement: DEGRADE→BLOCK for R04, R21
     strict_p1: bool = False  # if True, P1 failures block in addition to P0
 
+    # -- Derived inputs, computed on first use and shared by every rule --
+
+    @cached_property
+    def texts(self) -> list[str]:
+        return [q.get("text", q.get("question_text", "")) for q in self.questions]
+
+    @cached_property
+    def analyses(self) -> list:
+        return [analyze_text(t) for t in self.texts]
+
+    @cached_property
+    def deep_templates(self) -> list[str]:
+        return [a.deep_template for a in self.analyses]
+
+
+_CONTEXT_INPUTS = frozenset({f.name for f in fields(GateContext)} | {"texts", "analyses", "deep_templates"})
+
 
 # ---------------------------------------------------------------------------
 # Rule Registry
@@ -93,11 +131,31 @@ RuleFunc = Callable[[GateContext], RuleResult]
 RULE_REGISTRY: list[tuple[str, Enforcement, RuleFunc]] = []
 
 
-def register_rule(name: str, enforcement: Enforcement):
-    """Decorator to register a rule function."""
+@dataclass(frozen=True)
+class RuleSpec:
+    name: str
+    enforcement: Enforcement
+    cost: RuleCost
+    inputs: tuple[str, ...]  # GateContext attributes the rule reads
+
+
+RULE_SPECS: dict[str, RuleSpec] = {}
+
+
+def register_rule(
+    name: str,
+    enforcement: Enforcement,
+    cost: RuleCost = RuleCost.FIELDS,
+    inputs: tuple[str, ...] = ("questions",),
+):
+    """Decorator to register a rule function with its cost tier and inputs."""
+    unknown = set(inputs) - _CONTEXT_INPUTS
+    if unknown:
+        raise ValueError(f"{name}: unknown GateContext inputs {sorted(unknown)}")
 
     def decorator(func: RuleFunc) -> RuleFunc:
         RULE_REGISTRY.append((name, enforcement, func))
+        RULE_SPECS[name] = RuleSpec(name, enforcement, cost, tuple(inputs))
         return func
 
     return decorator
@@ -125,7 +183,7 @@ _NUMBER_RE = re.compile(r"\b\d+\b")
 # ---------------------------------------------------------------------------
 
 
-@register_rule("R01_ARITHMETIC_VERIFIED", Enforcement.BLOCK)
+@register_rule("R01_ARITHMETIC_VERIFIED", Enforcement.BLOCK, inputs=("subject", "questions"))
 def r01_arithmetic_verified(ctx: GateContext) -> RuleResult:
     """Maths: 0 questions may have _math_unverified=True."""
     if ctx.subject.lower() != "maths":
@@ -169,7 +227,7 @@ def r02_known_types_only(ctx: GateContext) -> RuleResult:
 # ---------------------------------------------------------------------------
 
 
-@register_rule("R03_FORMAT_MIX_TOLERANCE", Enforcement.DEGRADE)
+@register_rule("R03_FORMAT_MIX_TOLERANCE", Enforcement.DEGRADE, inputs=("generation_context", "questions"))
 def r03_format_mix_tolerance(ctx: GateContext) -> RuleResult:
     """Max 15pp drift per format category from format_mix target."""
     gc = ctx.generation_context
@@ -205,7 +263,9 @@ def r03_format_mix_tolerance(ctx: GateContext) -> RuleResult:
 # ---------------------------------------------------------------------------
 
 
-@register_rule("R04_CURRICULUM_GROUNDED", Enforcement.DEGRADE)
+@register_rule(
+    "R04_CURRICULUM_GROUNDED", Enforcement.DEGRADE, inputs=("curriculum_available", "warnings", "gold_standard_mode")
+)
 def r04_curriculum_grounded(ctx: GateContext) -> RuleResult:
     """Check curriculum_available flag and warnings for unavailable curriculum."""
     enforcement = Enforcement.BLOCK if ctx.gold_standard_mode else Enforcement.DEGRADE
@@ -232,7 +292,7 @@ def r04_curriculum_grounded(ctx: GateContext) -> RuleResult:
 # ---------------------------------------------------------------------------
 
 
-@register_rule("R05_QUESTION_COUNT_EXACT", Enforcement.BLOCK)
+@register_rule("R05_QUESTION_COUNT_EXACT", Enforcement.BLOCK, inputs=("questions", "num_questions"))
 def r05_question_count_exact(ctx: GateContext) -> RuleResult:
     """Non-bonus count >= requested-1 (for 10+), exact (for <10)."""
     non_bonus = [q for q in ctx.questions if not q.get("_is_bonus")]
@@ -254,7 +314,7 @@ def r05_question_count_exact(ctx: GateContext) -> RuleResult:
 # ---------------------------------------------------------------------------
 
 
-@register_rule("R06_ADAPTIVE_EXPLICIT", Enforcement.STAMP)
+@register_rule("R06_ADAPTIVE_EXPLICIT", Enforcement.STAMP, inputs=("generation_context",))
 def r06_adaptive_explicit(ctx: GateContext) -> RuleResult:
     """Stamp adaptive_fallback and adaptive_source on every worksheet."""
     gc = ctx.generation_context
@@ -275,7 +335,7 @@ def r06_adaptive_explicit(ctx: GateContext) -> RuleResult:
 # ---------------------------------------------------------------------------
 
 
-@register_rule("R07_WORD_PROBLEM_VERIFIED", Enforcement.DEGRADE)
+@register_rule("R07_WORD_PROBLEM_VERIFIED", Enforcement.DEGRADE, RuleCost.TEXT, inputs=("subject", "questions"))
 def r07_word_problem_verified(ctx: GateContext) -> RuleResult:
     """Maths: ≤20% of word problems with 4+ numbers that have answer mismatches."""
     if ctx.subject.lower() != "maths":
@@ -346,7 +406,7 @@ def r08_minimum_quality_bar(ctx: GateContext) -> RuleResult:
 # ---------------------------------------------------------------------------
 
 
-@register_rule("R09_SKILL_TAGS_VALID", Enforcement.DEGRADE)
+@register_rule("R09_SKILL_TAGS_VALID", Enforcement.DEGRADE, inputs=("generation_context", "questions"))
 def r09_skill_tags_valid(ctx: GateContext) -> RuleResult:
     """All tags in valid_skill_tags; no single tag >60% when 3+ available."""
     gc = ctx.generation_context
@@ -413,7 +473,7 @@ _MODERATE_PATTERNS = [
 ]
 
 
-@register_rule("R10_WARNINGS_TRANSPARENT", Enforcement.STAMP)
+@register_rule("R10_WARNINGS_TRANSPARENT", Enforcement.STAMP, inputs=("warnings",))
 def r10_warnings_transparent(ctx: GateContext) -> RuleResult:
     """Classify warnings → stamp quality_tier and severity_score."""
     crit = mod = info = 0
@@ -453,7 +513,7 @@ def r10_warnings_transparent(ctx: GateContext) -> RuleResult:
 # ---------------------------------------------------------------------------
 
 
-@register_rule("R11_TOPIC_DRIFT_GUARD", Enforcement.DEGRADE)
+@register_rule("R11_TOPIC_DRIFT_GUARD", Enforcement.DEGRADE, inputs=("warnings",))
 def r11_topic_drift_guard(ctx: GateContext) -> RuleResult:
     """Degrade if >50% of questions appear off-topic based on warnings."""
     import re as _re
@@ -486,18 +546,15 @@ def r11_topic_drift_guard(ctx: GateContext) -> RuleResult:
 # ---------------------------------------------------------------------------
 
 
-@register_rule("R12_ROUND_NUMBER_GUARD", Enforcement.DEGRADE)
+@register_rule("R12_ROUND_NUMBER_GUARD", Enforcement.DEGRADE, RuleCost.TEXT, inputs=("subject", "analyses"))
 def r12_round_number_guard(ctx: GateContext) -> RuleResult:
     """Degrade if >40% of numbers are round (multiples of 5/10). Only for Maths."""
-    import re as _re
-
     if ctx.subject.lower() not in ("maths", "mathematics", "math"):
         return RuleResult("R12_ROUND_NUMBER_GUARD", True, Enforcement.DEGRADE, "Non-maths — skipped")
 
     all_nums: list[int] = []
-    for q in ctx.questions:
-        text = q.get("text", q.get("question_text", ""))
-        for n_str in _re.findall(r"\b(\d+)\b", text):
+    for analysis in ctx.analyses:
+        for n_str in analysis.numbers:
             n = int(n_str)
             if n > 1:
                 all_nums.append(n)
@@ -523,7 +580,7 @@ def r12_round_number_guard(ctx: GateContext) -> RuleResult:
 # ---------------------------------------------------------------------------
 
 
-@register_rule("R13_SENTENCE_STRUCTURE_GUARD", Enforcement.DEGRADE)
+@register_rule("R13_SENTENCE_STRUCTURE_GUARD", Enforcement.DEGRADE, RuleCost.TEXT, inputs=("texts",))
 def r13_sentence_structure_guard(ctx: GateContext) -> RuleResult:
     """Degrade if sentence structure diversity is too low (≥5 questions)."""
     if len(ctx.questions) < 5:
@@ -539,8 +596,8 @@ def r13_sentence_structure_guard(ctx: GateContext) -> RuleResult:
     _cond = _re.compile(r"(?i)^(if|suppose|imagine|given)\b")
 
     types: set[str] = set()
-    for q in ctx.questions:
-        text = q.get("text", q.get("question_text", "")).strip()
+    for text in ctx.texts:
+        text = text.strip()
         if _qw.match(text):
             types.add("question_word")
         elif _imp.match(text):
@@ -567,17 +624,13 @@ def r13_sentence_structure_guard(ctx: GateContext) -> RuleResult:
 # ---------------------------------------------------------------------------
 
 
-@register_rule("R14_SENTENCE_DIVERSITY_GUARD", Enforcement.BLOCK)
+@register_rule("R14_SENTENCE_DIVERSITY_GUARD", Enforcement.BLOCK, RuleCost.TEXT, inputs=("deep_templates",))
 def r14_sentence_diversity_guard(ctx: GateContext) -> RuleResult:
     """Block if deep sentence-structure diversity is critically low (≥5 questions)."""
     if len(ctx.questions) < 5:
         return RuleResult("R14_SENTENCE_DIVERSITY_GUARD", True, Enforcement.BLOCK, "Too few questions")
 
-    from app.services.output_validator import OutputValidator
-
-    deep_templates = [
-        OutputValidator._make_deep_template(q.get("text", q.get("question_text", ""))) for q in ctx.questions
-    ]
+    deep_templates = ctx.deep_templates
     unique_count = len(set(deep_templates))
     diversity_score = unique_count / len(deep_templates)
 
@@ -651,7 +704,7 @@ _BANNED_MCQ_PHRASES = frozenset(
 )
 
 
-@register_rule("R16_MCQ_QUALITY_GUARD", Enforcement.BLOCK)
+@register_rule("R16_MCQ_QUALITY_GUARD", Enforcement.BLOCK, inputs=("questions", "grade_num"))
 def r16_mcq_quality_guard(ctx: GateContext) -> RuleResult:
     """Block (Class 1-3) or degrade (4-5) if MCQ has banned meta-options."""
     offending = []
@@ -688,7 +741,7 @@ def r16_mcq_quality_guard(ctx: GateContext) -> RuleResult:
 _HINDI_IMPURITY_BLOCK_THRESHOLD = 0.3  # >30% impure → BLOCK
 
 
-@register_rule("R17_HINDI_SCRIPT_PURITY", Enforcement.BLOCK)
+@register_rule("R17_HINDI_SCRIPT_PURITY", Enforcement.BLOCK, inputs=("questions", "subject"))
 def r17_hindi_script_purity(ctx: GateContext) -> RuleResult:
     """Block Hindi worksheets only when impurity exceeds threshold."""
     impure = [q for q in ctx.questions if q.get("_hindi_impure")]
@@ -736,7 +789,7 @@ def r18_fill_blank_ambiguity(ctx: GateContext) -> RuleResult:
 # ---------------------------------------------------------------------------
 
 
-@register_rule("R19_CURRICULUM_DEPTH", Enforcement.STAMP)
+@register_rule("R19_CURRICULUM_DEPTH", Enforcement.STAMP, RuleCost.LOOKUP, inputs=("grade_level", "subject", "topic"))
 def r19_curriculum_depth(ctx: GateContext) -> RuleResult:
     """Stamp curriculum_depth based on curriculum graph coverage."""
     try:
@@ -767,7 +820,7 @@ def r19_curriculum_depth(ctx: GateContext) -> RuleResult:
 # ---------------------------------------------------------------------------
 
 
-@register_rule("R20_RENDER_INTEGRITY", Enforcement.DEGRADE)
+@register_rule("R20_RENDER_INTEGRITY", Enforcement.DEGRADE, inputs=("questions", "grade_num"))
 def r20_render_integrity(ctx: GateContext) -> RuleResult:
     """Degrade if phantom visual references found; block for Class 1-2."""
     phantom_count = sum(1 for q in ctx.questions if q.get("_phantom_visual_ref"))
@@ -788,7 +841,9 @@ def r20_render_integrity(ctx: GateContext) -> RuleResult:
 # ---------------------------------------------------------------------------
 
 
-@register_rule("R21_PARENT_CONFIDENCE", Enforcement.DEGRADE)
+@register_rule(
+    "R21_PARENT_CONFIDENCE", Enforcement.DEGRADE, RuleCost.LOOKUP, inputs=("worksheet_meta", "gold_standard_mode")
+)
 def r21_parent_confidence(ctx: GateContext) -> RuleResult:
     """Degrade if parent confidence blocks are missing or generic."""
     from app.services.quality_reviewer import validate_parent_blocks
@@ -868,7 +923,7 @@ def r23_answer_key_complete(ctx: GateContext) -> RuleResult:
     )
 
 
-@register_rule("R24_MINIMUM_QUALITY_SCORE", Enforcement.BLOCK)
+@register_rule("R24_MINIMUM_QUALITY_SCORE", Enforcement.BLOCK, inputs=("worksheet_meta",))
 def r24_minimum_quality_score(ctx: GateContext) -> RuleResult:
     """Block worksheets below minimum quality threshold.
 
@@ -931,13 +986,22 @@ def run_release_gate(
     worksheet_meta: dict | None = None,
     gold_standard_mode: bool = False,
     strict_p1: bool | None = None,
+    mode: str = "full",
 ) -> ReleaseVerdict:
     """
-    Run all registered rules and produce a ReleaseVerdict.
+    Run the registered rules and produce a ReleaseVerdict.
+
+    mode="full" runs every rule in registry order. mode="fast" runs rules
+    cheapest-first and stops at the first blocking failure: the verdict is
+    the same as in full mode, but rule_results, failed_rules, stamps and
+    reasons only cover the rules that ran (the rest are in skipped_rules).
 
     Returns:
         ReleaseVerdict with verdict in {"released", "best_effort", "blocked"}.
     """
+    if mode not in ("full", "fast"):
+        raise ValueError(f"Unknown release gate mode: {mode!r}")
+
     # Parse grade number
     grade_num = 3  # safe default
     for part in grade_level.replace("-", " ").split():
@@ -966,8 +1030,14 @@ def run_release_gate(
     block_reasons: list[str] = []
     degrade_reasons: list[str] = []
     failed_rules: list[str] = []
+    timings_ms: dict[str, float] = {}
+
+    rules = RULE_REGISTRY
+    if mode == "fast":
+        rules = sorted(RULE_REGISTRY, key=lambda rule: RULE_SPECS[rule[0]].cost)
 
-    for name, enforcement, func in RULE_REGISTRY:
+    for name, enforcement, func in rules:
+        t0 = time.perf_counter()
         try:
             result = func(ctx)
         except Exception as exc:
@@ -977,6 +1047,7 @@ def run_release_gate(
                 result = RuleResult(name, False, Enforcement.BLOCK, f"Crashed (fail-closed): {exc}")
             else:
                 result = RuleResult(name, False, enforcement, f"Crashed: {exc}")
+        timings_ms[name] = round((time.perf_counter() - t0) * 1000, 3)
 
         results.append(result)
         merged_stamps.update(result.stamps)
@@ -986,9 +1057,13 @@ def run_release_gate(
             strict_block = ctx.strict_p1 and is_trust_blocking_failure(name, strict_p1=True)
             if result.enforcement == Enforcement.BLOCK or strict_block:
                 block_reasons.append(f"[{name}] {result.detail}")
+                if mode == "fast":
+                    break
             elif result.enforcement == Enforcement.DEGRADE:
                 degrade_reasons.append(f"[{name}] {result.detail}")
 
+    skipped_rules = [name for name, _, _ in RULE_REGISTRY if name not in timings_ms]
+
     # Determine verdict
     # P3-A: Cosmetic degrade rules — AI-smell / polish issues, not accuracy problems.
     # If ONLY cosmetic rules failed, upgrade from best_effort to released.
@@ -1034,13 +1109,16 @@ def run_release_gate(
     merged_stamps["trust_policy_version"] = "v1"
 
     logger.info(
-        "[release_gate] verdict=%s failed=%d blocked=%d degraded=%d gold=%s strict_p1=%s",
+        "[release_gate] verdict=%s mode=%s failed=%d blocked=%d degraded=%d skipped=%d gold=%s strict_p1=%s ms=%.2f",
         verdict,
+        mode,
         len(failed_rules),
         len(block_reasons),
         len(degrade_reasons),
+        len(skipped_rules),
         gold_standard_mode,
         ctx.strict_p1,
+        sum(timings_ms.values()),
     )
 
     return ReleaseVerdict(
@@ -1051,4 +1129,7 @@ def run_release_gate(
         stamps=merged_stamps,
         block_reasons=block_reasons,
         degrade_reasons=degrade_reasons,
+        mode=mode,
+        skipped_rules=skipped_rules,
+        rule_timings_ms=timings_ms,
     )
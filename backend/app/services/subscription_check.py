@@ -7,12 +7,21 @@ Usage:
 """
 
 import logging
+import os
 from datetime import datetime
 
+from cachetools import TTLCache
+
+from app.services.async_db import execute
+
 logger = logging.getLogger("skolar.subscription")
 
 FREE_TIER_LIMIT = 5  # worksheets per month
 
+# user_id -> tier, for read-only callers (PDF watermark). Short TTL: an upgrade
+# shows up within this window.
+_tier_cache: TTLCache = TTLCache(maxsize=10000, ttl=float(os.getenv("TIER_CACHE_TTL_S", "300")))
+
 
 async def check_and_increment_usage(user_id: str, supabase_client) -> dict:
     """Atomically check and increment worksheet usage via Postgres function.
@@ -28,9 +37,9 @@ async def check_and_increment_usage(user_id: str, supabase_client) -> dict:
     On ANY DB error: logs warning and returns allowed=False (fail-closed).
     """
     try:
-        result = supabase_client.rpc(
-            "increment_worksheet_usage", {"p_user_id": user_id, "p_limit": FREE_TIER_LIMIT}
-        ).execute()
+        result = await execute(
+            supabase_client.rpc("increment_worksheet_usage", {"p_user_id": user_id, "p_limit": FREE_TIER_LIMIT})
+        )
 
         if result.data:
             data = result.data
@@ -67,12 +76,11 @@ async def check_ai_usage_allowed(user_id: str, supabase_client) -> dict:
     On DB failure: fail-closed.
     """
     try:
-        result = (
+        result = await execute(
             supabase_client.table("user_subscriptions")
             .select("tier, worksheets_generated_this_month")
             .eq("user_id", user_id)
             .maybe_single()
-            .execute()
         )
 
         data = getattr(result, "data", None)
@@ -97,6 +105,22 @@ async def check_ai_usage_allowed(user_id: str, supabase_client) -> dict:
         return _fail_closed()
 
 
+async def get_user_tier(user_id: str, supabase_client) -> str:
+    """Return "paid" or "free" for *user_id*, cached for TIER_CACHE_TTL_S.
+
+    Raises on DB error (nothing is cached) so callers pick their own default.
+    """
+    tier = _tier_cache.get(user_id)
+    if tier is None:
+        result = await execute(
+            supabase_client.table("user_subscriptions").select("tier").eq("user_id", user_id).maybe_single()
+        )
+        data = getattr(result, "data", None)
+        tier = "paid" if data and data.get("tier") == "paid" else "free"
+        _tier_cache[user_id] = tier
+    return tier
+
+
 def _start_of_next_month(now: datetime) -> datetime:
     """Return the first day of the next month, preserving tzinfo."""
     if now.month == 12:
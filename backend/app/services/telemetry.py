@@ -1,12 +1,288 @@
+"""Telemetry events — structured log line per event, optional Supabase persistence.
+
+With ENABLE_TELEMETRY_DB=1, events are not inserted inline on the request path:
+emit_event() appends the row to a bounded in-memory buffer and a background
+thread bulk-inserts it into ``telemetry_events`` when TELEMETRY_FLUSH_BATCH rows
+are waiting or every TELEMETRY_FLUSH_INTERVAL_S seconds. If the buffer is full
+the oldest rows are dropped (counted); if the insert fails the batch is appended
+to a local JSONL spill file and replayed after the next successful insert.
+A batch the database rejects for its data (bad column, type, constraint) is
+split until the offending rows are isolated; those go to a ``.rejected``
+quarantine file instead of the spill file, so one bad row cannot keep its
+batch replaying forever.
+The app lifespan calls shutdown_telemetry() to flush what is left.
+"""
+
 import asyncio
 import json
 import logging
+import os
+import threading
 import time
+from collections import deque
+from collections.abc import Callable
 from functools import wraps
 from typing import Optional
 
 logger = logging.getLogger("skolar.telemetry")
 
+BUFFER_SIZE = int(os.getenv("TELEMETRY_BUFFER_SIZE", "10000"))
+FLUSH_BATCH = int(os.getenv("TELEMETRY_FLUSH_BATCH", "200"))
+FLUSH_INTERVAL_S = float(os.getenv("TELEMETRY_FLUSH_INTERVAL_S", "2"))
+SPILL_PATH = os.getenv("TELEMETRY_SPILL_PATH", "/tmp/skolar_telemetry_spill.jsonl")  # noqa: S108
+
+
+# Postgres SQLSTATE classes meaning "bad input", not "database unreachable":
+# 22 data exception, 23 integrity violation, 42 undefined column / syntax.
+# PGRST1xx are PostgREST request-parsing errors.
+_DATA_ERROR_CODES = ("22", "23", "42", "PGRST1")
+
+
+def _is_data_error(exc: Exception) -> bool:
+    if isinstance(exc, (TypeError, ValueError)):  # row not serializable
+        return True
+    return str(getattr(exc, "code", "") or "").startswith(_DATA_ERROR_CODES)
+
+
+class _Unsent(Exception):
+    """The database became unreachable mid-batch; *rows* were not inserted."""
+
+    def __init__(self, rows: list[dict], cause: Exception):
+        super().__init__(str(cause))
+        self.rows = rows
+        self.cause = cause
+
+
+def _supabase_insert(rows: list[dict]) -> None:
+    from app.services.supabase_client import get_supabase_client
+
+    get_supabase_client().table("telemetry_events").insert(rows).execute()
+
+
+class TelemetrySink:
+    """Bounded ring buffer drained by a background thread in bulk inserts."""
+
+    def __init__(
+        self,
+        insert_rows: Callable[[list[dict]], None] = _supabase_insert,
+        maxsize: int = BUFFER_SIZE,
+        batch_size: int = FLUSH_BATCH,
+        interval_s: float = FLUSH_INTERVAL_S,
+        spill_path: str | None = SPILL_PATH,
+    ):
+        self._insert_rows = insert_rows
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.interval_s = interval_s
+        self.spill_path = spill_path
+
+        self._buffer: deque[dict] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._counters = {
+            "enqueued": 0,
+            "dropped": 0,
+            "flushed": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "rejected": 0,
+            "failures": 0,
+        }
+        self._last_error: str | None = None
+
+    # -- Producer side (request path) ------------------------------------------
+
+    def enqueue(self, row: dict) -> None:
+        """Never blocks on I/O: O(1) append, oldest row dropped when full."""
+        with self._lock:
+            if len(self._buffer) >= self.maxsize:
+                self._buffer.popleft()
+                self._counters["dropped"] += 1
+            self._buffer.append(row)
+            self._counters["enqueued"] += 1
+            pending = len(self._buffer)
+            if self._thread is None and not self._stopping.is_set():
+                self._thread = threading.Thread(target=self._run, name="telemetry-flush", daemon=True)
+                self._thread.start()
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    # -- Consumer side (background thread) -------------------------------------
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.interval_s)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:  # never let the flusher die
+                logger.error(f"[telemetry.flush] {e}", exc_info=True)
+        self.flush()
+
+    def _take(self, n: int) -> list[dict]:
+        with self._lock:
+            return [self._buffer.popleft() for _ in range(min(n, len(self._buffer)))]
+
+    def flush(self) -> int:
+        """Drain the buffer in batches. Returns the number of rows inserted."""
+        inserted = 0
+        with self._flush_lock:
+            db_down = False
+            while batch := self._take(self.batch_size):
+                if db_down:
+                    self._spill(batch)
+                    continue
+                try:
+                    inserted += self._insert_batch(batch, "flushed")
+                except _Unsent as e:
+                    db_down = True
+                    self._record_failure(e.cause)
+                    self._spill(e.rows)
+            if not db_down:
+                inserted += self._replay_spill()
+        return inserted
+
+    def _insert_batch(self, rows: list[dict], counter: str) -> int:
+        """Insert *rows*, isolating and quarantining rows the database rejects.
+
+        A data error splits the chunk in halves until each bad row fails
+        alone. Any other error means the database is unreachable: raises
+        _Unsent with every row not yet inserted. Returns rows inserted.
+        """
+        inserted = 0
+        stack = [rows]
+        while stack:
+            chunk = stack.pop()
+            try:
+                self._insert_rows(chunk)
+            except Exception as e:
+                if not _is_data_error(e):
+                    raise _Unsent(chunk + [r for c in reversed(stack) for r in c], e) from e
+                if len(chunk) == 1:
+                    self._quarantine(chunk, e)
+                else:
+                    mid = len(chunk) // 2
+                    stack += [chunk[mid:], chunk[:mid]]
+                continue
+            inserted += len(chunk)
+            with self._lock:
+                self._counters[counter] += len(chunk)
+        return inserted
+
+    def _quarantine(self, rows: list[dict], exc: Exception) -> None:
+        """Set aside rows the database will never accept (not retried)."""
+        logger.warning("[telemetry] row rejected, quarantined: %s: %s", type(exc).__name__, exc)
+        with self._lock:
+            self._counters["rejected"] += len(rows)
+        if not self.spill_path:
+            return
+        try:
+            with open(f"{self.spill_path}.rejected", "a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row, separators=(",", ":"), default=str) + "\n")
+        except OSError as e:
+            logger.error(f"[telemetry.quarantine] {e}")
+
+    def _record_failure(self, exc: Exception) -> None:
+        with self._lock:
+            self._counters["failures"] += 1
+        self._last_error = f"{type(exc).__name__}: {exc}"
+        logger.warning("[telemetry] bulk insert failed, spilling to disk: %s", self._last_error)
+
+    def _spill(self, rows: list[dict]) -> None:
+        if not self.spill_path:
+            with self._lock:
+                self._counters["dropped"] += len(rows)
+            return
+        try:
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row, separators=(",", ":"), default=str) + "\n")
+            with self._lock:
+                self._counters["spilled"] += len(rows)
+        except OSError as e:
+            logger.error(f"[telemetry.spill] {e}")
+            with self._lock:
+                self._counters["dropped"] += len(rows)
+
+    def _replay_spill(self) -> int:
+        """Re-insert rows spilled while the DB was down. Called with _flush_lock held."""
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return 0
+        # Per-process name: every uvicorn worker may spill to / replay the same file
+        replay_path = f"{self.spill_path}.{os.getpid()}.replay"
+        try:
+            os.replace(self.spill_path, replay_path)
+            with open(replay_path, encoding="utf-8") as f:
+                lines = [line for line in f if line.strip()]
+        except OSError as e:
+            logger.error(f"[telemetry.replay] {e}")
+            return 0
+
+        rows: list[dict] = []
+        for line in lines:
+            try:
+                rows.append(json.loads(line))
+            except ValueError as e:  # torn write: quarantine the line, keep the rest
+                self._quarantine([{"raw": line.rstrip("\n")}], e)
+
+        replayed = 0
+        for i in range(0, len(rows), self.batch_size):
+            try:
+                replayed += self._insert_batch(rows[i : i + self.batch_size], "replayed")
+            except _Unsent as e:
+                self._record_failure(e.cause)
+                self._spill(e.rows + rows[i + self.batch_size :])
+                break
+        os.remove(replay_path)
+        return replayed
+
+    # -- Lifecycle ---------------------------------------------------------------
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the flusher and push out everything still buffered."""
+        self._stopping.set()
+        self._wake.set()
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        if thread is None or not thread.is_alive():
+            self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counters, "buffered": len(self._buffer), "last_error": self._last_error}
+
+
+_sink: TelemetrySink | None = None
+_sink_lock = threading.Lock()
+
+
+def get_telemetry_sink() -> TelemetrySink:
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                _sink = TelemetrySink()
+    return _sink
+
+
+def telemetry_stats() -> dict:
+    """Sink counters for /health/deep."""
+    return get_telemetry_sink().stats()
+
+
+def shutdown_telemetry(timeout: float = 5.0) -> dict | None:
+    """Flush and stop the sink (lifespan shutdown). Returns final stats, or None if never used."""
+    if _sink is None:
+        return None
+    _sink.shutdown(timeout)
+    return _sink.stats()
+
 
 def emit_event(
     event: str,
@@ -36,30 +312,22 @@ def emit_event(
     logger.info("telemetry=%s", json.dumps(payload, separators=(",", ":")))
 
     # persist to Supabase (best-effort, never block the request)
-    import os
-
     if os.getenv("ENABLE_TELEMETRY_DB", "0") != "1":
         return
 
-    try:
-        from app.services.supabase_client import get_supabase_client
-
-        sb = get_supabase_client()
-        sb.table("telemetry_events").insert(
-            {
-                "event": event,
-                "route": route,
-                "version": version,
-                "student_id": student_id,
-                "skill_tag": skill_tag,
-                "topic": topic,
-                "error_type": error_type,
-                "latency_ms": latency_ms,
-                "ok": ok,
-            }
-        ).execute()
-    except Exception as e:
-        logger.error(f"[telemetry.emit_event] {e}", exc_info=True)
+    get_telemetry_sink().enqueue(
+        {
+            "event": event,
+            "route": route,
+            "version": version,
+            "student_id": student_id,
+            "skill_tag": skill_tag,
+            "topic": topic,
+            "error_type": error_type,
+            "latency_ms": latency_ms,
+            "ok": ok,
+        }
+    )
 
 
 def instrument(route: str, version: str):
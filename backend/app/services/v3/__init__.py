@@ -1,3 +1,3 @@
-from .generate import generate_worksheet_v3
+from .generate import generate_worksheet_v3, generate_worksheet_v3_async, stream_worksheet_v3
 
-__all__ = ["generate_worksheet_v3"]
+__all__ = ["generate_worksheet_v3", "generate_worksheet_v3_async", "stream_worksheet_v3"]
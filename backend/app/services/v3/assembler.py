@@ -8,7 +8,7 @@ from __future__ import annotations
 
 import random
 
-from .slot_builder import SlotBuilderOutput
+from .slot_builder import Slot, SlotBuilderOutput
 
 
 # ---------------------------------------------------------------------------
@@ -57,21 +57,24 @@ def _infer_render_format(q_type: str, options: list[str] | None) -> str:
 # ---------------------------------------------------------------------------
 # Main entry: assemble_worksheet()
 # ---------------------------------------------------------------------------
-def assemble_worksheet(slot_output: SlotBuilderOutput, filled: list[dict]) -> dict:
-    """Assemble the final worksheet dict matching frontend expectations.
-
-    Args:
-        slot_output: SlotBuilderOutput from slot_builder
-        filled: list of dicts from gemini_filler (slot, text, hint, explanation, options, common_mistake, parent_tip)
-
-    Returns:
-        dict with title, skill_focus, common_mistake, parent_tip, learning_objectives, questions
-    """
-    # Index filled by slot number
+def _index_fills(filled: list[dict]) -> dict[int, dict]:
+    """Index filled by slot number."""
     filled_by_slot: dict[int, dict] = {}
     for item in filled:
         slot_num = item.get("slot", 0)
         filled_by_slot[slot_num] = item
+    return filled_by_slot
+
+
+def assemble_questions(
+    slot_output: SlotBuilderOutput, filled: list[dict], slots: list[Slot] | None = None
+) -> list[dict]:
+    """Assemble question dicts for *slots* (default: every slot in *slot_output*).
+
+    Lets the streaming pipeline assemble each batch as soon as it is filled;
+    maths detection still looks at the whole worksheet.
+    """
+    filled_by_slot = _index_fills(filled)
 
     is_maths = False
     for slot in slot_output.slots:
@@ -80,7 +83,7 @@ def assemble_worksheet(slot_output: SlotBuilderOutput, filled: list[dict]) -> di
             break
 
     questions = []
-    for slot in slot_output.slots:
+    for slot in slots if slots is not None else slot_output.slots:
         fill = filled_by_slot.get(slot.slot_number, {})
         q_type_override = None
 
@@ -216,6 +219,24 @@ def assemble_worksheet(slot_output: SlotBuilderOutput, filled: list[dict]) -> di
 
         questions.append(q)
 
+    return questions
+
+
+def assemble_worksheet(slot_output: SlotBuilderOutput, filled: list[dict], questions: list[dict] | None = None) -> dict:
+    """Assemble the final worksheet dict matching frontend expectations.
+
+    Args:
+        slot_output: SlotBuilderOutput from slot_builder
+        filled: list of dicts from gemini_filler (slot, text, hint, explanation, options, common_mistake, parent_tip)
+        questions: already-assembled questions (streaming path); assembled from *filled* when omitted
+
+    Returns:
+        dict with title, skill_focus, common_mistake, parent_tip, learning_objectives, questions
+    """
+    filled_by_slot = _index_fills(filled)
+    if questions is None:
+        questions = assemble_questions(slot_output, filled)
+
     # Worksheet-level metadata
     meta = slot_output.worksheet_meta
     common_mistake = meta.get("common_mistake", "")
@@ -0,0 +1,213 @@
+"""Content-addressed cache for LLM slot fills.
+
+build_slots() is deterministic given topic, grade, difficulty, numbers and
+instruction, so an identical Slot filled a few minutes ago for another parent
+can be served again without paying for LLM text. Each Slot is hashed into a
+fingerprint (instruction minus the random ``Variation:`` nonce, numbers,
+question type, language, curriculum context); hits are served per slot and
+only the misses go to Gemini.
+
+Variety guards so children don't all see identical questions:
+  - an entry is dropped after MAX_SERVES hits and regenerated fresh
+  - at most MAX_HIT_FRACTION of a worksheet's slots are served from cache;
+    the rest are always freshly written
+  - one worksheet never gets the same entry twice: the fingerprint ignores the
+    Variation nonce, so two slots can share it, and only the first is served
+  - per-topic quota: at most TOPIC_MAX_SERVES cached fills per topic (and
+    language) every TOPIC_WINDOW_S; past it that topic is written fresh until
+    the window rolls over
+
+Hit/miss counters are recorded in the shared LLMMetrics (get_llm_metrics()).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+from cachetools import TTLCache
+
+from .slot_builder import Slot
+
+logger = logging.getLogger(__name__)
+
+MAXSIZE = int(os.getenv("V3_FILL_CACHE_MAXSIZE", "5000"))
+TTL_S = int(os.getenv("V3_FILL_CACHE_TTL_S", str(6 * 3600)))
+MAX_SERVES = 5
+MAX_HIT_FRACTION = 0.5
+TOPIC_MAX_SERVES = int(os.getenv("V3_FILL_CACHE_TOPIC_MAX_SERVES", "100"))
+TOPIC_WINDOW_S = float(os.getenv("V3_FILL_CACHE_TOPIC_WINDOW_S", "3600"))
+
+# "Variation: ab12cd" — a per-generation nonce that must not affect the fingerprint
+_VARIATION_RE = re.compile(r"Variation: [a-z0-9]+(?: \| )?")
+_TOPIC_RE = re.compile(r"Topic: ([^|]+)")
+
+
+def is_enabled() -> bool:
+    return os.getenv("V3_FILL_CACHE_ENABLED", "1") == "1"
+
+
+def slot_fingerprint(slot: Slot, language: str, curriculum_context: str | None = None) -> str:
+    """Stable hash of everything that determines what the LLM is asked to write for *slot*."""
+    payload = {
+        "instruction": _VARIATION_RE.sub("", slot.llm_instruction),
+        "numbers": slot.numbers,
+        "question_type": slot.question_type,
+        "language": language,
+        # Slot 1 also carries common_mistake / parent_tip
+        "first": slot.slot_number == 1,
+        "ctx": hashlib.sha256(curriculum_context.encode()).hexdigest()[:16] if curriculum_context else None,
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def slot_topic(slot: Slot, language: str) -> str:
+    """Topic the quota is counted against: the instruction's ``Topic:`` field, else the skill tag."""
+    match = _TOPIC_RE.search(slot.llm_instruction)
+    topic = match.group(1).strip() if match else slot.skill_tag
+    return f"{language}:{topic.lower()}"
+
+
+def _is_cacheable(fill: dict) -> bool:
+    text = fill.get("text")
+    return isinstance(text, str) and len(text) >= 5 and bool(fill.get("correct_answer"))
+
+
+@dataclass
+class _CachedFill:
+    fill: dict
+    served: int = 0  # mutated in place so a hit does not reset the entry's TTL
+
+
+class SlotFillCache:
+    """Thread-safe TTL/LRU cache of filled slots keyed by slot_fingerprint()."""
+
+    def __init__(
+        self,
+        maxsize: int = MAXSIZE,
+        ttl: int = TTL_S,
+        max_serves: int = MAX_SERVES,
+        max_hit_fraction: float = MAX_HIT_FRACTION,
+        topic_max_serves: int = TOPIC_MAX_SERVES,
+        topic_window_s: float = TOPIC_WINDOW_S,
+    ):
+        # Serve counts live in the entries, so they expire and are evicted with them
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # topic -> (window start, cached fills served in that window)
+        self._topic_serves: dict[str, tuple[float, int]] = {}
+        self._lock = threading.Lock()
+        self.max_serves = max_serves
+        self.max_hit_fraction = max_hit_fraction
+        self.topic_max_serves = topic_max_serves
+        self.topic_window_s = topic_window_s
+
+    def lookup(
+        self, slots: list[Slot], language: str, curriculum_context: str | None = None
+    ) -> tuple[dict[int, dict], list[Slot]]:
+        """Split *slots* into cached fills (by slot_number) and slots that still need the LLM."""
+        keyed = [(slot, slot_fingerprint(slot, language, curriculum_context)) for slot in slots]
+        with self._lock:
+            candidates = []
+            seen: set[str] = set()
+            for slot, key in keyed:
+                # Same fingerprint twice in one worksheet: the later slot is written fresh
+                if key in self._entries and key not in seen:
+                    candidates.append((slot, key))
+                seen.add(key)
+            quota = int(len(slots) * self.max_hit_fraction)
+            quota_skipped = max(0, len(candidates) - quota)
+            if quota_skipped:
+                candidates = random.sample(candidates, quota)
+            candidates, topic_skipped = self._take_topic_quota(candidates, language)
+            quota_skipped += topic_skipped
+
+            hits: dict[int, dict] = {}
+            for slot, key in candidates:
+                entry = self._entries[key]
+                fill = dict(entry.fill)
+                fill["slot"] = slot.slot_number
+                hits[slot.slot_number] = fill
+                entry.served += 1
+                if entry.served >= self.max_serves:
+                    # Retire after MAX_SERVES so the next request gets a fresh fill
+                    self._entries.pop(key, None)
+
+        misses = [slot for slot in slots if slot.slot_number not in hits]
+        _record(len(hits), len(misses), quota_skipped)
+        if hits:
+            logger.info("[fill_cache] %d/%d slots served from cache", len(hits), len(slots))
+        return hits, misses
+
+    def _take_topic_quota(self, candidates: list[tuple[Slot, str]], language: str) -> tuple[list, int]:
+        """Keep the candidates their topic still has quota for; caller holds the lock."""
+        now = time.monotonic()
+        # Drop rolled-over windows so the map only holds topics served recently
+        for topic in [t for t, (start, _) in self._topic_serves.items() if now - start >= self.topic_window_s]:
+            del self._topic_serves[topic]
+        kept = []
+        for slot, key in candidates:
+            topic = slot_topic(slot, language)
+            start, served = self._topic_serves.get(topic, (now, 0))
+            if served < self.topic_max_serves:
+                kept.append((slot, key))
+                served += 1
+            self._topic_serves[topic] = (start, served)
+        return kept, len(candidates) - len(kept)
+
+    def store(
+        self, slots: list[Slot], filled: list[dict], language: str, curriculum_context: str | None = None
+    ) -> None:
+        """Cache fresh LLM fills for *slots* (matched on the ``slot`` field)."""
+        by_slot = {item.get("slot"): item for item in filled if isinstance(item, dict)}
+        with self._lock:
+            for slot in slots:
+                fill = by_slot.get(slot.slot_number)
+                if fill is None or not _is_cacheable(fill):
+                    continue
+                key = slot_fingerprint(slot, language, curriculum_context)
+                self._entries[key] = _CachedFill(dict(fill))
+
+    def invalidate(self, slots: list[Slot], language: str, curriculum_context: str | None = None) -> None:
+        """Drop entries for slots whose fill failed validation."""
+        with self._lock:
+            for slot in slots:
+                key = slot_fingerprint(slot, language, curriculum_context)
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._topic_serves.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "maxsize": self._entries.maxsize, "ttl": self._entries.ttl}
+
+
+def _record(hits: int, misses: int, quota_skipped: int) -> None:
+    from app.services.ai_client import record_slot_fill_cache
+
+    record_slot_fill_cache(hits, misses, quota_skipped)
+
+
+# -- Singleton ----------------------------------------------------------------
+
+_fill_cache: SlotFillCache | None = None
+_fill_cache_lock = threading.Lock()
+
+
+def get_fill_cache() -> SlotFillCache:
+    global _fill_cache
+    if _fill_cache is None:
+        with _fill_cache_lock:
+            if _fill_cache is None:
+                _fill_cache = SlotFillCache()
+    return _fill_cache
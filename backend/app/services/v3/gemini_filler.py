@@ -7,14 +7,82 @@ All structure, numbers, visuals, and answers come from slot_builder.
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import inspect
 import json
 import logging
+import os
 import re
+import weakref
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait as _wait_futures
 
+from app.services.ai_client import llm_deadline
+from app.services.metrics import stage_timer
+
+from . import fill_cache
 from .slot_builder import Slot
 
 logger = logging.getLogger(__name__)
 
+# ---------------------------------------------------------------------------
+# Batch fan-out limits
+# ---------------------------------------------------------------------------
+# Worksheets over BATCH_SIZE slots are split into batches that are sent to the
+# LLM concurrently. MAX_CONCURRENT_BATCHES caps in-flight batch calls for the
+# whole process (shared by every request), BATCH_TIMEOUT_S bounds how long a fill
+# waits for its batches.
+BATCH_SIZE = 10
+MAX_CONCURRENT_BATCHES = int(os.getenv("V3_FILL_MAX_CONCURRENCY", "16"))
+BATCH_TIMEOUT_S = float(os.getenv("V3_FILL_BATCH_TIMEOUT_S", "45"))
+
+_batch_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_BATCHES, thread_name_prefix="v3-fill")
+
+# asyncio.Semaphore binds to one event loop — keep one per loop (one per uvicorn worker in practice)
+_loop_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _batch_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    sem = _loop_semaphores.get(loop)
+    if sem is None:
+        sem = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+        _loop_semaphores[loop] = sem
+    return sem
+
+
+def _split_batches(slots: list[Slot]) -> list[list[Slot]]:
+    return [slots[i : i + BATCH_SIZE] for i in range(0, len(slots), BATCH_SIZE)]
+
+
+def _merge_batches(batches: list[list[Slot]], outcomes: list) -> list[dict]:
+    """Concatenate batch results in slot order.
+
+    A failed batch (timeout or API error) contributes nothing — its slots come
+    back empty and are picked up by light_validator + the failed-slot retry.
+    Only when every batch fails is the first error raised to the caller.
+    """
+    errors = [o for o in outcomes if isinstance(o, BaseException)]
+    if errors and len(errors) == len(outcomes):
+        raise errors[0]
+
+    results: list[dict] = []
+    for batch, outcome in zip(batches, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.warning(
+                "[gemini_filler] Batch for slots %d-%d failed (%s: %s); continuing with other batches",
+                batch[0].slot_number,
+                batch[-1].slot_number,
+                type(outcome).__name__,
+                outcome,
+            )
+            continue
+        results.extend(outcome)
+    return results
+
+
 # ---------------------------------------------------------------------------
 # System prompt (simple — no structural rules)
 # ---------------------------------------------------------------------------
@@ -111,8 +179,8 @@ def _parse_response(raw: str) -> list[dict]:
 # ---------------------------------------------------------------------------
 # Single LLM call
 # ---------------------------------------------------------------------------
-def _single_call(client, slots: list[Slot], language: str, curriculum_context: str | None = None) -> list[dict]:
-    """Make a single LLM call for a batch of slots."""
+def _build_request(slots: list[Slot], language: str, curriculum_context: str | None = None) -> dict:
+    """Build chat.completions.create() kwargs for a batch of slots."""
     user_prompt = _build_user_prompt(slots, language, curriculum_context)
 
     # Determine temperature and tokens
@@ -131,18 +199,52 @@ def _single_call(client, slots: list[Slot], language: str, curriculum_context: s
             "writing it."
         )
 
-    logger.info("[gemini_filler] Calling LLM for %d slots", len(slots))
-
-    response = client.chat.completions.create(
-        model="gemini-2.5-flash",
-        messages=[
+    return {
+        "model": "gemini-2.5-flash",
+        "messages": [
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": user_prompt},
         ],
-        temperature=temp,
-        max_tokens=max_tokens,
-        thinking_budget=thinking_budget,
-    )
+        "temperature": temp,
+        "max_tokens": max_tokens,
+        "thinking_budget": thinking_budget,
+    }
+
+
+def _single_call(client, slots: list[Slot], language: str, curriculum_context: str | None = None) -> list[dict]:
+    """Make a single LLM call for a batch of slots."""
+    request = _build_request(slots, language, curriculum_context)
+
+    logger.info("[gemini_filler] Calling LLM for %d slots", len(slots))
+
+    with stage_timer("gemini_batch"):
+        response = client.chat.completions.create(**request)
+
+    raw = response.choices[0].message.content or ""
+    filled = _parse_response(raw)
+
+    logger.info("[gemini_filler] Got %d filled slots from LLM", len(filled))
+    return filled
+
+
+async def _single_call_async(
+    client, slots: list[Slot], language: str, curriculum_context: str | None = None
+) -> list[dict]:
+    """Async twin of _single_call().
+
+    Uses the client's native ``acreate`` when it has one (OpenAICompatAdapter);
+    other OpenAI-compatible clients fall back to a worker thread.
+    """
+    request = _build_request(slots, language, curriculum_context)
+
+    logger.info("[gemini_filler] Calling LLM for %d slots (async)", len(slots))
+
+    acreate = getattr(client.chat.completions, "acreate", None)
+    with stage_timer("gemini_batch"):
+        if acreate is not None and inspect.iscoroutinefunction(acreate):
+            response = await acreate(**request)
+        else:
+            response = await asyncio.to_thread(client.chat.completions.create, **request)
 
     raw = response.choices[0].message.content or ""
     filled = _parse_response(raw)
@@ -151,17 +253,144 @@ def _single_call(client, slots: list[Slot], language: str, curriculum_context: s
     return filled
 
 
+# ---------------------------------------------------------------------------
+# Dispatch (batch fan-out)
+# ---------------------------------------------------------------------------
+def _dispatch(client, slots: list[Slot], language: str, curriculum_context: str | None = None) -> list[dict]:
+    """Send *slots* to the LLM in batches of BATCH_SIZE on a bounded process-wide pool.
+
+    All batches, a single one included, are waited on together for at most
+    BATCH_TIMEOUT_S; a batch still running then is dropped like a failed one.
+    """
+    batches = _split_batches(slots)
+    # copy_context() carries the caller's metric labels and the LLM deadline into
+    # the pool threads, so an abandoned batch stops calling Gemini at the timeout
+    with llm_deadline(BATCH_TIMEOUT_S):
+        futures = [
+            _batch_executor.submit(
+                contextvars.copy_context().run, _single_call, client, b, language, curriculum_context
+            )
+            for b in batches
+        ]
+    done, _ = _wait_futures(futures, timeout=BATCH_TIMEOUT_S)
+
+    outcomes: list = []
+    for future in futures:
+        if future not in done:
+            future.cancel()
+            outcomes.append(TimeoutError(f"batch exceeded {BATCH_TIMEOUT_S:.0f}s"))
+        elif future.exception() is not None:
+            outcomes.append(future.exception())
+        else:
+            outcomes.append(future.result())
+    return _merge_batches(batches, outcomes)
+
+
+async def _bounded_call_async(
+    client, slots: list[Slot], language: str, curriculum_context: str | None = None
+) -> list[dict]:
+    """One batch call under the per-process concurrency cap and per-batch timeout."""
+    async with _batch_semaphore():
+        return await asyncio.wait_for(
+            _single_call_async(client, slots, language, curriculum_context), timeout=BATCH_TIMEOUT_S
+        )
+
+
+async def _dispatch_async(
+    client, slots: list[Slot], language: str, curriculum_context: str | None = None
+) -> list[dict]:
+    """Async twin of _dispatch(). Batches are awaited concurrently, results kept in slot order."""
+    if len(slots) <= BATCH_SIZE:
+        return await _bounded_call_async(client, slots, language, curriculum_context)
+
+    batches = _split_batches(slots)
+    outcomes = await asyncio.gather(
+        *(_bounded_call_async(client, b, language, curriculum_context) for b in batches),
+        return_exceptions=True,
+    )
+    return _merge_batches(batches, list(outcomes))
+
+
+def _with_cached(cached: dict[int, dict], filled: list[dict]) -> list[dict]:
+    """Combine cache hits with fresh fills (assembler indexes them by ``slot``)."""
+    if not cached:
+        return filled
+    return list(cached.values()) + [f for f in filled if f.get("slot") not in cached]
+
+
 # ---------------------------------------------------------------------------
 # Main entry: fill_slots()
 # ---------------------------------------------------------------------------
 def fill_slots(client, slots: list[Slot], language: str, curriculum_context: str | None = None) -> list[dict]:
-    """Fill all slots with LLM-generated text. Batches for 10+ slots."""
-    if len(slots) <= 10:
-        return _single_call(client, slots, language, curriculum_context)
-
-    results = []
-    for i in range(0, len(slots), 10):
-        batch = slots[i : i + 10]
-        filled = _single_call(client, batch, language, curriculum_context)
-        results.extend(filled)
-    return results
+    """Fill all slots with LLM-generated text.
+
+    Slots already in the fill cache are served from it; the rest are sent to
+    the LLM, split into concurrent batches when over BATCH_SIZE.
+    """
+    if not fill_cache.is_enabled():
+        return _dispatch(client, slots, language, curriculum_context)
+
+    cache = fill_cache.get_fill_cache()
+    cached, misses = cache.lookup(slots, language, curriculum_context)
+    filled = _dispatch(client, misses, language, curriculum_context) if misses else []
+    cache.store(misses, filled, language, curriculum_context)
+    return _with_cached(cached, filled)
+
+
+async def fill_slots_async(
+    client, slots: list[Slot], language: str, curriculum_context: str | None = None
+) -> list[dict]:
+    """Async twin of fill_slots()."""
+    if not fill_cache.is_enabled():
+        return await _dispatch_async(client, slots, language, curriculum_context)
+
+    cache = fill_cache.get_fill_cache()
+    cached, misses = cache.lookup(slots, language, curriculum_context)
+    filled = await _dispatch_async(client, misses, language, curriculum_context) if misses else []
+    cache.store(misses, filled, language, curriculum_context)
+    return _with_cached(cached, filled)
+
+
+async def iter_fill_batches_async(
+    client, slots: list[Slot], language: str, curriculum_context: str | None = None
+) -> AsyncIterator[tuple[list[Slot], list[dict]]]:
+    """Yield ``(batch_slots, fills)`` as each batch completes (streaming path).
+
+    Cache hits come first as one group, then LLM batches in completion order.
+    A failed batch yields its slots with no fills so the caller can flag them
+    for the failed-slot retry. Batches still in flight are cancelled if the
+    consumer stops iterating (e.g. the client disconnected).
+    """
+    misses = slots
+    cache = fill_cache.get_fill_cache() if fill_cache.is_enabled() else None
+    if cache is not None:
+        cached, misses = cache.lookup(slots, language, curriculum_context)
+        if cached:
+            yield [s for s in slots if s.slot_number in cached], list(cached.values())
+
+    async def _run(batch: list[Slot]):
+        try:
+            return batch, await _bounded_call_async(client, batch, language, curriculum_context)
+        except Exception as e:
+            return batch, e
+
+    tasks = [asyncio.ensure_future(_run(b)) for b in _split_batches(misses)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            batch, outcome = await next_done
+            if isinstance(outcome, BaseException):
+                logger.warning(
+                    "[gemini_filler] Batch for slots %d-%d failed (%s: %s); streaming without it",
+                    batch[0].slot_number,
+                    batch[-1].slot_number,
+                    type(outcome).__name__,
+                    outcome,
+                )
+                yield batch, []
+                continue
+            if cache is not None:
+                cache.store(batch, outcome, language, curriculum_context)
+            yield batch, outcome
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -2,6 +2,13 @@
 
 Orchestrates: slot_builder → gemini_filler → assembler → light_validator.
 Same signature as generate_worksheet() in worksheet_generator.py for easy swap-in.
+
+Three entry points share the same stages:
+  - generate_worksheet_v3()        — synchronous (scripts, v4 fallback)
+  - generate_worksheet_v3_async()  — awaits curriculum RAG and Gemini natively,
+                                     used by the API routes
+  - stream_worksheet_v3()          — async generator of progress events for the
+                                     SSE route (plan → questions → gate → html)
 """
 
 from __future__ import annotations
@@ -10,9 +17,12 @@ import asyncio
 import logging
 import re
 import time
+from collections.abc import AsyncIterator
+
+from app.services.metrics import stage_labels, stage_timer
 
-from .assembler import assemble_worksheet
-from .gemini_filler import fill_slots
+from .assembler import assemble_questions, assemble_worksheet
+from .gemini_filler import fill_slots, fill_slots_async, iter_fill_batches_async
 from .light_validator import validate_worksheet
 from .slot_builder import build_slots
 
@@ -72,6 +82,11 @@ def _get_child_adaptive_config(child_id: str, topic: str, subject: str) -> dict
 
 def _fetch_curriculum_context(grade_level: str, subject: str, topic: str) -> str | None:
     """Fetch curriculum context synchronously (wraps async get_curriculum_context)."""
+    with stage_timer("curriculum_rag"):
+        return _fetch_curriculum_context_blocking(grade_level, subject, topic)
+
+
+def _fetch_curriculum_context_blocking(grade_level: str, subject: str, topic: str) -> str | None:
     try:
         from app.services.curriculum import get_curriculum_context
 
@@ -92,45 +107,54 @@ def _fetch_curriculum_context(grade_level: str, subject: str, topic: str) -> str
     return None
 
 
-def generate_worksheet_v3(
-    client,
+async def _fetch_curriculum_context_async(grade_level: str, subject: str, topic: str) -> str | None:
+    """Fetch curriculum context on the caller's event loop."""
+    try:
+        from app.services.curriculum import get_curriculum_context
+
+        with stage_timer("curriculum_rag"):
+            return await get_curriculum_context(grade_level, subject, topic)
+    except Exception as e:
+        logger.warning("[v3] curriculum fetch failed: %s", e)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Pipeline stages (shared by the sync and async entry points)
+# ---------------------------------------------------------------------------
+def _resolve_adaptive_config(child_id: str | None, topic: str, subject: str, warnings: list[str]) -> dict | None:
+    """Step 0.5: Fetch adaptive difficulty if child_id is provided."""
+    if not child_id:
+        return None
+    try:
+        adaptive_config = _get_child_adaptive_config(child_id, topic, subject)
+        if adaptive_config:
+            warnings.append(f"[v3] adaptive difficulty applied: mastery={adaptive_config['mastery_level']}")
+            logger.info(
+                "[v3] Adaptive config: mastery=%s accuracy=%.1f%% attempts=%d",
+                adaptive_config["mastery_level"],
+                adaptive_config["accuracy"],
+                adaptive_config["total_attempts"],
+            )
+        return adaptive_config
+    except Exception as e:
+        logger.warning("[v3] adaptive difficulty fetch failed (non-blocking): %s", e)
+        return None
+
+
+def _build_slot_output(
     board: str,
     grade_level: str,
     subject: str,
     topic: str,
     difficulty: str,
-    num_questions: int = 10,
-    language: str = "English",
-    problem_style: str = "standard",
-    custom_instructions: str | None = None,
-    child_id: str | None = None,
-) -> tuple[dict, int, list[str]]:
-    """V3 worksheet generation. Returns (worksheet_dict, elapsed_ms, warnings).
-
-    This function has the SAME return signature as the current generate_worksheet()
-    in worksheet_generator.py, making it easy to swap in.
-    """
-    t0 = time.perf_counter()
-    warnings: list[str] = []
-
-    # Step 0.5: Fetch adaptive difficulty if child_id is provided
-    adaptive_config = None
-    if child_id:
-        try:
-            adaptive_config = _get_child_adaptive_config(child_id, topic, subject)
-            if adaptive_config:
-                warnings.append(f"[v3] adaptive difficulty applied: mastery={adaptive_config['mastery_level']}")
-                logger.info(
-                    "[v3] Adaptive config: mastery=%s accuracy=%.1f%% attempts=%d",
-                    adaptive_config["mastery_level"],
-                    adaptive_config["accuracy"],
-                    adaptive_config["total_attempts"],
-                )
-        except Exception as e:
-            logger.warning("[v3] adaptive difficulty fetch failed (non-blocking): %s", e)
-            adaptive_config = None
-
-    # Step 1: Build slots (pure Python, instant)
+    num_questions: int,
+    problem_style: str,
+    language: str,
+    adaptive_config: dict | None,
+):
+    """Step 1: Build slots (pure Python, instant)."""
+    t_slot = time.perf_counter()
     logger.info(
         "[v3] Building slots: %s / %s / %s / %s / %dQ",
         grade_level,
@@ -139,80 +163,82 @@ def generate_worksheet_v3(
         difficulty,
         num_questions,
     )
-    slot_output = build_slots(
-        board=board,
-        grade_level=grade_level,
-        subject=subject,
-        topic=topic,
-        difficulty=difficulty,
-        num_questions=num_questions,
-        problem_style=problem_style,
-        language=language,
-        adaptive_config=adaptive_config,
-    )
-    slot_ms = int((time.perf_counter() - t0) * 1000)
+    with stage_timer("slot_build"):
+        slot_output = build_slots(
+            board=board,
+            grade_level=grade_level,
+            subject=subject,
+            topic=topic,
+            difficulty=difficulty,
+            num_questions=num_questions,
+            problem_style=problem_style,
+            language=language,
+            adaptive_config=adaptive_config,
+        )
+    slot_ms = int((time.perf_counter() - t_slot) * 1000)
     logger.info("[v3] Slot building took %dms", slot_ms)
+    return slot_output
 
-    # Step 1.5: Fetch curriculum context (NCERT RAG)
-    curriculum_ctx = _fetch_curriculum_context(grade_level, subject, topic)
+
+def _log_curriculum_context(curriculum_ctx: str | None, subject: str, topic: str, warnings: list[str]) -> None:
     if curriculum_ctx:
         warnings.append("[v3] curriculum context injected")
         logger.info("[v3] Curriculum context loaded for %s / %s", subject, topic)
     else:
         logger.info("[v3] No curriculum context for %s / %s", subject, topic)
 
-    # Step 2: Fill with Gemini
-    t_fill = time.perf_counter()
-    filled = fill_slots(client, slot_output.slots, language, curriculum_context=curriculum_ctx)
-    fill_ms = int((time.perf_counter() - t_fill) * 1000)
-    logger.info("[v3] Gemini fill took %dms for %d slots", fill_ms, len(filled))
-
-    # Step 3: Assemble
-    worksheet = assemble_worksheet(slot_output, filled)
-
-    # Step 4: Light validation
-    passed, issues, failed_slots = validate_worksheet(worksheet, slot_output.slots)
-    warnings.extend(issues)
-
-    # Step 5: Retry failed slots (max 1 retry)
-    if not passed and failed_slots:
-        logger.info("[v3] Retrying %d failed slots: %s", len(failed_slots), failed_slots)
-        retry_slots = [s for s in slot_output.slots if s.slot_number in failed_slots]
-        if retry_slots:
-            retry_filled = fill_slots(client, retry_slots, language, curriculum_context=curriculum_ctx)
-            # Merge retry results into worksheet
-            retry_by_slot = {}
-            for item in retry_filled:
-                retry_by_slot[item.get("slot", 0)] = item
-
-            for slot_num, fill_data in retry_by_slot.items():
-                idx = slot_num - 1
-                if 0 <= idx < len(worksheet["questions"]):
-                    q = worksheet["questions"][idx]
-                    if fill_data.get("text") and len(fill_data["text"]) >= 5:
-                        q["text"] = fill_data["text"]
-                        if fill_data.get("hint"):
-                            q["hint"] = fill_data["hint"]
-                        if fill_data.get("explanation"):
-                            q["explanation"] = fill_data["explanation"]
-                        if fill_data.get("options"):
-                            q["options"] = fill_data["options"]
-                        warnings.append(f"Q{slot_num}: retried and replaced")
-
-    # Add custom_instructions note
-    if custom_instructions:
-        warnings.append(f"[v3] custom_instructions not yet supported: {custom_instructions[:50]}")
-
-    # === Runtime quality gate ===
+
+def _light_validate(worksheet: dict, slots: list) -> tuple[bool, list[str], list[int]]:
+    with stage_timer("validation"):
+        return validate_worksheet(worksheet, slots)
+
+
+def _evict_failed_fills(slots: list, language: str, curriculum_ctx: str | None) -> None:
+    """Drop cached fills for slots that failed validation so the retry writes them fresh."""
+    from .fill_cache import get_fill_cache, is_enabled
+
+    if is_enabled():
+        get_fill_cache().invalidate(slots, language, curriculum_ctx)
+
+
+def _merge_retry_results(worksheet: dict, retry_filled: list[dict], warnings: list[str]) -> list[int]:
+    """Merge retried slot fills into the assembled worksheet in place. Returns the replaced slot numbers."""
+    replaced: list[int] = []
+    retry_by_slot = {}
+    for item in retry_filled:
+        retry_by_slot[item.get("slot", 0)] = item
+
+    for slot_num, fill_data in retry_by_slot.items():
+        idx = slot_num - 1
+        if 0 <= idx < len(worksheet["questions"]):
+            q = worksheet["questions"][idx]
+            if fill_data.get("text") and len(fill_data["text"]) >= 5:
+                q["text"] = fill_data["text"]
+                if fill_data.get("hint"):
+                    q["hint"] = fill_data["hint"]
+                if fill_data.get("explanation"):
+                    q["explanation"] = fill_data["explanation"]
+                if fill_data.get("options"):
+                    q["options"] = fill_data["options"]
+                warnings.append(f"Q{slot_num}: retried and replaced")
+                replaced.append(slot_num)
+    return replaced
+
+
+def _apply_quality_gate(
+    worksheet: dict, slots: list, topic: str, subject: str, grade_level: str, warnings: list[str]
+) -> None:
+    """Runtime quality gate — advisory only, stamps ``_quality_gate`` on the worksheet."""
     from app.services.v3.quality_gate import check_worksheet
 
-    gate_result = check_worksheet(
-        worksheet=worksheet,
-        slots=slot_output.slots,
-        topic=topic,
-        subject=subject,
-        grade_level=grade_level,
-    )
+    with stage_timer("quality_gate"):
+        gate_result = check_worksheet(
+            worksheet=worksheet,
+            slots=slots,
+            topic=topic,
+            subject=subject,
+            grade_level=grade_level,
+        )
 
     if gate_result.issues:
         warnings.extend([f"[quality_gate] {issue}" for issue in gate_result.issues])
@@ -232,7 +258,15 @@ def generate_worksheet_v3(
         "issues_count": len(gate_result.issues),
     }
 
-    # Step 6: Render HTML template (display-only, does NOT change question content)
+
+def _render_template(
+    worksheet: dict, grade_level: str, subject: str, topic: str, difficulty: str, board: str
+) -> tuple[dict, bool]:
+    """Step 6: Render HTML template (display-only, does NOT change question content).
+
+    Returns (worksheet, ok). ``ok`` is False when the Jinja render raised and the
+    caller should try the LLM html_renderer fallback.
+    """
     t_render = time.perf_counter()
     try:
         from .visual_strategy import enrich_visuals
@@ -244,25 +278,323 @@ def generate_worksheet_v3(
         worksheet["difficulty"] = difficulty
         worksheet["board"] = board
 
-        worksheet = enrich_visuals(worksheet)
+        with stage_timer("visual_enrichment"):
+            worksheet = enrich_visuals(worksheet)
 
-        rendered_html = render_worksheet_html(worksheet)
+        with stage_timer("template_render"):
+            rendered_html = render_worksheet_html(worksheet)
         if rendered_html:
             worksheet["rendered_html"] = rendered_html
             render_ms = int((time.perf_counter() - t_render) * 1000)
             logger.info("[v3] Template rendering took %dms", render_ms)
+        return worksheet, True
     except Exception as render_err:
         logger.warning("[v3] Template rendering failed (non-blocking): %s", render_err)
-        try:
-            from .html_renderer import render_worksheet_html as old_render
+        return worksheet, False
+
+
+def _render_fallback(client, worksheet: dict) -> None:
+    """LLM html_renderer fallback when the Jinja template fails."""
+    try:
+        from .html_renderer import render_worksheet_html as old_render
+
+        rendered_html = old_render(client, worksheet)
+        if rendered_html:
+            worksheet["rendered_html"] = rendered_html
+    except Exception as fallback_err:
+        logger.debug("[v3] html_renderer fallback also failed: %s", fallback_err)
+
+
+# ---------------------------------------------------------------------------
+# Entry points
+# ---------------------------------------------------------------------------
+def generate_worksheet_v3(
+    client,
+    board: str,
+    grade_level: str,
+    subject: str,
+    topic: str,
+    difficulty: str,
+    num_questions: int = 10,
+    language: str = "English",
+    problem_style: str = "standard",
+    custom_instructions: str | None = None,
+    child_id: str | None = None,
+) -> tuple[dict, int, list[str]]:
+    """V3 worksheet generation. Returns (worksheet_dict, elapsed_ms, warnings).
+
+    This function has the SAME return signature as the current generate_worksheet()
+    in worksheet_generator.py, making it easy to swap in.
+    """
+    with stage_labels(engine="v3", subject=subject, grade=grade_level):
+        t0 = time.perf_counter()
+        warnings: list[str] = []
+
+        adaptive_config = _resolve_adaptive_config(child_id, topic, subject, warnings)
+        slot_output = _build_slot_output(
+            board, grade_level, subject, topic, difficulty, num_questions, problem_style, language, adaptive_config
+        )
+
+        # Step 1.5: Fetch curriculum context (NCERT RAG)
+        curriculum_ctx = _fetch_curriculum_context(grade_level, subject, topic)
+        _log_curriculum_context(curriculum_ctx, subject, topic, warnings)
+
+        # Step 2: Fill with Gemini
+        t_fill = time.perf_counter()
+        filled = fill_slots(client, slot_output.slots, language, curriculum_context=curriculum_ctx)
+        fill_ms = int((time.perf_counter() - t_fill) * 1000)
+        logger.info("[v3] Gemini fill took %dms for %d slots", fill_ms, len(filled))
+
+        # Step 3: Assemble
+        worksheet = assemble_worksheet(slot_output, filled)
+
+        # Step 4: Light validation
+        passed, issues, failed_slots = _light_validate(worksheet, slot_output.slots)
+        warnings.extend(issues)
+
+        # Step 5: Retry failed slots (max 1 retry) — same bounded fan-out as the first fill
+        if not passed and failed_slots:
+            logger.info("[v3] Retrying %d failed slots: %s", len(failed_slots), failed_slots)
+            retry_slots = [s for s in slot_output.slots if s.slot_number in failed_slots]
+            if retry_slots:
+                _evict_failed_fills(retry_slots, language, curriculum_ctx)
+                retry_filled = fill_slots(client, retry_slots, language, curriculum_context=curriculum_ctx)
+                _merge_retry_results(worksheet, retry_filled, warnings)
+
+        # Add custom_instructions note
+        if custom_instructions:
+            warnings.append(f"[v3] custom_instructions not yet supported: {custom_instructions[:50]}")
+
+        _apply_quality_gate(worksheet, slot_output.slots, topic, subject, grade_level, warnings)
+
+        worksheet, rendered = _render_template(worksheet, grade_level, subject, topic, difficulty, board)
+        if not rendered:
+            _render_fallback(client, worksheet)
+
+        elapsed_ms = int((time.perf_counter() - t0) * 1000)
+        logger.info("[v3] Total generation: %dms, %d warnings", elapsed_ms, len(warnings))
+
+        return worksheet, elapsed_ms, warnings
+
+
+async def generate_worksheet_v3_async(
+    client,
+    board: str,
+    grade_level: str,
+    subject: str,
+    topic: str,
+    difficulty: str,
+    num_questions: int = 10,
+    language: str = "English",
+    problem_style: str = "standard",
+    custom_instructions: str | None = None,
+    child_id: str | None = None,
+) -> tuple[dict, int, list[str]]:
+    """Async V3 worksheet generation. Same arguments and return value as generate_worksheet_v3().
+
+    Curriculum retrieval, the Gemini fill and the failed-slot retry are awaited on
+    the caller's event loop, so a route can keep many generations in flight
+    without parking each one on a thread-pool slot, and a surrounding
+    ``asyncio.wait_for`` genuinely cancels the outstanding LLM calls.
+    """
+    with stage_labels(engine="v3", subject=subject, grade=grade_level):
+        t0 = time.perf_counter()
+        warnings: list[str] = []
+
+        # Mastery lookup is a short blocking DB read — keep it off the loop
+        adaptive_config = (
+            await asyncio.to_thread(_resolve_adaptive_config, child_id, topic, subject, warnings) if child_id else None
+        )
+        slot_output = _build_slot_output(
+            board, grade_level, subject, topic, difficulty, num_questions, problem_style, language, adaptive_config
+        )
+
+        # Step 1.5: Fetch curriculum context (NCERT RAG)
+        curriculum_ctx = await _fetch_curriculum_context_async(grade_level, subject, topic)
+        _log_curriculum_context(curriculum_ctx, subject, topic, warnings)
+
+        # Step 2: Fill with Gemini
+        t_fill = time.perf_counter()
+        filled = await fill_slots_async(client, slot_output.slots, language, curriculum_context=curriculum_ctx)
+        fill_ms = int((time.perf_counter() - t_fill) * 1000)
+        logger.info("[v3] Gemini fill took %dms for %d slots", fill_ms, len(filled))
+
+        # Step 3: Assemble
+        worksheet = assemble_worksheet(slot_output, filled)
+
+        # Step 4: Light validation
+        passed, issues, failed_slots = _light_validate(worksheet, slot_output.slots)
+        warnings.extend(issues)
+
+        # Step 5: Retry failed slots (max 1 retry) — same bounded fan-out as the first fill
+        if not passed and failed_slots:
+            logger.info("[v3] Retrying %d failed slots: %s", len(failed_slots), failed_slots)
+            retry_slots = [s for s in slot_output.slots if s.slot_number in failed_slots]
+            if retry_slots:
+                _evict_failed_fills(retry_slots, language, curriculum_ctx)
+                retry_filled = await fill_slots_async(client, retry_slots, language, curriculum_context=curriculum_ctx)
+                _merge_retry_results(worksheet, retry_filled, warnings)
+
+        if custom_instructions:
+            warnings.append(f"[v3] custom_instructions not yet supported: {custom_instructions[:50]}")
+
+        _apply_quality_gate(worksheet, slot_output.slots, topic, subject, grade_level, warnings)
+
+        worksheet, rendered = _render_template(worksheet, grade_level, subject, topic, difficulty, board)
+        if not rendered:
+            # The fallback renderer is a blocking LLM call
+            await asyncio.to_thread(_render_fallback, client, worksheet)
+
+        elapsed_ms = int((time.perf_counter() - t0) * 1000)
+        logger.info("[v3] Total generation: %dms, %d warnings", elapsed_ms, len(warnings))
+
+        return worksheet, elapsed_ms, warnings
+
+
+def _slot_plan(slot_output) -> dict:
+    """Worksheet skeleton sent before any LLM call — lets the UI lay out placeholders."""
+    return {
+        "num_questions": len(slot_output.slots),
+        "worksheet_meta": slot_output.worksheet_meta,
+        "slots": [
+            {
+                "slot_number": s.slot_number,
+                "question_type": s.question_type,
+                "role": s.role,
+                "difficulty": s.difficulty,
+                "skill_tag": s.skill_tag,
+                "visual_type": s.visual_type,
+            }
+            for s in slot_output.slots
+        ],
+    }
+
+
+def _issues_for(slot_num: int, issues: list[str]) -> list[str]:
+    prefix = f"Q{slot_num}:"
+    return [i for i in issues if i.startswith(prefix)]
+
+
+async def stream_worksheet_v3(
+    client,
+    board: str,
+    grade_level: str,
+    subject: str,
+    topic: str,
+    difficulty: str,
+    num_questions: int = 10,
+    language: str = "English",
+    problem_style: str = "standard",
+    custom_instructions: str | None = None,
+    child_id: str | None = None,
+) -> AsyncIterator[tuple[str, dict]]:
+    """Streaming V3 generation. Yields ``(event, payload)`` pairs:
+
+      plan          — slot skeleton, before any LLM call
+      question      — one per slot as its batch is filled and light-validated
+                      (again with ``retried=True`` if the retry replaced it)
+      quality_gate  — advisory verdict for the whole worksheet
+      html          — rendered worksheet HTML
+      done          — final worksheet, elapsed_ms and warnings (same as
+                      generate_worksheet_v3_async's return value)
+
+    Stages and outputs are the same as generate_worksheet_v3_async(); only the
+    order of delivery differs. Duplicate checks that span batches run once all
+    batches are in, so a question can still be flagged and retried after it
+    was first streamed.
+    """
+    with stage_labels(engine="v3", subject=subject, grade=grade_level):
+        t0 = time.perf_counter()
+        warnings: list[str] = []
+
+        adaptive_config = (
+            await asyncio.to_thread(_resolve_adaptive_config, child_id, topic, subject, warnings) if child_id else None
+        )
+        slot_output = _build_slot_output(
+            board, grade_level, subject, topic, difficulty, num_questions, problem_style, language, adaptive_config
+        )
+        yield "plan", _slot_plan(slot_output)
+
+        curriculum_ctx = await _fetch_curriculum_context_async(grade_level, subject, topic)
+        _log_curriculum_context(curriculum_ctx, subject, topic, warnings)
+
+        # Steps 2-4 per batch: fill → assemble → light-validate, streamed as each batch lands
+        t_fill = time.perf_counter()
+        filled: list[dict] = []
+        questions_by_slot: dict[int, dict] = {}
+        unfilled: list[int] = []
+        async for batch_slots, batch_filled in iter_fill_batches_async(
+            client, slot_output.slots, language, curriculum_context=curriculum_ctx
+        ):
+            filled.extend(batch_filled)
+            batch_questions = assemble_questions(slot_output, batch_filled, slots=batch_slots)
+            _, batch_issues, batch_failed = _light_validate({"questions": batch_questions}, batch_slots)
+            # A dropped batch assembles as placeholder text — flag it so the retry rewrites it
+            returned = {f.get("slot") for f in batch_filled}
+            for slot in batch_slots:
+                if slot.slot_number not in returned:
+                    unfilled.append(slot.slot_number)
+                    batch_issues.append(f"Q{slot.slot_number}: no fill returned")
+                    batch_failed.append(slot.slot_number)
+            for slot, q in zip(batch_slots, batch_questions):
+                questions_by_slot[slot.slot_number] = q
+                yield (
+                    "question",
+                    {
+                        "slot_number": slot.slot_number,
+                        "question": q,
+                        "issues": _issues_for(slot.slot_number, batch_issues),
+                        "failed": slot.slot_number in batch_failed,
+                    },
+                )
+        fill_ms = int((time.perf_counter() - t_fill) * 1000)
+        logger.info("[v3] Gemini fill (streamed) took %dms for %d slots", fill_ms, len(filled))
+
+        worksheet = assemble_worksheet(
+            slot_output, filled, questions=[questions_by_slot[s.slot_number] for s in slot_output.slots]
+        )
+
+        # Whole-worksheet validation picks up cross-batch duplicates
+        passed, issues, failed_slots = _light_validate(worksheet, slot_output.slots)
+        warnings.extend(issues)
+        if unfilled:
+            warnings.extend(f"Q{n}: no fill returned" for n in unfilled)
+            failed_slots = sorted(set(failed_slots) | set(unfilled))
+            passed = False
+
+        if not passed and failed_slots:
+            logger.info("[v3] Retrying %d failed slots: %s", len(failed_slots), failed_slots)
+            retry_slots = [s for s in slot_output.slots if s.slot_number in failed_slots]
+            if retry_slots:
+                _evict_failed_fills(retry_slots, language, curriculum_ctx)
+                retry_filled = await fill_slots_async(client, retry_slots, language, curriculum_context=curriculum_ctx)
+                for slot_num in _merge_retry_results(worksheet, retry_filled, warnings):
+                    yield (
+                        "question",
+                        {
+                            "slot_number": slot_num,
+                            "question": worksheet["questions"][slot_num - 1],
+                            "issues": [],
+                            "failed": False,
+                            "retried": True,
+                        },
+                    )
+
+        if custom_instructions:
+            warnings.append(f"[v3] custom_instructions not yet supported: {custom_instructions[:50]}")
+
+        _apply_quality_gate(worksheet, slot_output.slots, topic, subject, grade_level, warnings)
+        yield (
+            "quality_gate",
+            {**worksheet["_quality_gate"], "issues": [w for w in warnings if w.startswith("[quality_gate]")]},
+        )
 
-            rendered_html = old_render(client, worksheet)
-            if rendered_html:
-                worksheet["rendered_html"] = rendered_html
-        except Exception as fallback_err:
-            logger.debug("[v3] html_renderer fallback also failed: %s", fallback_err)
+        worksheet, rendered = _render_template(worksheet, grade_level, subject, topic, difficulty, board)
+        if not rendered:
+            await asyncio.to_thread(_render_fallback, client, worksheet)
+        yield "html", {"rendered_html": worksheet.get("rendered_html")}
 
-    elapsed_ms = int((time.perf_counter() - t0) * 1000)
-    logger.info("[v3] Total generation: %dms, %d warnings", elapsed_ms, len(warnings))
+        elapsed_ms = int((time.perf_counter() - t0) * 1000)
+        logger.info("[v3] Total streamed generation: %dms, %d warnings", elapsed_ms, len(warnings))
 
-    return worksheet, elapsed_ms, warnings
+        yield "done", {"worksheet": worksheet, "elapsed_ms": elapsed_ms, "warnings": warnings}
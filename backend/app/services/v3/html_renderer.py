@@ -244,6 +244,9 @@ def render_worksheet_html(client: object, worksheet: dict) -> str:
             ],
             temperature=0.3,
             max_tokens=12000,
+            # A second 12k-token render is not worth racing; the reply is HTML, not JSON
+            hedge=False,
+            expect_json=False,
         )
 
         html = response.choices[0].message.content.strip()
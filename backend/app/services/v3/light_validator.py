@@ -12,28 +12,22 @@ from __future__ import annotations
 
 import logging
 
+from app.services.question_analysis import analyze_text
+
 from .slot_builder import Slot
 
 logger = logging.getLogger(__name__)
 
 
-def _jaccard_similarity(text_a: str, text_b: str) -> float:
-    """Compute Jaccard similarity between two texts."""
-    words_a = set(text_a.lower().split())
-    words_b = set(text_b.lower().split())
-    if not words_a or not words_b:
-        return 0.0
-    intersection = words_a & words_b
-    union = words_a | words_b
-    return len(intersection) / len(union)
-
-
 def validate_worksheet(
     worksheet: dict,
     slots: list[Slot],
 ) -> tuple[bool, list[str], list[int]]:
     """Run 5 light checks on the assembled worksheet.
 
+    *slots* may be a subset (one streamed batch) as long as it lines up with
+    ``worksheet["questions"]``; issues are reported against its slot numbers.
+
     Returns:
         (passed, issues, failed_slot_numbers)
     """
@@ -43,9 +37,13 @@ def validate_worksheet(
 
     # Index slots by number
     slots_by_num = {s.slot_number: s for s in slots}
+    if len(slots) == len(questions):
+        numbers = [s.slot_number for s in slots]
+    else:
+        numbers = list(range(1, len(questions) + 1))
 
     for i, q in enumerate(questions):
-        slot_num = i + 1
+        slot_num = numbers[i]
         slot = slots_by_num.get(slot_num)
         text = q.get("text", "")
 
@@ -68,7 +66,7 @@ def validate_worksheet(
         # CHECK 3: Word count limit
         if slot:
             max_allowed = slot.max_words * 4  # generous limit
-            word_count = len(text.split())
+            word_count = analyze_text(text).word_count
             if word_count > max_allowed:
                 issues.append(f"Q{slot_num}: text too long ({word_count} words, max {max_allowed})")
 
@@ -79,7 +77,7 @@ def validate_worksheet(
             except (ValueError, IndexError):
                 age_start = 8
             max_question_words = 15 if age_start <= 7 else (20 if age_start <= 8 else 40)
-            word_count = len(text.split())
+            word_count = analyze_text(text).word_count
             if word_count > max_question_words:
                 issues.append(
                     f"Q{slot_num}: question too long for age {slot.age_range}"
@@ -118,13 +116,13 @@ def validate_worksheet(
                 failed_slots.append(slot_num)
 
     # CHECK 4: No duplicates (Jaccard similarity)
-    texts = [q.get("text", "") for q in questions]
-    for i in range(len(texts)):
-        for j in range(i + 1, len(texts)):
-            sim = _jaccard_similarity(texts[i], texts[j])
+    analyses = [analyze_text(q.get("text", "")) for q in questions]
+    for i in range(len(analyses)):
+        for j in range(i + 1, len(analyses)):
+            sim = analyses[i].jaccard(analyses[j])
             if sim >= 0.6:
-                issues.append(f"Q{i + 1} and Q{j + 1}: too similar (Jaccard={sim:.2f})")
-                failed_slots.append(j + 1)
+                issues.append(f"Q{numbers[i]} and Q{numbers[j]}: too similar (Jaccard={sim:.2f})")
+                failed_slots.append(numbers[j])
 
     passed = len(failed_slots) == 0
     if issues:
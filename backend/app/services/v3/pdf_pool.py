@@ -0,0 +1,290 @@
+"""Process pool for WeasyPrint PDF rendering.
+
+generate_pdf() is seconds of CPU (layout, font shaping). Called inline from
+an async handler it froze the event loop for every other request on the
+worker. PDFRenderPool runs it in dedicated processes instead:
+
+  - pre-warmed workers: the initializer renders a small worksheet once, so
+    WeasyPrint, fonts, the Google Fonts stylesheet and the Jinja templates are
+    loaded before the first real job; each worker then reuses one
+    FontConfiguration and the caching url_fetcher for every PDF
+  - admission control: at most PDF_POOL_WORKERS jobs running plus
+    PDF_POOL_QUEUE_SIZE waiting; beyond that render() raises PDFPoolBusy
+    (the handler answers 503 + Retry-After) instead of queueing without bound
+  - per-job timeout (PDF_RENDER_TIMEOUT_S); a crashed worker (BrokenProcessPool)
+    gets the pool rebuilt for the next job
+  - a timed-out job cannot be interrupted, so its pool is retired: new jobs
+    go to fresh workers, and the old workers (the stuck one included) are
+    killed once every job already submitted to them has passed its timeout
+
+PDF_POOL_WORKERS=0 renders in one background thread instead (dev machines,
+tests) — still off the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+WORKERS = int(os.getenv("PDF_POOL_WORKERS", "2"))
+QUEUE_SIZE = int(os.getenv("PDF_POOL_QUEUE_SIZE", "8"))
+RENDER_TIMEOUT_S = float(os.getenv("PDF_RENDER_TIMEOUT_S", "60"))
+RETRY_AFTER_S = int(os.getenv("PDF_POOL_RETRY_AFTER_S", "5"))
+
+_WARMUP_WORKSHEET = {
+    "title": "Warm-up",
+    "subject": "Maths",
+    "grade": "Class 3",
+    "questions": [
+        {
+            "text": "What time is it?",
+            "visual_type": "clock",
+            "visual_data": {"hour": 3, "minute": 0},
+            "correct_answer": "3:00",
+            "card_color": 1,
+        }
+    ],
+}
+
+
+class PDFPoolBusy(Exception):
+    """Admission control rejected the job — every worker busy and the queue full."""
+
+    def __init__(self, retry_after: int = RETRY_AFTER_S):
+        super().__init__("PDF render pool is at capacity")
+        self.retry_after = retry_after
+
+
+# -- Worker side ----------------------------------------------------------------
+
+_worker_font_config = None
+
+
+def _init_worker() -> None:
+    """Process initializer: load WeasyPrint and fetch fonts/stylesheets once."""
+    global _worker_font_config
+    try:
+        from weasyprint.text.fonts import FontConfiguration
+
+        from .pdf_renderer import caching_url_fetcher, generate_pdf
+
+        _worker_font_config = FontConfiguration()
+        generate_pdf(_WARMUP_WORKSHEET, font_config=_worker_font_config, url_fetcher=caching_url_fetcher)
+    except Exception as exc:
+        logger.warning("[v3] PDF worker warm-up failed: %s", exc)
+
+
+def render_job(worksheet: dict, pdf_type: str) -> bytes:
+    """Runs in a pool worker: generate_pdf() with the worker's warm font config."""
+    global _worker_font_config
+    from .pdf_renderer import caching_url_fetcher, generate_pdf
+
+    if _worker_font_config is None:
+        from weasyprint.text.fonts import FontConfiguration
+
+        _worker_font_config = FontConfiguration()
+    return generate_pdf(worksheet, pdf_type, font_config=_worker_font_config, url_fetcher=caching_url_fetcher)
+
+
+def _thread_render_job(worksheet: dict, pdf_type: str) -> bytes:
+    from .pdf_renderer import caching_url_fetcher, generate_pdf
+
+    return generate_pdf(worksheet, pdf_type, url_fetcher=caching_url_fetcher)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+# -- Pool ---------------------------------------------------------------------------
+
+
+class PDFRenderPool:
+    """Bounded, awaitable PDF rendering on worker processes."""
+
+    def __init__(
+        self,
+        workers: int = WORKERS,
+        queue_size: int = QUEUE_SIZE,
+        timeout_s: float = RENDER_TIMEOUT_S,
+        job: Callable[[dict, str], bytes] | None = None,
+        initializer: Callable[[], None] | None = _init_worker,
+    ):
+        self.workers = workers
+        self.capacity = max(1, workers) + queue_size
+        self.timeout_s = timeout_s
+        self._job = job or (render_job if workers > 0 else _thread_render_job)
+        self._initializer = initializer
+        self._executor: Executor | None = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "timeouts": 0,
+            "restarts": 0,
+            "recycled": 0,
+        }
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.workers > 0:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        # spawn: the API process runs threads (telemetry, executors) — unsafe to fork
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=self._initializer,
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-render")
+            return self._executor
+
+    def start(self) -> None:
+        """Spawn and warm every worker now instead of on the first export."""
+        executor = self._get_executor()
+        if self.workers > 0:
+            for _ in range(self.workers):
+                executor.submit(_ping)
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def render(self, worksheet: dict, pdf_type: str = "full") -> bytes:
+        """Render *worksheet* to PDF bytes off the event loop.
+
+        Raises PDFPoolBusy when the pool is at capacity and asyncio.TimeoutError
+        after PDF_RENDER_TIMEOUT_S.
+        """
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._stats["rejected"] += 1
+                raise PDFPoolBusy()
+            self._in_flight += 1
+            self._stats["submitted"] += 1
+
+        executor = self._get_executor()
+        try:
+            future = executor.submit(self._job, worksheet, pdf_type)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            self._restart_if_broken(executor)
+            raise
+        # The slot is held until the job really finishes (or its worker is killed) — a
+        # timed-out job still occupies a worker
+        future.add_done_callback(self._release)
+
+        try:
+            pdf_bytes = await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout_s)
+        except asyncio.TimeoutError:
+            self._count("timeouts")
+            logger.warning("[v3] PDF render timed out after %.0fs", self.timeout_s)
+            self._recycle(executor)
+            raise
+        except BrokenProcessPool:
+            self._count("failed")
+            self._restart_if_broken(executor)
+            raise
+        except Exception:
+            self._count("failed")
+            raise
+        self._count("completed")
+        return pdf_bytes
+
+    def _restart_if_broken(self, executor: Executor) -> None:
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            self._stats["restarts"] += 1
+        logger.error("[v3] PDF worker pool broken — rebuilding")
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _recycle(self, executor: Executor) -> None:
+        """Retire *executor* after a timed-out job left one of its workers busy.
+
+        Only process pools are recycled; a thread cannot be killed, so in thread
+        mode the job just keeps its slot until it finishes. Jobs already queued
+        on the old pool may still finish there; none is awaited for longer than
+        timeout_s, after which the old workers are killed.
+        """
+        if self.workers <= 0:
+            return
+        with self._lock:
+            if self._executor is not executor:
+                return  # already retired by another timed-out job
+            self._executor = None
+            self._stats["recycled"] += 1
+        logger.warning("[v3] PDF worker stuck on a timed-out job — recycling the pool")
+        # shutdown() forgets the worker processes, so take them first
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False)
+        timer = threading.Timer(self.timeout_s, _kill_workers, args=(processes,))
+        timer.daemon = True
+        timer.start()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "in_flight": self._in_flight,
+            }
+
+
+def _kill_workers(processes: list[multiprocessing.Process]) -> None:
+    """Kill a retired pool's workers; a job still running there fails with BrokenProcessPool."""
+    for process in processes:
+        if process.is_alive():
+            process.kill()
+
+
+# -- Singleton ----------------------------------------------------------------
+
+_pool: PDFRenderPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pdf_pool() -> PDFRenderPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PDFRenderPool()
+    return _pool
+
+
+def pdf_pool_stats() -> dict:
+    """Pool counters for /health/deep."""
+    return get_pdf_pool().stats()
+
+
+def shutdown_pdf_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
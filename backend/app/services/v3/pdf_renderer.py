@@ -2,22 +2,88 @@
 
 Replaces the 2644-line ReportLab pdf.py with a single function.
 Same HTML template used for screen display also produces the PDF.
+
+Long-lived callers (the pdf_pool workers) pass a shared FontConfiguration and
+a caching url_fetcher so web fonts and stylesheets are fetched and registered
+once per process instead of on every PDF. The fetcher's cache is an LRU capped
+at PDF_RESOURCE_CACHE_MAX_BYTES.
 """
 
 from __future__ import annotations
 
 import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
 
 logger = logging.getLogger(__name__)
 
+# url → fetched resource (Google Fonts CSS, woff2 files, images), least recently
+# used first. Capped in bytes: fonts and stylesheets are shared by every PDF and
+# stay hot, one-off images fall out.
+RESOURCE_CACHE_MAX_BYTES = int(os.getenv("PDF_RESOURCE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+_resource_cache: OrderedDict[str, dict] = OrderedDict()
+_resource_bytes = 0
+_resource_lock = threading.Lock()
+
+
+def _resource_size(resource: dict) -> int:
+    return len(resource.get("string") or b"")
+
+
+def caching_url_fetcher(url: str, *args, **kwargs) -> dict:
+    """WeasyPrint url_fetcher that keeps fetched resources in a bounded in-process LRU.
+
+    data: URLs are never cached — they carry their own content.
+    """
+    global _resource_bytes
+    if url.startswith("data:"):
+        from weasyprint import default_url_fetcher
+
+        return default_url_fetcher(url, *args, **kwargs)
+    with _resource_lock:
+        cached = _resource_cache.get(url)
+        if cached is not None:
+            _resource_cache.move_to_end(url)
+    if cached is None:
+        from weasyprint import default_url_fetcher
+
+        cached = default_url_fetcher(url, *args, **kwargs)
+        file_obj = cached.pop("file_obj", None)
+        if file_obj is not None:
+            try:
+                cached["string"] = file_obj.read()
+            finally:
+                file_obj.close()
+        size = _resource_size(cached)
+        if size <= RESOURCE_CACHE_MAX_BYTES:
+            with _resource_lock:
+                previous = _resource_cache.pop(url, None)
+                if previous is not None:
+                    _resource_bytes -= _resource_size(previous)
+                _resource_cache[url] = cached
+                _resource_bytes += size
+                while _resource_bytes > RESOURCE_CACHE_MAX_BYTES:
+                    _, evicted = _resource_cache.popitem(last=False)
+                    _resource_bytes -= _resource_size(evicted)
+    return dict(cached)
+
 
-def generate_pdf(worksheet: dict, pdf_type: str = "full") -> bytes:
+def generate_pdf(
+    worksheet: dict,
+    pdf_type: str = "full",
+    font_config: object | None = None,
+    url_fetcher: Callable | None = None,
+) -> bytes:
     """Generate PDF from worksheet dict.
 
     Args:
         worksheet: Enriched worksheet dict (visual_strategy already applied)
         pdf_type: "full" (questions + answers), "student" (questions only),
                   "answer_key" (answers only)
+        font_config: Reusable weasyprint FontConfiguration (new one per call if None)
+        url_fetcher: WeasyPrint url_fetcher (default fetcher if None)
 
     Returns:
         PDF file as bytes
@@ -28,7 +94,8 @@ def generate_pdf(worksheet: dict, pdf_type: str = "full") -> bytes:
     from .visual_strategy import enrich_visuals
     from .worksheet_template import render_worksheet_html
 
-    font_config = FontConfiguration()
+    if font_config is None:
+        font_config = FontConfiguration()
 
     # Enrich visuals if not already done
     if not worksheet.get("questions", [{}])[0].get("card_color"):
@@ -43,7 +110,10 @@ def generate_pdf(worksheet: dict, pdf_type: str = "full") -> bytes:
 
     html_string = render_worksheet_html(ws_copy)
 
-    html = HTML(string=html_string)
+    if url_fetcher is not None:
+        html = HTML(string=html_string, url_fetcher=url_fetcher)
+    else:
+        html = HTML(string=html_string)
     pdf_bytes = html.write_pdf(font_config=font_config)
 
     logger.info(
@@ -16,6 +16,8 @@ import logging
 import re
 from dataclasses import dataclass
 
+from app.services.question_analysis import analyze_text
+
 logger = logging.getLogger(__name__)
 
 
@@ -136,7 +138,7 @@ def check_worksheet(
 
     # === CHECK 11: Word count for young grades ===
     if grade_num <= 2:
-        long_questions = sum(1 for q in questions if len(q.get("text", "").split()) > 25)
+        long_questions = sum(1 for q in questions if analyze_text(q.get("text", "")).word_count > 25)
         if long_questions > 3:
             issues.append(f"[WARNING] {long_questions} questions exceed 25 words for Class {grade_num}")
 
@@ -1,18 +1,54 @@
-"""Render worksheet dict to beautiful HTML using Jinja2 template."""
+"""Render worksheet dict to beautiful HTML using Jinja2 template.
+
+Rendering is cached at three levels:
+  - compiled templates: a FileSystemBytecodeCache (JINJA_BYTECODE_CACHE_DIR) so a
+    fresh worker loads compiled template code instead of re-parsing ~1k lines of Jinja
+  - SVG visuals: svg_fragment() memoizes each macro's output per
+    (visual_type, visual_data) — the same clock / number line recurs across worksheets
+  - question body: the tiered question cards depend only on subject + questions,
+    so the full, student and answer-key variants of one worksheet render them once
+"""
 
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
 import math
 import os
+import tempfile
+import threading
+
+from cachetools import LRUCache
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from markupsafe import Markup
 
-from jinja2 import Environment, FileSystemLoader
+logger = logging.getLogger(__name__)
 
 TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "templates")
 
+# Empty string disables the on-disk bytecode cache
+BYTECODE_CACHE_DIR = os.getenv("JINJA_BYTECODE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "skolar-jinja"))
+SVG_FRAGMENT_CACHE_SIZE = int(os.getenv("V3_SVG_FRAGMENT_CACHE_SIZE", "2048"))
+QUESTION_BODY_CACHE_SIZE = int(os.getenv("V3_QUESTION_BODY_CACHE_SIZE", "256"))
+
+
+def _bytecode_cache() -> FileSystemBytecodeCache | None:
+    if not BYTECODE_CACHE_DIR:
+        return None
+    try:
+        os.makedirs(BYTECODE_CACHE_DIR, exist_ok=True)
+        return FileSystemBytecodeCache(BYTECODE_CACHE_DIR)
+    except OSError as exc:
+        logger.warning("[v3] Jinja bytecode cache disabled (%s): %s", BYTECODE_CACHE_DIR, exc)
+        return None
+
+
 # Not Flask — standalone Jinja2 with autoescape=True; XSS-safe.
 _env = Environment(  # nosemgrep: python.flask.security.xss.audit.direct-use-of-jinja2.direct-use-of-jinja2
     loader=FileSystemLoader(TEMPLATE_DIR),
     autoescape=True,
+    bytecode_cache=_bytecode_cache(),
 )
 
 # Register custom filters/globals for SVG math
@@ -26,6 +62,103 @@ _env.globals["max"] = max
 _env.globals["enumerate"] = enumerate
 
 
+# -- SVG fragment cache ----------------------------------------------------------
+
+# visual_type → macro call on partials/svg_visuals.html.j2 (defaults as in the template)
+_SVG_MACROS = {
+    "clock": lambda m, d: m.clock(d.get("hour", 12), d.get("minute", 0)),
+    "number_line": lambda m, d: m.number_line(
+        d.get("start", 0),
+        d.get("end", 20),
+        d.get("step", 1),
+        d.get("highlight"),
+        d.get("hops_from"),
+        d.get("hops_count"),
+    ),
+    "pie_fraction": lambda m, d: m.pie_fraction(d.get("numerator", 1), d.get("denominator", 4)),
+    "shapes": lambda m, d: m.shapes_visual(d.get("shapes", []), d.get("target", "")),
+    "base_ten_regrouping": lambda m, d: m.base_ten(d.get("numbers", []), d.get("operation", "+")),
+}
+
+_fragments: LRUCache = LRUCache(maxsize=SVG_FRAGMENT_CACHE_SIZE)
+_bodies: LRUCache = LRUCache(maxsize=QUESTION_BODY_CACHE_SIZE)
+_cache_lock = threading.Lock()
+_stats = {"svg_hits": 0, "svg_misses": 0, "body_hits": 0, "body_misses": 0}
+
+
+def _canonical(value: object) -> str | None:
+    try:
+        return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    except (TypeError, ValueError):
+        # Mixed-type keys can't be sorted — render without caching
+        return None
+
+
+def _lookup(cache: LRUCache, key: object, stat: str) -> Markup | None:
+    with _cache_lock:
+        html = cache.get(key) if key is not None else None
+        _stats[f"{stat}_hits" if html is not None else f"{stat}_misses"] += 1
+    return html
+
+
+def _store(cache: LRUCache, key: object, html: Markup) -> None:
+    if key is None:
+        return
+    with _cache_lock:
+        cache[key] = html
+
+
+def svg_fragment(visual_type: str, visual_data: dict) -> Markup:
+    """SVG markup for one visual, memoized by (visual_type, visual_data)."""
+    data_key = _canonical(visual_data)
+    key = (visual_type, data_key) if data_key is not None else None
+    html = _lookup(_fragments, key, "svg")
+    if html is None:
+        module = _env.get_template("partials/svg_visuals.html.j2").module
+        # Macro output is already autoescaped
+        html = Markup(_SVG_MACROS[visual_type](module, visual_data))  # noqa: S704
+        _store(_fragments, key, html)
+    return html
+
+
+_env.globals["svg_fragment"] = svg_fragment
+_env.globals["svg_visual_types"] = frozenset(_SVG_MACROS)
+
+
+# -- Question body (render once per worksheet content) -------------------------
+
+
+def _question_body(worksheet: dict) -> Markup:
+    # Only what question_body.html.j2 reads — variant flags (_hide_answers /
+    # _answers_only) and page chrome must not split the cache
+    content = {"subject": worksheet.get("subject"), "questions": worksheet.get("questions")}
+    raw = _canonical(content)
+    key = hashlib.sha256(raw.encode()).hexdigest() if raw is not None else None
+    html = _lookup(_bodies, key, "body")
+    if html is None:
+        template = _env.get_template("partials/question_body.html.j2")
+        # Template output is already autoescaped
+        rendered = template.render(
+            worksheet=content
+        )  # nosemgrep: python.flask.security.xss.audit.direct-use-of-jinja2.direct-use-of-jinja2
+        html = Markup(rendered)  # noqa: S704
+        _store(_bodies, key, html)
+    return html
+
+
+def template_cache_stats() -> dict:
+    with _cache_lock:
+        return {**_stats, "svg_size": len(_fragments), "body_size": len(_bodies)}
+
+
+def clear_template_caches() -> None:
+    with _cache_lock:
+        _fragments.clear()
+        _bodies.clear()
+        for name in _stats:
+            _stats[name] = 0
+
+
 def render_worksheet_html(worksheet: dict) -> str:
     """Render enriched worksheet to HTML string.
 
@@ -36,6 +169,7 @@ def render_worksheet_html(worksheet: dict) -> str:
         Complete HTML string ready for iframe display or WeasyPrint PDF.
     """
     template = _env.get_template("worksheet.html.j2")
+    question_body = "" if worksheet.get("_answers_only", False) else _question_body(worksheet)
     return template.render(
-        worksheet=worksheet
+        worksheet=worksheet, question_body=question_body
     )  # nosemgrep: python.flask.security.xss.audit.direct-use-of-jinja2.direct-use-of-jinja2
@@ -1363,6 +1363,8 @@ REQUIRED_VISUAL_FIELDS: dict[str, list[str]] = {
 }
 
 
+VALID_QUESTION_TYPES = {"mcq", "fill_blank", "true_false", "short_answer", "word_problem", "error_detection"}
+
 VALID_ROLES = {"recognition", "representation", "application", "error_detection", "thinking"}
 
 TIER_ORDER = {"recognition": 0, "representation": 0, "application": 1, "error_detection": 2, "thinking": 2}
@@ -1580,6 +1582,18 @@ def _pad_mcq_to_target(
     question["options"] = opts
 
 
+def _fit_mcq_options(question: dict, subject: str) -> None:
+    """Trim an MCQ to 4 options (keeping the correct one) or pad it up to 4."""
+    opts = question.get("options") or []
+    correct = question.get("correct_answer", "")
+    if len(opts) > 4:
+        # Keep correct answer + first 3 others
+        others = [o for o in opts if o != correct][:3]
+        question["options"] = others + [correct] if correct not in others else opts[:4]
+    elif 1 <= len(opts) < 4:
+        _pad_mcq_to_target(question, subject, target=4)
+
+
 def fix_mcq_options(questions: list[dict], subject: str = "Maths") -> list[dict]:
     """Ensure MCQ questions have options, downgrade to short_answer if not."""
     MCQ_PHRASES = ["which of these", "which one of", "which of the following", "which animal", "which option"]
@@ -2139,7 +2153,6 @@ def validate_response(
         raise ValueError("LLM returned no questions")
 
     # --- Schema check ---
-    valid_types = {"mcq", "fill_blank", "true_false", "short_answer", "word_problem", "error_detection"}
     for i, q in enumerate(questions):
         qid = q.get("id") or f"q{i + 1}"
         q["id"] = qid
@@ -2151,7 +2164,7 @@ def validate_response(
             warnings.append(f"{qid}: missing correct_answer")
 
         q_type = q.get("type", "short_answer")
-        if q_type not in valid_types:
+        if q_type not in VALID_QUESTION_TYPES:
             q["type"] = "short_answer"
             warnings.append(f"[type_error] {qid}: unknown type '{q_type}', defaulted to short_answer")
 
@@ -2163,13 +2176,7 @@ def validate_response(
             opts = q.get("options") or []
             if len(opts) != 4:
                 warnings.append(f"{qid}: MCQ should have 4 options, got {len(opts)}")
-                correct = q.get("correct_answer", "")
-                if len(opts) > 4:
-                    # Keep correct answer + first 3 others
-                    others = [o for o in opts if o != correct][:3]
-                    q["options"] = others + [correct] if correct not in others else opts[:4]
-                elif 1 <= len(opts) < 4:
-                    _pad_mcq_to_target(q, subject, target=4)
+                _fit_mcq_options(q, subject)
 
     # --- Strip banned MCQ options (English + Hindi) ---
     _banned_mcq = {
@@ -2337,6 +2344,132 @@ def _extract_repeated_templates(questions: list[dict], threshold: int = 3) -> li
     return [tmpl for tmpl, cnt in counts.most_common() if cnt >= threshold]
 
 
+# ---------------------------------------------------------------------------
+# Question-level repair — replace only the offending questions on retry
+# ---------------------------------------------------------------------------
+
+# Above this share of offending questions a full regeneration is cheaper
+REPAIR_MAX_FRACTION = 0.5
+
+# OutputValidator per-question errors start with the question id ("q3: MCQ needs ...")
+_ERROR_QID_RE = re.compile(r"^([^\s:]+): ")
+
+
+def _repeated_pattern_problems(questions: list[dict], attr: str, threshold: int) -> dict[int, str]:
+    """Index → problem for every repeat after the first of a template shared by >= *threshold* questions.
+
+    *attr* is the QuestionAnalysis template the validator compared
+    ("template" for near-duplicates, "deep_template" for sentence diversity).
+    """
+    from collections import Counter
+
+    from app.services.question_analysis import analyze_text
+
+    templates = [getattr(analyze_text(q.get("text", "")), attr) for q in questions]
+    counts = Counter(templates)
+    seen: set[str] = set()
+    problems: dict[int, str] = {}
+    for i, tmpl in enumerate(templates):
+        if counts[tmpl] < threshold:
+            continue
+        if tmpl in seen:
+            problems[i] = f'repeats the sentence pattern "{tmpl}" — use a different structure'
+        seen.add(tmpl)
+    return problems
+
+
+def _error_problems(questions: list[dict], errors: list[str]) -> dict[int, str] | None:
+    """Index → problem for validation errors; None if any error is not tied to one question."""
+    index = {str(q.get("id")): i for i, q in enumerate(questions)}
+    problems: dict[int, str] = {}
+    for err in errors:
+        m = _ERROR_QID_RE.match(err)
+        if not m or m.group(1) not in index:
+            return None
+        problems.setdefault(index[m.group(1)], err[m.end() :])
+    return problems
+
+
+def _plan_repair(questions: list[dict], problems: dict[int, str] | None) -> dict[int, str] | None:
+    """Return *problems* if replacing just those questions is worth it, else None."""
+    if not problems or len(problems) > len(questions) * REPAIR_MAX_FRACTION:
+        return None
+    return problems
+
+
+def _repair_questions(
+    client,
+    system_prompt: str,
+    data: dict[str, Any],
+    problems: dict[int, str],
+    grade_level: str,
+    subject: str,
+    topic: str,
+    difficulty: str,
+) -> list[str]:
+    """Regenerate only the questions at *problems*' indices and splice them into *data*.
+
+    The rest of the worksheet is sent as context so the replacements do not
+    repeat it. Replacements keep the original id, role and (unless the LLM
+    returns another supported type) type, so tier ordering and the question
+    count are unchanged. They go through the same per-question clean-up as
+    ``validate_response``. Returns warnings; raises ValueError if the LLM
+    response is unusable.
+    """
+    questions = data["questions"]
+    slots = sorted(problems)
+    kept = [q.get("text", "") for i, q in enumerate(questions) if i not in problems]
+
+    prompt = (
+        f"Replace {len(slots)} question(s) in a {grade_level} {subject} worksheet "
+        f"about '{topic}' at {difficulty} difficulty.\n\n"
+        "These questions stay in the worksheet. Do NOT repeat their wording or sentence structure:\n"
+    )
+    prompt += "".join(f'  - "{text}"\n' for text in kept)
+    prompt += "\nWrite one new question for each slot below and fix the problem noted:\n"
+    for n, i in enumerate(slots, 1):
+        q = questions[i]
+        prompt += f"  {n}. type={q.get('type', 'short_answer')}, role={q.get('role', 'application')} — {problems[i]}\n"
+    prompt += (
+        f"\nReturn ONLY a JSON array of exactly {len(slots)} question objects, in slot order, "
+        "with the same schema as before (type, text, correct_answer, options if MCQ, explanation)."
+    )
+
+    raw = call_gemini(client, system_prompt, prompt, subject=subject, difficulty=difficulty, num_questions=len(slots))
+    match = re.search(r"\[.*\]", raw, re.DOTALL)
+    if not match:
+        raise ValueError("repair response has no JSON array")
+    fresh = json.loads(match.group())
+    if not isinstance(fresh, list) or len(fresh) != len(slots) or not all(isinstance(q, dict) for q in fresh):
+        raise ValueError(f"expected {len(slots)} replacement question(s), got {fresh!r:.80}")
+
+    warnings: list[str] = []
+    is_maths = subject.lower() in ("maths", "mathematics", "math")
+    for nq, i in zip(fresh, slots):
+        old = questions[i]
+        nq["id"] = old.get("id")
+        nq["role"] = old.get("role")
+        if nq.get("type") not in VALID_QUESTION_TYPES:
+            nq["type"] = old.get("type", "short_answer")
+        nq["format"] = nq["type"]
+        if nq["type"] == "mcq":
+            _fit_mcq_options(nq, subject)
+        if is_maths:
+            correction = _verify_maths_answer(nq)
+            if correction is not None:
+                nq["correct_answer"] = correction
+                warnings.append(f"{nq['id']}: answer auto-corrected to {correction}")
+
+    fresh = validate_visual_data(fix_visual_types(fresh))
+    fresh = resolve_question_images(fresh)
+    fresh = fix_mcq_options(fix_true_false_options(fresh, subject=subject), subject=subject)
+    fresh = strip_phantom_image_refs(_cleanup_question_text(fresh))
+
+    for nq, i in zip(fresh, slots):
+        questions[i] = nq
+    return warnings
+
+
 def generate_worksheet(
     client,
     board: str,
@@ -2435,15 +2568,44 @@ def generate_worksheet(
     last_error: Exception | None = None
     all_warnings: list[str] = list(curriculum_warnings)
     _gen_ctx = None
+    # Retry by question-level repair: index → problem, and the note a full
+    # regeneration would append to the prompt if the repair fails.
+    pending_repair: dict[int, str] | None = None
+    repair_note = ""
+    data: dict[str, Any] = {}
 
     for attempt in range(1, max_attempts + 1):
         t0 = time.perf_counter()
         try:
             system_prompt = build_system_prompt(problem_style, subject)
-            raw = call_gemini(
-                client, system_prompt, user_prompt, subject=subject, difficulty=difficulty, num_questions=num_questions
-            )
-            data, warnings = validate_response(raw, subject, topic, num_questions, difficulty, problem_style)
+            repair, pending_repair = pending_repair, None
+            repaired: list[int] | None = None
+            if repair:
+                try:
+                    warnings = _repair_questions(
+                        client, system_prompt, data, repair, grade_level, subject, topic, difficulty
+                    )
+                    repaired = sorted(repair)
+                    all_warnings.append(
+                        f"[repair] Replaced {len(repaired)}/{len(data['questions'])} question(s) "
+                        f"({', '.join(str(data['questions'][i].get('id')) for i in repaired)}) "
+                        "instead of regenerating the worksheet"
+                    )
+                    logger.info("[v2] Attempt %d: repaired %d question(s)", attempt, len(repaired))
+                except Exception as exc:
+                    logger.warning("[v2] Attempt %d: question repair failed, regenerating: %s", attempt, exc)
+                    all_warnings.append(f"[repair] Targeted repair failed, regenerating the worksheet: {exc}")
+                    user_prompt += repair_note
+            if repaired is None:
+                raw = call_gemini(
+                    client,
+                    system_prompt,
+                    user_prompt,
+                    subject=subject,
+                    difficulty=difficulty,
+                    num_questions=num_questions,
+                )
+                data, warnings = validate_response(raw, subject, topic, num_questions, difficulty, problem_style)
             elapsed_ms = int((time.perf_counter() - t0) * 1000)
             all_warnings.extend(warnings)
 
@@ -2480,13 +2642,7 @@ def generate_worksheet(
                             tq["id"] = f"q{len(questions) + idx + 1}"
                             # Pad/trim MCQ options (topup skips validate_response)
                             if tq.get("type") == "mcq":
-                                opts = tq.get("options") or []
-                                correct = tq.get("correct_answer", "")
-                                if len(opts) > 4:
-                                    others = [o for o in opts if o != correct][:3]
-                                    tq["options"] = others + [correct] if correct not in others else opts[:4]
-                                elif 1 <= len(opts) < 4:
-                                    _pad_mcq_to_target(tq, subject, target=4)
+                                _fit_mcq_options(tq, subject)
                         data["questions"] = questions + topup_qs
                         all_warnings.append(
                             f"[topup] Generated {len(topup_qs)} extra question(s) to reach {num_questions}"
@@ -2497,6 +2653,10 @@ def generate_worksheet(
                     all_warnings.append(f"[topup] Backfill failed: {exc}")
 
             # ── Output validation ──
+            # After a repair the whole worksheet is re-validated (duplicate and
+            # diversity checks compare questions), but per-question analyses and
+            # answer verdicts of the untouched questions come from the shared
+            # question_analysis cache, so only the replaced questions are analysed.
             from app.services.output_validator import get_validator
 
             validator = get_validator()
@@ -2544,8 +2704,14 @@ def generate_worksheet(
                     child_context={},
                 )
 
-                # Map v2 field names → v1 for QualityReviewer
+                # Map v2 field names → v1 for QualityReviewer. After a repair
+                # only the replaced questions are reviewed; the others were
+                # reviewed (and corrected in place) on the previous attempt but
+                # still count towards worksheet-level targets like framing.
                 _v2_questions = data.get("questions", [])
+                _reviewed: set[int] = set()
+                if repaired is not None:
+                    _reviewed = set(range(len(_v2_questions))) - set(repaired)
                 for _q in _v2_questions:
                     if "text" in _q and "question_text" not in _q:
                         _q["question_text"] = _q["text"]
@@ -2554,7 +2720,7 @@ def generate_worksheet(
                     if "type" in _q and "slot_type" not in _q:
                         _q["slot_type"] = _q["type"]
 
-                _review = get_quality_reviewer().review_worksheet(_v2_questions, _gen_ctx)
+                _review = get_quality_reviewer().review_worksheet(_v2_questions, _gen_ctx, reviewed=_reviewed)
 
                 # Map v1 corrections back → v2
                 for _q in _review.questions:
@@ -2615,9 +2781,15 @@ def generate_worksheet(
                     for tmpl in repeated[:3]:
                         neg += f'  - "{tmpl}"\n'
                     neg += "Each question MUST have a DIFFERENT sentence structure.\n"
-                    user_prompt += neg
                     all_warnings.append(f"Retry {attempt}: near-duplicate patterns detected")
                     logger.warning("[v2] Attempt %d: near-duplicates, retrying", attempt)
+                    pending_repair = _plan_repair(
+                        data["questions"], _repeated_pattern_problems(data["questions"], "template", 3)
+                    )
+                    if pending_repair:
+                        repair_note = neg
+                    else:
+                        user_prompt += neg
                     continue
 
             # Sentence diversity retry — deep template analysis
@@ -2629,9 +2801,15 @@ def generate_worksheet(
                     for tmpl in deep_templates[:3]:
                         neg += f'  - "{tmpl}"\n'
                     neg += "Each question MUST have a DIFFERENT sentence structure.\n"
-                    user_prompt += neg
                     all_warnings.append(f"Retry {attempt}: sentence diversity too low")
                     logger.warning("[v2] Attempt %d: sentence diversity too low, retrying", attempt)
+                    pending_repair = _plan_repair(
+                        data["questions"], _repeated_pattern_problems(data["questions"], "deep_template", 2)
+                    )
+                    if pending_repair:
+                        repair_note = neg
+                    else:
+                        user_prompt += neg
                     continue
 
             # Unknown type retry — LLM returned types we don't support
@@ -2667,11 +2845,25 @@ def generate_worksheet(
                         f"correct is '{debug.get('computed', '?')}'"
                     )
                 feedback = "; ".join(feedback_parts)
-                user_prompt += (
+                note = (
                     f"\n\nCRITICAL — WRONG ANSWERS DETECTED:\n{feedback}\n"
                     "Regenerate these questions with the CORRECT answers. "
                     "Double-check every arithmetic calculation."
                 )
+                pending_repair = _plan_repair(
+                    data["questions"],
+                    {
+                        i: f"the answer '{q.get('answer', q.get('correct_answer', ''))}' was wrong "
+                        f"(correct is '{q.get('_answer_mismatch_debug', {}).get('computed', '?')}') — "
+                        "double-check the arithmetic"
+                        for i, q in enumerate(data["questions"])
+                        if q.get("_answer_mismatch")
+                    },
+                )
+                if pending_repair:
+                    repair_note = note
+                else:
+                    user_prompt += note
                 all_warnings.append(f"Retry {attempt}: {len(mismatched)} answer mismatch(es)")
                 logger.warning(
                     "[v2] Attempt %d: %d answer mismatches, retrying: %s", attempt, len(mismatched), feedback
@@ -2681,10 +2873,22 @@ def generate_worksheet(
             # Math unverified retry — questions where arithmetic check failed
             unverified = [q for q in data.get("questions", []) if q.get("_math_unverified")]
             if len(unverified) > 2 and attempt < max_attempts:
-                user_prompt += (
+                note = (
                     "\n\nCRITICAL: Every arithmetic question must have a verifiably correct answer. "
                     "Show your working: state the expression and its result clearly."
                 )
+                pending_repair = _plan_repair(
+                    data["questions"],
+                    {
+                        i: "the answer could not be verified — state the expression and its result clearly"
+                        for i, q in enumerate(data["questions"])
+                        if q.get("_math_unverified")
+                    },
+                )
+                if pending_repair:
+                    repair_note = note
+                else:
+                    user_prompt += note
                 all_warnings.append(f"Retry {attempt}: {len(unverified)} math answers unverifiable")
                 logger.warning("[v2] Attempt %d: %d unverified math answers, retrying", attempt, len(unverified))
                 continue
@@ -2700,12 +2904,17 @@ def generate_worksheet(
             ]
             if serious_errors and attempt < max_attempts:
                 feedback = "; ".join(serious_errors[:3])
-                user_prompt += (
+                note = (
                     f"\n\nFIX THESE ERRORS in your next attempt:\n{feedback}\n"
                     "Every MCQ answer must be one of the options. "
                     "Every question must have non-empty text. "
                     "Every math answer must be correct."
                 )
+                pending_repair = _plan_repair(data["questions"], _error_problems(data["questions"], serious_errors))
+                if pending_repair:
+                    repair_note = note
+                else:
+                    user_prompt += note
                 all_warnings.append(f"Retry {attempt}: {len(serious_errors)} validation error(s)")
                 logger.warning(
                     "[v2] Attempt %d: %d serious validation errors, retrying: %s",
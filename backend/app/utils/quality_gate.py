@@ -17,6 +17,8 @@ Field conventions understood:
 import re
 from typing import List, Tuple
 
+from app.services.question_analysis import analyze_text
+
 FORBIDDEN_CLASS_1_2 = [
     "explain why",
     "explain how",
@@ -126,21 +128,21 @@ def run_quality_gate(worksheet: dict) -> Tuple[bool, List[str]]:
     # Jaccard threshold lowered to 0.50 (was 0.60) to catch closer paraphrases.
     # CONCEPT_DUPLICATE fires when both questions share a content word (len > 4)
     # regardless of phrasing similarity — catches same concept retested.
-    for i, q1 in enumerate(questions):
-        for j, q2 in enumerate(questions[i + 1 :], i + 1):
-            t1 = _q_text(q1)
-            t2 = _q_text(q2)
-            sim = jaccard(t1, t2)
+    analyses = [analyze_text(_q_text(q)) for q in questions]
+    for i, a1 in enumerate(analyses):
+        for j, a2 in enumerate(analyses[i + 1 :], i + 1):
+            q1, q2 = questions[i], questions[j]
+            sim = a1.jaccard(a2)
             if sim > 0.50:
                 n1 = _q_number(q1, i + 1)
                 n2 = _q_number(q2, j + 1)
                 failures.append(f"DUPLICATE: Q{n1} and Q{n2} ({int(sim * 100)}% overlap)")
-            times1, times2 = extract_times(t1), extract_times(t2)
+            times1, times2 = a1.times, a2.times
             if len(times1) >= 2 and times1 == times2:
                 n1 = _q_number(q1, i + 1)
                 n2 = _q_number(q2, j + 1)
                 failures.append(f"DUPLICATE_TIMES: Q{n1} and Q{n2} share identical times")
-            shared = _content_words(t1) & _content_words(t2)
+            shared = a1.content_words & a2.content_words
             if shared:
                 n1 = _q_number(q1, i + 1)
                 n2 = _q_number(q2, j + 1)
@@ -18,7 +18,7 @@ import traceback
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from app.services.ai_client import get_openai_compat_client
-from app.services.v3 import generate_worksheet_v3
+from app.services.v3 import generate_worksheet_v3_async
 
 TEST_CASES = [
     ("WS-01", "Class 1", "Maths", "Addition (single digit)", "easy", 10, "English"),
@@ -174,7 +174,7 @@ async def run_audit():
         print(f"{'─' * 60}")
 
         try:
-            data, elapsed_ms, warnings = await generate_worksheet_v3(
+            data, elapsed_ms, warnings = await generate_worksheet_v3_async(
                 client=client,
                 board="CBSE",
                 grade_level=grade,
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for worksheet generation, offline and without Gemini costs.
+
+Drives the real FastAPI app (app.main.app) in-process over ASGI at a chosen
+concurrency and POSTs to:
+
+  v3 — /api/v3/worksheets/generate
+  v2 — /api/v2/worksheets/generate (WORKSHEET_ENGINE=v3, the production default)
+
+The LLM is replaced by FakeLLM, an in-process stand-in for OpenAICompatAdapter
+with configurable latency and jitter. It replays responses recorded from real
+Gemini calls (--cassette, captured with --record) and synthesizes plausible
+slot fills for any prompt the cassette does not cover. Auth, the usage RPC
+and the curriculum RAG lookup are stubbed, so every other stage is the real
+production code.
+
+Reports RPS, end-to-end request latency, p50/p95/p99 for each pipeline stage
+(slot_build, curriculum_rag, gemini_batch, validation, quality_gate,
+template_render, …) from app.services.metrics, and peak RSS. --save-baseline
+writes the results to JSON. --baseline compares against a saved file and
+exits 1 when a stage's p95 or the RPS is worse than --tolerance. This
+catches slot_builder, validator or rendering regressions before they ship.
+
+scripts/bench_baselines/generate.json is the committed baseline, recorded
+with the flags below (zero LLM latency, so only our own code is timed).
+Re-record it with --save-baseline when a change is meant to move the
+numbers, or when benchmarking on different hardware.
+
+Run as:
+    python scripts/bench_generate.py
+    python scripts/bench_generate.py --route v3 --concurrency 50 --requests 500 --latency-ms 800 --jitter-ms 300
+    python scripts/bench_generate.py --latency-ms 0 --jitter-ms 0 --seed 0 --baseline scripts/bench_baselines/generate.json
+    python scripts/bench_generate.py --latency-ms 0 --jitter-ms 0 --seed 0 --save-baseline scripts/bench_baselines/generate.json
+    python scripts/bench_generate.py --record cassette.jsonl --requests 5   # real Gemini, costs money
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import re
+import resource
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from unittest.mock import patch
+
+# Ensure backend is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# Settings need these before any app import; the benchmark never talks to them
+os.environ.setdefault("SUPABASE_URL", "https://bench.supabase.co")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "bench-service-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench-service-key")
+os.environ.setdefault("GEMINI_API_KEY", "bench-gemini-key")
+# Cached fills would turn every request after the first few into a cache benchmark
+os.environ.setdefault("V3_FILL_CACHE_ENABLED", "0")
+
+import httpx  # noqa: E402
+
+from app.core.deps import get_openai_compat_client, get_supabase_client, get_user_id  # noqa: E402
+from app.middleware.rate_limit import limiter  # noqa: E402
+from app.services.metrics import capture_stage_samples  # noqa: E402
+
+ROUTES = {
+    "v2": "/api/v2/worksheets/generate",
+    "v3": "/api/v3/worksheets/generate",
+}
+USER_ID = "bench-user"
+
+# A spread of subjects, grades and question counts so slot_builder, the
+# validators and the renderer all see more than one topic profile
+WORKLOAD: list[dict] = [
+    {"grade_level": "Class 3", "subject": "Maths", "topic": "Addition (carries)", "num_questions": 10},
+    {"grade_level": "Class 3", "subject": "Maths", "topic": "Subtraction (borrowing)", "num_questions": 10},
+    {"grade_level": "Class 3", "subject": "Maths", "topic": "Multiplication (tables 2-10)", "num_questions": 15},
+    {"grade_level": "Class 3", "subject": "Maths", "topic": "Time (reading clock, calendar)", "num_questions": 10},
+    {"grade_level": "Class 3", "subject": "English", "topic": "Nouns (Class 3)", "num_questions": 10},
+    {"grade_level": "Class 4", "subject": "English", "topic": "Tenses (Class 4)", "num_questions": 5},
+]
+
+_SLOT_RE = re.compile(r"^SLOT (\d+):", re.MULTILINE)
+
+
+# -- Fake LLM -------------------------------------------------------------------
+
+
+class _Resp:
+    def __init__(self, text: str):
+        self.choices = [type("C", (), {"message": type("M", (), {"content": text})()})()]
+
+
+def _slots_in(messages: list[dict]) -> tuple[int, ...]:
+    user = next((m["content"] for m in messages if m["role"] == "user"), "")
+    return tuple(int(n) for n in _SLOT_RE.findall(user))
+
+
+def synthesize_fill(slots: tuple[int, ...]) -> str:
+    """A plausible filled-slot JSON array answering every SLOT n in the prompt."""
+    return json.dumps(
+        [
+            {
+                "slot": n,
+                "text": f"Riya has {n + 10} mangoes and buys {n + 3} more. How many mangoes does she have now?",
+                "correct_answer": str(2 * n + 13),
+                "hint": "Add the two numbers",
+                "explanation": f"{n + 10} + {n + 3} = {2 * n + 13}",
+                "options": None,
+            }
+            for n in slots
+        ]
+    )
+
+
+def load_cassette(path: str | Path) -> dict[tuple[int, ...], list[str]]:
+    """Recorded responses by the SLOT numbers they answered (JSONL: {"slots": [...], "content": "..."})."""
+    recorded: dict[tuple[int, ...], list[str]] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                recorded.setdefault(tuple(entry["slots"]), []).append(entry["content"])
+    return recorded
+
+
+class FakeLLM:
+    """Stand-in for OpenAICompatAdapter: recorded or synthesized replies after a simulated delay.
+
+    Each call waits ``latency_ms ± jitter_ms`` (uniform, never negative).
+    ``acreate`` sleeps on the event loop, like the native async Gemini client.
+    ``create`` blocks its thread, like the sync one.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        cassette: dict[tuple[int, ...], list[str]] | None = None,
+        seed: int = 0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._replay = {k: itertools.cycle(v) for k, v in (cassette or {}).items()}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.replayed = 0
+        self.chat = type("Chat", (), {"completions": self})()
+
+    def _delay(self) -> float:
+        with self._lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def _respond(self, messages: list[dict]) -> _Resp:
+        slots = _slots_in(messages)
+        with self._lock:
+            self.calls += 1
+            replay = self._replay.get(slots)
+            if replay is not None:
+                self.replayed += 1
+                return _Resp(next(replay))
+        return _Resp(synthesize_fill(slots))
+
+    def create(self, messages=None, **kwargs):
+        time.sleep(self._delay())
+        return self._respond(messages or [])
+
+    async def acreate(self, messages=None, **kwargs):
+        await asyncio.sleep(self._delay())
+        return self._respond(messages or [])
+
+
+class RecordingLLM:
+    """Wraps a real OpenAICompatAdapter and appends every reply to a cassette file."""
+
+    def __init__(self, inner, path: str | Path):
+        self._inner = inner.chat.completions
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self.chat = type("Chat", (), {"completions": self})()
+
+    def _record(self, messages: list[dict], resp):
+        entry = {"slots": list(_slots_in(messages)), "content": resp.choices[0].message.content or ""}
+        with self._lock, self._path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return resp
+
+    def create(self, messages=None, **kwargs):
+        return self._record(messages or [], self._inner.create(messages=messages, **kwargs))
+
+    async def acreate(self, messages=None, **kwargs):
+        return self._record(messages or [], await self._inner.acreate(messages=messages, **kwargs))
+
+
+# -- App wiring -----------------------------------------------------------------
+
+
+class _UsageRpc:
+    def execute(self):
+        return type("R", (), {"data": [{"allowed": True, "tier": "paid", "remaining": None, "message": ""}]})()
+
+
+class _UsageDb:
+    """Answers check_and_increment_usage()'s RPC; the generate routes touch nothing else."""
+
+    def rpc(self, name: str, params: dict) -> _UsageRpc:
+        return _UsageRpc()
+
+
+@contextmanager
+def bench_app(llm, rag_ms: float = 0.0) -> Iterator:
+    """app.main.app with auth, usage, LLM and curriculum RAG stubbed; restored on exit."""
+    from app.main import app
+
+    async def _curriculum_context(grade: str, subject: str, topic: str) -> str | None:
+        if rag_ms:
+            await asyncio.sleep(rag_ms / 1000)
+        return None
+
+    db = _UsageDb()
+    saved = dict(app.dependency_overrides)
+    app.dependency_overrides[get_user_id] = lambda: USER_ID
+    app.dependency_overrides[get_supabase_client] = lambda: db
+    app.dependency_overrides[get_openai_compat_client] = lambda: llm
+    limiter_enabled, limiter.enabled = limiter.enabled, False
+    try:
+        with (
+            patch.dict(os.environ, {"WORKSHEET_ENGINE": "v3"}),
+            patch("app.services.curriculum.get_curriculum_context", _curriculum_context),
+        ):
+            yield app
+    finally:
+        limiter.enabled = limiter_enabled
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(saved)
+
+
+# -- Load -----------------------------------------------------------------------
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """p50/p95/p99 in milliseconds (nearest-rank)."""
+    if not samples:
+        return {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+    ordered = sorted(samples)
+
+    def rank(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1e3
+
+    return {"count": len(ordered), "p50_ms": rank(0.50), "p95_ms": rank(0.95), "p99_ms": rank(0.99)}
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def run_load(app, route: str, concurrency: int, total: int, workload: list[dict] | None = None) -> dict:
+    """POST *total* generate requests to *route*, *concurrency* in flight; return throughput and latencies."""
+    workload = workload or WORKLOAD
+    sem = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://app", timeout=120) as client:
+
+        async def one(i: int) -> None:
+            body = {"board": "CBSE", "difficulty": "medium", **workload[i % len(workload)]}
+            async with sem:
+                t0 = time.perf_counter()
+                resp = await client.post(ROUTES[route], json=body)
+                latencies.append(time.perf_counter() - t0)
+            statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+
+        with capture_stage_samples() as stages:
+            t0 = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(total)))
+            elapsed = time.perf_counter() - t0
+
+    return {
+        "route": route,
+        "concurrency": concurrency,
+        "requests": total,
+        "ok": statuses.get(200, 0),
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "rps": total / elapsed if elapsed else 0.0,
+        "request": percentiles(latencies),
+        "stages": {stage: percentiles(s) for stage, s in sorted(stages.items())},
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+# -- Baselines ------------------------------------------------------------------
+
+
+def compare(result: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> list[str]:
+    """Regressions of *result* against *baseline* for the same route, one line each.
+
+    A stage regresses when its p95 grows by more than *tolerance* (fraction)
+    and by more than *min_delta_ms*. The absolute floor keeps sub-millisecond
+    stages from failing on timer noise. RPS regresses when it drops by more
+    than *tolerance*.
+    """
+    problems: list[str] = []
+    route = result["route"]
+    if result["rps"] < baseline["rps"] * (1 - tolerance):
+        problems.append(f"{route} rps {result['rps']:.1f} < baseline {baseline['rps']:.1f}")
+    pairs = [("request", result["request"], baseline["request"])]
+    pairs += [(s, result["stages"].get(s), b) for s, b in baseline.get("stages", {}).items()]
+    for name, now, then in pairs:
+        if not now or not now["count"]:
+            continue
+        delta = now["p95_ms"] - then["p95_ms"]
+        if delta > min_delta_ms and now["p95_ms"] > then["p95_ms"] * (1 + tolerance):
+            problems.append(f"{route} {name} p95 {now['p95_ms']:.1f}ms > baseline {then['p95_ms']:.1f}ms")
+    return problems
+
+
+def _print_result(result: dict, llm: FakeLLM | None) -> None:
+    req = result["request"]
+    print(
+        f"\n{result['route']}  {result['ok']}/{result['requests']} ok  statuses={result['statuses']}  "
+        f"{result['rps']:.1f} req/s  peak RSS {result['peak_rss_mb']:.0f} MB"
+    )
+    if llm is not None:
+        print(f"    llm calls {llm.calls} ({llm.replayed} replayed from cassette)")
+    print(f"    {'stage':<18} {'n':>6} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for name, p in [("request", req), *result["stages"].items()]:
+        print(f"    {name:<18} {p['count']:>6} {p['p50_ms']:>7.1f}ms {p['p95_ms']:>7.1f}ms {p['p99_ms']:>7.1f}ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--route", choices=sorted(ROUTES), nargs="+", default=["v3", "v2"])
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="simulated LLM latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=100.0, help="uniform ± jitter on --latency-ms")
+    parser.add_argument("--rag-ms", type=float, default=0.0, help="simulated curriculum RAG latency")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cassette", help="JSONL of recorded LLM responses to replay")
+    parser.add_argument("--record", help="call real Gemini and append its responses to this cassette")
+    parser.add_argument("--baseline", help="compare against this baseline JSON; exit 1 on regression")
+    parser.add_argument("--save-baseline", help="write this run's results as a baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed fractional regression")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="ignore p95 growth below this")
+    args = parser.parse_args()
+
+    if args.record:
+        from app.services.ai_client import get_openai_compat_client as real_client
+
+        llm, fake = RecordingLLM(real_client(), args.record), None
+    else:
+        cassette = load_cassette(args.cassette) if args.cassette else None
+        llm = fake = FakeLLM(args.latency_ms, args.jitter_ms, cassette, seed=args.seed)
+
+    results: dict[str, dict] = {}
+    with bench_app(llm, rag_ms=args.rag_ms) as app:
+        # One unmeasured request per route: imports, template compilation, topic indexes
+        for route in args.route:
+            asyncio.run(run_load(app, route, concurrency=1, total=1))
+        for route in args.route:
+            if fake is not None:
+                fake.calls = fake.replayed = 0
+            result = asyncio.run(run_load(app, route, args.concurrency, args.requests))
+            result["llm"] = {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms}
+            results[route] = result
+            _print_result(result, fake)
+
+    failed = any(r["ok"] != r["requests"] for r in results.values())
+    if args.save_baseline:
+        Path(args.save_baseline).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.save_baseline).write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"\nbaseline written to {args.save_baseline}")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        problems = [
+            line
+            for route, result in results.items()
+            if route in baseline
+            for line in compare(result, baseline[route], args.tolerance, args.min_delta_ms)
+        ]
+        print(f"\nvs {args.baseline}: " + ("no regressions" if not problems else f"{len(problems)} regression(s)"))
+        for line in problems:
+            print(f"    {line}")
+        failed |= bool(problems)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for concurrent PDF exports: inline vs the PDF worker pool.
+
+  inline — generate_pdf() called directly inside the async handler (the old
+           export path): every render blocks the event loop
+  pool   — app.services.v3.pdf_pool.PDFRenderPool: renders on pre-warmed
+           worker processes, admission-controlled, awaited by the handler
+
+Reports exports/s, per-export latency, event-loop lag and admission rejects.
+Without WeasyPrint's system libraries (pango) use --fake-ms to stand in a
+CPU-bound render of that many milliseconds, which exercises the same pool
+mechanics.
+
+Run as:
+    python scripts/bench_pdf_export.py --jobs 24 --concurrency 8
+    python scripts/bench_pdf_export.py --fake-ms 500 --workers 4 --queue 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Ensure backend is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.v3.pdf_pool import PDFPoolBusy, PDFRenderPool  # noqa: E402
+
+SAMPLE_WORKSHEET = {
+    "title": "Addition within 100",
+    "subject": "Maths",
+    "grade": "Class 3",
+    "questions": [
+        {
+            "text": f"What is {10 + i} + {20 + i}?",
+            "role": ("recognition", "application", "thinking")[i % 3],
+            "visual_type": "number_line" if i % 2 else "clock",
+            "visual_data": {"start": 0, "end": 50, "step": 5} if i % 2 else {"hour": i % 12 + 1, "minute": 30},
+            "correct_answer": str(30 + 2 * i),
+            "card_color": i % 4 + 1,
+        }
+        for i in range(10)
+    ],
+}
+
+
+def fake_render_job(worksheet: dict, pdf_type: str) -> bytes:
+    """CPU-bound stand-in for generate_pdf() (pure-Python spin for ``_fake_ms``)."""
+    end = time.process_time() + worksheet["_fake_ms"] / 1000
+    n = 0
+    while time.process_time() < end:
+        n += 1
+    return b"%PDF-1.4 fake " + str(n).encode()
+
+
+def _inline_job(fake_ms: float):
+    if fake_ms:
+        return fake_render_job
+    from app.services.v3.pdf_renderer import generate_pdf
+
+    return generate_pdf
+
+
+async def _ticker(lags: list[float], stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + 0.01
+        await asyncio.sleep(0.01)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def run(mode: str, jobs: int, concurrency: int, pool: PDFRenderPool | None, fake_ms: float) -> dict:
+    worksheet = {**SAMPLE_WORKSHEET, "_fake_ms": fake_ms} if fake_ms else SAMPLE_WORKSHEET
+    inline = _inline_job(fake_ms) if mode == "inline" else None
+    sem = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    rejected = 0
+    lags: list[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(lags, stop))
+
+    async def one(i: int) -> None:
+        nonlocal rejected
+        pdf_type = ("full", "student", "answer_key")[i % 3]
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                if inline is not None:
+                    inline(dict(worksheet), pdf_type)
+                else:
+                    await pool.render(dict(worksheet), pdf_type)
+            except PDFPoolBusy:
+                rejected += 1
+                return
+            latencies.append(time.perf_counter() - t0)
+            await asyncio.sleep(0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(jobs)))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await ticker
+    latencies.sort()
+    return {
+        "done": len(latencies),
+        "rejected": rejected,
+        "per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(latencies) * 1e3 if latencies else 0.0,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1e3 if latencies else 0.0,
+        "lag_max_ms": max(lags, default=0.0) * 1e3,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=24)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--queue", type=int, default=16)
+    parser.add_argument("--fake-ms", type=float, default=0.0, help="simulate a CPU-bound render of this many ms")
+    parser.add_argument("--mode", choices=["inline", "pool", "both"], default="both")
+    args = parser.parse_args()
+
+    pool = None
+    if args.mode in ("pool", "both"):
+        # Fake renders skip the WeasyPrint warm-up initializer
+        fake = {"job": fake_render_job, "initializer": None} if args.fake_ms else {}
+        pool = PDFRenderPool(workers=args.workers, queue_size=args.queue, **fake)
+        pool.start()
+        # Let workers spawn and warm up before timing
+        asyncio.run(pool.render({**SAMPLE_WORKSHEET, "_fake_ms": 1} if args.fake_ms else SAMPLE_WORKSHEET))
+
+    print(f"{'mode':<7} {'done':>5} {'rej':>4} {'pdf/s':>7} {'p50':>9} {'p95':>9} {'loop lag max':>13}")
+    modes = ["inline", "pool"] if args.mode == "both" else [args.mode]
+    try:
+        for mode in modes:
+            stats = asyncio.run(run(mode, args.jobs, args.concurrency, pool, args.fake_ms))
+            print(
+                f"{mode:<7} {stats['done']:>5} {stats['rejected']:>4} {stats['per_s']:>7.2f} "
+                f"{stats['p50_ms']:>7.0f}ms {stats['p95_ms']:>7.0f}ms {stats['lag_max_ms']:>11.0f}ms"
+            )
+    finally:
+        if pool is not None:
+            print(f"pool stats: {pool.stats()}")
+            pool.shutdown(wait=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark + parity check for get_topic_profile().
+
+Compares the indexed resolver (app.data.topic_index) against the original
+linear-scan resolver on every profile key, every alias and common frontend
+variations (lowercase, class-stripped, truncated prefixes), across subjects and
+grades. Any mismatch is printed and the script exits 1.
+
+Run as:
+    python scripts/bench_topic_resolution.py            # parity + timings
+    python scripts/bench_topic_resolution.py --rounds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+# Ensure backend is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import re as _re  # noqa: E402
+
+from app.data import topic_profiles  # noqa: E402
+from app.data.topic_profiles import (  # noqa: E402
+    _SUBJECT_TO_PROFILE_GROUP,
+    _TOPIC_ALIASES,
+    TOPIC_PROFILES,
+    _profile_subject_group,
+    normalize_topic,
+)
+
+SUBJECTS = [None, "Maths", "English", "EVS", "Science", "Hindi", "Computer", "GK", "Moral Science", "Health"]
+GRADES = [None, 1, 2, 3, 4, 5, "Class 3"]
+
+
+def legacy_get_topic_profile(
+    topic: str, subject: str | None = None, grade_level: str | int | None = None
+) -> dict | None:
+    """get_topic_profile() as it was before the topic index — linear scans over every key."""
+
+    grade_num = None
+    if grade_level is not None:
+        gm = _re.search(r"\d+", str(grade_level))
+        if gm:
+            grade_num = int(gm.group())
+    if grade_num is None:
+        tm = _re.search(r"class\s*(\d+)", topic or "", _re.IGNORECASE)
+        if tm:
+            grade_num = int(tm.group(1))
+
+    topic_for_lookup = normalize_topic(topic)
+    if grade_num is not None and subject and subject.lower() in ("maths", "math", "mathematics"):
+        t_lower = topic_for_lookup.lower()
+        if grade_num >= 4 and t_lower in ("division (sharing equally)", "sharing equally"):
+            topic_for_lookup = "Division (long division)"
+        elif grade_num >= 4 and t_lower in ("multiplication (tables 2-10)", "multiplication tables"):
+            topic_for_lookup = "Multiplication (3-digit × 2-digit)"
+        elif grade_num <= 2 and t_lower in ("multiplication (tables 2-10)", "multiplication tables"):
+            topic_for_lookup = "Multiplication (tables 2-5)"
+        elif grade_num == 3 and t_lower in ("multiplication tables",):
+            topic_for_lookup = "Multiplication (tables 2-10)"
+        elif grade_num == 3 and "division" in t_lower and "long" not in t_lower:
+            topic_for_lookup = "Division basics"
+
+    def _ok(profile: dict) -> bool:
+        if not subject:
+            return True
+        expected = _SUBJECT_TO_PROFILE_GROUP.get(subject.lower())
+        return not expected or _profile_subject_group(profile) == expected
+
+    def _class_num_from_key(key: str) -> int | None:
+        km = _re.search(r"class\s*(\d+)", key, _re.IGNORECASE)
+        return int(km.group(1)) if km else None
+
+    def _prefer_grade(candidates: list[str]) -> str | None:
+        if not candidates:
+            return None
+        if grade_num is None:
+            return candidates[0]
+        for key in candidates:
+            key_grade = _class_num_from_key(key)
+            if key_grade == grade_num:
+                return key
+        for key in candidates:
+            if _class_num_from_key(key) is None:
+                return key
+        return candidates[0]
+
+    # --- Exact lookup table (highest priority) ---
+    try:
+        from app.data.topic_lookup import resolve_topic
+
+        resolved_key = resolve_topic(topic_for_lookup, grade_num)
+        if resolved_key and resolved_key in TOPIC_PROFILES:
+            profile = TOPIC_PROFILES[resolved_key]
+            if _ok(profile):
+                return profile
+    except ImportError:
+        pass
+
+    normalized = topic_for_lookup
+
+    profile = TOPIC_PROFILES.get(normalized)
+    if profile:
+        return profile if _ok(profile) else None
+
+    alias_key = normalized.lower()
+    if alias_key in _TOPIC_ALIASES:
+        mapped_key = _TOPIC_ALIASES[alias_key]
+        candidates = [mapped_key]
+        # If alias mapped to wrong grade variant, try same-base with requested grade.
+        if grade_num is not None:
+            alias_base = _re.sub(r"\s*\(class\s*\d+\)\s*$", "", mapped_key, flags=_re.IGNORECASE).strip().lower()
+            for key in TOPIC_PROFILES:
+                key_base = _re.sub(r"\s*\(class\s*\d+\)\s*$", "", key, flags=_re.IGNORECASE).strip().lower()
+                if key_base == alias_base and key not in candidates:
+                    candidates.append(key)
+        selected = _prefer_grade(candidates)
+        if selected:
+            p = TOPIC_PROFILES.get(selected)
+            if p:
+                return p if _ok(p) else None
+
+    # Substring fallback — guard by class marker AND subject
+    _class_marker = _re.search(r"class\s*(\d)", alias_key, _re.IGNORECASE)
+    matches = []
+    for key in TOPIC_PROFILES:
+        key_lower = key.lower()
+        if key_lower.startswith(alias_key) or alias_key.startswith(key_lower.split("(")[0].strip()):
+            if _class_marker:
+                km = _re.search(r"class\s*(\d)", key_lower, _re.IGNORECASE)
+                if not km or km.group(1) != _class_marker.group(1):
+                    continue
+            if not _ok(TOPIC_PROFILES[key]):
+                continue
+            matches.append(key)
+    if matches:
+        matches.sort(key=len, reverse=True)
+        selected = _prefer_grade(matches)
+        if selected:
+            return TOPIC_PROFILES[selected]
+    # Fuzzy fallback: find profile whose key contains the topic stem.
+    # Handles frontend sending "Time" when key is "Time (Class 1)".
+    if topic:
+        _t_lower = topic.lower()
+        fuzzy_matches = []
+        for _k, _v in TOPIC_PROFILES.items():
+            if _t_lower in _k.lower() or _k.lower().startswith(_t_lower):
+                if _ok(_v):
+                    fuzzy_matches.append(_k)
+        selected = _prefer_grade(fuzzy_matches)
+        if selected:
+            return TOPIC_PROFILES[selected]
+    return None
+
+
+def parity_topics() -> list[str]:
+    """Every key and alias plus the variations the frontend actually sends."""
+    topics: set[str] = set(TOPIC_PROFILES) | set(_TOPIC_ALIASES) | set(_TOPIC_ALIASES.values())
+    for key in list(TOPIC_PROFILES):
+        low = key.lower()
+        topics.add(low)
+        topics.add(_re.sub(r"\s*\(.*?\)\s*", "", key).strip())
+        head = low.split("(")[0].strip()
+        topics.update({head, head[:4], head[: max(1, len(head) // 2)], f"  {key}  "})
+    topics.update({"", "xyz unknown topic", "Class 3 maths", "time", "Multiplication tables", "sharing equally"})
+    return sorted(topics)
+
+
+def parity_cases() -> list[tuple[str, str | None, str | int | None]]:
+    return [(t, s, g) for t in parity_topics() for s in SUBJECTS for g in GRADES]
+
+
+def check_parity() -> list[str]:
+    mismatches = []
+    for topic, subject, grade in parity_cases():
+        expected = legacy_get_topic_profile(topic, subject, grade)
+        actual = topic_profiles.get_topic_profile(topic, subject, grade)
+        if expected is not actual:
+            mismatches.append(f"  {topic!r} / {subject} / {grade}")
+    return mismatches
+
+
+def _time(fn, cases, rounds: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for topic, subject, grade in cases:
+            fn(topic, subject, grade)
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=1)
+    args = parser.parse_args()
+
+    cases = parity_cases()
+    mismatches = check_parity()
+    print(f"Parity: {len(cases) - len(mismatches)}/{len(cases)} cases match")
+    if mismatches:
+        print("\n".join(mismatches[:50]))
+        return 1
+
+    n = len(cases)
+    legacy_s = _time(legacy_get_topic_profile, cases, args.rounds)
+    topic_profiles._resolve_profile_key.cache_clear()
+    cold_s = _time(topic_profiles.get_topic_profile, cases, args.rounds)
+
+    # Memoized: a request-sized working set (fits the memo) looked up repeatedly
+    hot = cases[:: max(1, n // 1000)]
+    _time(topic_profiles.get_topic_profile, hot, 1)
+    warm_s = _time(topic_profiles.get_topic_profile, hot, 100)
+
+    print(f"legacy scan      : {legacy_s / (n * args.rounds) * 1e6:8.2f} us/lookup")
+    print(f"index (uncached) : {cold_s / (n * args.rounds) * 1e6:8.2f} us/lookup")
+    print(f"index (memoized) : {warm_s / (len(hot) * 100) * 1e6:8.2f} us/lookup")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
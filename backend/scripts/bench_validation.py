@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Validation CPU per worksheet: every validator over the gold worksheet fixtures.
+
+Runs the validators a worksheet passes through, in pipeline order, over each
+worksheet in tests/fixtures/gold_worksheets.py:
+
+  light_validator  — v3.light_validator.validate_worksheet
+  v3_quality_gate  — v3.quality_gate.check_worksheet
+  reviewer         — QualityReviewerAgent.review_worksheet
+  output_validator — OutputValidator.validate_worksheet
+  quality_scorer   — quality_scorer.score_worksheet (runs OutputValidator again)
+  release_gate     — release_gate.run_release_gate
+  utils_gate       — utils.quality_gate.run_quality_gate
+
+and reports CPU time per validator and per worksheet.
+
+Every validator reads its per-question text features (tokens, numbers, times,
+templates, answer verdict) from the shared app.services.question_analysis
+cache. --no-share clears that cache before each validator, so each one pays
+for its own analysis as it did before the cache was shared. Compare the two
+runs to see what sharing saves.
+
+--dump writes every validator's output to JSON; diff two dumps to check that
+a refactor did not change any verdict. Run both with PYTHONHASHSEED=0: a few
+messages name the first item iterated from a set of strings.
+
+--templates is a micro-benchmark of the structural templates alone
+(OutputValidator._make_template / _make_deep_template) over every gold
+question text, bypassing the analysis cache.
+
+Run as:
+    python scripts/bench_validation.py
+    python scripts/bench_validation.py --no-share
+    python scripts/bench_validation.py --rounds 200 --dump /tmp/validation.json
+    python scripts/bench_validation.py --templates --rounds 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import time
+
+# Ensure backend is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+os.environ.setdefault("SUPABASE_URL", "https://bench.supabase.co")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "bench-service-key")
+
+import logging  # noqa: E402
+
+from app.services.output_validator import OutputValidator, get_validator  # noqa: E402
+from app.services.quality_reviewer import get_quality_reviewer  # noqa: E402
+from app.services.quality_scorer import score_worksheet  # noqa: E402
+from app.services.question_analysis import clear_analysis_cache  # noqa: E402
+from app.services.release_gate import run_release_gate  # noqa: E402
+from app.services.topic_intelligence import GenerationContext  # noqa: E402
+from app.services.v3.light_validator import validate_worksheet as light_validate  # noqa: E402
+from app.services.v3.quality_gate import check_worksheet  # noqa: E402
+from app.utils.quality_gate import run_quality_gate  # noqa: E402
+from tests.fixtures.gold_worksheets import GOLD_FIXTURES  # noqa: E402
+
+VALIDATORS = (
+    "light_validator",
+    "v3_quality_gate",
+    "reviewer",
+    "output_validator",
+    "quality_scorer",
+    "release_gate",
+    "utils_gate",
+)
+
+
+def _context(ws: dict) -> GenerationContext:
+    grade = int("".join(c for c in ws.get("grade", "Class 3") if c.isdigit()) or 3)
+    return GenerationContext(
+        topic_slug=ws.get("topic", ""),
+        subject=ws.get("subject", ""),
+        grade=grade,
+        ncert_chapter=ws.get("topic", ""),
+        ncert_subtopics=[],
+        bloom_level="application",
+        format_mix={},
+        scaffolding=False,
+        challenge_mode=False,
+        valid_skill_tags=[],
+        child_context={},
+    )
+
+
+def validate_all(ws: dict, timings: dict[str, float], share: bool = True) -> dict:
+    """Run every validator on *ws* (mutated like the pipeline does); return their outputs."""
+    grade, subject, topic = ws.get("grade", "Class 3"), ws.get("subject", ""), ws.get("topic", "")
+    questions = ws["questions"]
+    steps = {
+        "light_validator": lambda: light_validate(ws, []),
+        "v3_quality_gate": lambda: check_worksheet(ws, [], topic, subject, grade),
+        "reviewer": lambda: get_quality_reviewer().review_worksheet(questions, _context(ws)),
+        "output_validator": lambda: get_validator().validate_worksheet(
+            ws, grade=grade, subject=subject, topic=topic, num_questions=len(questions)
+        ),
+        "quality_scorer": lambda: score_worksheet(ws, expected_count=len(questions)),
+        "release_gate": lambda: run_release_gate(
+            questions=questions,
+            grade_level=grade,
+            subject=subject,
+            topic=topic,
+            num_questions=len(questions),
+            difficulty=ws.get("difficulty", "medium"),
+            warnings=[],
+            worksheet_meta=ws,
+        ),
+        "utils_gate": lambda: run_quality_gate(ws),
+    }
+    outputs: dict = {}
+    random.seed(0)  # the reviewer picks engagement-framing names at random
+    for name in VALIDATORS:
+        if not share:
+            clear_analysis_cache()
+        t0 = time.process_time()
+        result = steps[name]()
+        timings[name] = timings.get(name, 0.0) + time.process_time() - t0
+        outputs[name] = _summarize(name, result)
+    return outputs
+
+
+def _summarize(name: str, result) -> object:
+    if name == "v3_quality_gate":
+        return [result.passed, result.issues, result.severity]
+    if name == "reviewer":
+        return [result.corrections, result.warnings, result.errors]
+    if name == "quality_scorer":
+        return [result.total_score, sorted(f.check_id for f in result.failures)]
+    if name == "release_gate":
+        return [result.verdict, result.failed_rules, result.block_reasons, result.degrade_reasons]
+    return list(result)
+
+
+def bench_templates(worksheets: dict[str, dict], rounds: int) -> None:
+    """Time each template function over every gold question text."""
+    texts = [q.get("text", "") for ws in worksheets.values() for q in ws["questions"]]
+    print(f"{len(texts)} gold question texts × {rounds} rounds")
+    print(f"  {'template':<22} {'µs / question':>14}")
+    for fn in (OutputValidator._make_template, OutputValidator._make_deep_template):
+        fn(texts[0])  # build the pattern bank
+        t0 = time.process_time()
+        for _ in range(rounds):
+            for text in texts:
+                fn(text)
+        elapsed = time.process_time() - t0
+        print(f"  {fn.__name__:<22} {elapsed * 1e6 / (rounds * len(texts)):>14.2f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=50, help="passes over the fixture set")
+    parser.add_argument("--no-share", action="store_true", help="clear the analysis cache before each validator")
+    parser.add_argument("--dump", help="write every validator's output (first round) to this JSON file")
+    parser.add_argument("--templates", action="store_true", help="micro-benchmark the structural templates only")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    worksheets = {fid: spec["builder"]() for fid, spec in GOLD_FIXTURES.items()}
+    if args.templates:
+        bench_templates(worksheets, args.rounds)
+        return 0
+    timings: dict[str, float] = {}
+    dump: dict = {}
+
+    validate_all(copy.deepcopy(next(iter(worksheets.values()))), {})  # imports, profile indexes
+    for round_no in range(args.rounds):
+        if args.no_share or round_no:
+            # Measure sharing within one worksheet, not reuse across rounds
+            clear_analysis_cache()
+        for fid, ws in worksheets.items():
+            outputs = validate_all(copy.deepcopy(ws), timings, share=not args.no_share)
+            if round_no == 0:
+                dump[fid] = outputs
+
+    n = args.rounds * len(worksheets)
+    total = sum(timings.values())
+    mode = "isolated (--no-share)" if args.no_share else "shared analysis"
+    print(f"{len(worksheets)} gold worksheets × {args.rounds} rounds, {mode}")
+    print(f"  {'validator':<18} {'CPU ms / worksheet':>20}")
+    for name in VALIDATORS:
+        print(f"  {name:<18} {timings[name] * 1000 / n:>20.3f}")
+    print(f"  {'total':<18} {total * 1000 / n:>20.3f}")
+
+    if args.dump:
+        with open(args.dump, "w", encoding="utf-8") as f:
+            json.dump(dump, f, indent=2, ensure_ascii=False, default=str)
+        print(f"\nWrote {args.dump}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,18 +2,36 @@
 """
 Bulk audit: run build_slots() on every topic profile and check quality signals.
 
+--bench switches to a throughput benchmark over the same topics. It times
+build_slots() for every topic × difficulty × question count (seeded, so runs
+are comparable) and measures its peak traced allocation. It then prints a
+per-topic cost table with the slowest profiles flagged, plus a hot-spot
+report: per-call counts of get_topic_profile, _get_topic_images and regex
+compiles, and the top functions by own time. --json writes the table so a
+before/after pair proves an optimization.
+
 Usage:
     cd backend
     python scripts/bulk_audit.py
+    python scripts/bulk_audit.py --bench
+    python scripts/bulk_audit.py --bench --counts 10 30 --repeat 5 --json slot_costs.json
 """
 
 from __future__ import annotations
 
+import argparse
+import cProfile
+import json
 import os
+import pstats
+import random
 import re
+import statistics
 import sys
+import time
+import tracemalloc
 from collections import Counter
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
@@ -247,7 +265,186 @@ def audit_topic(topic_name: str, profile: dict) -> list[AuditIssue]:
     return issues
 
 
+# -- Benchmark mode ---------------------------------------------------------------
+
+# Functions whose call count per build_slots() call is a known cost driver:
+# label → (defining file suffix or None for any, function name)
+HOT_SPOTS: dict[str, tuple[str | None, str]] = {
+    "get_topic_profile": (None, "get_topic_profile"),
+    "_get_topic_images": (None, "_get_topic_images"),
+    # every re.* call with a pattern string goes through the compile-cache lookup
+    "re._compile": (os.path.join("re", "__init__.py"), "_compile"),
+    # a cache miss compiles the pattern from scratch
+    "regex recompiles": ("_compiler.py", "compile"),
+}
+
+
+@dataclass
+class CaseCost:
+    topic: str
+    subject: str
+    grade: str
+    difficulty: str
+    num_questions: int
+    median_ms: float
+    max_ms: float
+    alloc_peak_kb: float
+
+
+def _case_args(topic_name: str, profile: dict, difficulty: str, num_questions: int) -> tuple:
+    subject = _detect_subject(topic_name, profile)
+    language = "Hindi" if subject == "Hindi" else "English"
+    grade_level = f"Class {_detect_grade(topic_name)}"
+    return ("CBSE", grade_level, subject, topic_name, difficulty, num_questions, "standard", language)
+
+
+def bench_case(args: tuple, repeat: int, seed: int) -> CaseCost:
+    """Time build_slots(*args) *repeat* times (seeded), then trace one run's allocations."""
+    timings = []
+    for _ in range(repeat):
+        random.seed(seed)
+        t0 = time.perf_counter()
+        build_slots(*args)
+        timings.append((time.perf_counter() - t0) * 1000)
+
+    random.seed(seed)
+    tracemalloc.start()
+    try:
+        build_slots(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    _, grade, subject, topic, difficulty, num_questions, _, _ = args
+    return CaseCost(
+        topic, subject, grade, difficulty, num_questions, statistics.median(timings), max(timings), peak / 1024
+    )
+
+
+def hot_spot_report(cases: list[tuple], seed: int, top: int) -> tuple[dict[str, float], list[tuple]]:
+    """Profile one build_slots() per case: (calls per build for HOT_SPOTS, top functions by own time)."""
+    profiler = cProfile.Profile()
+    for args in cases:
+        random.seed(seed)
+        profiler.runcall(build_slots, *args)
+    stats = pstats.Stats(profiler).stats  # (file, line, func) → (cc, nc, tt, ct, callers)
+
+    per_build: dict[str, float] = {}
+    for label, (suffix, func) in HOT_SPOTS.items():
+        calls = sum(
+            nc
+            for (path, _, name), (_, nc, _, _, _) in stats.items()
+            if name == func and (suffix is None or path.endswith(suffix))
+        )
+        per_build[label] = calls / len(cases)
+
+    heaviest = sorted(stats.items(), key=lambda kv: kv[1][2], reverse=True)[:top]
+    rows = [
+        (f"{os.path.basename(path)}:{line} {name}", nc / len(cases), tt * 1000 / len(cases))
+        for (path, line, name), (_, nc, tt, _, _) in heaviest
+    ]
+    return per_build, rows
+
+
+def bench_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bench", action="store_true")
+    parser.add_argument("--difficulties", nargs="+", default=["easy", "medium", "hard"])
+    parser.add_argument("--counts", type=int, nargs="+", default=[5, 10, 20], help="num_questions values")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (median reported)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--topic", action="append", help="limit to these topic names (repeatable)")
+    parser.add_argument("--top", type=int, default=15, help="rows in the slowest-topic and hot-spot lists")
+    parser.add_argument("--json", help="write per-case and per-topic costs to this file")
+    args = parser.parse_args(argv)
+
+    topics = sorted(TOPIC_PROFILES.items())
+    if args.topic:
+        topics = [(t, p) for t, p in topics if t in set(args.topic)]
+    cases = [
+        _case_args(topic, profile, difficulty, n)
+        for topic, profile in topics
+        for difficulty in args.difficulties
+        for n in args.counts
+    ]
+
+    # Warm module-level caches (grade profiles, topic index) outside the measurement
+    build_slots(*cases[0])
+
+    t0 = time.perf_counter()
+    costs: list[CaseCost] = []
+    for case in cases:
+        try:
+            costs.append(bench_case(case, args.repeat, args.seed))
+        except Exception as e:
+            print(f"  [SKIP] {case[3]} {case[4]} n={case[5]}: {e}")
+    wall = time.perf_counter() - t0
+
+    by_topic: dict[str, list[CaseCost]] = {}
+    for c in costs:
+        by_topic.setdefault(c.topic, []).append(c)
+    table = []
+    for topic, rows in by_topic.items():
+        worst = max(rows, key=lambda r: r.max_ms)
+        table.append(
+            {
+                "topic": topic,
+                "subject": rows[0].subject,
+                "grade": rows[0].grade,
+                "median_ms": statistics.median(r.median_ms for r in rows),
+                "worst_ms": worst.max_ms,
+                "worst_case": f"{worst.difficulty}/n={worst.num_questions}",
+                "alloc_peak_kb": max(r.alloc_peak_kb for r in rows),
+            }
+        )
+    table.sort(key=lambda row: row["median_ms"], reverse=True)
+
+    all_ms = sorted(c.median_ms for c in costs)
+    overall = statistics.median(all_ms)
+    p95 = all_ms[min(len(all_ms) - 1, int(0.95 * len(all_ms)))]
+    print(f"build_slots: {len(costs)} cases over {len(by_topic)} topics in {wall:.1f}s")
+    print(f"  per call: median {overall:.2f}ms  p95 {p95:.2f}ms  max {all_ms[-1]:.2f}ms")
+    print(f"  throughput: {1000 / overall:.0f} builds/s (single thread, median case)")
+
+    print(f"\nSlowest {args.top} topics (median over difficulty × count; * = over 2× overall median):")
+    print(f"  {'topic':<45} {'subject':<8} {'grade':<8} {'median':>8} {'worst':>8} {'worst case':<12} {'alloc':>8}")
+    for row in table[: args.top]:
+        flag = "*" if row["median_ms"] > 2 * overall else " "
+        print(
+            f"{flag} {row['topic'][:45]:<45} {row['subject'][:8]:<8} {row['grade']:<8} "
+            f"{row['median_ms']:>6.2f}ms {row['worst_ms']:>6.2f}ms {row['worst_case']:<12} "
+            f"{row['alloc_peak_kb']:>6.0f}KB"
+        )
+
+    per_build, heaviest = hot_spot_report(cases, args.seed, args.top)
+    print("\nHot spots (calls per build_slots):")
+    for label, calls in per_build.items():
+        print(f"  {label:<20} {calls:>8.1f}")
+    print(f"\nTop {args.top} functions by own time (per build_slots):")
+    for name, calls, ms in heaviest:
+        print(f"  {ms:>7.3f}ms {calls:>8.1f} calls  {name}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "cases": [asdict(c) for c in costs],
+                    "topics": table,
+                    "hot_spots": per_build,
+                    "summary": {"median_ms": overall, "p95_ms": p95, "max_ms": all_ms[-1], "cases": len(costs)},
+                },
+                f,
+                indent=2,
+                ensure_ascii=False,
+            )
+        print(f"\nWrote {args.json}")
+    return 0
+
+
 def main():
+    if "--bench" in sys.argv[1:]:
+        return bench_main(sys.argv[1:])
+
     total = len(TOPIC_PROFILES)
     passed = 0
     failed = 0
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Event-loop lag under load: sync Supabase calls vs the async data-access layer.
+
+Serves GET /api/classes/{id}/dashboard in-process against a fake PostgREST
+(httpx.MockTransport) whose latency is injected per round trip, while a ticker
+task measures how late the event loop wakes it up every 10 ms.
+
+  legacy — the pre-async route body: sync supabase.Client ``.execute()`` inline
+           in ``async def`` (each round trip blocks the loop)
+  async  — the real route: AsyncClient on a pooled httpx client via
+           app.services.async_db.execute()/gather()
+
+With the async layer, loop lag should stay flat (~ms) as DB latency rises,
+and throughput should scale with concurrency instead of with 1/latency.
+
+Run as:
+    python scripts/load_test_event_loop.py
+    python scripts/load_test_event_loop.py --latency-ms 10 50 200 --concurrency 50 --requests 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Ensure backend is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from supabase import ClientOptions, create_client  # noqa: E402
+
+from app.api.classes import router as classes_router  # noqa: E402
+from app.core.deps import get_async_supabase_client, get_user_id  # noqa: E402
+from app.middleware.rate_limit import limiter  # noqa: E402
+from app.services.async_db import create_async_supabase  # noqa: E402
+
+SUPABASE_URL = "http://supabase.test"
+SUPABASE_KEY = "service-role-key-for-load-test"
+USER_ID = "teacher-1"
+CLASS_ID = "class-1"
+N_CHILDREN = 30
+TICK_S = 0.01
+
+
+def fake_rows(path: str) -> object:
+    """Canned PostgREST payloads for the four class-dashboard queries."""
+    table = path.rsplit("/", 1)[-1]
+    if table == "teacher_classes":
+        return [{"id": CLASS_ID, "name": "3A", "grade": "Class 3", "subject": "Maths"}]
+    if table == "worksheets":
+        return [{"child_id": f"child-{i}"} for i in range(N_CHILDREN)]
+    if table == "children":
+        return [{"id": f"child-{i}", "name": f"Child {i}"} for i in range(N_CHILDREN)]
+    if table == "topic_mastery":
+        levels = ("mastered", "learning", "unknown")
+        return [
+            {"child_id": f"child-{i}", "topic_slug": f"topic-{t}", "mastery_level": levels[(i + t) % 3]}
+            for i in range(N_CHILDREN)
+            for t in range(8)
+        ]
+    return []
+
+
+def make_sync_client(latency_s: float):
+    def handler(request: httpx.Request) -> httpx.Response:
+        time.sleep(latency_s)
+        return httpx.Response(200, json=fake_rows(request.url.path))
+
+    options = ClientOptions(httpx_client=httpx.Client(transport=httpx.MockTransport(handler)))
+    return create_client(SUPABASE_URL, SUPABASE_KEY, options)
+
+
+def make_async_client(latency_s: float):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency_s)
+        return httpx.Response(200, json=fake_rows(request.url.path))
+
+    return create_async_supabase(SUPABASE_URL, SUPABASE_KEY, transport=httpx.MockTransport(handler))
+
+
+def build_app(mode: str, latency_s: float) -> FastAPI:
+    app = FastAPI()
+    app.dependency_overrides[get_user_id] = lambda: USER_ID
+
+    if mode == "async":
+        client = make_async_client(latency_s)
+        app.include_router(classes_router)
+        app.dependency_overrides[get_async_supabase_client] = lambda: client
+        return app
+
+    db = make_sync_client(latency_s)
+
+    @app.get("/api/classes/{class_id}/dashboard")
+    async def legacy_dashboard(request: Request, class_id: str):
+        # Data access as the route did it before async_db: sync calls inside async def
+        cls = (
+            db.table("teacher_classes")
+            .select("id, name, grade, subject")
+            .eq("id", class_id)
+            .eq("user_id", USER_ID)
+            .maybe_single()
+            .execute()
+        )
+        ws_rows = db.table("worksheets").select("child_id").eq("class_id", class_id).execute().data
+        child_ids = list({row["child_id"] for row in ws_rows})
+
+        async def _fetch_children():
+            return db.table("children").select("id, name").in_("id", child_ids).execute()
+
+        async def _fetch_mastery():
+            return (
+                db.table("topic_mastery")
+                .select("child_id, topic_slug, mastery_level")
+                .in_("child_id", child_ids)
+                .execute()
+            )
+
+        children, mastery = await asyncio.gather(_fetch_children(), _fetch_mastery())
+        return {"class_name": cls.data["name"], "children": len(children.data), "rows": len(mastery.data)}
+
+    return app
+
+
+async def _ticker(lags: list[float], stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + TICK_S
+        await asyncio.sleep(TICK_S)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def run_load(app: FastAPI, concurrency: int, total: int) -> dict:
+    """Fire *total* dashboard requests, *concurrency* in flight; return loop-lag and throughput stats."""
+    limiter_enabled, limiter.enabled = limiter.enabled, False
+    lags: list[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(lags, stop))
+    sem = asyncio.Semaphore(concurrency)
+    statuses: list[int] = []
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://app") as client:
+
+            async def one() -> None:
+                async with sem:
+                    resp = await client.get(f"/api/classes/{CLASS_ID}/dashboard")
+                    statuses.append(resp.status_code)
+
+            t0 = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(total)))
+            elapsed = time.perf_counter() - t0
+    finally:
+        limiter.enabled = limiter_enabled
+        stop.set()
+        await ticker
+    lags.sort()
+    return {
+        "requests": total,
+        "ok": sum(1 for s in statuses if s == 200),
+        "rps": total / elapsed if elapsed else 0.0,
+        "lag_p50_ms": statistics.median(lags) * 1e3 if lags else 0.0,
+        "lag_p99_ms": lags[int(0.99 * (len(lags) - 1))] * 1e3 if lags else 0.0,
+        "lag_max_ms": lags[-1] * 1e3 if lags else 0.0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, nargs="+", default=[5, 20, 50, 100])
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--mode", choices=["legacy", "async", "both"], default="both")
+    args = parser.parse_args()
+
+    modes = ["legacy", "async"] if args.mode == "both" else [args.mode]
+    print(f"{'mode':<7} {'db ms':>6} {'req/s':>8} {'lag p50':>9} {'lag p99':>9} {'lag max':>9}  ok")
+    failed = False
+    for latency_ms in args.latency_ms:
+        for mode in modes:
+            app = build_app(mode, latency_ms / 1e3)
+            stats = asyncio.run(run_load(app, args.concurrency, args.requests))
+            failed |= stats["ok"] != stats["requests"]
+            print(
+                f"{mode:<7} {latency_ms:>6.0f} {stats['rps']:>8.1f} {stats['lag_p50_ms']:>7.1f}ms "
+                f"{stats['lag_p99_ms']:>7.1f}ms {stats['lag_max_ms']:>7.1f}ms  {stats['ok']}/{stats['requests']}"
+            )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
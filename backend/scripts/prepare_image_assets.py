@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Build the print-ready image derivatives for every IMAGE_REGISTRY entry.
+
+Run at Docker build time so workers start with every derivative on disk and
+only have to index them:
+
+    IMAGE_ASSET_DIR=/app/.image-assets python scripts/prepare_image_assets.py
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+# Ensure backend is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.image_assets import prepare_image_assets  # noqa: E402
+
+
+def main() -> int:
+    stats = prepare_image_assets()
+    print(json.dumps(stats, indent=2))
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Startup profiler — where does worker boot time go?
+
+Runs ``python -X importtime -c "import app.main"`` in a subprocess and prints
+the slowest imports (cumulative and self time) plus the import tree pruned to
+modules above a threshold. By default the bytecode cache is primed first so
+the numbers match a deployed worker (the Dockerfile precompiles app/); pass
+--cold to measure a first boot with no .pyc files.
+
+Run as:
+    python scripts/profile_startup.py                  # warm, top 25
+    python scripts/profile_startup.py --cold --top 40
+    python scripts/profile_startup.py --tree --threshold-ms 20
+    python scripts/profile_startup.py --module app.services.v3
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass
+class ImportRecord:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def run_importtime(module: str, cold: bool) -> list[ImportRecord]:
+    env = dict(os.environ)
+    # Config needs these to import app.main; values are never used for network calls here
+    env.setdefault("SUPABASE_URL", "http://localhost")
+    env.setdefault("SUPABASE_SERVICE_KEY", "profile")
+    env.setdefault("GEMINI_API_KEY", "profile")
+    cmd = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+
+    with tempfile.TemporaryDirectory(prefix="skolar-pyc-") as pyc_dir:
+        env["PYTHONPYCACHEPREFIX"] = pyc_dir
+        if cold:
+            env["PYTHONDONTWRITEBYTECODE"] = "1"
+        else:
+            env.pop("PYTHONDONTWRITEBYTECODE", None)
+            subprocess.run(cmd, cwd=BACKEND_DIR, env=env, capture_output=True, check=False)
+        proc = subprocess.run(cmd, cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=False)
+
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr[-4000:])
+        raise SystemExit(f"import {module} failed (exit {proc.returncode})")
+
+    records = []
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if m:
+            records.append(ImportRecord(m.group(4), int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2))
+    return records
+
+
+def print_top(records: list[ImportRecord], top: int) -> None:
+    print(f"\n{'cumulative ms':>14} {'self ms':>9}  module   (top {top} by cumulative)")
+    for r in sorted(records, key=lambda r: r.cumulative_us, reverse=True)[:top]:
+        print(f"{r.cumulative_us / 1000:14.1f} {r.self_us / 1000:9.1f}  {r.name}")
+
+    print(f"\n{'self ms':>14} {'cum ms':>9}  module   (top {top} by self)")
+    for r in sorted(records, key=lambda r: r.self_us, reverse=True)[:top]:
+        print(f"{r.self_us / 1000:14.1f} {r.cumulative_us / 1000:9.1f}  {r.name}")
+
+
+def print_tree(records: list[ImportRecord], threshold_ms: float) -> None:
+    """-X importtime lists children before their parent; print parent-first, pruned."""
+    print(f"\nImport tree (cumulative >= {threshold_ms:g} ms)")
+    for r in reversed(records):
+        if r.cumulative_us / 1000 >= threshold_ms:
+            print(f"{r.cumulative_us / 1000:9.1f} ms  {'  ' * r.depth}{r.name}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main", help="Module to import (default: app.main)")
+    parser.add_argument("--cold", action="store_true", help="No bytecode cache — first boot of a fresh image")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--tree", action="store_true", help="Also print the pruned import tree")
+    parser.add_argument("--threshold-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    records = run_importtime(args.module, args.cold)
+    roots = [r for r in records if r.depth == 0]
+    total_ms = sum(r.cumulative_us for r in roots) / 1000
+    app_ms = sum(r.self_us for r in records if r.name.startswith("app.")) / 1000
+
+    print(f"import {args.module} ({'cold' if args.cold else 'warm'} bytecode)")
+    print(f"  total:          {total_ms:8.1f} ms across {len(records)} modules")
+    print(f"  app.* self time:{app_ms:8.1f} ms")
+    print_top(records, args.top)
+    if args.tree:
+        print_tree(records, args.threshold_ms)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,6 +23,8 @@ os.environ.setdefault("SUPABASE_URL", "https://fake.supabase.co")
 os.environ.setdefault("SUPABASE_SERVICE_KEY", "fake-service-key")
 os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "fake-service-key")
 os.environ.setdefault("OPENAI_API_KEY", "sk-fake-key-for-tests")
+# Slot-fill cache shares fills across calls — keep tests independent unless a test opts in
+os.environ.setdefault("V3_FILL_CACHE_ENABLED", "0")
 
 from unittest.mock import MagicMock
 
@@ -286,8 +288,14 @@ def app_client(fake_db, fake_ai, fake_openai):
     from app.api.health import router as health_router
     from app.api.saved_worksheets import router as saved_ws_router
     from app.api.worksheets_v2 import router as ws_v2_router
-    from app.core.deps import get_ai_client, get_openai_compat_client, get_supabase_client, get_user_id
-    from app.services.pdf import get_pdf_service
+    from app.core.deps import (
+        get_ai_client,
+        get_async_supabase_client,
+        get_openai_compat_client,
+        get_pdf_service,
+        get_supabase_client,
+        get_user_id,
+    )
 
     app = FastAPI()
     app.include_router(health_router)
@@ -297,6 +305,7 @@ def app_client(fake_db, fake_ai, fake_openai):
 
     # Override all dependencies
     app.dependency_overrides[get_supabase_client] = lambda: fake_db
+    app.dependency_overrides[get_async_supabase_client] = lambda: fake_db
     app.dependency_overrides[get_user_id] = lambda: TEST_USER_ID
     app.dependency_overrides[get_ai_client] = lambda: fake_ai
     app.dependency_overrides[get_openai_compat_client] = lambda: fake_openai
@@ -0,0 +1,244 @@
+"""Tests for LLM request deadlines and hedged requests in AIClient."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services import ai_client as ai_mod
+from app.services.ai_client import (
+    AIClient,
+    LLMMetrics,
+    deadline_remaining,
+    iter_with_llm_deadline,
+    llm_deadline,
+    wait_for_llm,
+)
+
+MESSAGES = [{"role": "user", "content": "Make a worksheet"}]
+
+
+@pytest.fixture(autouse=True)
+def _no_min_delay(monkeypatch):
+    monkeypatch.setattr(ai_mod, "HEDGE_MIN_DELAY_S", 0.0)
+
+
+def _client(generate=None, agenerate=None, hedge: bool = True) -> AIClient:
+    ai = AIClient.__new__(AIClient)  # skip the real genai.Client
+    ai.client = MagicMock()
+    ai.client.models.generate_content.side_effect = generate
+    ai.client.aio.models.generate_content = agenerate
+    ai.model = "test-model"
+    ai.hedge = hedge
+    ai.metrics = LLMMetrics()
+    return ai
+
+
+def _warm(ai: AIClient, method: str, latency_ms: int = 50) -> None:
+    for _ in range(ai_mod.HEDGE_MIN_SAMPLES):
+        ai.metrics.record_request_latency(method, latency_ms)
+
+
+def _scripted(*replies: tuple[float, str]):
+    """generate_content stand-in: the n-th request sleeps, then returns its text."""
+    lock = threading.Lock()
+    requests: list[dict] = []
+
+    def generate(**request):
+        with lock:
+            requests.append({**request, "thread": threading.current_thread().name})
+            delay, text = replies[len(requests) - 1]
+        time.sleep(delay)
+        return MagicMock(text=text)
+
+    return generate, requests
+
+
+class TestDeadline:
+    def test_nested_deadline_keeps_earlier(self):
+        assert deadline_remaining() is None
+        with llm_deadline(5.0):
+            with llm_deadline(60.0):
+                assert deadline_remaining() <= 5.0
+        assert deadline_remaining() is None
+
+    def test_propagates_to_worker_threads(self):
+        async def run():
+            with llm_deadline(30.0):
+                return await asyncio.to_thread(deadline_remaining)
+
+        assert 0 < asyncio.run(run()) <= 30.0
+
+    def test_expired_deadline_skips_request(self):
+        generate, requests = _scripted((0, '{"ok": 1}'))
+        ai = _client(generate)
+        with llm_deadline(-1.0), pytest.raises(TimeoutError):
+            ai.generate_json("prompt", retries=2)
+        assert requests == []
+
+    def test_request_timeout_is_time_left(self):
+        generate, requests = _scripted((0, '{"ok": 1}'))
+        ai = _client(generate)
+        with llm_deadline(10.0):
+            assert ai.generate_json("prompt") == {"ok": 1}
+        assert 0 < requests[0]["config"].http_options.timeout <= 10_000
+
+    def test_wait_for_llm_sets_deadline_for_worker_threads(self):
+        async def run():
+            return await wait_for_llm(asyncio.to_thread(deadline_remaining), timeout=30.0)
+
+        assert 0 < asyncio.run(run()) <= 30.0
+        assert deadline_remaining() is None
+
+    def test_iter_with_llm_deadline_keeps_iterator_context(self):
+        async def items():
+            with llm_deadline(5.0):  # a context var held across yields, like stage_labels()
+                for i in range(3):
+                    await asyncio.sleep(0)
+                    yield i, await asyncio.to_thread(deadline_remaining)
+
+        async def run():
+            return [item async for item in iter_with_llm_deadline(items(), timeout=30.0)]
+
+        got = asyncio.run(run())
+        assert [i for i, _ in got] == [0, 1, 2]
+        assert all(0 < remaining <= 5.0 for _, remaining in got)
+
+    def test_iter_with_llm_deadline_times_out_and_cancels(self):
+        cancelled = []
+
+        async def items():
+            yield "plan"
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            yield "never"
+
+        async def run():
+            got = []
+            with pytest.raises(TimeoutError):
+                async for item in iter_with_llm_deadline(items(), timeout=0.1):
+                    got.append(item)
+            await asyncio.sleep(0)  # let the cancellation land
+            return got
+
+        assert asyncio.run(run()) == ["plan"]
+        assert cancelled == [True]
+
+    def test_iter_with_llm_deadline_propagates_errors(self):
+        async def items():
+            yield 1
+            raise ValueError("upstream 500")
+
+        async def run():
+            return [item async for item in iter_with_llm_deadline(items(), timeout=30.0)]
+
+        with pytest.raises(ValueError, match="upstream 500"):
+            asyncio.run(run())
+
+
+class TestHedging:
+    def test_no_hedge_until_latency_window_fills(self):
+        generate, requests = _scripted((0.1, '{"who": "primary"}'))
+        ai = _client(generate)
+        assert ai.generate_json("prompt") == {"who": "primary"}
+        assert len(requests) == 1
+        assert ai.metrics.snapshot()["hedging"]["hedged"] == 0
+
+    def test_fast_primary_is_not_hedged(self):
+        generate, requests = _scripted((0, '{"who": "primary"}'))
+        ai = _client(generate)
+        _warm(ai, "generate_json", latency_ms=200)
+        assert ai.generate_json("prompt") == {"who": "primary"}
+        assert len(requests) == 1
+
+    def test_slow_primary_loses_to_hedge(self):
+        generate, requests = _scripted((1.0, '{"who": "primary"}'), (0, '{"who": "hedge"}'))
+        ai = _client(generate)
+        _warm(ai, "generate_json")
+        start = time.perf_counter()
+        assert ai.generate_json("prompt") == {"who": "hedge"}
+        assert time.perf_counter() - start < 0.8
+        hedging = ai.metrics.snapshot()["hedging"]
+        assert hedging == {"hedged": 1, "hedge_wins": 1, "primary_wins": 0, "hedge_win_rate": 1.0}
+
+    def test_invalid_json_does_not_win(self):
+        generate, _ = _scripted((0.15, '{"who": "primary"}'), (0, "not json"))
+        ai = _client(generate)
+        _warm(ai, "generate_openai_style")
+        assert ai.generate_openai_style(MESSAGES) == '{"who": "primary"}'
+        assert ai.metrics.snapshot()["by_method"]["generate_openai_style"]["hedge_wins"] == 0
+
+    def test_disabled(self):
+        generate, requests = _scripted((0.2, '{"who": "primary"}'))
+        ai = _client(generate, hedge=False)
+        _warm(ai, "generate_json")
+        assert ai.generate_json("prompt") == {"who": "primary"}
+        assert len(requests) == 1
+
+    def test_async_loser_is_cancelled(self):
+        cancelled = []
+        calls = []
+
+        async def agenerate(**request):
+            calls.append(request)
+            if len(calls) == 1:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+                return MagicMock(text='{"who": "primary"}')
+            return MagicMock(text='{"who": "hedge"}')
+
+        ai = _client(agenerate=agenerate)
+        _warm(ai, "generate_openai_style")
+
+        async def run():
+            text = await ai.generate_openai_style_async(MESSAGES)
+            await asyncio.sleep(0)  # let the cancellation land
+            return text
+
+        assert asyncio.run(run()) == '{"who": "hedge"}'
+        assert cancelled == [True]
+        assert ai.metrics.snapshot()["hedging"]["hedge_wins"] == 1
+
+    def test_only_the_hedge_runs_on_the_pool(self):
+        generate, requests = _scripted((1.0, '{"who": "primary"}'), (0, '{"who": "hedge"}'))
+        ai = _client(generate)
+        _warm(ai, "generate_json")
+        assert ai.generate_json("prompt") == {"who": "hedge"}
+        assert [r["thread"].split("_")[0] for r in requests] == ["llm-primary", "llm-hedge"]
+
+    def test_hedge_skipped_when_pool_is_busy(self, monkeypatch):
+        monkeypatch.setattr(ai_mod, "_hedge_slots", threading.BoundedSemaphore(1))
+        ai_mod._hedge_slots.acquire()  # every hedge worker taken
+        generate, requests = _scripted((0.2, '{"who": "primary"}'), (0, '{"who": "hedge"}'))
+        ai = _client(generate)
+        _warm(ai, "generate_json")
+        assert ai.generate_json("prompt") == {"who": "primary"}
+        assert len(requests) == 1
+        assert ai.metrics.snapshot()["hedging"]["hedged"] == 0
+
+    def test_plain_text_wins_when_json_not_expected(self):
+        generate, _ = _scripted((1.0, "<html>primary</html>"), (0, "<html>hedge</html>"))
+        ai = _client(generate)
+        _warm(ai, "generate_openai_style")
+        assert ai.generate_openai_style(MESSAGES, expect_json=False) == "<html>hedge</html>"
+
+    def test_caller_opt_out_sends_one_request_and_keeps_window_clean(self):
+        generate, requests = _scripted((0.2, "<html></html>"))
+        ai = _client(generate)
+        _warm(ai, "generate_openai_style")
+        before = ai.metrics.latency_quantile_ms("generate_openai_style", 0.9)
+        compat = ai_mod.OpenAICompatAdapter(ai)
+        response = compat.chat.completions.create(messages=MESSAGES, hedge=False, expect_json=False)
+        assert response.choices[0].message.content == "<html></html>"
+        assert len(requests) == 1
+        assert ai.metrics.latency_quantile_ms("generate_openai_style", 0.9) == before
@@ -18,8 +18,14 @@ from unittest.mock import MagicMock, patch
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
-from app.core.deps import get_ai_client, get_openai_compat_client, get_supabase_client, get_user_id
-from app.services.pdf import get_pdf_service
+from app.core.deps import (
+    get_ai_client,
+    get_async_supabase_client,
+    get_openai_compat_client,
+    get_pdf_service,
+    get_supabase_client,
+    get_user_id,
+)
 
 # Import conftest fixtures/helpers
 from tests.conftest import TEST_USER_ID, FakeAIClient, FakeOpenAICompat, FakeSupabase
@@ -54,6 +60,7 @@ def _build_client(
 
     db = fake_db or FakeSupabase()
     app.dependency_overrides[get_supabase_client] = lambda: db
+    app.dependency_overrides[get_async_supabase_client] = lambda: db
 
     if not require_auth:
         app.dependency_overrides[get_user_id] = lambda: user_id
@@ -219,6 +226,29 @@ class TestSavedWorksheetEndpoints:
         assert resp.status_code == 200
 
 
+    def test_export_bulk_zip_contains_each_pdf_type(self):
+        import io
+        import zipfile
+        from unittest.mock import AsyncMock
+
+        client = _build_client(self._db_with_worksheets())
+        with patch("app.services.pdf_artifact_cache.get_pdf_artifact_store", return_value=None), \
+             patch("app.api.saved_worksheets._render_pdf", new=AsyncMock(return_value=b"%PDF-1.4 fake")):
+            resp = client.post(
+                "/api/worksheets/export-bulk",
+                json={"worksheet_ids": ["ws-1"], "pdf_types": ["student", "answer_key"]},
+            )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/zip"
+        names = zipfile.ZipFile(io.BytesIO(resp.content)).namelist()
+        assert sorted(names) == ["001_Addition_Worksheet_answer_key.pdf", "001_Addition_Worksheet_student.pdf"]
+
+    def test_export_bulk_requires_ids_or_class(self):
+        client = _build_client(self._db_with_worksheets())
+        resp = client.post("/api/worksheets/export-bulk", json={"pdf_types": ["student"]})
+        assert resp.status_code == 422
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # 4. Worksheet Generation v2
 # ─────────────────────────────────────────────────────────────────────────────
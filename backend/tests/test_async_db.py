@@ -0,0 +1,190 @@
+"""Tests for the async Supabase data-access layer (app.services.async_db)."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.services import async_db
+from app.services.async_db import DB_QUERY_LATENCY, create_async_supabase, execute, gather
+from tests.conftest import TEST_USER_ID, FakeSupabase
+
+
+def _async_client(latency_s: float, rows: list | None = None, seen: list | None = None):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if seen is not None:
+            seen.append(request.url.path)
+        await asyncio.sleep(latency_s)
+        return httpx.Response(200, json=rows if rows is not None else [{"id": "c1"}])
+
+    return create_async_supabase("http://supabase.test", "k" * 40, transport=httpx.MockTransport(handler))
+
+
+class _SlowQuery:
+    """Sync builder whose execute() blocks like a slow PostgREST call."""
+
+    def __init__(self, delay_s: float):
+        self.delay_s = delay_s
+
+    def execute(self):
+        time.sleep(self.delay_s)
+        return type("Result", (), {"data": [{"id": "c1"}]})()
+
+
+async def _max_loop_lag(coro) -> tuple[object, float]:
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def ticker():
+        loop = asyncio.get_running_loop()
+        while not done.is_set():
+            expected = loop.time() + 0.005
+            await asyncio.sleep(0.005)
+            lags.append(loop.time() - expected)
+
+    task = asyncio.create_task(ticker())
+    try:
+        result = await coro
+    finally:
+        done.set()
+        await task
+    return result, max(lags, default=0.0)
+
+
+class TestExecute:
+    def test_async_builder_is_awaited(self):
+        seen: list[str] = []
+
+        async def run():
+            db = _async_client(0, seen=seen)
+            return await execute(db.table("children").select("id").eq("id", "c1"))
+
+        result = asyncio.run(run())
+        assert result.data == [{"id": "c1"}]
+        assert seen == ["/rest/v1/children"]
+
+    def test_sync_builder_runs_off_the_loop(self):
+        result, lag = asyncio.run(_max_loop_lag(execute(_SlowQuery(0.2))))
+        assert result.data == [{"id": "c1"}]
+        assert lag < 0.1
+
+    def test_sync_fake_client(self):
+        db = FakeSupabase({"children": [{"id": "c1", "user_id": TEST_USER_ID}]})
+        result = asyncio.run(execute(db.table("children").select("id").eq("id", "c1")))
+        assert result.data[0]["id"] == "c1"
+
+    def test_latency_recorded_by_mode(self):
+        DB_QUERY_LATENCY.reset()
+        asyncio.run(execute(_SlowQuery(0)))
+        assert DB_QUERY_LATENCY.snapshot()[("thread",)]["count"] == 1
+
+
+class TestGather:
+    def test_fan_out_is_concurrent(self):
+        async def run():
+            db = _async_client(0.1)
+            t0 = time.perf_counter()
+            results = await gather(*(db.table(f"t{i}").select("*") for i in range(4)))
+            return results, time.perf_counter() - t0
+
+        results, elapsed = asyncio.run(run())
+        assert len(results) == 4
+        assert elapsed < 0.3
+
+    def test_failure_propagates(self):
+        class Boom:
+            def execute(self):
+                raise RuntimeError("db down")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(gather(_SlowQuery(0), Boom()))
+
+
+class TestSingleton:
+    def test_client_is_per_event_loop(self, monkeypatch):
+        monkeypatch.setenv("SUPABASE_URL", "http://supabase.test")
+        monkeypatch.setenv("SUPABASE_SERVICE_KEY", "k" * 40)
+        from app.core.config import get_settings
+
+        get_settings.cache_clear()
+
+        async def pair():
+            return async_db.get_async_supabase(), async_db.get_async_supabase()
+
+        try:
+            a1, a2 = asyncio.run(pair())
+            b1, _ = asyncio.run(pair())
+            assert a1 is a2
+            assert b1 is not a1
+            asyncio.run(async_db.close_async_supabase())
+        finally:
+            get_settings.cache_clear()
+            async_db._client = async_db._client_loop = None
+
+
+class TestClassDashboardRoute:
+    def test_dashboard_on_async_client(self):
+        from app.api.classes import router as classes_router
+        from app.core.deps import get_async_supabase_client, get_user_id
+
+        rows = [{"id": "cls-1", "name": "3A", "child_id": "child-1", "topic_slug": "t", "mastery_level": "learning"}]
+        seen: list[str] = []
+        db = _async_client(0, rows=rows, seen=seen)
+
+        app = FastAPI()
+        app.include_router(classes_router)
+        app.dependency_overrides[get_async_supabase_client] = lambda: db
+        app.dependency_overrides[get_user_id] = lambda: TEST_USER_ID
+
+        resp = TestClient(app).get("/api/classes/cls-1/dashboard")
+        assert resp.status_code == 200, resp.text
+        body = resp.json()
+        assert body["class_name"] == "3A"
+        assert body["weak_topics"] == ["t"]
+        assert sorted(seen) == sorted(
+            ["/rest/v1/teacher_classes", "/rest/v1/worksheets", "/rest/v1/children", "/rest/v1/topic_mastery"]
+        )
+
+
+class TestParentDashboardRoute:
+    def test_dashboard_queries_fan_out_on_async_client(self):
+        from app.api.dashboard import router as dashboard_router
+        from app.core.deps import get_async_supabase_client, get_user_id
+
+        rows = [{"id": "child-7", "topic": "Fractions", "created_at": "2026-01-01", "total_stars": 4}]
+        seen: list[str] = []
+        db = _async_client(0.1, rows=rows, seen=seen)
+
+        app = FastAPI()
+        app.include_router(dashboard_router)
+        app.dependency_overrides[get_async_supabase_client] = lambda: db
+        app.dependency_overrides[get_user_id] = lambda: TEST_USER_ID
+
+        t0 = time.perf_counter()
+        resp = TestClient(app).get("/api/v1/dashboard/parent", params={"student_id": "child-dash-7"})
+        elapsed = time.perf_counter() - t0
+        assert resp.status_code == 200, resp.text
+        body = resp.json()
+        assert body["overall_stats"]["total_stars"] == 4
+        assert body["recent_topics"][0]["topic"] == "Fractions"
+        assert sorted(seen) == sorted(
+            ["/rest/v1/children", "/rest/v1/child_engagement", "/rest/v1/mastery_state", "/rest/v1/worksheets"]
+        )
+        assert elapsed < 0.35  # ownership check, then the three queries together
+
+
+class TestLoadHarness:
+    def test_loop_lag_flat_vs_legacy(self):
+        from scripts.load_test_event_loop import build_app, run_load
+
+        legacy = asyncio.run(run_load(build_app("legacy", 0.02), concurrency=10, total=10))
+        fast = asyncio.run(run_load(build_app("async", 0.02), concurrency=10, total=10))
+        assert legacy["ok"] == fast["ok"] == 10
+        # Legacy blocks the loop for every round trip; async only for CPU work
+        assert fast["lag_max_ms"] < legacy["lag_max_ms"]
+        assert fast["rps"] > legacy["rps"]
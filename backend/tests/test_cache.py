@@ -0,0 +1,341 @@
+"""Tests for app.services.cache — pluggable backends, single-flight, stale-while-revalidate."""
+
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+import time
+
+import pytest
+
+from app.services import cache as cache_mod
+from app.services.cache import (
+    CacheNamespace,
+    MemoryBackend,
+    RedisBackend,
+    SQLiteBackend,
+    TieredBackend,
+)
+
+
+class FakeRedis:
+    """Tiny Redis-protocol stand-in: get / set(px, nx) / delete / scan_iter / eval (lease release only)."""
+
+    def __init__(self):
+        self._data: dict[str, tuple[float | None, bytes]] = {}
+
+    def _alive(self, key):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at is not None and expires_at <= time.time():
+            del self._data[key]
+            return None
+        return value
+
+    def get(self, key):
+        return self._alive(key)
+
+    def set(self, key, value, ex=None, px=None, nx=False):
+        if nx and self._alive(key) is not None:
+            return None
+        ttl = px / 1000 if px else ex
+        self._data[key] = (time.time() + ttl if ttl else None, value.encode() if isinstance(value, str) else value)
+        return True
+
+    def delete(self, *keys):
+        return sum(1 for k in keys if self._data.pop(k, None) is not None)
+
+    def scan_iter(self, match="*"):
+        return [k for k in list(self._data) if fnmatch.fnmatch(k, match) and self._alive(k) is not None]
+
+    def eval(self, script, numkeys, key, token):
+        assert script == cache_mod._RELEASE_LEASE_LUA
+        if self._alive(key) == token.encode():
+            return self.delete(key)
+        return 0
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend(maxsize=100)
+    if request.param == "sqlite":
+        return SQLiteBackend(str(tmp_path / "cache.sqlite3"))
+    return RedisBackend(FakeRedis())
+
+
+class TestBackends:
+    def test_roundtrip_and_delete(self, backend):
+        backend.set("skolar:cache:t:a", {"cards": [1, 2]}, ttl=60)
+        assert backend.get("skolar:cache:t:a") == {"cards": [1, 2]}
+        backend.delete("skolar:cache:t:a")
+        assert backend.get("skolar:cache:t:a") is None
+
+    def test_expiry(self, backend):
+        backend.set("skolar:cache:t:a", {"x": 1}, ttl=0.05)
+        time.sleep(0.1)
+        assert backend.get("skolar:cache:t:a") is None
+
+    def test_clear_by_prefix(self, backend):
+        backend.set("skolar:cache:one:a", 1, ttl=60)
+        backend.set("skolar:cache:two:a", 2, ttl=60)
+        backend.clear("skolar:cache:one:")
+        assert backend.get("skolar:cache:one:a") is None
+        assert backend.get("skolar:cache:two:a") == 2
+
+    def test_lease_is_exclusive(self, backend):
+        if isinstance(backend, MemoryBackend):
+            pytest.skip("in-process tier relies on shared futures instead of leases")
+        assert backend.acquire_lease("k:lease", 60, "a") is True
+        assert backend.acquire_lease("k:lease", 60, "b") is False
+        backend.release_lease("k:lease", "a")
+        assert backend.acquire_lease("k:lease", 60, "b") is True
+
+    def test_release_keeps_a_lease_taken_by_someone_else(self, backend):
+        if isinstance(backend, MemoryBackend):
+            pytest.skip("in-process tier relies on shared futures instead of leases")
+        assert backend.acquire_lease("k:lease", 0.05, "a") is True
+        time.sleep(0.1)  # a's lease expired ...
+        assert backend.acquire_lease("k:lease", 60, "b") is True  # ... and b took it
+        backend.release_lease("k:lease", "a")
+        assert backend.acquire_lease("k:lease", 60, "c") is False
+
+    def test_sqlite_shared_between_workers(self, tmp_path):
+        path = str(tmp_path / "shared.sqlite3")
+        worker_a, worker_b = SQLiteBackend(path), SQLiteBackend(path)
+        worker_a.set("skolar:cache:t:a", {"v": 1}, ttl=60)
+        assert worker_b.get("skolar:cache:t:a") == {"v": 1}
+
+    def test_memory_lru_eviction(self):
+        mem = MemoryBackend(maxsize=2)
+        for k in "abc":
+            mem.set(k, k, ttl=60)
+        assert mem.get("a") is None
+        assert mem.get("c") == "c"
+
+
+def _ns(backend=None, ttl=60.0, stale_ttl=0.0) -> CacheNamespace:
+    ns = CacheNamespace("test", maxsize=50, ttl=ttl, stale_ttl=stale_ttl)
+    if backend is not None:
+        ns._backend = backend
+    return ns
+
+
+class TestSingleFlight:
+    def test_concurrent_misses_generate_once(self):
+        ns = _ns()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"notes": "ok"}
+
+        async def run():
+            key = ns.key("a")
+            return await asyncio.gather(*(ns.get_or_compute(key, compute) for _ in range(20)))
+
+        results = asyncio.run(run())
+        assert calls == 1
+        assert all(r == {"notes": "ok"} for r in results)
+        assert ns.coalesced == 19
+
+    def test_failure_propagates_to_waiters_and_is_not_cached(self):
+        ns = _ns()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise ValueError("gemini down")
+
+        async def run():
+            key = ns.key("a")
+            return await asyncio.gather(*(ns.get_or_compute(key, compute) for _ in range(3)), return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert calls == 1
+        assert all(isinstance(r, ValueError) for r in results)
+        assert ns.get(ns.key("a")) is None
+
+    def test_cross_worker_coalescing_via_shared_lease(self):
+        shared = RedisBackend(FakeRedis())
+        worker_a = _ns(TieredBackend(MemoryBackend(50, max_ttl=30), shared))
+        worker_b = _ns(TieredBackend(MemoryBackend(50, max_ttl=30), shared))
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.2)
+            return {"v": 1}
+
+        async def run():
+            key = worker_a.key("same")
+            return await asyncio.gather(worker_a.get_or_compute(key, compute), worker_b.get_or_compute(key, compute))
+
+        assert asyncio.run(run()) == [{"v": 1}, {"v": 1}]
+        assert calls == 1
+
+    def test_waiter_takes_over_when_lease_holder_fails(self):
+        shared = RedisBackend(FakeRedis())
+        worker_a = _ns(TieredBackend(MemoryBackend(50, max_ttl=30), shared))
+        worker_b = _ns(TieredBackend(MemoryBackend(50, max_ttl=30), shared))
+
+        async def failing():
+            await asyncio.sleep(0.1)
+            raise ValueError("gemini down")
+
+        async def compute():
+            return {"v": "b"}
+
+        async def run():
+            key = worker_a.key("same")
+            a = asyncio.create_task(worker_a.get_or_compute(key, failing))
+            await asyncio.sleep(0.02)  # a holds the lease
+            start = time.monotonic()
+            b = await worker_b.get_or_compute(key, compute)
+            return b, time.monotonic() - start, await asyncio.gather(a, return_exceptions=True)
+
+        value, waited, (a_result,) = asyncio.run(run())
+        assert value == {"v": "b"}
+        assert waited < 1.0  # not the 60 s lease TTL
+        assert isinstance(a_result, ValueError)
+
+    def test_cancelled_leader_does_not_fail_followers(self):
+        ns = _ns()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"v": 1}
+
+        async def run():
+            key = ns.key("a")
+            leader = asyncio.create_task(ns.get_or_compute(key, compute))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(ns.get_or_compute(key, compute))
+            await asyncio.sleep(0.01)
+            leader.cancel()  # e.g. the leader's client disconnected
+            return await follower, leader
+
+        value, leader = asyncio.run(run())
+        assert value == {"v": 1}
+        assert leader.cancelled()
+        assert calls == 1
+        assert ns.get(ns.key("a")) == {"v": 1}
+
+    def test_slow_shared_backend_does_not_block_event_loop(self):
+        class SlowBackend(MemoryBackend):
+            def get(self, key):
+                time.sleep(0.2)
+                return super().get(key)
+
+        ns = _ns(TieredBackend(MemoryBackend(50, max_ttl=30), SlowBackend(50)))
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        async def compute():
+            return {"v": 1}
+
+        async def run():
+            t = asyncio.create_task(ticker())
+            await ns.get_or_compute(ns.key("a"), compute)
+            t.cancel()
+
+        asyncio.run(run())
+        assert ticks >= 5
+
+
+class TestStaleWhileRevalidate:
+    def test_serves_stale_and_refreshes_in_background(self):
+        ns = _ns(ttl=0.2, stale_ttl=60)
+        version = 0
+
+        async def compute():
+            nonlocal version
+            version += 1
+            return {"v": version}
+
+        async def run():
+            key = ns.key("a")
+            first = await ns.get_or_compute(key, compute)
+            await asyncio.sleep(0.3)  # past TTL, inside stale window
+            stale = await ns.get_or_compute(key, compute)
+            await asyncio.sleep(0.02)  # let the refresh task finish
+            fresh = await ns.get_or_compute(key, compute)
+            return first, stale, fresh
+
+        first, stale, fresh = asyncio.run(run())
+        assert first == {"v": 1}
+        assert stale == {"v": 1}
+        assert fresh == {"v": 2}
+        assert ns.stale_hits == 1
+
+    def test_past_stale_window_blocks_on_regeneration(self):
+        ns = _ns(ttl=0.02, stale_ttl=0.02)
+        version = 0
+
+        async def compute():
+            nonlocal version
+            version += 1
+            return {"v": version}
+
+        async def run():
+            key = ns.key("a")
+            await ns.get_or_compute(key, compute)
+            await asyncio.sleep(0.1)
+            return await ns.get_or_compute(key, compute)
+
+        assert asyncio.run(run()) == {"v": 2}
+
+
+class TestModuleApi:
+    def test_revision_helpers_roundtrip(self):
+        cache_mod.set_cached_revision("Class 3", "Maths", "Fractions", "English", {"notes": 1})
+        assert cache_mod.get_cached_revision("class 3", "maths", "fractions", "english") == {"notes": 1}
+
+    def test_dashboard_invalidate(self):
+        cache_mod.set_cached_dashboard("child-123", {"skills": []})
+        cache_mod.invalidate_dashboard("child-123")
+        assert cache_mod.get_cached_dashboard("child-123") is None
+
+    def test_get_or_create_flashcards(self):
+        async def generate():
+            return {"cards": ["a"]}
+
+        result = asyncio.run(cache_mod.get_or_create_flashcards("Class 2", "EVS", "Plants", "English", generate))
+        assert result == {"cards": ["a"]}
+        assert cache_mod.get_cached_flashcards("Class 2", "EVS", "Plants", "English") == {"cards": ["a"]}
+
+    def test_cache_stats_shape(self):
+        stats = cache_mod.cache_stats()
+        assert set(stats) == {"revision", "flashcards", "dashboard"}
+        for entry in stats.values():
+            assert {"size", "maxsize", "ttl", "backend", "hits", "misses"} <= set(entry)
+
+    def test_shared_backend_wiring(self, tmp_path):
+        try:
+            cache_mod.set_shared_backend(SQLiteBackend(str(tmp_path / "c.sqlite3")))
+            cache_mod.set_cached_dashboard("child-9", {"ok": True})
+            assert cache_mod.cache_stats()["dashboard"]["backend"] == "memory+sqlite"
+            assert cache_mod.get_cached_dashboard("child-9") == {"ok": True}
+        finally:
+            cache_mod.set_shared_backend(None)
+
+    @pytest.fixture(autouse=True)
+    def _clean(self):
+        cache_mod.clear_all()
+        yield
+        cache_mod.clear_all()
@@ -41,6 +41,21 @@ def _run_gate(ws: dict) -> object:
     )
 
 
+def _run_gate_fast(ws: dict) -> object:
+    """Run the release gate in fast-verdict mode."""
+    return run_release_gate(
+        questions=ws.get("questions", []),
+        grade_level=ws.get("grade", "Class 3"),
+        subject=ws.get("subject", "Maths"),
+        topic=ws.get("topic", ""),
+        num_questions=len(ws.get("questions", [])),
+        difficulty=ws.get("difficulty", "Medium"),
+        warnings=[],
+        worksheet_meta=ws,
+        mode="fast",
+    )
+
+
 def _run_ov(ws: dict) -> tuple[bool, list[str]]:
     """Run OutputValidator on a worksheet."""
     from app.services.output_validator import get_validator
@@ -99,6 +114,16 @@ class TestGoldRegression:
                 f"{fixture_id}: expected blocked, got {verdict.verdict}"
             )
 
+    def test_fast_verdict_matches_full(self, fixture_id: str):
+        """Fast mode short-circuits but never changes the verdict."""
+        full = _run_gate(_build_fixture(fixture_id))
+        fast = _run_gate_fast(_build_fixture(fixture_id))
+        assert fast.verdict == full.verdict
+        if full.verdict == "blocked":
+            assert fast.block_reasons[0] in full.block_reasons
+        else:
+            assert not fast.skipped_rules
+
     def test_no_critical_failures(self, fixture_id: str):
         """Clean fixtures have zero critical failures."""
         spec = GOLD_FIXTURES[fixture_id]
@@ -0,0 +1,71 @@
+"""Tests for print-ready image derivatives used by the ReportLab PDF."""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+from app.services import image_assets
+from app.services.image_assets import ImageAsset, ImageAssetStore
+
+
+@pytest.fixture
+def images_dir(tmp_path, monkeypatch):
+    src = tmp_path / "images" / "animals"
+    src.mkdir(parents=True)
+    Image.new("RGBA", (512, 256), (255, 0, 0, 0)).save(src / "ghost.png")
+    Image.new("RGB", (100, 100), (0, 128, 0)).save(src / "leaf.webp")
+    monkeypatch.setattr(image_assets, "IMAGES_DIR", str(tmp_path / "images"))
+    return tmp_path
+
+
+class TestImageAssetStore:
+    def test_alpha_flattened_and_downscaled(self, images_dir):
+        store = ImageAssetStore(str(images_dir / "assets"), max_px=200)
+        asset = store.get("/images/animals/ghost.png")
+        assert (asset.width, asset.height) == (200, 100)
+        with Image.open(asset.path) as img:
+            assert img.format == "JPEG"
+            assert img.mode == "RGB"
+            assert img.getpixel((10, 10))[1] > 240  # transparent → white, not black
+
+    def test_small_images_not_upscaled(self, images_dir):
+        asset = ImageAssetStore(str(images_dir / "assets"), max_px=200).get("/images/animals/leaf.webp")
+        assert (asset.width, asset.height) == (100, 100)
+
+    def test_content_hashed_and_reused_across_stores(self, images_dir):
+        first = ImageAssetStore(str(images_dir / "assets"), max_px=200)
+        path = first.get("/images/animals/leaf.webp").path
+        second = ImageAssetStore(str(images_dir / "assets"), max_px=200)
+        assert second.get("/images/animals/leaf.webp").path == path
+        assert (first.stats()["built"], second.stats()["built"], second.stats()["reused"]) == (1, 0, 1)
+        # A different recipe never overwrites the other derivative
+        assert ImageAssetStore(str(images_dir / "assets"), max_px=64).get("/images/animals/leaf.webp").path != path
+
+    def test_concurrent_first_use_builds_once(self, images_dir):
+        store = ImageAssetStore(str(images_dir / "assets"), max_px=200)
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            paths = set(ex.map(lambda _: store.get("/images/animals/ghost.png").path, range(32)))
+        assert len(paths) == 1
+        assert store.stats()["built"] == 1
+        assert not [f for f in os.listdir(images_dir / "assets") if f.endswith(".tmp")]
+
+    def test_missing_source_returns_none(self, images_dir):
+        store = ImageAssetStore(str(images_dir / "assets"))
+        assert store.get("/images/animals/unicorn.webp") is None
+        assert store.get("") is None
+
+
+def test_fit_keeps_aspect_ratio():
+    assert ImageAsset("x.jpg", 200, 100).fit(50, 50) == (50, 25)
+    assert ImageAsset("x.jpg", 100, 200).fit(50, 50) == (25, 50)
+
+
+def test_every_registry_image_prepares(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_assets, "_store", ImageAssetStore(str(tmp_path)))
+    stats = image_assets.prepare_image_assets()
+    assert stats["failed"] == 0
+    assert stats["ready"] == stats["indexed"] > 0
@@ -0,0 +1,145 @@
+"""Tests for local access-token verification and the token → user_id cache."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+from fastapi import HTTPException
+
+from app.core.jwt_verify import InvalidTokenError, TokenVerifier
+
+SECRET = "super-secret-jwt-token-with-at-least-32-characters"
+
+
+class _Clock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _token(sub: str = "user-1", exp_in: float = 3600, now: float | None = None, key=SECRET, alg="HS256", **extra):
+    now = time.time() if now is None else now
+    claims = {"sub": sub, "aud": "authenticated", "exp": int(now + exp_in), "role": "authenticated", **extra}
+    headers = {"kid": "k1"} if alg != "HS256" else None
+    return jwt.encode(claims, key, algorithm=alg, headers=headers)
+
+
+class TestLocalHS256:
+    def test_verifies_and_caches(self):
+        verifier = TokenVerifier(jwt_secret=SECRET)
+        token = _token()
+        assert verifier.user_id(token) == "user-1"
+        assert verifier.user_id(token) == "user-1"
+        stats = verifier.stats()
+        assert (stats["hits"], stats["misses"], stats["local"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    def test_bad_signature_rejected_without_remote_call(self):
+        remote = []
+        verifier = TokenVerifier(jwt_secret=SECRET, remote_verify=lambda t: remote.append(t) or "x")
+        with pytest.raises(InvalidTokenError):
+            verifier.user_id(_token(key="another-secret-that-is-also-32-chars-long"))
+        assert remote == []
+        assert verifier.stats()["rejected"] == 1
+
+    def test_expired_token_rejected(self):
+        verifier = TokenVerifier(jwt_secret=SECRET)
+        with pytest.raises(InvalidTokenError):
+            verifier.user_id(_token(exp_in=-60))
+
+    def test_wrong_audience_rejected(self):
+        verifier = TokenVerifier(jwt_secret=SECRET)
+        with pytest.raises(InvalidTokenError):
+            verifier.user_id(_token(aud="anon"))
+
+    def test_alg_none_rejected(self):
+        verifier = TokenVerifier(jwt_secret=SECRET, remote_verify=lambda t: "user-1")
+        token = jwt.encode(
+            {"sub": "user-1", "aud": "authenticated", "exp": int(time.time()) + 60}, None, algorithm="none"
+        )
+        with pytest.raises(InvalidTokenError):
+            verifier.user_id(token)
+
+    def test_entry_expires_with_token(self):
+        clock = _Clock()
+        verifier = TokenVerifier(jwt_secret=SECRET, clock=clock)
+        token = _token(exp_in=120)
+        # Real time for signature checks; cache expiry follows the injected clock
+        clock.now = time.time()
+        verifier.user_id(token)
+        assert verifier.stats()["size"] == 1
+        verifier.user_id(token)
+        clock.now += 121
+        assert verifier.stats()["size"] == 0
+        # Past exp the entry is gone: the token is verified again, not served from cache
+        verifier.user_id(token)
+        stats = verifier.stats()
+        assert (stats["hits"], stats["misses"], stats["local"]) == (1, 2, 2)
+
+    def test_cache_is_bounded(self):
+        verifier = TokenVerifier(jwt_secret=SECRET, maxsize=3)
+        for i in range(10):
+            verifier.user_id(_token(sub=f"user-{i}"))
+        assert verifier.stats()["size"] == 3
+
+
+class TestJWKS:
+    def test_es256_verified_with_jwks_key(self):
+        private_key = ec.generate_private_key(ec.SECP256R1())
+        jwk = jwt.PyJWK.from_dict(
+            {**jwt.algorithms.ECAlgorithm.to_jwk(private_key.public_key(), as_dict=True), "kid": "k1", "alg": "ES256"}
+        )
+        verifier = TokenVerifier(jwks_url="https://example.supabase.co/auth/v1/.well-known/jwks.json")
+        with patch.object(jwt.PyJWKClient, "get_signing_key_from_jwt", return_value=jwk) as lookup:
+            token = _token(key=private_key, alg="ES256")
+            assert verifier.user_id(token) == "user-1"
+            assert verifier.user_id(token) == "user-1"
+        assert lookup.call_count == 1
+        assert verifier.stats()["local"] == 1
+
+    def test_jwks_unreachable_falls_back_to_remote(self):
+        private_key = ec.generate_private_key(ec.SECP256R1())
+        verifier = TokenVerifier(
+            jwks_url="https://example.supabase.co/auth/v1/.well-known/jwks.json", remote_verify=lambda t: "user-9"
+        )
+        with patch.object(jwt.PyJWKClient, "get_signing_key_from_jwt", side_effect=jwt.PyJWKClientError("down")):
+            assert verifier.user_id(_token(key=private_key, alg="ES256")) == "user-9"
+        assert verifier.stats()["remote"] == 1
+
+
+class TestRemoteFallback:
+    def test_hs256_without_secret_uses_remote_once(self):
+        calls = []
+        verifier = TokenVerifier(remote_verify=lambda t: calls.append(t) or "user-2")
+        token = _token(sub="user-2")
+        assert verifier.user_id(token) == "user-2"
+        assert verifier.user_id(token) == "user-2"
+        assert len(calls) == 1
+
+    def test_remote_rejection(self):
+        verifier = TokenVerifier(remote_verify=lambda t: None)
+        with pytest.raises(InvalidTokenError):
+            verifier.user_id(_token())
+        assert verifier.stats()["size"] == 0
+
+
+class TestGetCurrentUserId:
+    def test_invalid_token_is_401(self):
+        from app.core import deps
+
+        with patch.object(deps, "get_token_verifier", return_value=TokenVerifier(jwt_secret=SECRET)):
+            with pytest.raises(HTTPException) as exc:
+                deps.get_current_user_id("Bearer not-a-jwt")
+        assert exc.value.status_code == 401
+
+    def test_valid_token(self):
+        from app.core import deps
+
+        with patch.object(deps, "get_token_verifier", return_value=TokenVerifier(jwt_secret=SECRET)):
+            assert deps.get_current_user_id(f"Bearer {_token(sub='abc')}") == "abc"
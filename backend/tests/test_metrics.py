@@ -0,0 +1,222 @@
+"""Tests for the per-stage latency histograms and the /metrics endpoint."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.services.metrics import (
+    STAGE_LATENCY,
+    Histogram,
+    capture_stage_samples,
+    get_metrics_registry,
+    observe_stage,
+    stage_labels,
+    stage_timer,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    get_metrics_registry().reset()
+    yield
+    get_metrics_registry().reset()
+
+
+def _series(stage: str) -> dict:
+    return {k: v for k, v in STAGE_LATENCY.snapshot().items() if k[0] == stage}
+
+
+class TestHistogram:
+    def test_buckets_are_cumulative(self):
+        h = Histogram("h", "help", ("stage",), (0.1, 1.0))
+        for v in (0.05, 0.5, 0.5, 5.0):
+            h.observe(v, stage="x")
+        snap = h.snapshot()[("x",)]
+        assert snap["buckets"] == [(0.1, 1), (1.0, 3)]
+        assert snap["count"] == 4
+        assert snap["sum"] == pytest.approx(6.05)
+
+    def test_quantile_returns_bucket_bound(self):
+        h = Histogram("h", "help", ("stage",), (0.1, 1.0, 10.0))
+        for _ in range(98):
+            h.observe(0.05, stage="x")
+        h.observe(5.0, stage="x")
+        h.observe(5.0, stage="x")
+        assert h.quantile(0.5, stage="x") == 0.1
+        assert h.quantile(0.99, stage="x") == 10.0
+
+    def test_thread_safe_counts(self):
+        h = Histogram("h", "help", ("stage",), (1.0,))
+
+        def work():
+            for _ in range(1000):
+                h.observe(0.5, stage="x")
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert h.snapshot()[("x",)]["count"] == 8000
+
+
+class TestStageLabels:
+    def test_labels_apply_to_nested_timers(self):
+        with stage_labels(engine="v3", subject="Maths", grade="Class 3"):
+            with stage_timer("slot_build"):
+                pass
+        assert list(_series("slot_build")) == [("slot_build", "v3", "Maths", "Class 3")]
+
+    def test_explicit_labels_override_context(self):
+        with stage_labels(engine="v3", subject="Maths"):
+            observe_stage("pdf_render", 0.2, engine="weasyprint")
+        assert ("pdf_render", "weasyprint", "Maths", "") in STAGE_LATENCY.snapshot()
+
+    def test_timer_records_on_error(self):
+        with pytest.raises(ValueError):
+            with stage_timer("quality_gate"):
+                raise ValueError("boom")
+        assert sum(s["count"] for s in _series("quality_gate").values()) == 1
+
+
+class TestStageSamples:
+    def test_capture_collects_raw_seconds_only_inside_block(self):
+        observe_stage("slot_build", 0.5)
+        with capture_stage_samples() as outer:
+            observe_stage("slot_build", 0.001)
+            with capture_stage_samples() as inner:
+                observe_stage("validation", 0.002)
+            observe_stage("slot_build", 0.003)
+        observe_stage("slot_build", 0.5)
+        assert outer == {"slot_build": [0.001, 0.003], "validation": [0.002]}
+        assert inner == {"validation": [0.002]}
+
+
+class TestPrometheusRender:
+    def test_exposition_format(self):
+        observe_stage("validation", 0.003, engine="v3", subject='Say "hi"', grade="Class 1")
+        text = get_metrics_registry().render()
+
+        assert "# TYPE skolar_generation_stage_seconds histogram" in text
+        assert 'subject="Say \\"hi\\""' in text
+        assert 'le="0.005"} 1' in text
+        assert 'le="+Inf"} 1' in text
+        assert "skolar_generation_stage_seconds_count{" in text
+
+    def test_metrics_endpoint(self, monkeypatch):
+        from app.api.health import router
+
+        monkeypatch.setenv("HEALTH_CHECK_TOKEN", "secret")
+        app = FastAPI()
+        app.include_router(router)
+        client = TestClient(app)
+        observe_stage("slot_build", 0.01, engine="v3")
+
+        assert client.get("/metrics").status_code == 403
+        resp = client.get("/metrics", headers={"Authorization": "Bearer secret"})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain")
+        assert 'stage="slot_build"' in resp.text
+
+
+class TestPipelineStages:
+    def test_v3_generation_records_each_stage(self, monkeypatch):
+        from app.services.v3 import generate_worksheet_v3_async
+        from tests.test_v3_generate_async import _ARGS, AsyncFakeClient
+
+        async def _none(*args, **kwargs):
+            return None
+
+        monkeypatch.setattr("app.services.curriculum.get_curriculum_context", _none)
+        asyncio.run(generate_worksheet_v3_async(client=AsyncFakeClient(), **_ARGS))
+
+        stages = {k[0] for k in STAGE_LATENCY.snapshot()}
+        assert {
+            "slot_build",
+            "curriculum_rag",
+            "gemini_batch",
+            "validation",
+            "quality_gate",
+            "visual_enrichment",
+            "template_render",
+        } <= stages
+        for key in STAGE_LATENCY.snapshot():
+            assert key[1:] == ("v3", "Maths", "Class 3")
+
+    def test_sync_batch_fan_out_keeps_labels(self):
+        from app.services.v3 import generate_worksheet_v3
+        from tests.test_v3_generate_async import _ARGS, SyncOnlyClient
+
+        generate_worksheet_v3(client=SyncOnlyClient(), **{**_ARGS, "num_questions": 20})
+
+        batches = _series("gemini_batch")
+        assert list(batches) == [("gemini_batch", "v3", "Maths", "Class 3")]
+        assert batches[("gemini_batch", "v3", "Maths", "Class 3")]["count"] >= 2
+
+    def test_pdf_export_labels_ignore_free_text(self, monkeypatch):
+        from app.api.saved_worksheets import _render_pdf
+
+        class FakePool:
+            async def render(self, worksheet, pdf_type="full"):
+                return b"%PDF"
+
+        monkeypatch.setattr("app.services.v3.pdf_pool.get_pdf_pool", lambda: FakePool())
+        for i in range(3):
+            worksheet = {"subject": f"Maths {i}", "grade": f"<script>{i}", "questions": []}
+            asyncio.run(_render_pdf(worksheet, "full", None, None, None, pdf_service=None))
+        asyncio.run(_render_pdf({"subject": "EVS", "grade": "Class 2"}, "full", None, None, None, pdf_service=None))
+
+        assert set(_series("pdf_render")) == {
+            ("pdf_render", "weasyprint", "other", "other"),
+            ("pdf_render", "weasyprint", "EVS", "Class 2"),
+        }
+
+
+class TestGenerateBenchmark:
+    def test_harness_drives_both_routes_and_reports_stages(self):
+        from scripts.bench_generate import FakeLLM, bench_app, compare, run_load
+
+        llm = FakeLLM(latency_ms=5, jitter_ms=2)
+        with bench_app(llm) as app:
+            results = {route: asyncio.run(run_load(app, route, concurrency=4, total=4)) for route in ("v3", "v2")}
+
+        for result in results.values():
+            assert result["ok"] == 4, result["statuses"]
+            assert {"slot_build", "gemini_batch", "validation", "template_render"} <= set(result["stages"])
+            assert result["request"]["p95_ms"] >= result["stages"]["slot_build"]["p95_ms"]
+        assert llm.calls >= 8
+
+        v3 = results["v3"]
+        assert compare(v3, v3, tolerance=0.25, min_delta_ms=5) == []
+        slower = {**v3, "stages": {**v3["stages"], "slot_build": {**v3["stages"]["slot_build"], "p95_ms": 1e4}}}
+        assert [p.split()[1] for p in compare(slower, v3, tolerance=0.25, min_delta_ms=5)] == ["slot_build"]
+
+    def test_committed_baseline_is_comparable(self):
+        import json
+        from pathlib import Path
+
+        from scripts.bench_generate import compare
+
+        path = Path(__file__).resolve().parent.parent / "scripts" / "bench_baselines" / "generate.json"
+        baseline = json.loads(path.read_text())
+        assert set(baseline) == {"v2", "v3"}
+        for result in baseline.values():
+            assert {"slot_build", "gemini_batch", "validation", "template_render"} <= set(result["stages"])
+            assert compare(result, result, tolerance=0.25, min_delta_ms=5) == []
+
+    def test_fake_llm_replays_cassette_for_matching_slots(self, tmp_path):
+        from scripts.bench_generate import FakeLLM, load_cassette
+
+        cassette = tmp_path / "c.jsonl"
+        cassette.write_text('{"slots": [1, 2], "content": "recorded"}\n')
+        llm = FakeLLM(cassette=load_cassette(cassette))
+        hit = llm.chat.completions.create(messages=[{"role": "user", "content": "SLOT 1: a\nSLOT 2: b"}])
+        miss = llm.chat.completions.create(messages=[{"role": "user", "content": "SLOT 3: c"}])
+        assert hit.choices[0].message.content == "recorded"
+        assert '"slot": 3' in miss.choices[0].message.content
+        assert (llm.calls, llm.replayed) == (2, 1)
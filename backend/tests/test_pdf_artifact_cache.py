@@ -0,0 +1,140 @@
+"""Tests for the rendered-PDF artifact cache: keying, LRU eviction, object-store tier."""
+
+from __future__ import annotations
+
+import os
+import time
+
+from app.services.pdf_artifact_cache import LocalDiskStore, ObjectStore, PDFArtifactStore, artifact_key
+
+WS = {"title": "Fractions", "grade": "Class 4", "questions": [{"id": "q1", "text": "1/2 + 1/4 = ?"}]}
+
+
+class _DictStore(ObjectStore):
+    name = "dict"
+
+    def __init__(self):
+        self.blobs: dict[str, bytes] = {}
+
+    def get(self, key: str) -> bytes | None:
+        return self.blobs.get(key)
+
+    def put(self, key: str, data: bytes) -> None:
+        self.blobs[key] = data
+
+
+class TestArtifactKey:
+    def test_stable_across_dict_order(self):
+        reordered = {"questions": WS["questions"], "grade": WS["grade"], "title": WS["title"]}
+        assert artifact_key(WS, "full", "color", "Skolar") == artifact_key(reordered, "full", "color", "Skolar")
+
+    def test_every_input_changes_key(self):
+        base = artifact_key(WS, "full", "color", "Skolar")
+        assert artifact_key(WS, "answer_key", "color", "Skolar") != base
+        assert artifact_key(WS, "full", "bw", "Skolar") != base
+        assert artifact_key(WS, "full", "color", None) != base
+        assert artifact_key({**WS, "title": "Decimals"}, "full", "color", "Skolar") != base
+
+    def test_default_theme_is_color(self):
+        assert artifact_key(WS, "full", None, None) == artifact_key(WS, "full", "color", None)
+
+
+class TestLocalDiskStore:
+    def test_put_then_get(self, tmp_path):
+        store = LocalDiskStore(str(tmp_path))
+        path = store.put("ab" + "0" * 62, b"%PDF one")
+        assert store.get("ab" + "0" * 62) == path
+        assert path.read_bytes() == b"%PDF one"
+        assert store.get("cd" + "0" * 62) is None
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        store = LocalDiskStore(str(tmp_path), max_bytes=250)
+        keys = [f"{i:02d}" + "0" * 62 for i in range(3)]
+        for i, key in enumerate(keys[:2]):
+            path = store.put(key, b"x" * 100)
+            os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+        store.get(keys[0])  # touch: keys[1] is now the oldest
+        store.put(keys[2], b"x" * 100)
+        assert store.get(keys[1]) is None
+        assert store.get(keys[0]) is not None
+        assert store.get(keys[2]) is not None
+        assert store.evictions == 1
+        assert store.size_bytes == 200
+
+    def test_size_survives_restart(self, tmp_path):
+        LocalDiskStore(str(tmp_path)).put("ab" + "0" * 62, b"x" * 64)
+        assert LocalDiskStore(str(tmp_path)).size_bytes == 64
+
+    def test_overwrite_is_counted_once(self, tmp_path):
+        store = LocalDiskStore(str(tmp_path))
+        store.put("ab" + "0" * 62, b"x" * 64)
+        store.put("ab" + "0" * 62, b"x" * 64)
+        assert store.size_bytes == 64
+
+    def test_cap_holds_across_workers(self, tmp_path):
+        worker_a = LocalDiskStore(str(tmp_path), max_bytes=250)
+        worker_b = LocalDiskStore(str(tmp_path), max_bytes=250)
+        for i in range(4):
+            (worker_a if i % 2 else worker_b).put(f"{i:02d}" + "0" * 62, b"x" * 100)
+        on_disk = sum(p.stat().st_size for p in tmp_path.glob("*/*.pdf"))
+        assert on_disk <= 250
+        assert worker_a.size_bytes == worker_b.size_bytes == on_disk
+
+    def test_pinned_file_survives_eviction(self, tmp_path):
+        store = LocalDiskStore(str(tmp_path), max_bytes=150)
+        key = "ab" + "0" * 62
+        store.put(key, b"%PDF pinned")
+        pinned = store.pin(key)
+        store.put("cd" + "0" * 62, b"x" * 200)  # evicts everything
+        assert store.get(key) is None
+        assert pinned.read_bytes() == b"%PDF pinned"
+        store.unpin(pinned)
+        assert not pinned.exists()
+
+    def test_unpin_never_deletes_the_entry(self, tmp_path):
+        store = LocalDiskStore(str(tmp_path))
+        path = store.put("ab" + "0" * 62, b"%PDF")
+        store.unpin(path)
+        assert path.exists()
+
+    def test_stale_pins_are_pruned(self, tmp_path, monkeypatch):
+        store = LocalDiskStore(str(tmp_path))
+        store.put("ab" + "0" * 62, b"%PDF")
+        pinned = store.pin("ab" + "0" * 62)
+        monkeypatch.setattr("app.services.pdf_artifact_cache.PIN_TTL_S", -1)
+        store.put("cd" + "0" * 62, b"%PDF")
+        assert not pinned.exists()
+
+
+class TestPDFArtifactStore:
+    def test_hit_and_miss_counters(self, tmp_path):
+        store = PDFArtifactStore(LocalDiskStore(str(tmp_path)))
+        key = artifact_key(WS, "full", "color", None)
+        assert store.lookup(key) is None
+        store.store(key, b"%PDF")
+        path = store.lookup(key)
+        assert path.read_bytes() == b"%PDF"
+        store.release(path)
+        assert not path.exists()
+        stats = store.stats()
+        assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    def test_remote_hit_fills_local_disk(self, tmp_path):
+        remote = _DictStore()
+        key = artifact_key(WS, "student", "color", "Skolar")
+        remote.put(key, b"%PDF shared")
+        store = PDFArtifactStore(LocalDiskStore(str(tmp_path)), remote)
+        assert store.lookup(key).read_bytes() == b"%PDF shared"
+        remote.blobs.clear()
+        assert store.lookup(key) is not None
+        assert (store.stats()["remote_hits"], store.stats()["hits"]) == (1, 1)
+
+    def test_store_failure_is_swallowed(self, tmp_path):
+        class _Broken(_DictStore):
+            def put(self, key, data):
+                raise RuntimeError("bucket down")
+
+        store = PDFArtifactStore(LocalDiskStore(str(tmp_path)), _Broken())
+        store.store("ab" + "0" * 62, b"%PDF")
+        assert store.stats()["errors"] == 1
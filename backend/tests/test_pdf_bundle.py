@@ -0,0 +1,103 @@
+"""Tests for bulk PDF export helpers: bounded rendering, streamed ZIP, merged PDF."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import zipfile
+
+from PyPDF2 import PdfReader, PdfWriter
+
+from app.services.pdf_bundle import BundleJob, merge_pdfs, render_bounded, stream_zip
+
+
+def _jobs(n: int) -> list[BundleJob]:
+    return [BundleJob(f"{i:03d}_ws.pdf", {"title": f"WS {i}"}, "student") for i in range(n)]
+
+
+def _blank_pdf(pages: int, password: str | None = None) -> bytes:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=200, height=200)
+    if password:
+        writer.encrypt(password)
+    buf = io.BytesIO()
+    writer.write(buf)
+    return buf.getvalue()
+
+
+async def _collect(agen) -> list:
+    return [item async for item in agen]
+
+
+class TestRenderBounded:
+    def test_concurrency_is_capped(self):
+        active = peak = 0
+
+        async def render(job):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return job.name.encode()
+
+        results = asyncio.run(_collect(render_bounded(_jobs(10), render, concurrency=3)))
+        assert peak == 3
+        assert sorted(r.pdf for r in results) == [j.name.encode() for j in _jobs(10)]
+
+    def test_failure_is_reported_not_raised(self):
+        async def render(job):
+            if job.name.startswith("001"):
+                raise RuntimeError("boom")
+            return b"%PDF"
+
+        results = asyncio.run(_collect(render_bounded(_jobs(3), render, concurrency=2)))
+        failed = [r for r in results if r.error]
+        assert len(results) == 3
+        assert [r.job.name for r in failed] == ["001_ws.pdf"]
+        assert "boom" in failed[0].error
+
+
+class TestStreamZip:
+    def test_zip_contains_every_pdf_and_errors(self, tmp_path):
+        cached = tmp_path / "cached.pdf"
+        cached.write_bytes(b"%PDF cached")
+
+        async def render(job):
+            if job.name.startswith("002"):
+                raise ValueError("bad worksheet")
+            return cached if job.name.startswith("000") else f"%PDF {job.name}".encode()
+
+        chunks = asyncio.run(_collect(stream_zip(render_bounded(_jobs(3), render, concurrency=2))))
+        assert len(chunks) >= 3  # bytes flow per entry, not once at the end
+        zf = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+        assert zf.testzip() is None
+        assert zf.read("000_ws.pdf") == b"%PDF cached"
+        assert zf.read("001_ws.pdf") == b"%PDF 001_ws.pdf"
+        assert "002_ws.pdf" not in zf.namelist()
+        assert "bad worksheet" in zf.read("errors.txt").decode()
+
+
+class TestMergePdfs:
+    def test_pages_concatenated_in_order(self, tmp_path):
+        parts = []
+        for i, pages in enumerate([1, 2, 3]):
+            part = tmp_path / f"{i}.pdf"
+            part.write_bytes(_blank_pdf(pages))
+            parts.append(part)
+        out = tmp_path / "merged.pdf"
+        assert merge_pdfs(parts, out) == 6
+        assert len(PdfReader(str(out)).pages) == 6
+        assert not PdfReader(str(out)).is_encrypted
+
+    def test_encrypted_parts_keep_password(self, tmp_path):
+        plain, locked = tmp_path / "a.pdf", tmp_path / "b.pdf"
+        plain.write_bytes(_blank_pdf(1))
+        locked.write_bytes(_blank_pdf(2, password="abcd1234"))
+        out = tmp_path / "merged.pdf"
+        assert merge_pdfs([plain, locked], out, password="abcd1234") == 3
+        reader = PdfReader(str(out))
+        assert reader.is_encrypted
+        reader.decrypt("abcd1234")
+        assert len(reader.pages) == 3
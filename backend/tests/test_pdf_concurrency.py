@@ -0,0 +1,81 @@
+"""PDFService is re-entrant: themed PDFs rendered in parallel threads are byte-identical to serial renders."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services import pdf
+from app.services.pdf import PDFService, get_pdf_service
+
+THEMES = ("color", "black_and_white", "minimal")
+PDF_TYPES = ("full", "student", "answer_key")
+
+
+def _worksheet(theme: str, hindi: bool) -> dict:
+    text = "क्षत्रिय ज्ञान प्रश्न" if hindi else "What is 2 + 2?"
+    return {
+        "title": "Concurrency",
+        "grade": "Class 3",
+        "subject": "Hindi" if hindi else "Maths",
+        "language": "Hindi" if hindi else "English",
+        "visual_theme": theme,
+        "questions": [
+            {
+                "id": f"q{i}",
+                "type": "mcq",
+                "text": f"{text} {i}",
+                "options": ["1", "2", "3", "4"],
+                "correct_answer": "4",
+                "role": ("recognition", "application", "thinking")[i % 3],
+                "hint": "Count on your fingers",
+            }
+            for i in range(9)
+        ],
+    }
+
+
+def test_same_input_same_bytes():
+    ws = _worksheet("color", hindi=False)
+    assert PDFService().generate_worksheet_pdf(ws) == PDFService().generate_worksheet_pdf(ws)
+
+
+def test_themes_render_differently():
+    outputs = {theme: get_pdf_service().generate_worksheet_pdf(_worksheet(theme, False)) for theme in THEMES}
+    assert len(set(outputs.values())) == len(THEMES)
+
+
+def test_parallel_themed_renders_are_byte_stable():
+    service = get_pdf_service()
+    # Watermarked and plain jobs interleaved so per-call state leaking between threads would show up
+    jobs = [
+        (theme, hindi, pdf_type, watermark)
+        for theme in THEMES
+        for hindi in (False, True)
+        for pdf_type in PDF_TYPES
+        for watermark in (None, "Skolar")
+    ]
+
+    def render(job):
+        theme, hindi, pdf_type, watermark = job
+        return service.generate_worksheet_pdf(_worksheet(theme, hindi), pdf_type=pdf_type, watermark=watermark)
+
+    expected = {job: render(job) for job in jobs}
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        results = list(ex.map(render, jobs * 3))
+
+    for job, pdf_bytes in zip(jobs * 3, results):
+        assert pdf_bytes == expected[job], f"render {job} differs from serial output"
+
+
+def test_render_does_not_mutate_shared_service():
+    service = get_pdf_service()
+    before = (service.theme, service.palette, service._page_count, service._watermark, service._hindi)
+    service.generate_worksheet_pdf(_worksheet("black_and_white", hindi=True), watermark="SAMPLE")
+    assert (service.theme, service.palette, service._page_count, service._watermark, service._hindi) == before
+
+
+def test_style_sheets_precompiled_per_theme():
+    assert PDFService("minimal").styles is PDFService("minimal").styles
+    assert PDFService("minimal").styles is not PDFService("color").styles
+    assert PDFService("unknown").theme == "color"
+    assert pdf._style_sheet("black_and_white")["WorksheetTitle"].textColor == pdf._PALETTES["black_and_white"].primary
@@ -0,0 +1,186 @@
+"""Tests for the PDF render pool: off-loop rendering, admission control, timeouts."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from app.services.v3 import pdf_renderer
+from app.services.v3.pdf_pool import PDFPoolBusy, PDFRenderPool
+
+
+def _echo_job(worksheet: dict, pdf_type: str) -> bytes:
+    return f"%PDF {worksheet['title']} {pdf_type}".encode()
+
+
+def _pid_job(worksheet: dict, pdf_type: str) -> bytes:
+    import os
+
+    if worksheet["title"] == "stuck":
+        time.sleep(60)
+    return str(os.getpid()).encode()
+
+
+class _BlockingJob:
+    """Job that holds its worker until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def __call__(self, worksheet: dict, pdf_type: str) -> bytes:
+        self.release.wait(5)
+        return b"%PDF done"
+
+
+@pytest.fixture
+def thread_pool():
+    pools = []
+
+    def make(**kwargs):
+        pool = PDFRenderPool(workers=0, initializer=None, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown(wait=False)
+
+
+class TestThreadMode:
+    def test_render_returns_bytes(self, thread_pool):
+        pool = thread_pool(queue_size=2, job=_echo_job)
+        assert asyncio.run(pool.render({"title": "T"}, "student")) == b"%PDF T student"
+        stats = pool.stats()
+        assert (stats["submitted"], stats["completed"], stats["in_flight"]) == (1, 1, 0)
+
+    def test_event_loop_stays_responsive(self, thread_pool):
+        pool = thread_pool(queue_size=2, job=lambda ws, t: time.sleep(0.2) or b"%PDF")
+        ticks = []
+
+        async def main():
+            async def tick():
+                while True:
+                    ticks.append(time.perf_counter())
+                    await asyncio.sleep(0.01)
+
+            ticker = asyncio.create_task(tick())
+            await pool.render({"title": "T"})
+            ticker.cancel()
+
+        asyncio.run(main())
+        assert len(ticks) >= 5
+
+    def test_job_error_propagates(self, thread_pool):
+        def boom(ws, t):
+            raise RuntimeError("layout failed")
+
+        pool = thread_pool(queue_size=1, job=boom)
+        with pytest.raises(RuntimeError, match="layout failed"):
+            asyncio.run(pool.render({"title": "T"}))
+        assert pool.stats()["failed"] == 1
+        assert pool.stats()["in_flight"] == 0
+
+
+class TestAdmissionControl:
+    def test_rejects_beyond_capacity(self, thread_pool):
+        job = _BlockingJob()
+        pool = thread_pool(queue_size=1, job=job)
+        assert pool.capacity == 2
+
+        async def main():
+            first = asyncio.create_task(pool.render({"title": "a"}))
+            second = asyncio.create_task(pool.render({"title": "b"}))
+            await asyncio.sleep(0.05)
+            with pytest.raises(PDFPoolBusy) as exc:
+                await pool.render({"title": "c"})
+            assert exc.value.retry_after > 0
+            job.release.set()
+            return await asyncio.gather(first, second)
+
+        assert asyncio.run(main()) == [b"%PDF done", b"%PDF done"]
+        assert pool.stats()["rejected"] == 1
+
+    def test_timed_out_job_holds_slot_until_finished(self, thread_pool):
+        job = _BlockingJob()
+        pool = thread_pool(queue_size=0, job=job, timeout_s=0.05)
+
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(pool.render({"title": "slow"}))
+        # The worker is still busy with the abandoned job
+        assert pool.stats()["in_flight"] == 1
+        with pytest.raises(PDFPoolBusy):
+            asyncio.run(pool.render({"title": "next"}))
+
+        job.release.set()
+        deadline = time.time() + 2
+        while pool.stats()["in_flight"] and time.time() < deadline:
+            time.sleep(0.01)
+        assert pool.stats()["in_flight"] == 0
+        assert pool.stats()["timeouts"] == 1
+
+
+class TestProcessMode:
+    def test_renders_in_worker_process(self):
+        import os
+
+        pool = PDFRenderPool(workers=1, queue_size=1, job=_pid_job, initializer=None)
+        try:
+            pool.start()
+            pid = asyncio.run(pool.render({"title": "T"}))
+        finally:
+            pool.shutdown(wait=True)
+        assert int(pid) != os.getpid()
+
+    def test_timed_out_job_gets_its_worker_recycled(self):
+        pool = PDFRenderPool(workers=1, queue_size=1, job=_pid_job, initializer=None, timeout_s=3)
+        try:
+            first_pid = int(asyncio.run(pool.render({"title": "warm"})))
+            with pytest.raises(asyncio.TimeoutError):
+                asyncio.run(pool.render({"title": "stuck"}))
+            # New jobs go to a fresh worker instead of queueing behind the stuck one
+            assert int(asyncio.run(pool.render({"title": "next"}))) != first_pid
+            deadline = time.time() + 10
+            while pool.stats()["in_flight"] and time.time() < deadline:
+                time.sleep(0.05)
+            # The stuck worker was killed, which frees its slot
+            assert pool.stats()["in_flight"] == 0
+            assert pool.stats()["recycled"] == 1
+        finally:
+            pool.shutdown(wait=True)
+
+
+class TestResourceCache:
+    @pytest.fixture
+    def fetched(self, monkeypatch):
+        urls: list[str] = []
+
+        def default_url_fetcher(url, *args, **kwargs):
+            urls.append(url)
+            return {"string": b"x" * int(url.rsplit("/", 1)[1]), "mime_type": "font/woff2"}
+
+        monkeypatch.setitem(sys.modules, "weasyprint", types.SimpleNamespace(default_url_fetcher=default_url_fetcher))
+        monkeypatch.setattr(pdf_renderer, "_resource_cache", type(pdf_renderer._resource_cache)())
+        monkeypatch.setattr(pdf_renderer, "_resource_bytes", 0)
+        monkeypatch.setattr(pdf_renderer, "RESOURCE_CACHE_MAX_BYTES", 100)
+        return urls
+
+    def test_repeat_fetch_is_served_from_memory(self, fetched):
+        pdf_renderer.caching_url_fetcher("https://fonts/40")
+        assert pdf_renderer.caching_url_fetcher("https://fonts/40")["string"] == b"x" * 40
+        assert fetched == ["https://fonts/40"]
+
+    def test_capped_in_bytes_least_recently_used_first(self, fetched):
+        for url in ("https://a/40", "https://b/40", "https://a/40", "https://c/40"):
+            pdf_renderer.caching_url_fetcher(url)
+        assert list(pdf_renderer._resource_cache) == ["https://a/40", "https://c/40"]
+        assert pdf_renderer._resource_bytes == 80
+
+    def test_oversized_and_data_urls_are_not_cached(self, fetched):
+        pdf_renderer.caching_url_fetcher("https://big/500")
+        pdf_renderer.caching_url_fetcher("data:image/png;base64,/10")
+        assert not pdf_renderer._resource_cache
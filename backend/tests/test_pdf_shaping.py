@@ -0,0 +1,78 @@
+"""Tests for Devanagari shaping in the ReportLab PDF service: fixed PUA table, memo, thread safety."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from reportlab.pdfbase import pdfmetrics
+
+from app.services import pdf
+
+pytestmark = pytest.mark.skipif(not pdf._HB_AVAILABLE, reason="HarfBuzz shaping unavailable")
+
+SEGMENTS = ["क्षत्रिय", "ज्ञान", "श्रम", "त्रिकोण", "पाठ्यपुस्तक", "कृपया उत्तर लिखिए"]
+
+
+@pytest.fixture
+def empty_shape_cache():
+    with pdf._shape_cache_lock:
+        saved = dict(pdf._shape_cache)
+        pdf._shape_cache.clear()
+    yield
+    with pdf._shape_cache_lock:
+        pdf._shape_cache.clear()
+        pdf._shape_cache.update(saved)
+
+
+class TestPuaTable:
+    def test_every_glyph_is_preinstalled(self):
+        for font_name, hb_f in (("SkolarFont", pdf._hb_font), ("SkolarFont-Bold", pdf._hb_font_bold)):
+            face = pdfmetrics.getFont(font_name).face
+            for gid in (0, 1, hb_f.face.glyph_count - 1):
+                assert face.charToGlyph[pdf._pua_for_gid(gid)] == gid
+                assert pdf._pua_for_gid(gid) in face.charWidths
+
+    def test_conjunct_shapes_to_preinstalled_glyphs(self, empty_shape_cache):
+        shaped = pdf._shape_devanagari_segment("क्ष")
+        assert len(shaped) < len("क्ष")  # ligated into one glyph
+        face = pdfmetrics.getFont("SkolarFont").face
+        assert all(ord(c) in face.charToGlyph for c in shaped)
+
+    def test_mapping_is_independent_of_shaping_order(self, empty_shape_cache):
+        first = [pdf._shape_devanagari_segment(s) for s in SEGMENTS]
+        pdf._shape_cache.clear()
+        second = [pdf._shape_devanagari_segment(s) for s in reversed(SEGMENTS)]
+        assert first == list(reversed(second))
+
+
+class TestShapeCache:
+    def test_memoized_per_segment_and_weight(self, empty_shape_cache):
+        regular = pdf._shape_devanagari_segment("ज्ञान")
+        bold = pdf._shape_devanagari_segment("ज्ञान", bold=True)
+        assert pdf.shape_cache_stats()["entries"] == 2
+        assert pdf._shape_devanagari_segment("ज्ञान") is regular
+        assert pdf._shape_devanagari_segment("ज्ञान", bold=True) is bold
+
+    def test_concurrent_shaping_is_consistent(self, empty_shape_cache):
+        expected = {s: pdf._shape_devanagari_segment(s) for s in SEGMENTS}
+        pdf._shape_cache.clear()
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            results = list(ex.map(lambda i: pdf._shape_devanagari_segment(SEGMENTS[i % len(SEGMENTS)]), range(400)))
+        assert results == [expected[SEGMENTS[i % len(SEGMENTS)]] for i in range(400)]
+
+    def test_persist_round_trip(self, empty_shape_cache, tmp_path):
+        path = str(tmp_path / "shapes.json")
+        shaped = pdf._shape_devanagari_segment("श्रम", bold=True)
+        assert pdf.save_shape_cache(path) == 1
+        pdf._shape_cache.clear()
+        assert pdf.load_shape_cache(path) == 1
+        assert pdf._shape_cache[("श्रम", True)] == shaped
+
+    def test_persisted_file_for_other_font_is_ignored(self, empty_shape_cache, tmp_path, monkeypatch):
+        path = str(tmp_path / "shapes.json")
+        pdf._shape_devanagari_segment("श्रम")
+        pdf.save_shape_cache(path)
+        pdf._shape_cache.clear()
+        monkeypatch.setattr(pdf, "_shape_font_signature", "OtherFont.ttf:1")
+        assert pdf.load_shape_cache(path) == 0
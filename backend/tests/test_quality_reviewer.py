@@ -372,6 +372,39 @@ class TestReviewResult:
         assert result.questions[1]["_answer_mismatch"] is True
 
 
+class TestPartialReview:
+    """reviewed= leaves earlier-reviewed questions alone but counts them for worksheet-level targets."""
+
+    @staticmethod
+    def _worksheet():
+        questions = []
+        for i in range(10):
+            text = f"There are {i + 2} apples and 3 more come. How many apples are there now?"
+            if i < 3:
+                text = f"Riya is wondering: {text}"
+            q = _make_q(q_id=i + 1, slot_type="application", question_text=text, answer=str(i + 5))
+            q["type"] = "word_problem"
+            q["text"] = text
+            questions.append(q)
+        return questions
+
+    def test_repaired_questions_get_no_extra_framing(self):
+        questions = self._worksheet()
+        kept = [dict(q) for q in questions[:8]]
+        result = QualityReviewerAgent().review_worksheet(questions, _DEFAULT_CTX, reviewed=set(range(8)))
+        assert result.questions[:8] == kept
+        assert not any("is wondering" in q["text"] or "figure out" in q["text"] for q in result.questions[8:])
+        assert not any("engagement framing" in c for c in result.corrections)
+
+    def test_reviewed_questions_skip_per_question_checks(self):
+        questions = self._worksheet()
+        questions[0].update(question_text="What is 5 + 7?", text="What is 5 + 7?", answer="999")
+        QualityReviewerAgent().review_worksheet(questions, _DEFAULT_CTX, reviewed={0})
+        assert "_answer_mismatch" not in questions[0]
+        QualityReviewerAgent().review_worksheet(questions, _DEFAULT_CTX)
+        assert questions[0]["_answer_mismatch"] is True
+
+
 # ---------------------------------------------------------------------------
 # Singleton
 # ---------------------------------------------------------------------------
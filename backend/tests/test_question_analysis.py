@@ -0,0 +1,93 @@
+"""Tests for the shared per-question analysis used by every validator."""
+
+import pytest
+
+from app.services.output_validator import OutputValidator
+from app.services.question_analysis import analyze_text, answer_verdict, clear_analysis_cache
+from app.utils.quality_gate import _content_words, extract_times, jaccard
+
+TEXTS = [
+    "Aarav bought 12 apples at the market at 3:45 PM. How many apples did he buy?",
+    "Priya  has 25 pencils and gives 5 to Rohan. How many are left?",
+    "राम के पास 5 आम हैं। उसने 2 आम खाए। कितने आम बचे?",
+    "Fill in the blank: The sun rises in the ______.",
+    "",
+]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_analysis_cache()
+    yield
+    clear_analysis_cache()
+
+
+class TestSharing:
+    def test_same_text_same_object(self):
+        assert analyze_text(TEXTS[0]) is analyze_text(TEXTS[0])
+
+    def test_lazy_features_computed_once(self):
+        a = analyze_text(TEXTS[0])
+        assert "deep_template" not in a.__dict__
+        tmpl = a.deep_template
+        assert analyze_text(TEXTS[0]).__dict__["deep_template"] is tmpl
+
+    def test_clear_drops_entries(self):
+        a = analyze_text(TEXTS[0])
+        clear_analysis_cache()
+        assert analyze_text(TEXTS[0]) is not a
+
+
+@pytest.mark.parametrize("text", TEXTS)
+class TestParityWithValidatorHelpers:
+    def test_template(self, text):
+        assert analyze_text(text).template == OutputValidator._make_template(text.strip().lower())
+
+    def test_deep_template(self, text):
+        assert analyze_text(text).deep_template == OutputValidator._make_deep_template(text)
+
+    def test_times_and_content_words(self, text):
+        a = analyze_text(text)
+        assert a.times == extract_times(text)
+        assert a.content_words == _content_words(text)
+
+    def test_jaccard(self, text):
+        assert analyze_text(text).jaccard(analyze_text(TEXTS[1])) == jaccard(text, TEXTS[1])
+
+    def test_word_count(self, text):
+        assert analyze_text(text).word_count == len(text.split())
+
+
+class TestFeatures:
+    def test_numbers_keep_order_and_repeats(self):
+        assert analyze_text("5 plus 5 is 10").numbers == ("5", "5", "10")
+
+    def test_script(self):
+        assert analyze_text(TEXTS[0]).script == "latin"
+        assert analyze_text(TEXTS[2]).script == "devanagari"
+        assert analyze_text("राम has 5 apples").script == "mixed"
+        assert analyze_text("12 + 7 = ?").script == "none"
+
+    def test_hindi_purity_check_reads_shared_script(self):
+        from app.services.quality_reviewer import _has_hindi_code_mixing, _has_hindi_transliteration
+
+        assert _has_hindi_code_mixing("राम has 5 apples")
+        assert "script" in analyze_text("राम has 5 apples").__dict__
+        assert not _has_hindi_code_mixing(TEXTS[2])
+        assert not _has_hindi_transliteration(TEXTS[0])
+
+    def test_normalized_collapses_whitespace(self):
+        assert analyze_text("  Priya  HAS\t3 pens ").normalized == "priya has 3 pens"
+
+
+class TestAnswerVerdict:
+    def test_memoized_per_question_content(self):
+        q = {"id": "q1", "type": "short_answer", "text": "What is 7 + 8?", "correct_answer": "15"}
+        v = answer_verdict(q, "Maths")
+        assert v.match is True
+        assert answer_verdict(dict(q), "Maths") is v
+
+    def test_changed_answer_is_reverified(self):
+        q = {"id": "q1", "type": "short_answer", "text": "What is 7 + 8?", "correct_answer": "15"}
+        answer_verdict(q, "Maths")
+        assert answer_verdict({**q, "correct_answer": "16"}, "Maths").match is False
@@ -2,9 +2,14 @@
 Tests for the Release Gate Engine — 10 rules + integration tests.
 """
 
+import pytest
+
 from app.services.release_gate import (
+    RULE_REGISTRY,
+    RULE_SPECS,
     Enforcement,
     GateContext,
+    RuleCost,
     VALID_QUESTION_TYPES,
     r01_arithmetic_verified,
     r02_known_types_only,
@@ -16,6 +21,7 @@ from app.services.release_gate import (
     r08_minimum_quality_bar,
     r09_skill_tags_valid,
     r10_warnings_transparent,
+    register_rule,
     run_release_gate,
 )
 
@@ -455,3 +461,74 @@ class TestIntegration:
         # R06 stamps adaptive info, R10 stamps quality_tier
         assert "adaptive_fallback" in verdict.stamps
         assert "quality_tier" in verdict.stamps
+
+
+# ===========================================================================
+# Rule engine — specs, fast mode, timings, derived inputs
+# ===========================================================================
+
+
+def _gate(qs, mode="full", num_questions=10):
+    return run_release_gate(
+        questions=qs,
+        grade_level="Class 3",
+        subject="Maths",
+        topic="Addition",
+        num_questions=num_questions,
+        difficulty="medium",
+        warnings=[],
+        mode=mode,
+    )
+
+
+class TestRuleEngine:
+    def test_every_rule_declares_a_spec(self):
+        assert [name for name, _, _ in RULE_REGISTRY] == list(RULE_SPECS)
+        assert RULE_SPECS["R14_SENTENCE_DIVERSITY_GUARD"].cost == RuleCost.TEXT
+        assert RULE_SPECS["R14_SENTENCE_DIVERSITY_GUARD"].inputs == ("deep_templates",)
+
+    def test_unknown_input_rejected(self):
+        with pytest.raises(ValueError, match="unknown GateContext inputs"):
+            register_rule("R99_BOGUS", Enforcement.BLOCK, inputs=("questions", "no_such_field"))
+        assert "R99_BOGUS" not in RULE_SPECS
+
+    def test_full_mode_times_every_rule(self):
+        verdict = _gate([_q(i) for i in range(1, 11)])
+        assert verdict.mode == "full"
+        assert list(verdict.rule_timings_ms) == list(RULE_SPECS)
+        assert verdict.skipped_rules == []
+
+    def test_fast_mode_stops_at_first_block(self):
+        qs = [_q(1, qtype="alien_format"), _q(2, _answer_mismatch=True)]
+        full = _gate(qs, num_questions=2)
+        fast = _gate(qs, mode="fast", num_questions=2)
+        assert full.verdict == fast.verdict == "blocked"
+        assert len(fast.block_reasons) == 1 < len(full.block_reasons)
+        assert fast.skipped_rules
+        # No expensive rule ran before the verdict was decided
+        ran = list(fast.rule_timings_ms)
+        assert all(RULE_SPECS[name].cost == RuleCost.FIELDS for name in ran)
+        assert set(ran).isdisjoint(fast.skipped_rules)
+
+    def test_fast_mode_without_block_runs_everything(self):
+        texts = [
+            "What is 2+3?", "Find the sum of 4+5.", "If Riya has 3 apples, how many more does she need?",
+            "A box has 7 balls.", "How many are left?", "Solve 8+2.", "Which is greater?",
+            "Suppose you have 6 coins.", "Count the flowers.", "There are 10 books.",
+        ]  # fmt: skip
+        qs = [_q(i, text=texts[i - 1]) for i in range(1, 11)]
+        verdict = _gate(qs, mode="fast")
+        full = _gate(qs)
+        assert verdict.verdict == full.verdict == "released"
+        assert verdict.skipped_rules == []
+        assert sorted(verdict.failed_rules) == sorted(full.failed_rules)
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError, match="mode"):
+            _gate([_q(1)], mode="quick", num_questions=1)
+
+    def test_derived_inputs_memoized(self):
+        ctx = _ctx()
+        assert ctx.deep_templates is ctx.deep_templates
+        assert ctx.analyses[0] is ctx.analyses[1]  # identical text → shared analysis
+        assert ctx.texts == [q["text"] for q in ctx.questions]
@@ -92,6 +92,22 @@ class TestMakeDeepTemplate:
         # Deep should have more or equal placeholders
         assert deep.count("<") >= shallow.count("<")
 
+    def test_context_pool_names_normalized(self):
+        """Names the v3 generator draws from context_pools are replaced too."""
+        t1 = OutputValidator._make_deep_template("Karthik has 4 books")
+        t2 = OutputValidator._make_deep_template("Moushumi has 9 books")
+        assert t1 == t2 == "<NAME> <VERB> <NUM> <OBJ>"
+
+    def test_case_insensitive_whole_words_only(self):
+        """Vocabulary matches any case, but never inside a longer word."""
+        assert OutputValidator._make_deep_template("RIYA BOUGHT APPLES") == "<NAME> <VERB> <OBJ>"
+        assert OutputValidator._make_deep_template("Shelly herself") == "Shelly herself"
+
+    def test_times_before_numbers(self):
+        """Clock times become <TIME>, not <NUM>:<NUM>; attached digits still split off."""
+        assert OutputValidator._make_template("At 3:45 PM Riya had ₹500") == "At <TIME> <NAME> had <NUM>"
+        assert OutputValidator._make_deep_template("12apples") == "<NUM><OBJ>"
+
 
 # ---------------------------------------------------------------------------
 # Check #20 tests (via validate_worksheet)
@@ -0,0 +1,21 @@
+"""Worker boot must not import the heavy PDF renderers — they load on first export."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+LAZY_MODULES = ("app.services.pdf", "app.services.flashcard_pdf", "app.services.revision_pdf", "reportlab")
+
+
+def test_app_main_does_not_import_pdf_renderers():
+    code = f"import sys, app.main; print([m for m in {LAZY_MODULES!r} if m in sys.modules])"
+    env = {**os.environ, "SUPABASE_URL": "http://localhost", "SUPABASE_SERVICE_KEY": "test"}
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,192 @@
+"""Tests for the buffered telemetry sink (ring buffer → bulk insert → spill file)."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+import pytest
+
+from app.services.telemetry import TelemetrySink, emit_event
+
+
+class FakeTable:
+    def __init__(self, fail: bool = False, delay: float = 0.0):
+        self.batches: list[list[dict]] = []
+        self.fail = fail
+        self.delay = delay
+
+    def insert(self, rows: list[dict]) -> None:
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("db down")
+        self.batches.append(list(rows))
+
+    @property
+    def rows(self) -> list[dict]:
+        return [r for b in self.batches for r in b]
+
+
+def _row(i: int) -> dict:
+    return {"event": "api_call", "route": "/x", "version": "v3", "latency_ms": i}
+
+
+@pytest.fixture
+def spill(tmp_path):
+    return str(tmp_path / "spill.jsonl")
+
+
+class TestTelemetrySink:
+    def test_flushes_in_bulk_batches(self, spill):
+        db = FakeTable()
+        sink = TelemetrySink(db.insert, batch_size=10, interval_s=60, spill_path=spill)
+        for i in range(25):
+            sink.enqueue(_row(i))
+        sink.shutdown()
+
+        assert [len(b) for b in db.batches][:2] == [10, 10]
+        assert [r["latency_ms"] for r in db.rows] == list(range(25))
+        assert sink.stats()["flushed"] == 25
+
+    def test_size_threshold_wakes_flusher(self, spill):
+        db = FakeTable()
+        sink = TelemetrySink(db.insert, batch_size=5, interval_s=60, spill_path=spill)
+        for i in range(5):
+            sink.enqueue(_row(i))
+        deadline = time.time() + 2
+        while not db.rows and time.time() < deadline:
+            time.sleep(0.01)
+        assert len(db.rows) == 5
+        sink.shutdown()
+
+    def test_interval_flushes_partial_batch(self, spill):
+        db = FakeTable()
+        sink = TelemetrySink(db.insert, batch_size=100, interval_s=0.05, spill_path=spill)
+        sink.enqueue(_row(1))
+        time.sleep(0.3)
+        assert len(db.rows) == 1
+        sink.shutdown()
+
+    def test_enqueue_does_not_block_on_slow_db(self, spill):
+        db = FakeTable(delay=0.5)
+        sink = TelemetrySink(db.insert, batch_size=1, interval_s=60, spill_path=spill)
+        t0 = time.perf_counter()
+        for i in range(50):
+            sink.enqueue(_row(i))
+        assert time.perf_counter() - t0 < 0.1
+        sink.shutdown(timeout=0.01)
+
+    def test_full_buffer_drops_oldest_and_counts(self, spill):
+        db = FakeTable()
+        sink = TelemetrySink(db.insert, maxsize=3, batch_size=100, interval_s=60, spill_path=spill)
+        sink._stopping.set()  # no background thread: inspect the buffer directly
+        for i in range(5):
+            sink.enqueue(_row(i))
+        assert sink.stats()["dropped"] == 2
+        sink.flush()
+        assert [r["latency_ms"] for r in db.rows] == [2, 3, 4]
+
+    def test_db_down_spills_then_replays(self, spill):
+        db = FakeTable(fail=True)
+        sink = TelemetrySink(db.insert, batch_size=2, interval_s=60, spill_path=spill)
+        sink._stopping.set()
+        for i in range(5):
+            sink.enqueue(_row(i))
+        sink.flush()
+
+        with open(spill) as f:
+            assert [json.loads(line)["latency_ms"] for line in f] == [0, 1, 2, 3, 4]
+        stats = sink.stats()
+        assert stats["spilled"] == 5
+        assert stats["failures"] == 1
+        assert "db down" in stats["last_error"]
+
+        db.fail = False
+        sink.enqueue(_row(5))
+        sink.flush()
+        assert sorted(r["latency_ms"] for r in db.rows) == [0, 1, 2, 3, 4, 5]
+        assert sink.stats()["replayed"] == 5
+
+    def test_bad_row_is_quarantined_not_respilled(self, spill):
+        class RejectingTable(FakeTable):
+            def insert(self, rows):
+                if any(r["latency_ms"] == "oops" for r in rows):
+                    err = Exception("invalid input syntax for type integer")
+                    err.code = "22P02"
+                    raise err
+                super().insert(rows)
+
+        db = RejectingTable()
+        sink = TelemetrySink(db.insert, batch_size=4, interval_s=60, spill_path=spill)
+        sink._stopping.set()
+        for i in range(4):
+            sink.enqueue(_row("oops" if i == 2 else i))
+        sink.flush()
+
+        assert sorted(r["latency_ms"] for r in db.rows) == [0, 1, 3]
+        assert sink.stats()["rejected"] == 1
+        assert sink.stats()["spilled"] == 0
+        with open(spill + ".rejected") as f:
+            assert [json.loads(line)["latency_ms"] for line in f] == ["oops"]
+
+    def test_db_down_mid_isolation_spills_only_unsent_rows(self, spill):
+        class FlakyTable(FakeTable):
+            def insert(self, rows):
+                if any(r["latency_ms"] == "oops" for r in rows):
+                    err = Exception("bad row")
+                    err.code = "23502"
+                    raise err
+                if rows[0]["latency_ms"] == 2:
+                    raise ConnectionError("db down")
+                super().insert(rows)
+
+        db = FlakyTable()
+        sink = TelemetrySink(db.insert, batch_size=4, interval_s=60, spill_path=spill)
+        sink._stopping.set()
+        for i in range(4):
+            sink.enqueue(_row("oops" if i == 3 else i))
+        sink.flush()
+
+        assert [r["latency_ms"] for r in db.rows] == [0, 1]
+        with open(spill) as f:
+            assert [json.loads(line)["latency_ms"] for line in f] == [2, "oops"]
+
+    def test_concurrent_producers_lose_nothing(self, spill):
+        db = FakeTable()
+        sink = TelemetrySink(db.insert, batch_size=50, interval_s=0.01, spill_path=spill)
+
+        def produce(base):
+            for i in range(500):
+                sink.enqueue(_row(base + i))
+
+        threads = [threading.Thread(target=produce, args=(n * 1000,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        sink.shutdown()
+        assert len(db.rows) == 2000
+
+
+class TestEmitEvent:
+    def test_emit_event_enqueues_when_db_enabled(self, monkeypatch):
+        captured = []
+
+        class _Sink:
+            def enqueue(self, row):
+                captured.append(row)
+
+        monkeypatch.setenv("ENABLE_TELEMETRY_DB", "1")
+        monkeypatch.setattr("app.services.telemetry.get_telemetry_sink", lambda: _Sink())
+        emit_event("worksheet_generation", route="/api/v3/worksheets/generate", version="v3", ok=True)
+        assert captured and captured[0]["event"] == "worksheet_generation"
+
+    def test_emit_event_skips_sink_when_disabled(self, monkeypatch):
+        monkeypatch.setenv("ENABLE_TELEMETRY_DB", "0")
+        monkeypatch.setattr(
+            "app.services.telemetry.get_telemetry_sink",
+            lambda: pytest.fail("sink used with telemetry DB disabled"),
+        )
+        emit_event("x", route="/x", version="v3")
@@ -0,0 +1,64 @@
+"""Parity tests for the precompiled topic index behind get_topic_profile().
+
+The original linear-scan resolver lives on in scripts/bench_topic_resolution.py
+as the oracle; here every key and alias (plus common variations) must resolve
+to the very same profile object.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.data.topic_index import TopicIndex, get_topic_index
+from app.data.topic_profiles import _TOPIC_ALIASES, TOPIC_PROFILES, get_topic_profile
+from scripts.bench_topic_resolution import legacy_get_topic_profile, parity_topics
+
+_TOPICS = parity_topics()
+
+
+@pytest.mark.parametrize("subject", [None, "Maths", "EVS", "Hindi"])
+@pytest.mark.parametrize("grade", [None, 2, "Class 4"])
+def test_parity_with_linear_scan(subject, grade):
+    mismatches = [
+        t for t in _TOPICS if get_topic_profile(t, subject, grade) is not legacy_get_topic_profile(t, subject, grade)
+    ]
+    assert mismatches == []
+
+
+def test_every_alias_resolves_like_before():
+    for alias in _TOPIC_ALIASES:
+        for grade in (None, 1, 3, 5):
+            assert get_topic_profile(alias, None, grade) is legacy_get_topic_profile(alias, None, grade), alias
+
+
+def test_results_are_memoized():
+    from app.data.topic_profiles import _resolve_profile_key
+
+    _resolve_profile_key.cache_clear()
+    get_topic_profile("Fractions", "Maths", "Class 3")
+    get_topic_profile("Fractions", "Maths", "Class 3")
+    assert _resolve_profile_key.cache_info().hits == 1
+
+
+def test_unhashable_grade_still_resolves():
+    assert get_topic_profile("Fractions", "Maths", ["Class 3"]) is legacy_get_topic_profile(
+        "Fractions", "Maths", ["Class 3"]
+    )
+
+
+class TestTopicIndex:
+    def test_prefix_matches_both_directions(self):
+        index = TopicIndex({"Time (Class 1)": {}, "Time and calendar": {}, "Money": {}})
+        assert index.prefix_matches("time") == ["Time (Class 1)", "Time and calendar"]
+        assert index.prefix_matches("money matters") == ["Money"]
+
+    def test_containing_lists_each_key_once_in_order(self):
+        index = TopicIndex({"Add and add more": {}, "Subtraction": {}, "Addition": {}})
+        assert index.containing("add") == ["Add and add more", "Addition"]
+        assert index.containing("zzz") == []
+
+    def test_same_base_groups_grade_variants(self):
+        index = get_topic_index()
+        variants = index.same_base("Time (Class 1)")
+        assert all(k in TOPIC_PROFILES for k in variants)
+        assert "Time (Class 1)" in variants
@@ -0,0 +1,193 @@
+"""Tests for the v3 content-addressed slot-fill cache."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+import re
+import time
+
+import pytest
+
+from app.services.ai_client import get_llm_metrics
+from app.services.v3 import fill_cache
+from app.services.v3.fill_cache import SlotFillCache, slot_fingerprint, slot_topic
+from app.services.v3.gemini_filler import fill_slots, fill_slots_async
+from app.services.v3.slot_builder import Slot, build_slots
+
+
+class _Resp:
+    def __init__(self, text: str):
+        self.choices = [type("C", (), {"message": type("M", (), {"content": text})()})()]
+
+
+class CountingClient:
+    """Fake OpenAI-compatible client that records which slots were sent to the LLM."""
+
+    def __init__(self):
+        self.requested: list[int] = []
+        self.chat = type("Chat", (), {"completions": self})()
+
+    def create(self, messages=None, **kwargs):
+        user = next(m["content"] for m in messages if m["role"] == "user")
+        nums = [int(n) for n in re.findall(r"^SLOT (\d+):", user, re.MULTILINE)]
+        self.requested.extend(nums)
+        return _Resp(
+            json.dumps([{"slot": n, "text": f"Fresh question number {n}?", "correct_answer": str(n)} for n in nums])
+        )
+
+
+def _slots(n: int = 10) -> list[Slot]:
+    return build_slots("CBSE", "Class 3", "Maths", "Addition (carries)", "medium", n, "standard", "English").slots
+
+
+@pytest.fixture
+def enabled_cache(monkeypatch):
+    monkeypatch.setenv("V3_FILL_CACHE_ENABLED", "1")
+    cache = SlotFillCache(maxsize=100, ttl=600, max_serves=3, max_hit_fraction=1.0)
+    monkeypatch.setattr(fill_cache, "_fill_cache", cache)
+    return cache
+
+
+class TestFingerprint:
+    def test_ignores_variation_nonce(self):
+        a = Slot(1, "mcq", "recognition", "easy", "tag", llm_instruction="Variation: abc123 | Question type: mcq")
+        b = Slot(1, "mcq", "recognition", "easy", "tag", llm_instruction="Variation: zz99yy | Question type: mcq")
+        assert slot_fingerprint(a, "English") == slot_fingerprint(b, "English")
+
+    def test_sensitive_to_numbers_type_language_and_context(self):
+        base = Slot(2, "mcq", "recognition", "easy", "tag", numbers={"a": 1}, llm_instruction="Q")
+        fp = slot_fingerprint(base, "English")
+
+        other_numbers = copy.deepcopy(base)
+        other_numbers.numbers = {"a": 2}
+        other_type = copy.deepcopy(base)
+        other_type.question_type = "fill_blank"
+
+        assert slot_fingerprint(other_numbers, "English") != fp
+        assert slot_fingerprint(other_type, "English") != fp
+        assert slot_fingerprint(base, "Hindi") != fp
+        assert slot_fingerprint(base, "English", "[CURRICULUM]x") != fp
+
+
+class TestSlotFillCache:
+    def test_second_fill_served_from_cache(self, enabled_cache):
+        slots = _slots()
+        client = CountingClient()
+
+        fill_slots(client, slots, "English")
+        assert sorted(client.requested) == list(range(1, 11))
+
+        client.requested.clear()
+        filled = fill_slots(client, copy.deepcopy(slots), "English")
+        assert client.requested == []
+        assert sorted(f["slot"] for f in filled) == list(range(1, 11))
+
+    def test_entries_retire_after_max_serves(self, enabled_cache):
+        slots = _slots()
+        client = CountingClient()
+        fill_slots(client, slots, "English")
+        for _ in range(3):
+            fill_slots(client, slots, "English")
+
+        client.requested.clear()
+        fill_slots(client, slots, "English")
+        assert sorted(client.requested) == list(range(1, 11))
+
+    def test_hit_quota_keeps_part_of_worksheet_fresh(self, enabled_cache):
+        enabled_cache.max_hit_fraction = 0.5
+        slots = _slots()
+        client = CountingClient()
+        fill_slots(client, slots, "English")
+
+        client.requested.clear()
+        filled = fill_slots(client, slots, "English")
+        assert len(client.requested) == 5
+        assert sorted(f["slot"] for f in filled) == list(range(1, 11))
+
+    def test_unusable_fills_not_cached(self, enabled_cache):
+        slots = _slots(2)
+        enabled_cache.store(slots, [{"slot": 1, "text": "", "correct_answer": "1"}, {"slot": 2}], "English")
+        hits, misses = enabled_cache.lookup(slots, "English")
+        assert hits == {}
+        assert len(misses) == 2
+
+    def test_invalidate_drops_entry(self, enabled_cache):
+        slots = _slots(2)
+        fill_slots(CountingClient(), slots, "English")
+        enabled_cache.invalidate(slots[:1], "English")
+        hits, _ = enabled_cache.lookup(slots, "English")
+        assert list(hits) == [2]
+
+    def test_async_path_shares_cache(self, enabled_cache):
+        slots = _slots()
+        client = CountingClient()
+        fill_slots(client, slots, "English")
+
+        client.requested.clear()
+        asyncio.run(fill_slots_async(client, slots, "English"))
+        assert client.requested == []
+
+    def test_hit_rate_reported_in_llm_metrics(self, enabled_cache):
+        before = get_llm_metrics()["slot_fill_cache"]
+        slots = _slots()
+        fill_slots(CountingClient(), slots, "English")
+        fill_slots(CountingClient(), slots, "English")
+        after = get_llm_metrics()["slot_fill_cache"]
+
+        assert after["hits"] - before["hits"] == 10
+        assert after["misses"] - before["misses"] == 10
+        assert 0 < after["hit_rate"] <= 1
+
+    def test_same_entry_served_once_per_worksheet(self, enabled_cache):
+        # Two slots that only differ in their Variation nonce share a fingerprint
+        a = Slot(2, "mcq", "recognition", "easy", "tag", llm_instruction="Variation: aaa111 | Topic: Shapes")
+        b = Slot(3, "mcq", "recognition", "easy", "tag", llm_instruction="Variation: bbb222 | Topic: Shapes")
+        enabled_cache.store([a], [{"slot": 2, "text": "How many sides?", "correct_answer": "3"}], "English")
+
+        hits, misses = enabled_cache.lookup([a, b], "English")
+        assert list(hits) == [2]
+        assert misses == [b]
+
+    def test_topic_quota_caps_cached_fills_per_window(self, enabled_cache):
+        enabled_cache.topic_max_serves = 4
+        enabled_cache.max_serves = 100
+        slots = _slots()
+        fill_slots(CountingClient(), slots, "English")
+
+        hits, misses = enabled_cache.lookup(slots, "English")
+        assert len(hits) == 4
+        assert len(misses) == 6
+        hits, _ = enabled_cache.lookup(slots, "English")
+        assert hits == {}
+
+        enabled_cache.topic_window_s = 0.05
+        time.sleep(0.1)  # window rolled over
+        hits, _ = enabled_cache.lookup(slots, "English")
+        assert len(hits) == 4
+
+    def test_bookkeeping_bounded_by_cache_size(self):
+        cache = SlotFillCache(maxsize=10, ttl=600, max_serves=3, max_hit_fraction=1.0, topic_window_s=0)
+        for i in range(1000):
+            slot = Slot(2, "mcq", "recognition", "easy", "tag", llm_instruction=f"Topic: T{i}")
+            cache.store([slot], [{"slot": 2, "text": "How many sides?", "correct_answer": "3"}], "English")
+            hits, _ = cache.lookup([slot], "English")
+            assert list(hits) == [2]
+
+        assert cache.stats()["size"] == 10
+        assert len(cache._topic_serves) <= 1  # rolled-over windows are dropped
+
+    def test_topic_from_instruction_or_skill_tag(self):
+        with_topic = Slot(1, "mcq", "recognition", "easy", "tag", llm_instruction="Variation: x1 | Topic: Time | Age")
+        without = Slot(1, "mcq", "recognition", "easy", "vachan_pairs", llm_instruction="Write a question")
+        assert slot_topic(with_topic, "English") == "English:time"
+        assert slot_topic(without, "Hindi") == "Hindi:vachan_pairs"
+
+    def test_disabled_cache_always_calls_llm(self, monkeypatch):
+        monkeypatch.setenv("V3_FILL_CACHE_ENABLED", "0")
+        slots = _slots()
+        client = CountingClient()
+        fill_slots(client, slots, "English")
+        fill_slots(client, slots, "English")
+        assert len(client.requested) == 20
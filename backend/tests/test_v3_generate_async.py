@@ -0,0 +1,405 @@
+"""Tests for the async-native v3 generation path (generate_worksheet_v3_async).
+
+All tests run offline: the LLM is a fake OpenAI-compatible client and the
+curriculum RAG lookup is patched out.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from app.services.v3 import generate_worksheet_v3, generate_worksheet_v3_async
+from app.services.v3.gemini_filler import fill_slots_async
+from app.services.v3.slot_builder import build_slots
+
+
+def _fake_fill(messages: list[dict]) -> str:
+    """Answer every SLOT n in the user prompt with a plausible filled slot."""
+    user = next(m["content"] for m in messages if m["role"] == "user")
+    slots = [int(n) for n in re.findall(r"^SLOT (\d+):", user, re.MULTILINE)]
+    return json.dumps(
+        [
+            {
+                "slot": n,
+                "text": f"Riya has {n + 10} mangoes and buys {n + 3} more. How many now?",
+                "correct_answer": str(2 * n + 13),
+                "hint": "Add the two numbers",
+                "explanation": "Add them together",
+                "options": None,
+            }
+            for n in slots
+        ]
+    )
+
+
+class _Resp:
+    def __init__(self, text: str):
+        self.choices = [type("C", (), {"message": type("M", (), {"content": text})()})()]
+
+
+class AsyncFakeClient:
+    """Exposes both create() and a native acreate(), like OpenAICompatAdapter."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sync_calls = 0
+        self.async_calls = 0
+        self.threads: set[int] = set()
+        self.chat = type("Chat", (), {"completions": self})()
+
+    def create(self, messages=None, **kwargs):
+        self.sync_calls += 1
+        return _Resp(_fake_fill(messages))
+
+    async def acreate(self, messages=None, **kwargs):
+        self.async_calls += 1
+        self.threads.add(threading.get_ident())
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return _Resp(_fake_fill(messages))
+
+
+class SyncOnlyClient:
+    def __init__(self):
+        self.calls = 0
+        self.chat = type("Chat", (), {"completions": self})()
+
+    def create(self, messages=None, **kwargs):
+        self.calls += 1
+        return _Resp(_fake_fill(messages))
+
+
+@pytest.fixture(autouse=True)
+def _no_curriculum():
+    async def _none(*args, **kwargs):
+        return None
+
+    with (
+        patch("app.services.v3.generate._fetch_curriculum_context_async", _none),
+        patch("app.services.v3.generate._fetch_curriculum_context", lambda *a, **k: None),
+    ):
+        yield
+
+
+_ARGS = dict(
+    board="CBSE",
+    grade_level="Class 3",
+    subject="Maths",
+    topic="Addition (carries)",
+    difficulty="medium",
+    num_questions=10,
+)
+
+
+class TestGenerateV3Async:
+    def test_uses_native_acreate_on_event_loop_thread(self):
+        client = AsyncFakeClient()
+
+        async def run():
+            loop_thread = threading.get_ident()
+            result = await generate_worksheet_v3_async(client=client, **_ARGS)
+            return loop_thread, result
+
+        loop_thread, (worksheet, elapsed_ms, warnings) = asyncio.run(run())
+
+        assert client.async_calls >= 1
+        assert client.sync_calls == 0
+        assert client.threads == {loop_thread}
+        assert len(worksheet["questions"]) == 10
+        assert "_quality_gate" in worksheet
+        assert isinstance(elapsed_ms, int)
+        assert isinstance(warnings, list)
+
+    def test_matches_sync_output_shape(self):
+        sync_ws, _, _ = generate_worksheet_v3(client=AsyncFakeClient(), **_ARGS)
+        async_ws, _, _ = asyncio.run(generate_worksheet_v3_async(client=AsyncFakeClient(), **_ARGS))
+
+        assert set(sync_ws.keys()) == set(async_ws.keys())
+        assert [q["type"] for q in sync_ws["questions"]] == [q["type"] for q in async_ws["questions"]]
+
+    def test_sync_only_client_falls_back_to_thread(self):
+        client = SyncOnlyClient()
+        worksheet, _, _ = asyncio.run(generate_worksheet_v3_async(client=client, **_ARGS))
+        assert client.calls >= 1
+        assert len(worksheet["questions"]) == 10
+
+    def test_wait_for_cancels_inflight_generation(self):
+        client = AsyncFakeClient(delay=5.0)
+
+        async def run():
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(generate_worksheet_v3_async(client=client, **_ARGS), timeout=0.05)
+
+        asyncio.run(run())
+        assert client.async_calls == 1
+
+    def test_many_generations_in_flight_concurrently(self):
+        client = AsyncFakeClient(delay=0.2)
+
+        async def run():
+            return await asyncio.gather(*(generate_worksheet_v3_async(client=client, **_ARGS) for _ in range(20)))
+
+        loop = asyncio.new_event_loop()
+        try:
+            t0 = loop.time()
+            results = loop.run_until_complete(run())
+            elapsed = loop.time() - t0
+        finally:
+            loop.close()
+
+        assert len(results) == 20
+        # 20 × 0.2 s (plus retries) serial would be 4 s+; concurrent awaits are only
+        # bounded by the per-process batch cap
+        assert elapsed < 2.0
+
+
+class TestFillSlotsAsync:
+    def test_batches_over_ten_slots_in_order(self):
+        output = build_slots("CBSE", "Class 3", "Maths", "Addition (carries)", "medium", 20, "standard", "English")
+        filled = asyncio.run(fill_slots_async(AsyncFakeClient(), output.slots, "English"))
+        assert [f["slot"] for f in filled] == [s.slot_number for s in output.slots]
+
+
+class _FlakyAsyncClient(AsyncFakeClient):
+    """Fails (or hangs) on any batch containing ``bad_slot``."""
+
+    def __init__(self, bad_slot: int, hang: bool = False):
+        super().__init__()
+        self.bad_slot = bad_slot
+        self.hang = hang
+
+    async def acreate(self, messages=None, **kwargs):
+        user = next(m["content"] for m in messages if m["role"] == "user")
+        if f"SLOT {self.bad_slot}:" in user:
+            if self.hang:
+                await asyncio.sleep(10)
+            raise ValueError("upstream 500")
+        return await super().acreate(messages=messages, **kwargs)
+
+
+class TestFillSlotsFanOut:
+    def _slots(self, n: int):
+        return build_slots("CBSE", "Class 3", "Maths", "Addition (carries)", "medium", n, "standard", "English").slots
+
+    def test_batches_dispatched_concurrently(self):
+        client = AsyncFakeClient(delay=0.3)
+        slots = self._slots(30)
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            t0 = loop.time()
+            filled = await fill_slots_async(client, slots, "English")
+            return filled, loop.time() - t0
+
+        filled, elapsed = asyncio.run(run())
+        assert client.async_calls == 3
+        assert [f["slot"] for f in filled] == [s.slot_number for s in slots]
+        # Three serial batches would take ~0.9 s
+        assert elapsed < 0.75
+
+    def test_concurrency_cap_respected(self):
+        slots = self._slots(30)
+        in_flight = 0
+        peak = 0
+
+        class Counting(AsyncFakeClient):
+            async def acreate(self, messages=None, **kwargs):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                try:
+                    await asyncio.sleep(0.05)
+                    return await super().acreate(messages=messages, **kwargs)
+                finally:
+                    in_flight -= 1
+
+        with (
+            patch("app.services.v3.gemini_filler.MAX_CONCURRENT_BATCHES", 2),
+            patch("app.services.v3.gemini_filler._loop_semaphores", {}),
+        ):
+            asyncio.run(fill_slots_async(Counting(), slots, "English"))
+        assert peak == 2
+
+    def test_failed_batch_is_dropped_not_fatal(self):
+        slots = self._slots(20)
+        filled = asyncio.run(fill_slots_async(_FlakyAsyncClient(bad_slot=15), slots, "English"))
+        assert [f["slot"] for f in filled] == list(range(1, 11))
+
+    def test_batch_timeout_is_dropped_not_fatal(self):
+        slots = self._slots(20)
+        with patch("app.services.v3.gemini_filler.BATCH_TIMEOUT_S", 0.1):
+            filled = asyncio.run(fill_slots_async(_FlakyAsyncClient(bad_slot=1, hang=True), slots, "English"))
+        assert [f["slot"] for f in filled] == list(range(11, 21))
+
+    def test_all_batches_failing_raises(self):
+        slots = self._slots(10)
+        with pytest.raises(ValueError):
+            asyncio.run(fill_slots_async(_FlakyAsyncClient(bad_slot=1), slots, "English"))
+
+    def test_sync_fill_slots_fans_out_in_order(self):
+        import time
+
+        from app.services.v3.gemini_filler import fill_slots
+
+        class SlowSync(SyncOnlyClient):
+            def create(self, messages=None, **kwargs):
+                time.sleep(0.3)
+                return super().create(messages=messages, **kwargs)
+
+        slots = self._slots(30)
+        t0 = time.perf_counter()
+        filled = fill_slots(SlowSync(), slots, "English")
+        elapsed = time.perf_counter() - t0
+        assert [f["slot"] for f in filled] == [s.slot_number for s in slots]
+        assert elapsed < 0.75
+
+    @pytest.mark.parametrize("n_slots", [5, 30])
+    def test_sync_timeout_bounds_the_whole_fill(self, n_slots):
+        import time
+
+        from app.services.v3.gemini_filler import fill_slots
+
+        class Hanging(SyncOnlyClient):
+            def create(self, messages=None, **kwargs):
+                time.sleep(0.5)
+                return super().create(messages=messages, **kwargs)
+
+        t0 = time.perf_counter()
+        with patch("app.services.v3.gemini_filler.BATCH_TIMEOUT_S", 0.2), pytest.raises(TimeoutError):
+            fill_slots(Hanging(), self._slots(n_slots), "English")
+        # One deadline for every batch, not 0.2 s per batch waited on in turn
+        assert time.perf_counter() - t0 < 0.45
+
+
+class TestStreamWorksheetV3:
+    def _collect(self, client, **overrides):
+        from app.services.v3 import stream_worksheet_v3
+
+        async def run():
+            return [e async for e in stream_worksheet_v3(client=client, **{**_ARGS, **overrides})]
+
+        return asyncio.run(run())
+
+    def test_event_order(self):
+        events = self._collect(AsyncFakeClient(), num_questions=20)
+        names = [name for name, _ in events]
+
+        assert names[0] == "plan"
+        assert names[-3:] == ["quality_gate", "html", "done"]
+        assert set(names[1:-3]) == {"question"}
+        assert len(events[0][1]["slots"]) == 20
+
+    def test_every_slot_streamed_and_matches_final(self):
+        events = self._collect(AsyncFakeClient(), num_questions=20)
+        streamed = {p["slot_number"]: p["question"] for name, p in events if name == "question"}
+        final = events[-1][1]["worksheet"]
+
+        assert sorted(streamed) == list(range(1, 21))
+        assert [q["id"] for q in final["questions"]] == [streamed[n]["id"] for n in range(1, 21)]
+        assert "_quality_gate" in final
+        assert events[-2][1]["rendered_html"] == final.get("rendered_html")
+
+    def test_questions_stream_before_slow_batch_finishes(self):
+        class SlowSecondBatch(AsyncFakeClient):
+            async def acreate(self, messages=None, **kwargs):
+                user = next(m["content"] for m in messages if m["role"] == "user")
+                if "SLOT 11:" in user:
+                    await asyncio.sleep(0.3)
+                return await super().acreate(messages=messages, **kwargs)
+
+        from app.services.v3 import stream_worksheet_v3
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            t0 = loop.time()
+            first_q = None
+            async for name, payload in stream_worksheet_v3(client=SlowSecondBatch(), **{**_ARGS, "num_questions": 20}):
+                if name == "question" and first_q is None:
+                    first_q = (payload["slot_number"], loop.time() - t0)
+            return first_q
+
+        slot_number, at = asyncio.run(run())
+        assert slot_number <= 10
+        assert at < 0.25
+
+    def test_failed_batch_flagged_then_retried(self):
+        class FailOnce(AsyncFakeClient):
+            failed = False
+
+            async def acreate(self, messages=None, **kwargs):
+                user = next(m["content"] for m in messages if m["role"] == "user")
+                if "SLOT 15:" in user and not self.failed:
+                    self.failed = True
+                    raise ValueError("upstream 500")
+                return await super().acreate(messages=messages, **kwargs)
+
+        events = self._collect(FailOnce(), num_questions=20)
+        q15 = [p for name, p in events if name == "question" and p["slot_number"] == 15]
+
+        assert q15[0]["failed"] is True
+        assert q15[-1].get("retried") is True
+        assert events[-1][1]["worksheet"]["questions"][14]["text"] == q15[-1]["question"]["text"]
+
+
+_STREAM_BODY = {
+    "board": "CBSE",
+    "grade_level": "Class 3",
+    "subject": "Maths",
+    "topic": "Addition (carries)",
+    "difficulty": "medium",
+    "num_questions": 10,
+}
+
+
+class TestStreamRoute:
+    @staticmethod
+    def _post(client):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from app.api.worksheets_v3 import router
+        from app.core.deps import get_openai_compat_client, get_supabase_client, get_user_id
+
+        async def _allowed(*args, **kwargs):
+            return {"allowed": True}
+
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_user_id] = lambda: "user-1"
+        app.dependency_overrides[get_supabase_client] = lambda: object()
+        app.dependency_overrides[get_openai_compat_client] = lambda: client
+
+        with patch("app.api.worksheets_v3.check_and_increment_usage", _allowed):
+            return TestClient(app).post("/api/v3/worksheets/generate/stream", json=_STREAM_BODY)
+
+    def test_sse_events_end_with_done_response(self):
+        resp = self._post(AsyncFakeClient())
+
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        names = re.findall(r"^event: (\w+)$", resp.text, re.MULTILINE)
+        assert names[0] == "plan"
+        assert names.count("question") >= 10
+        assert names[-1] == "done"
+        done = json.loads(resp.text.rstrip().rsplit("data: ", 1)[1])
+        assert len(done["worksheet"]["questions"]) == 10
+        assert "rendered_html" not in done["worksheet"]
+
+    def test_stream_past_deadline_ends_with_error_event(self):
+        from app.services.ai_client import iter_with_llm_deadline
+
+        def short_deadline(items, timeout):
+            return iter_with_llm_deadline(items, timeout=0.2)
+
+        with patch("app.api.worksheets_v3.iter_with_llm_deadline", short_deadline):
+            resp = self._post(AsyncFakeClient(delay=2.0))
+
+        names = re.findall(r"^event: (\w+)$", resp.text, re.MULTILINE)
+        assert names == ["plan", "error"]
+        assert "timed out" in resp.text
@@ -114,3 +114,28 @@ class TestBuildSlots:
         assert len(unique) >= min(5, len(contexts)), (
             f"Need variety: {len(unique)} unique contexts out of {len(contexts)}"
         )
+
+
+class TestSlotBuilderBenchmark:
+    def test_seeded_builds_are_deterministic(self):
+        import random
+
+        random.seed(7)
+        a = build_slots("CBSE", "Class 3", "Maths", "Addition (carries)", "hard", 10, "standard", "English")
+        random.seed(7)
+        b = build_slots("CBSE", "Class 3", "Maths", "Addition (carries)", "hard", 10, "standard", "English")
+        assert [s.llm_instruction for s in a.slots] == [s.llm_instruction for s in b.slots]
+
+    def test_bench_case_and_hot_spots(self):
+        from scripts.bulk_audit import HOT_SPOTS, _case_args, bench_case, hot_spot_report
+
+        args = _case_args("Addition (carries)", {}, "medium", 10)
+        cost = bench_case(args, repeat=2, seed=1)
+        assert (cost.subject, cost.grade, cost.num_questions) == ("Maths", "Class 3", 10)
+        assert 0 < cost.median_ms <= cost.max_ms
+        assert cost.alloc_peak_kb > 0
+
+        per_build, heaviest = hot_spot_report([args], seed=1, top=5)
+        assert set(per_build) == set(HOT_SPOTS)
+        assert per_build["get_topic_profile"] >= 1
+        assert len(heaviest) == 5
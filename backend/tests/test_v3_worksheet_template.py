@@ -0,0 +1,111 @@
+"""Tests for the cached v3 worksheet template rendering (SVG fragments + shared question body)."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.services.v3 import worksheet_template as wt
+from app.services.v3.worksheet_template import (
+    clear_template_caches,
+    render_worksheet_html,
+    svg_fragment,
+    template_cache_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    clear_template_caches()
+    yield
+    clear_template_caches()
+
+
+def _worksheet(subject: str = "Maths") -> dict:
+    return {
+        "title": "Time practice",
+        "subject": subject,
+        "questions": [
+            {
+                "text": "What time is it?",
+                "role": "recognition",
+                "visual_type": "clock",
+                "visual_data": {"hour": 3, "minute": 30},
+                "correct_answer": "3:30",
+            },
+            {
+                "text": "Hop along the line",
+                "role": "application",
+                "visual_type": "number_line",
+                "visual_data": {"start": 0, "end": 10, "hops_from": 2, "hops_count": 3},
+                "correct_answer": "5",
+            },
+            {
+                "text": "Same clock again",
+                "role": "thinking",
+                "visual_type": "clock",
+                "visual_data": {"minute": 30, "hour": 3},
+                "correct_answer": "3:30",
+            },
+        ],
+    }
+
+
+class TestSvgFragment:
+    def test_matches_direct_macro_call(self):
+        module = wt._env.get_template("partials/svg_visuals.html.j2").module
+        assert svg_fragment("clock", {"hour": 3, "minute": 30}) == str(module.clock(3, 30))
+        assert svg_fragment("pie_fraction", {}) == str(module.pie_fraction(1, 4))
+
+    def test_memoized_by_canonical_visual_data(self):
+        first = svg_fragment("clock", {"hour": 3, "minute": 30})
+        again = svg_fragment("clock", {"minute": 30, "hour": 3})
+        assert again is first
+        stats = template_cache_stats()
+        assert stats["svg_misses"] == 1
+        assert stats["svg_hits"] == 1
+
+    def test_unsortable_visual_data_renders_uncached(self):
+        data = {"hour": 3, 1: "x"}
+        assert "svg" in svg_fragment("clock", data)
+        assert template_cache_stats()["svg_size"] == 0
+
+
+class TestQuestionBodyReuse:
+    def test_variants_share_one_question_body_render(self):
+        ws = _worksheet()
+        full = render_worksheet_html(ws)
+        student = render_worksheet_html({**ws, "_hide_answers": True})
+        key = render_worksheet_html({**ws, "_answers_only": True})
+
+        stats = template_cache_stats()
+        assert stats["body_misses"] == 1
+        assert stats["body_hits"] == 1
+        # Repeated clock visual rendered once
+        assert stats["svg_misses"] == 2
+
+        assert "Hop along the line" in full and "Hop along the line" in student
+        assert "Hop along the line" not in key
+        assert "answer-key" in full and "answer-key" in key
+        assert 'class="answer-key' not in student
+
+    def test_body_keyed_on_content(self):
+        ws = _worksheet()
+        render_worksheet_html(ws)
+        changed = _worksheet()
+        changed["questions"][0]["text"] = "A different question"
+        html = render_worksheet_html(changed)
+        assert "A different question" in html
+        assert template_cache_stats()["body_misses"] == 2
+
+    def test_body_uses_subject_labels(self):
+        maths = render_worksheet_html(_worksheet("Maths"))
+        hindi = render_worksheet_html(_worksheet("Hindi"))
+        assert maths != hindi
+        assert template_cache_stats()["body_misses"] == 2
+
+    def test_question_text_is_escaped(self):
+        ws = _worksheet()
+        ws["questions"][0]["text"] = "<script>alert(1)</script>"
+        html = render_worksheet_html(ws)
+        assert "<script>alert(1)</script>" not in html
+        assert "&lt;script&gt;" in html
@@ -400,6 +400,97 @@ class TestGenerateWorksheetAsync:
         assert "questions" in data
         assert call_count >= 2  # retried at least once after bad JSON
 
+    @staticmethod
+    def _run_with_responses(responses: list[str]):
+        """Run generate_worksheet (Class 3 Maths, 5 questions) over scripted LLM responses."""
+        from app.services.worksheet_generator import generate_worksheet
+
+        prompts: list[str] = []
+
+        def side_effect(*args, **kwargs):
+            prompts.append(kwargs["messages"][1]["content"])
+            content = responses[min(len(prompts), len(responses)) - 1]
+            return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.side_effect = side_effect
+
+        mock_qs = MagicMock(total_score=85.0, export_allowed=True, gold_standard_eligible=False)
+        with patch("app.services.curriculum.get_curriculum_context", return_value=None), \
+             patch("app.services.quality_scorer.score_worksheet", return_value=mock_qs):
+            data, _, warnings = generate_worksheet(
+                client=mock_client,
+                board="CBSE",
+                grade_level="Class 3",
+                subject="Maths",
+                topic="Addition (carries)",
+                difficulty="easy",
+                num_questions=5,
+            )
+        return data, warnings, prompts
+
+    @staticmethod
+    def _varied_worksheet() -> dict:
+        """Five structurally different questions; q1's MCQ answer is not among its options."""
+        questions = [
+            _make_question(qid="q1", text="Which sum is the largest?", options=["12", "14", "16", "18"],
+                           correct_answer="20"),
+            _make_question(qid="q2", qtype="fill_blank", text="36 + 47 = ______", correct_answer="83",
+                           role="recognition"),
+            _make_question(qid="q3", qtype="word_problem", role="application",
+                           text="Can you help Meera? She has 28 marbles and wins 15 more. How many now?",
+                           correct_answer="43"),
+            _make_question(qid="q4", qtype="short_answer", role="application",
+                           text="Help Arjun add 56 and 29 by carrying the tens.", correct_answer="85"),
+            _make_question(qid="q5", qtype="true_false", role="thinking", options=["True", "False"],
+                           text="Ravi says 45 + 38 = 73. True or false?", correct_answer="False"),
+        ]
+        return {
+            "title": "Addition (carries)",
+            "skill_focus": "Adding two-digit numbers with carrying",
+            "common_mistake": "Forgetting to carry the ten.",
+            "parent_tip": "Practise with coins.",
+            "learning_objectives": ["Add two-digit numbers with carrying"],
+            "questions": questions,
+        }
+
+    def test_retry_repairs_only_offending_question(self):
+        """q1's MCQ answer is not in its options: only q1 is regenerated."""
+        first = self._varied_worksheet()
+        fix = [_make_question(qid="x", text="Which number is 7 + 8?", options=["13", "14", "15", "16"],
+                              correct_answer="15")]
+
+        data, warnings, prompts = self._run_with_responses([json.dumps(first), json.dumps(fix)])
+
+        assert len(prompts) == 2
+        assert "Replace 1 question(s)" in prompts[1]
+        assert "MCQ answer '20' not in options" in prompts[1]
+        texts = [q["text"] for q in data["questions"]]
+        assert "Which number is 7 + 8?" in texts
+        # The other four questions are sent as context and kept as they were
+        assert all(f'"{t}"' in prompts[1] for t in texts if t != "Which number is 7 + 8?")
+        assert any(w.startswith("[repair] Replaced 1/5 question(s) (q1)") for w in warnings)
+
+    def test_failed_repair_falls_back_to_full_regeneration(self):
+        first = json.dumps(self._varied_worksheet())
+        data, warnings, prompts = self._run_with_responses([first, "NOT JSON", first])
+
+        assert "Replace 1 question(s)" in prompts[1]
+        assert "FIX THESE ERRORS" in prompts[2]
+        assert any(w.startswith("[repair] Targeted repair failed") for w in warnings)
+        assert len(data["questions"]) == 5
+
+    def test_repair_plan_limits(self):
+        from app.services.worksheet_generator import _error_problems, _plan_repair
+
+        qs = self._varied_worksheet()["questions"]
+        assert _error_problems(qs, ["q2: empty question text"]) == {1: "empty question text"}
+        # An error not tied to one question forces a full regeneration
+        assert _error_problems(qs, ["q2: empty question text", "Duplicate question detected"]) is None
+        # So does replacing more than half the worksheet
+        assert _plan_repair(qs, {0: "x", 1: "x"}) == {0: "x", 1: "x"}
+        assert _plan_repair(qs, {0: "x", 1: "x", 2: "x"}) is None
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Warning severity categorization